@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Incremental Calendar Store
+
+Local SQLite store for FMP calendar feeds (earnings, economic events) with
+delta sync, revision tracking and an indexed date-range query.
+
+Sync works on a per-day ledger: each calendar day records when it was last
+fetched. A day is served from the store when it was synced after it ended
+(its events are final) or within the sync TTL; the remaining stale days are
+merged into contiguous windows and only those windows are downloaded.
+
+Events are keyed by a stable id per kind:
+    earnings  symbol:fiscalDateEnding   (survives date reschedules)
+    economic  country:event:date
+
+When a re-synced event changes a tracked field (actual vs. estimate updates,
+reschedules) the event's revision number is bumped and the old/new values are
+kept in the revisions table. Events that vanish from a re-synced window are
+removed and recorded as a 'removed' revision.
+
+Usage:
+    from calendar_store import CalendarStore
+
+    store = CalendarStore()
+    store.sync('earnings', '2025-11-03', '2025-11-09', client.fetch_earnings_calendar)
+    events = store.events('earnings', '2025-11-03', '2025-11-09')
+    changes = store.revisions('earnings', '2025-11-03', '2025-11-09')
+"""
+
+import json
+import sqlite3
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+CACHE_DIR = Path(__file__).parent.parent / "cache"
+DEFAULT_STORE_PATH = CACHE_DIR / "calendar_store.db"
+
+# Fields whose changes are recorded as revisions
+TRACKED_FIELDS = {
+    'earnings': ('date', 'time', 'epsEstimated', 'revenueEstimated', 'eps', 'revenue'),
+    'economic': ('estimate', 'actual', 'previous', 'impact'),
+}
+
+# FMP limits calendar requests to 90-day windows
+MAX_WINDOW_DAYS = 90
+
+
+def event_id(kind: str, event: Dict) -> str:
+    """Stable identifier for an event of the given kind"""
+    if kind == 'earnings':
+        return f"{event.get('symbol', '')}:{event.get('fiscalDateEnding') or event.get('date', '')}"
+    if kind == 'economic':
+        return f"{event.get('country', '')}:{event.get('event', '')}:{event.get('date', '')}"
+    raise ValueError(f"Unknown calendar kind: {kind}")
+
+
+def _parse_day(value: str) -> date:
+    return datetime.strptime(value[:10], '%Y-%m-%d').date()
+
+
+class CalendarStore:
+    """SQLite calendar events with a per-day sync ledger and revision history"""
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH, ttl: timedelta = timedelta(hours=12)):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS events (
+                kind TEXT NOT NULL,
+                event_id TEXT NOT NULL,
+                day TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                revision INTEGER NOT NULL DEFAULT 0,
+                first_seen TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (kind, event_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_events_kind_day ON events (kind, day);
+
+            CREATE TABLE IF NOT EXISTS revisions (
+                kind TEXT NOT NULL,
+                event_id TEXT NOT NULL,
+                revision INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                changed_at TEXT NOT NULL,
+                field TEXT NOT NULL,
+                old_value TEXT,
+                new_value TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_revisions_kind_day ON revisions (kind, day);
+
+            CREATE TABLE IF NOT EXISTS synced_days (
+                kind TEXT NOT NULL,
+                day TEXT NOT NULL,
+                synced_at TEXT NOT NULL,
+                PRIMARY KEY (kind, day)
+            );
+        """)
+        self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Sync planning
+    # ------------------------------------------------------------------
+
+    def stale_windows(
+        self,
+        kind: str,
+        start: str,
+        end: str,
+        now: Optional[datetime] = None
+    ) -> List[Tuple[str, str]]:
+        """Contiguous [from, to] windows in the range that need downloading"""
+        now = now or datetime.now()
+        first, last = _parse_day(start), _parse_day(end)
+        synced = dict(self._conn.execute(
+            "SELECT day, synced_at FROM synced_days WHERE kind = ? AND day BETWEEN ? AND ?",
+            (kind, first.isoformat(), last.isoformat())
+        ).fetchall())
+
+        windows = []
+        window_start = None
+        day = first
+        while day <= last:
+            synced_at = synced.get(day.isoformat())
+            fresh = False
+            if synced_at:
+                synced_at = datetime.fromisoformat(synced_at)
+                day_end = datetime.combine(day + timedelta(days=1), datetime.min.time())
+                fresh = synced_at >= day_end or now - synced_at < self.ttl
+
+            if not fresh and window_start is None:
+                window_start = day
+            if window_start is not None and (
+                fresh or (day - window_start).days + 1 >= MAX_WINDOW_DAYS
+            ):
+                window_end = day - timedelta(days=1) if fresh else day
+                windows.append((window_start.isoformat(), window_end.isoformat()))
+                window_start = None
+            day += timedelta(days=1)
+
+        if window_start is not None:
+            windows.append((window_start.isoformat(), last.isoformat()))
+        return windows
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def sync(
+        self,
+        kind: str,
+        start: str,
+        end: str,
+        fetch: Callable[[str, str], Optional[List[Dict]]],
+        force: bool = False
+    ) -> Dict[str, int]:
+        """
+        Download only the stale windows of [start, end] and merge them in
+
+        fetch(from, to) returns the raw event list (or None on failure, in
+        which case that window is left unsynced). Returns counts of requests
+        made, failed windows and events added/updated/removed.
+        """
+        windows = [(start, end)] if force else self.stale_windows(kind, start, end)
+        stats = {'requests': 0, 'failed': 0, 'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+
+        for window_start, window_end in windows:
+            events = fetch(window_start, window_end)
+            stats['requests'] += 1
+            if events is None:
+                stats['failed'] += 1
+                continue
+            for key, count in self._merge_window(kind, window_start, window_end, events).items():
+                stats[key] += count
+
+        if windows:
+            print(f"✓ Calendar store ({kind}): synced {len(windows)} window(s); "
+                  f"{stats['added']} added, {stats['updated']} revised, {stats['removed']} removed",
+                  file=sys.stderr)
+        else:
+            print(f"✓ Calendar store ({kind}): {start} to {end} served from local store", file=sys.stderr)
+        return stats
+
+    def _merge_window(self, kind: str, start: str, end: str, events: List[Dict]) -> Dict[str, int]:
+        now = datetime.now().isoformat()
+        tracked = TRACKED_FIELDS[kind]
+        counts = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+
+        stored = {
+            row[0]: (json.loads(row[1]), row[2])
+            for row in self._conn.execute(
+                "SELECT event_id, payload, revision FROM events WHERE kind = ? AND day BETWEEN ? AND ?",
+                (kind, start, end)
+            )
+        }
+
+        seen = set()
+        for event in events:
+            eid = event_id(kind, event)
+            day = (event.get('date') or '')[:10]
+            if not day or not start <= day <= end:
+                continue
+            seen.add(eid)
+
+            previous = stored.get(eid)
+            if previous is None:
+                # May have been rescheduled in from outside this window
+                row = self._conn.execute(
+                    "SELECT payload, revision FROM events WHERE kind = ? AND event_id = ?", (kind, eid)
+                ).fetchone()
+                previous = (json.loads(row[0]), row[1]) if row else None
+
+            if previous is None:
+                self._conn.execute(
+                    "INSERT INTO events (kind, event_id, day, payload, revision, first_seen, updated_at) "
+                    "VALUES (?, ?, ?, ?, 0, ?, ?)",
+                    (kind, eid, day, json.dumps(event), now, now)
+                )
+                counts['added'] += 1
+                continue
+
+            old, revision = previous
+            changed = [f for f in tracked if old.get(f) != event.get(f)]
+            if not changed:
+                if old != event:
+                    self._conn.execute(
+                        "UPDATE events SET payload = ?, updated_at = ? WHERE kind = ? AND event_id = ?",
+                        (json.dumps(event), now, kind, eid)
+                    )
+                counts['unchanged'] += 1
+                continue
+
+            revision += 1
+            self._conn.execute(
+                "UPDATE events SET day = ?, payload = ?, revision = ?, updated_at = ? "
+                "WHERE kind = ? AND event_id = ?",
+                (day, json.dumps(event), revision, now, kind, eid)
+            )
+            self._conn.executemany(
+                "INSERT INTO revisions (kind, event_id, revision, day, changed_at, field, old_value, new_value) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(kind, eid, revision, day, now, f, json.dumps(old.get(f)), json.dumps(event.get(f)))
+                 for f in changed]
+            )
+            counts['updated'] += 1
+
+        for eid, (old, revision) in stored.items():
+            if eid in seen:
+                continue
+            self._conn.execute("DELETE FROM events WHERE kind = ? AND event_id = ?", (kind, eid))
+            self._conn.execute(
+                "INSERT INTO revisions (kind, event_id, revision, day, changed_at, field, old_value, new_value) "
+                "VALUES (?, ?, ?, ?, ?, 'removed', ?, NULL)",
+                (kind, eid, revision + 1, (old.get('date') or '')[:10], now, json.dumps(old.get('date')))
+            )
+            counts['removed'] += 1
+
+        day = _parse_day(start)
+        last = _parse_day(end)
+        days = []
+        while day <= last:
+            days.append((kind, day.isoformat(), now))
+            day += timedelta(days=1)
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO synced_days (kind, day, synced_at) VALUES (?, ?, ?)", days
+        )
+        self._conn.commit()
+        return counts
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def events(self, kind: str, start: str, end: str) -> List[Dict]:
+        """Stored events with start <= date <= end, ordered by date"""
+        rows = self._conn.execute(
+            "SELECT payload FROM events WHERE kind = ? AND day BETWEEN ? AND ? ORDER BY day, event_id",
+            (kind, start[:10], end[:10])
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def revisions(self, kind: str, start: str, end: str) -> List[Dict]:
+        """Recorded field changes for events dated within the range"""
+        rows = self._conn.execute(
+            "SELECT event_id, revision, day, changed_at, field, old_value, new_value FROM revisions "
+            "WHERE kind = ? AND day BETWEEN ? AND ? ORDER BY changed_at, event_id",
+            (kind, start[:10], end[:10])
+        ).fetchall()
+        return [
+            {
+                'event_id': eid,
+                'revision': revision,
+                'date': day,
+                'changed_at': changed_at,
+                'field': field,
+                'old': json.loads(old) if old is not None else None,
+                'new': json.loads(new) if new is not None else None
+            }
+            for eid, revision, day, changed_at, field, old, new in rows
+        ]
+
+    def close(self):
+        self._conn.close()
@@ -13,17 +13,47 @@ Usage:
     # With API key as argument
     python fetch_earnings_fmp.py 2025-11-03 2025-11-09 YOUR_API_KEY
 
+    # Bypass the calendar store and company profile cache
+    python fetch_earnings_fmp.py 2025-11-03 2025-11-09 --no-cache
+
     # Help
     python fetch_earnings_fmp.py --help
+
+Company profiles are cached in earnings-calendar/cache/ with per-field TTLs
+(market cap: 1 day, name/sector/industry: 30 days), so repeat runs only fetch
+symbols whose entries are missing or stale.
+
+Earnings events are synced into a local calendar store (calendar_store.py):
+only days not fetched within the last 12 hours are downloaded, and estimate
+or date changes are recorded as revisions.
+
+Each processed event carries NYSE session fields from the shared trading
+calendar (market-environment-analysis/scripts/trading_calendar.py):
+tradingDaysUntil (sessions from today to the report date) and reactionDate
+(first session that trades on the news: same day for BMO, next session for AMC).
 """
 
 import sys
 import os
 import json
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import List, Dict, Optional
 
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "market-environment-analysis" / "scripts"))
+
+from calendar_store import CalendarStore
+from profile_cache import ProfileCache, RateLimiter
+# Shared exchange session calendar (market-environment-analysis skill)
+try:
+    from trading_calendar import get_calendar
+except ImportError:
+    # Standalone install: session fields are left as None
+    get_calendar = None
+
 
 class FMPEarningsCalendar:
     """FMP Earnings Calendar API client"""
@@ -32,16 +62,30 @@ class FMPEarningsCalendar:
     MIN_MARKET_CAP = 2_000_000_000  # $2B
     US_EXCHANGES = ['NYSE', 'NASDAQ', 'AMEX', 'NYSEArca', 'BATS', 'NMS', 'NGM', 'NCM']
 
-    def __init__(self, api_key: str, us_only: bool = True):
+    def __init__(
+        self,
+        api_key: str,
+        us_only: bool = True,
+        max_workers: int = 4,
+        requests_per_second: float = 5.0,
+        use_cache: bool = True
+    ):
         """
         Initialize FMP client
 
         Args:
             api_key: FMP API key
             us_only: If True, filter for US stocks only (default: True)
+            max_workers: Concurrent profile/quote batch requests (default: 4)
+            requests_per_second: Request rate shared by all workers (default: 5)
+            use_cache: Use the persistent company profile cache (default: True)
         """
         self.api_key = api_key
         self.us_only = us_only
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.session = requests.Session()
+        self.cache = ProfileCache() if use_cache else None
 
     def fetch_earnings_calendar(self, start_date: str, end_date: str) -> Optional[List[Dict]]:
         """
@@ -97,43 +141,82 @@ class FMPEarningsCalendar:
             print(f"❌ ERROR: Unexpected error: {str(e)}", file=sys.stderr)
             return None
 
+    def _fetch_batch(self, endpoint: str, batch: List[str]) -> List[Dict]:
+        """Rate-limited GET of a comma-separated symbol batch"""
+        self.rate_limiter.wait()
+        url = f"{self.BASE_URL}/{endpoint}/{','.join(batch)}"
+        response = self.session.get(url, params={"apikey": self.api_key}, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+
+        # FMP reports errors (bad key, plan limits) as a JSON object; treat that as
+        # a failed batch so its symbols are not cached as having no profile
+        if not isinstance(data, list):
+            message = data.get("Error Message") if isinstance(data, dict) else None
+            raise ValueError(message or f"unexpected {endpoint} response: {str(data)[:100]}")
+        return [item for item in data if isinstance(item, dict)]
+
     def fetch_company_profiles(self, symbols: List[str]) -> Dict[str, Dict]:
         """
         Fetch company profiles for multiple symbols (batch)
 
+        Profiles come from the local cache where fresh. Symbols with missing or
+        stale sector/name fields are fetched from /profile; symbols with only a
+        stale market cap are refreshed from /quote. All batches run
+        concurrently through a shared rate limiter.
+
         Args:
             symbols: List of ticker symbols
 
         Returns:
             Dictionary mapping symbol to profile data
         """
-        profiles = {}
         batch_size = 100  # FMP allows batch requests
 
-        print(f"✓ Fetching profiles for {len(symbols)} companies...", file=sys.stderr)
+        if self.cache:
+            needs_profile, needs_quote = self.cache.stale_symbols(symbols)
+        else:
+            needs_profile, needs_quote = list(symbols), []
 
-        for i in range(0, len(symbols), batch_size):
-            batch = symbols[i:i+batch_size]
-            symbols_str = ",".join(batch)
+        print(f"✓ Profiles for {len(symbols)} companies: "
+              f"{len(symbols) - len(needs_profile) - len(needs_quote)} cached, "
+              f"{len(needs_profile)} to fetch, {len(needs_quote)} market caps to refresh", file=sys.stderr)
 
-            url = f"{self.BASE_URL}/profile/{symbols_str}"
-            params = {"apikey": self.api_key}
+        jobs = [("profile", needs_profile[i:i+batch_size]) for i in range(0, len(needs_profile), batch_size)]
+        jobs += [("quote", needs_quote[i:i+batch_size]) for i in range(0, len(needs_quote), batch_size)]
 
-            try:
-                response = requests.get(url, params=params, timeout=30)
-                response.raise_for_status()
+        profiles = {}
+        market_caps = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._fetch_batch, endpoint, batch): (endpoint, batch)
+                       for endpoint, batch in jobs}
+            for future in as_completed(futures):
+                endpoint, batch = futures[future]
+                try:
+                    items = future.result()
+                except Exception as e:
+                    print(f"  ⚠️  Warning: Failed to fetch {endpoint} batch ({len(batch)} symbols): {str(e)}",
+                          file=sys.stderr)
+                    continue
 
-                for profile in response.json():
-                    if isinstance(profile, dict):
-                        profiles[profile.get("symbol")] = profile
+                if endpoint == "profile":
+                    fetched = {p.get("symbol"): p for p in items}
+                    profiles.update(fetched)
+                    if self.cache:
+                        self.cache.put_profiles(fetched, requested=batch)
+                else:
+                    fetched = {q.get("symbol"): q.get("marketCap", 0) for q in items}
+                    market_caps.update(fetched)
+                    if self.cache:
+                        self.cache.put_market_caps(fetched)
 
-                print(f"  ✓ Batch {i//batch_size + 1}: {len(batch)} profiles", file=sys.stderr)
+                print(f"  ✓ {endpoint.capitalize()} batch: {len(items)}/{len(batch)} symbols", file=sys.stderr)
 
-            except Exception as e:
-                print(f"  ⚠️  Warning: Failed to fetch batch {i//batch_size + 1}: {str(e)}", file=sys.stderr)
-                continue
+        if self.cache:
+            profiles = self.cache.get_many(symbols)
 
-        print(f"✓ Retrieved {len(profiles)} company profiles", file=sys.stderr)
+        print(f"✓ Retrieved {len(profiles)} company profiles ({len(jobs)} API calls)", file=sys.stderr)
         return profiles
 
     def filter_by_market_cap(self, earnings: List[Dict], profiles: Dict[str, Dict]) -> List[Dict]:
@@ -262,8 +345,35 @@ class FMPEarningsCalendar:
 
             processed.append(processed_earning)
 
+        self.add_session_dates(processed)
         return processed
 
+    def add_session_dates(self, earnings: List[Dict]) -> None:
+        """
+        Add NYSE session fields to processed earnings in place
+
+        tradingDaysUntil counts sessions from today up to the report date;
+        reactionDate is the first session whose prices reflect the report
+        (the report date itself for BMO, the following session otherwise).
+        Dates outside the calendar range, or every date when the trading
+        calendar is not installed, get None.
+        """
+        calendar = get_calendar("NYSE") if get_calendar else None
+        today = datetime.now().date()
+
+        for earning in earnings:
+            earning["tradingDaysUntil"] = None
+            earning["reactionDate"] = None
+            report_date = earning.get("date")
+            if not report_date or calendar is None:
+                continue
+            try:
+                earning["tradingDaysUntil"] = calendar.trading_days_between(today, report_date)
+                reaction = calendar.next_session(report_date, inclusive=earning["timing"] == "BMO")
+                earning["reactionDate"] = reaction.isoformat()
+            except ValueError:
+                continue
+
     def sort_earnings(self, earnings: List[Dict]) -> List[Dict]:
         """
         Sort earnings by date, timing, and market cap
@@ -343,6 +453,9 @@ def print_usage():
     print("  END_DATE    End date in YYYY-MM-DD format", file=sys.stderr)
     print("  API_KEY     (Optional) FMP API key (or use FMP_API_KEY env var)", file=sys.stderr)
     print("", file=sys.stderr)
+    print("Options:", file=sys.stderr)
+    print("  --no-cache  Bypass the local calendar store and company profile cache", file=sys.stderr)
+    print("", file=sys.stderr)
     print("Examples:", file=sys.stderr)
     print("  export FMP_API_KEY='your-key'", file=sys.stderr)
     print("  python fetch_earnings_fmp.py 2025-11-03 2025-11-09", file=sys.stderr)
@@ -361,6 +474,11 @@ def main():
         print_usage()
         sys.exit(0)
 
+    # Optional flag (positional arguments keep their order)
+    use_cache = "--no-cache" not in sys.argv
+    if not use_cache:
+        sys.argv.remove("--no-cache")
+
     # Validate arguments
     if len(sys.argv) < 3:
         print("❌ ERROR: Missing required arguments", file=sys.stderr)
@@ -392,13 +510,20 @@ def main():
     print(f"", file=sys.stderr)
 
     # Initialize client
-    client = FMPEarningsCalendar(api_key)
+    client = FMPEarningsCalendar(api_key, use_cache=use_cache)
 
-    # Step 1: Fetch earnings calendar
+    # Step 1: Fetch earnings calendar (delta sync through the local store)
     print("Step 1: Fetching earnings calendar...", file=sys.stderr)
-    earnings = client.fetch_earnings_calendar(start_date, end_date)
-    if earnings is None:
-        sys.exit(1)
+    if use_cache:
+        store = CalendarStore()
+        sync = store.sync('earnings', start_date, end_date, client.fetch_earnings_calendar)
+        earnings = store.events('earnings', start_date, end_date)
+        if sync['failed'] and not earnings:
+            sys.exit(1)
+    else:
+        earnings = client.fetch_earnings_calendar(start_date, end_date)
+        if earnings is None:
+            sys.exit(1)
 
     if len(earnings) == 0:
         print("⚠️  Warning: No earnings announcements found for date range", file=sys.stderr)
@@ -11,43 +11,96 @@ Usage:
     # Output to file
     python generate_report.py earnings_data.json earnings_calendar.md
 
+    # Read straight from the local calendar store (after fetch_earnings_fmp.py has synced it)
+    python generate_report.py --store 2025-11-03 2025-11-09 earnings_calendar.md
+
     # Help
     python generate_report.py --help
 """
 
 import sys
+import heapq
 import json
 from datetime import datetime
 from collections import defaultdict
-from typing import List, Dict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "market-environment-analysis" / "scripts"))
 
+# Shared exchange session calendar (market-environment-analysis skill)
+try:
+    from trading_calendar import get_calendar
+except ImportError:
+    # Standalone install: no holiday/early-close notes
+    get_calendar = None
 
-def load_earnings_data(filepath: str) -> List[Dict]:
+
+def iter_earnings_data(filepath: str, chunk_size: int = 1 << 20) -> Iterator[Dict]:
     """
-    Load earnings data from JSON file
+    Stream earnings objects from a JSON file without loading it whole
+
+    Reads the file in chunks and decodes one array element at a time. Text
+    before the first array (progress messages) is skipped, and several
+    concatenated arrays (e.g. multiple weekly fetches appended to one file)
+    are read back to back.
 
     Args:
         filepath: Path to JSON file
+        chunk_size: Characters read per chunk
 
-    Returns:
-        List of earnings announcements
+    Yields:
+        Earnings announcements
     """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    in_array = False
+    found_array = False
+    eof = False
+
     try:
         with open(filepath, 'r') as f:
-            content = f.read()
-
-            # Handle case where file has progress messages before JSON
-            json_start = content.find('[')
-            if json_start != -1:
-                content = content[json_start:]
-
-            data = json.loads(content)
-
-            if not isinstance(data, list):
-                print("ERROR: JSON file must contain an array of earnings data", file=sys.stderr)
-                sys.exit(1)
-
-            return data
+            while not eof:
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer += chunk
+                pos = 0
+
+                while True:
+                    if not in_array:
+                        start = buffer.find('[', pos)
+                        if start == -1:
+                            pos = len(buffer)
+                            break
+                        in_array = found_array = True
+                        pos = start + 1
+
+                    while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                        pos += 1
+                    if pos >= len(buffer):
+                        break
+                    if buffer[pos] == ']':
+                        in_array = False
+                        pos += 1
+                        continue
+
+                    try:
+                        item, pos_end = decoder.raw_decode(buffer, pos)
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        break  # element continues in the next chunk
+
+                    pos = pos_end
+                    if isinstance(item, dict):
+                        yield item
+
+                buffer = buffer[pos:]
+
+        if not found_array:
+            print("ERROR: JSON file must contain an array of earnings data", file=sys.stderr)
+            sys.exit(1)
 
     except FileNotFoundError:
         print(f"ERROR: File not found: {filepath}", file=sys.stderr)
@@ -55,67 +108,138 @@ def load_earnings_data(filepath: str) -> List[Dict]:
     except json.JSONDecodeError as e:
         print(f"ERROR: Invalid JSON in file: {e}", file=sys.stderr)
         sys.exit(1)
-    except Exception as e:
-        print(f"ERROR: Unexpected error reading file: {e}", file=sys.stderr)
-        sys.exit(1)
 
 
-def group_by_date(earnings: List[Dict]) -> Dict:
+def load_earnings_from_store(start_date: str, end_date: str) -> List[Dict]:
     """
-    Group earnings by date and timing
+    Load earnings for a date range from the local calendar store
+
+    Events are enriched from the cached company profiles and filtered,
+    processed and sorted exactly as fetch_earnings_fmp.py does, without
+    any API calls.
 
     Args:
-        earnings: List of earnings announcements
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD)
 
     Returns:
-        Dictionary grouped by date and timing
+        List of processed earnings announcements
     """
-    by_date = defaultdict(lambda: {'BMO': [], 'AMC': [], 'TAS': []})
+    from calendar_store import CalendarStore
+    from fetch_earnings_fmp import FMPEarningsCalendar
+    from profile_cache import ProfileCache
 
-    for stock in earnings:
-        date = stock.get('date')
-        timing = stock.get('timing', 'TAS')
+    earnings = CalendarStore().events('earnings', start_date, end_date)
+    if not earnings:
+        print(f"ERROR: No stored earnings for {start_date} to {end_date}. "
+              f"Run fetch_earnings_fmp.py for this range first.", file=sys.stderr)
+        sys.exit(1)
 
-        if date:
-            by_date[date][timing].append(stock)
+    symbols = list({e.get("symbol") for e in earnings if e.get("symbol")})
+    profiles = ProfileCache().get_many(symbols)
 
-    return by_date
+    client = FMPEarningsCalendar(api_key="", use_cache=False)
+    filtered = client.filter_by_market_cap(earnings, profiles)
+    return client.sort_earnings(client.process_earnings(filtered))
 
 
-def calculate_summary_stats(earnings: List[Dict]) -> Dict:
+class EarningsAggregator:
     """
-    Calculate summary statistics
+    Single-pass accumulator for every statistic the report needs
+
+    Each announcement is visited once: counts, sector distribution and per-day
+    totals are updated in place, while bounded min-heaps keep the largest
+    companies per (date, timing) table and overall. Memory grows with the
+    number of days, not the number of companies.
+    """
+
+    def __init__(self, per_table: int = 30, top_n: int = 5, top_sectors: int = 5):
+        self.per_table = per_table
+        self.top_n = top_n
+        self.top_sectors = top_sectors
+
+        self.total = 0
+        self.large_cap = 0
+        self.sectors = defaultdict(int)
+        self.date_counts = defaultdict(int)
+        self.table_counts = defaultdict(lambda: {'BMO': 0, 'AMC': 0, 'TAS': 0})
+        self.tables = defaultdict(lambda: {'BMO': [], 'AMC': [], 'TAS': []})
+        self._top = []
+        self._seq = 0
+
+    @staticmethod
+    def _push(heap: List, limit: int, entry: Tuple):
+        """Keep the `limit` largest (market cap, -arrival, stock) entries"""
+        if len(heap) < limit:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    @staticmethod
+    def _ranked(heap: List) -> List[Dict]:
+        return [entry[2] for entry in sorted(heap, reverse=True)]
+
+    def add(self, stock: Dict):
+        market_cap = stock.get('marketCap', 0)
+        self.total += 1
+        if market_cap >= 10_000_000_000:
+            self.large_cap += 1
+        self.sectors[stock.get('sector', 'N/A')] += 1
+
+        # Larger caps win; -arrival order makes earlier input win ties (and
+        # keeps tuple comparison from ever reaching the dict)
+        entry = (market_cap, -self._seq, stock)
+        self._seq += 1
+        self._push(self._top, self.top_n, entry)
+
+        date = stock.get('date')
+        if date:
+            timing = stock.get('timing', 'TAS')
+            self.date_counts[date] += 1
+            counts = self.table_counts[date]
+            counts[timing] = counts.get(timing, 0) + 1
+            self._push(self.tables[date].setdefault(timing, []), self.per_table, entry)
+
+    def consume(self, earnings: Iterable[Dict]) -> 'EarningsAggregator':
+        for stock in earnings:
+            self.add(stock)
+        return self
+
+    @property
+    def dates(self) -> List[str]:
+        return sorted(self.date_counts)
+
+    def table(self, date: str, timing: str) -> Tuple[List[Dict], int]:
+        """Top companies by market cap for one (date, timing) and the full count"""
+        return self._ranked(self.tables[date].get(timing, [])), self.table_counts[date].get(timing, 0)
+
+    def top_companies(self) -> List[Dict]:
+        return self._ranked(self._top)
+
+    def summary_stats(self) -> Dict:
+        peak_date, peak_count = max(self.date_counts.items(), key=lambda x: x[1])
+        return {
+            'total': self.total,
+            'large_cap': self.large_cap,
+            'mid_cap': self.total - self.large_cap,
+            'sectors': dict(self.sectors),
+            'top_sectors': heapq.nlargest(self.top_sectors, self.sectors.items(), key=lambda x: x[1]),
+            'peak_date': peak_date,
+            'peak_count': peak_count
+        }
+
+
+def aggregate_earnings(earnings: Iterable[Dict]) -> EarningsAggregator:
+    """
+    Build all report statistics in one pass over the earnings
 
     Args:
-        earnings: List of earnings announcements
+        earnings: Earnings announcements (list or stream)
 
     Returns:
-        Dictionary with summary statistics
+        Populated EarningsAggregator
     """
-    total = len(earnings)
-    large_cap = sum(1 for s in earnings if s.get('marketCap', 0) >= 10_000_000_000)
-    mid_cap = total - large_cap
-
-    # Sector distribution
-    sectors = defaultdict(int)
-    for stock in earnings:
-        sector = stock.get('sector', 'N/A')
-        sectors[sector] += 1
-
-    # Peak day
-    by_date = group_by_date(earnings)
-    peak = max(by_date.items(), key=lambda x: sum(len(v) for v in x[1].values()))
-    peak_date, peak_data = peak
-    peak_count = sum(len(v) for v in peak_data.values())
-
-    return {
-        'total': total,
-        'large_cap': large_cap,
-        'mid_cap': mid_cap,
-        'sectors': dict(sectors),
-        'peak_date': peak_date,
-        'peak_count': peak_count
-    }
+    return EarningsAggregator().consume(earnings)
 
 
 def get_day_name(date_str: str) -> str:
@@ -132,6 +256,30 @@ def get_day_name(date_str: str) -> str:
     return date_obj.strftime('%A, %B %d, %Y')
 
 
+def get_session_note(date_str: str) -> str:
+    """
+    NYSE session note for a report date (holiday or early close), else ''
+
+    Args:
+        date_str: Date in YYYY-MM-DD format
+
+    Returns:
+        Note such as "NYSE closed (Good Friday)" or "NYSE early close (1:00 PM ET)"
+    """
+    if get_calendar is None:
+        return ''
+    calendar = get_calendar("NYSE")
+    try:
+        holiday = calendar.holiday_name(date_str)
+        if holiday:
+            return f"NYSE closed ({holiday}) - reactions trade on {calendar.next_session(date_str):%A, %B %d}"
+        if calendar.is_early_close(date_str):
+            return "NYSE early close (1:00 PM ET)"
+    except ValueError:
+        pass
+    return ''
+
+
 def format_revenue(revenue: float) -> str:
     """
     Format revenue in human-readable format
@@ -152,34 +300,43 @@ def format_revenue(revenue: float) -> str:
         return f"${revenue:,.0f}"
 
 
-def generate_report(earnings: List[Dict]) -> str:
+def generate_report(earnings: Iterable[Dict]) -> str:
     """
     Generate markdown earnings calendar report
 
     Args:
-        earnings: List of earnings announcements
+        earnings: Earnings announcements (list or stream)
 
     Returns:
         Formatted markdown report
     """
-    if not earnings:
+    return render_report(aggregate_earnings(earnings))
+
+
+def render_report(aggregator: EarningsAggregator) -> str:
+    """
+    Render markdown report from aggregated statistics
+
+    Args:
+        aggregator: EarningsAggregator populated with the earnings
+
+    Returns:
+        Formatted markdown report
+    """
+    if not aggregator.total or not aggregator.date_counts:
         return "# Earnings Calendar\n\nNo earnings data available.\n"
 
     # Calculate statistics
-    stats = calculate_summary_stats(earnings)
-    by_date = group_by_date(earnings)
+    stats = aggregator.summary_stats()
 
     # Get date range
-    dates = sorted(by_date.keys())
-    if dates:
-        start_date = datetime.strptime(dates[0], '%Y-%m-%d')
-        end_date = datetime.strptime(dates[-1], '%Y-%m-%d')
-        date_range = f"{start_date.strftime('%B %d')} to {end_date.strftime('%B %d, %Y')}"
-    else:
-        date_range = "Unknown"
+    dates = aggregator.dates
+    start_date = datetime.strptime(dates[0], '%Y-%m-%d')
+    end_date = datetime.strptime(dates[-1], '%Y-%m-%d')
+    date_range = f"{start_date.strftime('%B %d')} to {end_date.strftime('%B %d, %Y')}"
 
     # Top 5 by market cap
-    top5 = sorted(earnings, key=lambda x: x.get('marketCap', 0), reverse=True)[:5]
+    top5 = aggregator.top_companies()
 
     # Generate report
     report = f"""# Upcoming Earnings Calendar - Week of {date_range}
@@ -206,6 +363,9 @@ def generate_report(earnings: List[Dict]) -> str:
     for date in dates:
         day_name = get_day_name(date)
         report += f"## {day_name}\n\n"
+        session_note = get_session_note(date)
+        if session_note:
+            report += f"> {session_note}\n\n"
 
         timings = ['BMO', 'AMC', 'TAS']
         timing_labels = {
@@ -215,19 +375,16 @@ def generate_report(earnings: List[Dict]) -> str:
         }
 
         for timing in timings:
-            stocks = by_date[date][timing]
+            display_stocks, count = aggregator.table(date, timing)
 
             report += f"### {timing_labels[timing]}\n\n"
 
-            if not stocks:
+            if not count:
                 report += "*No earnings announcements*\n\n"
             else:
                 report += "| Ticker | Company | Market Cap | Sector | EPS Est. | Revenue Est. |\n"
                 report += "|--------|---------|------------|--------|----------|--------------|\n"
 
-                # Top 30 by market cap
-                display_stocks = sorted(stocks, key=lambda x: x.get('marketCap', 0), reverse=True)[:30]
-
                 for stock in display_stocks:
                     ticker = stock.get('symbol', 'N/A')
                     company = stock.get('companyName', 'N/A')[:35]
@@ -242,8 +399,8 @@ def generate_report(earnings: List[Dict]) -> str:
 
                     report += f"| {ticker} | {company} | {mcap} | {sector} | {eps_str} | {rev_str} |\n"
 
-                if len(stocks) > 30:
-                    report += f"\n*Showing top 30 of {len(stocks)} companies by market cap*\n"
+                if count > aggregator.per_table:
+                    report += f"\n*Showing top {aggregator.per_table} of {count} companies by market cap*\n"
 
                 report += "\n"
 
@@ -260,8 +417,7 @@ def generate_report(earnings: List[Dict]) -> str:
         report += f"{i}. {company} ({ticker}) - {mcap} - {date_str} {timing}\n"
 
     report += "\n### Sector Distribution\n"
-    top_sectors = sorted(stats['sectors'].items(), key=lambda x: x[1], reverse=True)[:5]
-    for sector, count in top_sectors:
+    for sector, count in stats['top_sectors']:
         report += f"- **{sector}**: {count} companies\n"
 
     peak_day_name = get_day_name(stats['peak_date']).split(',')[0]
@@ -316,10 +472,12 @@ def print_usage():
     """Print usage instructions"""
     print("Usage:", file=sys.stderr)
     print("  python generate_report.py INPUT_JSON [OUTPUT_FILE]", file=sys.stderr)
+    print("  python generate_report.py --store START_DATE END_DATE [OUTPUT_FILE]", file=sys.stderr)
     print("", file=sys.stderr)
     print("Arguments:", file=sys.stderr)
     print("  INPUT_JSON   Path to earnings data JSON file (required)", file=sys.stderr)
     print("  OUTPUT_FILE  Path to output markdown file (optional, defaults to stdout)", file=sys.stderr)
+    print("  --store      Read earnings for START_DATE..END_DATE from the local calendar store", file=sys.stderr)
     print("", file=sys.stderr)
     print("Examples:", file=sys.stderr)
     print("  python generate_report.py earnings_data.json", file=sys.stderr)
@@ -344,15 +502,29 @@ def main():
         print_usage()
         sys.exit(1)
 
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    if sys.argv[1] == "--store":
+        if len(sys.argv) < 4:
+            print("ERROR: --store requires START_DATE and END_DATE", file=sys.stderr)
+            print("", file=sys.stderr)
+            print_usage()
+            sys.exit(1)
+        start_date, end_date = sys.argv[2], sys.argv[3]
+        output_file = sys.argv[4] if len(sys.argv) > 4 else None
+
+        print(f"📄 Loading earnings from calendar store: {start_date} to {end_date}", file=sys.stderr)
+        earnings = load_earnings_from_store(start_date, end_date)
+    else:
+        input_file = sys.argv[1]
+        output_file = sys.argv[2] if len(sys.argv) > 2 else None
+
+        print(f"📄 Streaming earnings data from: {input_file}", file=sys.stderr)
+        earnings = iter_earnings_data(input_file)
 
-    print(f"📄 Loading earnings data from: {input_file}", file=sys.stderr)
-    earnings = load_earnings_data(input_file)
-    print(f"✓ Loaded {len(earnings)} companies", file=sys.stderr)
+    aggregator = aggregate_earnings(earnings)
+    print(f"✓ Aggregated {aggregator.total} companies", file=sys.stderr)
 
     print("📝 Generating markdown report...", file=sys.stderr)
-    report = generate_report(earnings)
+    report = render_report(aggregator)
 
     if output_file:
         with open(output_file, 'w') as f:
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Company Profile Cache for the FMP Earnings Calendar
+
+Persistent SQLite cache of FMP company profiles with per-field TTLs, plus the
+per-second request window shared by the concurrent profile fetcher.
+
+Profile fields age at different speeds, so each field group carries its own
+fetch timestamp:
+
+    market  (mktCap, price)                                  stale after 1 day
+    static  (companyName, sector, industry, exchangeShortName) stale after 30 days
+
+A symbol whose static fields are missing or stale needs a full profile fetch;
+one whose static fields are fresh but market cap is stale only needs a quote
+refresh. Symbols FMP returned no profile for are remembered as empty entries
+(static TTL) so they are not re-requested every run.
+
+Usage:
+    from profile_cache import ProfileCache, RateLimiter
+
+    cache = ProfileCache()
+    needs_profile, needs_quote = cache.stale_symbols(symbols)
+    cache.put_profiles(fetched_profiles, requested=needs_profile)
+    cache.put_market_caps({'AAPL': 3.0e12})
+    profiles = cache.get_many(symbols)
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+CACHE_DIR = Path(__file__).parent.parent / "cache"
+DEFAULT_CACHE_PATH = CACHE_DIR / "company_profiles.db"
+
+MARKET_TTL = timedelta(days=1)
+STATIC_TTL = timedelta(days=30)
+
+
+class RateLimiter:
+    """Rolling window over the profile/quote batch requests
+
+    FMP counts requests per window rather than by spacing, so the first few
+    batches may go out together; a worker only waits once the last second
+    already holds `requests_per_second` requests.
+    """
+
+    def __init__(self, requests_per_second: float = 5.0):
+        self.limit = max(1, round(requests_per_second)) if requests_per_second > 0 else 0
+        self.window = self.limit / requests_per_second if self.limit else 0.0
+        self._sent = deque()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the window has room for one more request"""
+        if not self.limit:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0] >= self.window:
+                    self._sent.popleft()
+                if len(self._sent) < self.limit:
+                    self._sent.append(now)
+                    return
+                delay = self.window - (now - self._sent[0])
+            time.sleep(delay)
+
+
+class ProfileCache:
+    """SQLite cache of FMP company profiles with separate market/static TTLs"""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        market_ttl: timedelta = MARKET_TTL,
+        static_ttl: timedelta = STATIC_TTL
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.market_ttl = market_ttl
+        self.static_ttl = static_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                symbol TEXT PRIMARY KEY,
+                profile TEXT NOT NULL,
+                market_fetched_at TEXT NOT NULL,
+                static_fetched_at TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def _rows(self, symbols: List[str]) -> List[Tuple[str, str, str, str]]:
+        rows = []
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(symbols), 500):
+            chunk = symbols[i:i+500]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(self._conn.execute(
+                f"SELECT symbol, profile, market_fetched_at, static_fetched_at "
+                f"FROM profiles WHERE symbol IN ({placeholders})",
+                chunk
+            ).fetchall())
+        return rows
+
+    def get_many(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Cached profiles for symbols (fresh or not); empty entries are omitted"""
+        with self._lock:
+            rows = self._rows(symbols)
+        profiles = {}
+        for symbol, payload, _, _ in rows:
+            profile = json.loads(payload)
+            if profile:
+                profiles[symbol] = profile
+        return profiles
+
+    def stale_symbols(
+        self,
+        symbols: List[str],
+        now: Optional[datetime] = None
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Split symbols by what needs refreshing
+
+        Returns (needs_profile, needs_quote): symbols missing or with stale
+        static fields, and symbols whose only stale field is the market cap.
+        """
+        now = now or datetime.now()
+        with self._lock:
+            cached = {row[0]: row for row in self._rows(symbols)}
+
+        needs_profile, needs_quote = [], []
+        for symbol in symbols:
+            row = cached.get(symbol)
+            if row is None or now - datetime.fromisoformat(row[3]) >= self.static_ttl:
+                needs_profile.append(symbol)
+            elif row[1] != "{}" and now - datetime.fromisoformat(row[2]) >= self.market_ttl:
+                needs_quote.append(symbol)
+        return needs_profile, needs_quote
+
+    def put_profiles(self, profiles: Dict[str, Dict], requested: Optional[List[str]] = None):
+        """
+        Store full profiles (refreshes both field groups)
+
+        Symbols in requested that FMP did not return are stored as empty
+        entries so they are skipped until the static TTL expires.
+        """
+        now = datetime.now().isoformat()
+        entries = dict.fromkeys(requested or [], {})
+        entries.update(profiles)
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO profiles (symbol, profile, market_fetched_at, static_fetched_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(symbol, json.dumps(profile), now, now) for symbol, profile in entries.items()]
+            )
+            self._conn.commit()
+
+    def put_market_caps(self, market_caps: Dict[str, float]):
+        """Update only the market cap (and its timestamp) of cached profiles"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            cached = {row[0]: json.loads(row[1]) for row in self._rows(list(market_caps))}
+            updates = []
+            for symbol, market_cap in market_caps.items():
+                profile = cached.get(symbol)
+                if not profile:
+                    continue
+                profile["mktCap"] = market_cap
+                updates.append((json.dumps(profile), now, symbol))
+            self._conn.executemany(
+                "UPDATE profiles SET profile = ?, market_fetched_at = ? WHERE symbol = ?",
+                updates
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
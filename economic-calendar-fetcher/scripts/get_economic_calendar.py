@@ -2,6 +2,14 @@
 """
 Economic Calendar Fetcher using FMP API
 Retrieves economic events and data releases for specified date range
+
+Events are synced into a local calendar store (shared calendar_store.py from
+the earnings-calendar skill): only days not fetched within the last 12 hours
+are downloaded, and estimate/actual updates are kept as revisions.
+
+Events for US, UK and Japan are annotated with the local exchange session
+from the shared trading calendar (market-environment-analysis skill):
+tradingDaysUntil and marketClosed (release falls on an exchange holiday).
 """
 
 import os
@@ -13,6 +21,27 @@ from typing import Dict, List, Optional
 import urllib.request
 import urllib.error
 import urllib.parse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "earnings-calendar" / "scripts"))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "market-environment-analysis" / "scripts"))
+
+try:
+    from calendar_store import CalendarStore
+except ImportError:
+    # Standalone install: every run downloads the full range (as --no-store)
+    CalendarStore = None
+# Shared exchange session calendar (market-environment-analysis skill)
+try:
+    from trading_calendar import get_calendar
+except ImportError:
+    # Standalone install: session fields are left as None
+    get_calendar = None
+
+STORE_PATH = Path(__file__).parent.parent / "cache" / "calendar_store.db"
+
+# Event country -> exchange whose sessions the release is measured against
+COUNTRY_MARKETS = {'US': 'NYSE', 'UK': 'LSE', 'GB': 'LSE', 'JP': 'TSE'}
 
 
 def get_api_key() -> Optional[str]:
@@ -83,6 +112,18 @@ def fetch_economic_calendar(
         raise ValueError(f"Network error: {e.reason}")
 
 
+def fetch_window(from_date: str, to_date: str, api_key: str) -> Optional[List[Dict]]:
+    """
+    Fetch one store sync window; None on failure so the store leaves the
+    window unsynced and keeps going with the others.
+    """
+    try:
+        return fetch_economic_calendar(from_date, to_date, api_key)
+    except (urllib.error.URLError, ValueError) as e:
+        print(f"Warning: {from_date} to {to_date} not synced: {e}", file=sys.stderr)
+        return None
+
+
 def validate_date_range(from_date: str, to_date: str) -> None:
     """
     Validate date range is within FMP API limits (max 90 days).
@@ -113,6 +154,38 @@ def validate_date_range(from_date: str, to_date: str) -> None:
         print(f"Warning: End date {to_date} is in the past", file=sys.stderr)
 
 
+def add_session_fields(events: List[Dict], today: Optional[str] = None) -> List[Dict]:
+    """
+    Annotate events with their local exchange session.
+
+    Adds tradingDaysUntil (sessions from today up to the release date) and
+    marketClosed (the exchange is shut that weekday for a holiday) to events
+    whose country maps to a supported exchange; other events get None.
+
+    Args:
+        events: List of event dictionaries from FMP API
+        today: Reference date in YYYY-MM-DD format (default: today)
+
+    Returns:
+        The same list, annotated in place
+    """
+    today = today or datetime.now().strftime('%Y-%m-%d')
+    for event in events:
+        event['tradingDaysUntil'] = None
+        event['marketClosed'] = None
+        market = COUNTRY_MARKETS.get(event.get('country', ''))
+        day = (event.get('date') or '')[:10]
+        if not market or not day or get_calendar is None:
+            continue
+        calendar = get_calendar(market)
+        try:
+            event['tradingDaysUntil'] = calendar.trading_days_between(today, day)
+            event['marketClosed'] = calendar.holiday_name(day) is not None
+        except ValueError:
+            continue
+    return events
+
+
 def format_event_output(events: List[Dict], output_format: str = 'json') -> str:
     """
     Format economic events for output.
@@ -139,6 +212,11 @@ def format_event_output(events: List[Dict], output_format: str = 'json') -> str:
             lines.append(f"Currency: {event.get('currency', 'N/A')}")
             lines.append(f"Impact: {event.get('impact', 'N/A')}")
 
+            if event.get('tradingDaysUntil') is not None:
+                market = COUNTRY_MARKETS[event['country']]
+                closed = " - exchange holiday" if event.get('marketClosed') else ""
+                lines.append(f"Trading Days Until: {event['tradingDaysUntil']} ({market}{closed})")
+
             previous = event.get('previous')
             estimate = event.get('estimate')
             actual = event.get('actual')
@@ -186,6 +264,12 @@ Examples:
 
   # Save output to file
   python get_economic_calendar.py --output calendar.json
+
+  # Show estimate/actual revisions recorded for the range
+  python get_economic_calendar.py --revisions
+
+  # Skip the local calendar store and download the full range
+  python get_economic_calendar.py --no-store
         """
     )
 
@@ -224,8 +308,22 @@ Examples:
         help='Output file path (default: stdout)'
     )
 
+    # Local store
+    parser.add_argument(
+        '--no-store', action='store_true',
+        help='Bypass the local calendar store and download the full range'
+    )
+    parser.add_argument(
+        '--revisions', action='store_true',
+        help='Output recorded revisions (estimate/actual changes) instead of events'
+    )
+
     # Parse arguments
     args = parser.parse_args()
+    if args.revisions and args.no_store:
+        parser.error("--revisions reads the local calendar store and cannot be used with --no-store")
+    if args.revisions and CalendarStore is None:
+        parser.error("--revisions needs calendar_store.py from the earnings-calendar skill")
 
     # Get API key
     api_key = args.api_key or get_api_key()
@@ -241,12 +339,26 @@ Examples:
         # Fetch events
         print(f"Fetching economic calendar from {args.from_date} to {args.to_date}...",
               file=sys.stderr)
-        events = fetch_economic_calendar(args.from_date, args.to_date, api_key)
+        if args.no_store or CalendarStore is None:
+            events = fetch_economic_calendar(args.from_date, args.to_date, api_key)
+        else:
+            store = CalendarStore(STORE_PATH)
+            sync = store.sync(
+                'economic', args.from_date, args.to_date,
+                lambda window_from, window_to: fetch_window(window_from, window_to, api_key)
+            )
+            events = store.events('economic', args.from_date, args.to_date)
+            if sync['failed'] and not events:
+                raise ValueError("no events could be fetched and none are stored for this range")
 
         print(f"Retrieved {len(events)} events", file=sys.stderr)
 
         # Format output
-        output = format_event_output(events, args.format)
+        if args.revisions:
+            output = json.dumps(store.revisions('economic', args.from_date, args.to_date),
+                                indent=2, ensure_ascii=False)
+        else:
+            output = format_event_output(add_session_fields(events), args.format)
 
         # Write output
         if args.output:
@@ -3,20 +3,39 @@
 # requires-python = ">=3.11"
 # dependencies = ["httpx", "rich"]
 # ///
-"""Hacker News CLI - Browse HN stories and comments."""
+"""Hacker News CLI - Browse HN stories and comments.
+
+Items are fetched concurrently over one shared httpx.AsyncClient (bounded by
+--concurrency), comment trees are walked breadth-first one level at a time,
+and fetched items are kept in a local cache: items older than two weeks are
+treated as immutable, newer ones expire after a short TTL so scores and
+comment counts stay current.
+"""
 
 import argparse
+import asyncio
+import json
+import re
+import sqlite3
+import time
+from html import unescape
+from pathlib import Path
+
 import httpx
 from rich.console import Console
 from rich.table import Table
 from rich import print as rprint
-from html import unescape
-import re
 
 console = Console()
 BASE_URL = "https://hacker-news.firebaseio.com/v0"
 ALGOLIA_URL = "https://hn.algolia.com/api/v1"
 
+CACHE_FILE = Path(__file__).parent.parent / "cache" / "items.db"
+IMMUTABLE_AFTER = 14 * 86400   # voting and replies are closed on old items
+STORY_TTL = 60                 # scores and descendants move fast
+COMMENT_TTL = 300
+DEFAULT_CONCURRENCY = 16
+
 def strip_html(text: str) -> str:
     """Remove HTML tags and decode entities."""
     if not text:
@@ -24,23 +43,160 @@ def strip_html(text: str) -> str:
     text = re.sub(r'<[^>]+>', '', text)
     return unescape(text)
 
+class ItemCache:
+    """SQLite cache of HN items: old items never expire, recent ones use a short TTL."""
+
+    def __init__(self, path: Path = CACHE_FILE):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, payload TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def is_fresh(item: dict, fetched_at: float, now: float) -> bool:
+        if now - item.get('time', now) > IMMUTABLE_AFTER:
+            return True
+        ttl = COMMENT_TTL if item.get('type') == 'comment' else STORY_TTL
+        return now - fetched_at < ttl
+
+    def get_many(self, ids: list[int]) -> dict[int, dict]:
+        """Fresh cached items among ids (one query per 500 ids)."""
+        now = time.time()
+        found = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT id, payload, fetched_at FROM items WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            )
+            for item_id, payload, fetched_at in rows:
+                item = json.loads(payload)
+                if self.is_fresh(item, fetched_at, now):
+                    found[item_id] = item
+        return found
+
+    def put_many(self, items: list[dict]):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO items (id, payload, fetched_at) VALUES (?, ?, ?)",
+            [(item['id'], json.dumps(item), now) for item in items if item.get('id')]
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+class HNClient:
+    """Async HN API client: shared connection pool, bounded concurrency, item cache."""
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, cache: ItemCache | None = None,
+                 transport: httpx.AsyncBaseTransport | None = None):
+        self.concurrency = concurrency
+        self.cache = cache
+        self.transport = transport
+        self.requests = 0
+        self._inflight: dict[int, asyncio.Task] = {}
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            base_url=BASE_URL, timeout=10, transport=self.transport,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        )
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.aclose()
+
+    async def _get(self, path: str):
+        async with self.semaphore:
+            self.requests += 1
+            try:
+                r = await self.client.get(path)
+                return r.json() if r.status_code == 200 else None
+            except (httpx.HTTPError, ValueError):
+                return None
+
+    async def _fetch(self, item_id: int) -> dict:
+        item = await self._get(f"/item/{item_id}.json")
+        return item or {}
+
+    async def items(self, ids: list[int]) -> list[dict]:
+        """Items in the order of ids (missing ones dropped); cache first, the rest concurrently."""
+        cached = self.cache.get_many(ids) if self.cache else {}
+        missing = [i for i in dict.fromkeys(ids) if i not in cached]
+        for i in missing:
+            if i not in self._inflight:
+                self._inflight[i] = asyncio.ensure_future(self._fetch(i))
+        fetched = {}
+        if missing:
+            results = await asyncio.gather(*(self._inflight[i] for i in missing))
+            for i, item in zip(missing, results):
+                self._inflight.pop(i, None)
+                if item:
+                    fetched[i] = item
+            if self.cache and fetched:
+                self.cache.put_many(list(fetched.values()))
+        found = {**cached, **fetched}
+        return [found[i] for i in ids if i in found]
+
+    async def item(self, item_id: int) -> dict:
+        items = await self.items([item_id])
+        return items[0] if items else {}
+
+    async def stories(self, endpoint: str, limit: int = 10) -> list[dict]:
+        """Stories from a feed endpoint (topstories, newstories, ...)."""
+        ids = await self._get(f"/{endpoint}.json")
+        return await self.items((ids or [])[:limit])
+
+    async def comments(self, story: dict, limit: int = 10, depth: int = 1, replies: int = 3) -> list[tuple[int, dict]]:
+        """
+        Comment tree breadth-first: the first `limit` top-level comments, then up
+        to `replies` replies per comment for each further level, each level
+        fetched concurrently. Returns (depth, comment) in display order.
+        """
+        children: dict[int, list[dict]] = {}
+        level = await self.items(story.get('kids', [])[:limit])
+        top = level
+        for _ in range(depth - 1):
+            parents = [c for c in level if c.get('kids')]
+            if not parents:
+                break
+            ids = [kid for c in parents for kid in c['kids'][:replies]]
+            fetched = {c['id']: c for c in await self.items(ids)}
+            level = []
+            for parent in parents:
+                kids = [fetched[k] for k in parent['kids'][:replies] if k in fetched]
+                children[parent['id']] = kids
+                level.extend(kids)
+
+        ordered = []
+        def walk(comments: list[dict], d: int):
+            for c in comments:
+                ordered.append((d, c))
+                walk(children.get(c['id'], []), d + 1)
+        walk(top, 0)
+        return ordered
+
+def _run(coro_fn, concurrency: int = DEFAULT_CONCURRENCY, use_cache: bool = True):
+    """Run coro_fn(client) with a client (and cache) for the duration."""
+    async def runner():
+        cache = ItemCache() if use_cache else None
+        try:
+            async with HNClient(concurrency, cache) as client:
+                return await coro_fn(client)
+        finally:
+            if cache:
+                cache.close()
+    return asyncio.run(runner())
+
 def fetch_item(item_id: int) -> dict:
     """Fetch a single item (story, comment, etc)."""
-    r = httpx.get(f"{BASE_URL}/item/{item_id}.json", timeout=10)
-    return r.json() if r.status_code == 200 else {}
+    return _run(lambda client: client.item(item_id))
 
 def fetch_stories(endpoint: str, limit: int = 10) -> list[dict]:
     """Fetch stories from an endpoint."""
-    r = httpx.get(f"{BASE_URL}/{endpoint}.json", timeout=10)
-    if r.status_code != 200:
-        return []
-    ids = r.json()[:limit]
-    stories = []
-    for i in ids:
-        item = fetch_item(i)
-        if item:
-            stories.append(item)
-    return stories
+    return _run(lambda client: client.stories(endpoint, limit))
 
 def display_stories(stories: list[dict], title: str):
     """Display stories in a table."""
@@ -61,8 +217,8 @@ def display_stories(stories: list[dict], title: str):
         )
     console.print(table)
 
-def display_story(story: dict, comment_limit: int = 10):
-    """Display a story with comments."""
+def display_story(story: dict, comments: list[tuple[int, dict]]):
+    """Display a story with its (already fetched) comments."""
     rprint(f"\n[bold]{story.get('title', 'No title')}[/bold]")
     rprint(f"[green]{story.get('score', 0)} points[/green] by [cyan]{story.get('by', 'unknown')}[/cyan]")
     if story.get('url'):
@@ -70,15 +226,15 @@ def display_story(story: dict, comment_limit: int = 10):
     if story.get('text'):
         rprint(f"\n{strip_html(story.get('text'))}")
     
-    kids = story.get('kids', [])[:comment_limit]
-    if kids:
-        rprint(f"\n[bold]Top {len(kids)} comments:[/bold]\n")
-        for kid_id in kids:
-            comment = fetch_item(kid_id)
-            if comment and comment.get('text'):
+    top_level = sum(1 for d, _ in comments if d == 0)
+    if comments:
+        rprint(f"\n[bold]Top {top_level} comments:[/bold]\n")
+        for depth, comment in comments:
+            if comment.get('text'):
+                indent = "  " * depth
                 author = comment.get('by', 'unknown')
                 text = strip_html(comment.get('text', ''))[:500]
-                rprint(f"[cyan]{author}[/cyan]: {text}\n")
+                rprint(f"{indent}[cyan]{author}[/cyan]: {text}\n")
 
 def search_stories(query: str, limit: int = 10):
     """Search HN via Algolia."""
@@ -105,6 +261,9 @@ def search_stories(query: str, limit: int = 10):
 
 def main():
     parser = argparse.ArgumentParser(description="Hacker News CLI")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Parallel API requests (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the local item cache')
     subparsers = parser.add_subparsers(dest="command", help="Commands")
     
     # Feed commands
@@ -116,6 +275,8 @@ def main():
     story_p = subparsers.add_parser('story', help='Get story details')
     story_p.add_argument('id', type=int, help='Story ID')
     story_p.add_argument('--comments', type=int, default=10, help='Number of comments')
+    story_p.add_argument('--depth', type=int, default=1, help='Comment levels to show (default: 1)')
+    story_p.add_argument('--replies', type=int, default=3, help='Replies per comment below the top level')
     
     # Search command
     search_p = subparsers.add_parser('search', help='Search stories')
@@ -136,14 +297,20 @@ def main():
         'show': 'showstories',
         'jobs': 'jobstories'
     }
+    use_cache = not args.no_cache
     
     if args.command in endpoints:
-        stories = fetch_stories(endpoints[args.command], args.limit)
+        stories = _run(lambda client: client.stories(endpoints[args.command], args.limit),
+                       args.concurrency, use_cache)
         display_stories(stories, f"HN {args.command.title()}")
     elif args.command == 'story':
-        story = fetch_item(args.id)
+        async def load(client):
+            story = await client.item(args.id)
+            comments = await client.comments(story, args.comments, args.depth, args.replies) if story else []
+            return story, comments
+        story, comments = _run(load, args.concurrency, use_cache)
         if story:
-            display_story(story, args.comments)
+            display_story(story, comments)
         else:
             rprint("[red]Story not found[/red]")
     elif args.command == 'search':
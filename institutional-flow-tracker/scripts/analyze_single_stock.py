@@ -12,6 +12,7 @@ Usage:
 
 Requirements:
     - FMP API key (set FMP_API_KEY environment variable or pass --api-key)
+    - pandas, numpy
 """
 
 import argparse
@@ -19,8 +20,8 @@ import json
 import os
 import sys
 from datetime import datetime
+from pathlib import Path
 from typing import List, Dict, Optional
-from collections import defaultdict
 
 try:
     import requests
@@ -28,6 +29,10 @@ except ImportError:
     print("Error: 'requests' library not installed. Install with: pip install requests")
     sys.exit(1)
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ownership_analytics import holders_frame, position_changes, quarterly_summary
+
 
 class SingleStockAnalyzer:
     """Analyze institutional ownership for a single stock"""
@@ -86,35 +91,36 @@ class SingleStockAnalyzer:
             print(f"No institutional holder data available for {symbol}")
             return {}
 
-        # Group by quarter
-        quarters_data = defaultdict(list)
-        for holder in holders:
-            date = holder.get('dateReported', '')
-            if date:
-                quarters_data[date].append(holder)
+        df = holders_frame({symbol: holders})
+        df = df[df['q_rank'] < quarters]
+        summary = quarterly_summary(df)
 
-        # Get most recent N quarters
-        sorted_quarters = sorted(quarters_data.keys(), reverse=True)[:quarters]
-
-        if len(sorted_quarters) < 2:
-            print(f"Insufficient data (need at least 2 quarters, found {len(sorted_quarters)})")
+        if len(summary) < 2:
+            print(f"Insufficient data (need at least 2 quarters, found {len(summary)})")
             return {}
 
-        # Calculate quarterly metrics
-        quarterly_metrics = []
-        for q in sorted_quarters:
-            holders_q = quarters_data[q]
-            total_shares = sum(h.get('totalShares', 0) for h in holders_q)
-            total_value = sum(h.get('totalInvested', 0) for h in holders_q)
-            num_holders = len(holders_q)
-
-            quarterly_metrics.append({
-                'quarter': q,
-                'total_shares': total_shares,
-                'total_value': total_value,
-                'num_holders': num_holders,
-                'top_holders': sorted(holders_q, key=lambda x: x.get('totalShares', 0), reverse=True)[:20]
-            })
+        # Quarterly aggregates from one groupby; top 20 holders per quarter from one sort
+        top = (
+            df.sort_values(['q_rank', 'shares'], ascending=[True, False], kind='stable')
+            .groupby('q_rank', sort=False).head(20)
+        )
+        top_by_quarter = {
+            rank: group[['holder', 'shares', 'change']]
+            .rename(columns={'shares': 'totalShares'})
+            .to_dict('records')
+            for rank, group in top.groupby('q_rank', sort=False)
+        }
+
+        quarterly_metrics = [
+            {
+                'quarter': row['quarter'],
+                'total_shares': row['total_shares'],
+                'total_value': row['total_value'],
+                'num_holders': row['num_holders'],
+                'top_holders': top_by_quarter.get(row['q_rank'], [])
+            }
+            for row in summary.to_dict('records')
+        ]
 
         # Calculate trends
         most_recent = quarterly_metrics[0]
@@ -123,66 +129,31 @@ class SingleStockAnalyzer:
         shares_trend = ((most_recent['total_shares'] - oldest['total_shares']) / oldest['total_shares'] * 100) if oldest['total_shares'] > 0 else 0
         holders_trend = most_recent['num_holders'] - oldest['num_holders']
 
-        # Analyze position changes (recent quarter vs previous)
-        if len(quarterly_metrics) >= 2:
-            current_q = quarterly_metrics[0]
-            previous_q = quarterly_metrics[1]
-
-            # Create holder dictionaries for comparison
-            current_holders_map = {h.get('holder', ''): h for h in current_q['top_holders']}
-            previous_holders_map = {h.get('holder', ''): h for h in previous_q['top_holders']}
-
-            # Categorize changes
-            new_positions = []
-            increased_positions = []
-            decreased_positions = []
-            closed_positions = []
-
-            # Check current holders
-            for name, holder in current_holders_map.items():
-                current_shares = holder.get('totalShares', 0)
-                if name in previous_holders_map:
-                    previous_shares = previous_holders_map[name].get('totalShares', 0)
-                    change = current_shares - previous_shares
-                    pct_change = (change / previous_shares * 100) if previous_shares > 0 else 0
-
-                    if change > 0:
-                        increased_positions.append({
-                            'name': name,
-                            'current_shares': current_shares,
-                            'change': change,
-                            'pct_change': pct_change
-                        })
-                    elif change < 0:
-                        decreased_positions.append({
-                            'name': name,
-                            'current_shares': current_shares,
-                            'change': change,
-                            'pct_change': pct_change
-                        })
-                else:
-                    new_positions.append({
-                        'name': name,
-                        'shares': current_shares
-                    })
-
-            # Check for closed positions
-            for name, holder in previous_holders_map.items():
-                if name not in current_holders_map:
-                    closed_positions.append({
-                        'name': name,
-                        'previous_shares': holder.get('totalShares', 0)
-                    })
-
-            # Sort by magnitude
-            increased_positions.sort(key=lambda x: x['change'], reverse=True)
-            decreased_positions.sort(key=lambda x: x['change'])
-
-        else:
-            new_positions = []
-            increased_positions = []
-            decreased_positions = []
-            closed_positions = []
+        # Classify every holder's position change (recent quarter vs previous)
+        changes = position_changes(df)
+
+        new_positions = [
+            {'name': c['holder'], 'shares': c['current_shares']}
+            for c in changes[changes['status'] == 'new']
+            .sort_values('current_shares', ascending=False).to_dict('records')
+        ]
+        increased_positions = [
+            {'name': c['holder'], 'current_shares': c['current_shares'],
+             'change': c['change'], 'pct_change': c['pct_change']}
+            for c in changes[changes['status'] == 'increased']
+            .sort_values('change', ascending=False).to_dict('records')
+        ]
+        decreased_positions = [
+            {'name': c['holder'], 'current_shares': c['current_shares'],
+             'change': c['change'], 'pct_change': c['pct_change']}
+            for c in changes[changes['status'] == 'decreased']
+            .sort_values('change').to_dict('records')
+        ]
+        closed_positions = [
+            {'name': c['holder'], 'previous_shares': c['previous_shares']}
+            for c in changes[changes['status'] == 'closed']
+            .sort_values('previous_shares', ascending=False).to_dict('records')
+        ]
 
         return {
             'symbol': symbol,
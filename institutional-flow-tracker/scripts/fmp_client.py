@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Institutional Flow Tracker - Shared FMP Client Plumbing
+
+Connection pooling, retries, a thread-safe rate limiter and a local cache of
+13F holder snapshots shared by the screening scripts.
+
+Holder snapshots are stored per (symbol, dateReported) in a SQLite file. 13F
+data only changes once a quarter, so a symbol fetched after the most recent
+filing deadline is served from the cache until the next deadline passes.
+
+Usage:
+    from fmp_client import RateLimiter, HolderSnapshotCache, build_session
+
+    session = build_session(pool_size=8)
+    limiter = RateLimiter(requests_per_second=5)
+    cache = HolderSnapshotCache()
+
+    holders = cache.get('AAPL')            # None if missing or stale
+    cache.put('AAPL', holders)
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:
+    print("Error: 'requests' library not installed. Install with: pip install requests")
+    sys.exit(1)
+
+CACHE_DIR = Path(__file__).parent.parent / "cache"
+DEFAULT_CACHE_PATH = CACHE_DIR / "holder_snapshots.db"
+
+# 13F filings are due 45 days after each calendar quarter end
+FILING_LAG_DAYS = 45
+
+# Snapshot key for holder records FMP returns without a dateReported
+UNDATED = ''
+
+
+def build_session(pool_size: int = 8, retries: int = 3, backoff: float = 0.5) -> requests.Session:
+    """
+    Session with a connection pool sized for the worker count and automatic
+    retries (with Retry-After support) on 429 and 5xx responses
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces requests evenly across all workers"""
+
+    def __init__(self, requests_per_second: float = 5.0):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until this caller's request slot comes up"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def latest_filing_deadline(today: Optional[date] = None) -> date:
+    """Most recent 13F filing deadline on or before today"""
+    today = today or date.today()
+    deadlines = []
+    for year in (today.year - 1, today.year):
+        for month, day in ((3, 31), (6, 30), (9, 30), (12, 31)):
+            deadline = date(year, month, day) + timedelta(days=FILING_LAG_DAYS)
+            if deadline <= today:
+                deadlines.append(deadline)
+    return max(deadlines)
+
+
+class HolderSnapshotCache:
+    """
+    SQLite cache of institutional holder records keyed by (symbol, dateReported)
+
+    A symbol's cached holders are served while either
+      - they were fetched after the latest 13F filing deadline, or
+      - they were fetched within max_age_days (covers late filers/amendments)
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_age_days: int = 7):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS holder_snapshots (
+                symbol TEXT NOT NULL,
+                date_reported TEXT NOT NULL,
+                holders TEXT NOT NULL,
+                PRIMARY KEY (symbol, date_reported)
+            );
+            CREATE TABLE IF NOT EXISTS symbol_fetches (
+                symbol TEXT PRIMARY KEY,
+                fetched_at TEXT NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def is_fresh(self, fetched_at: datetime, now: Optional[datetime] = None) -> bool:
+        """Whether a fetch made at fetched_at still reflects the latest filings"""
+        now = now or datetime.now()
+        deadline = datetime.combine(latest_filing_deadline(now.date()), datetime.min.time())
+        return fetched_at >= deadline or (now - fetched_at) < timedelta(days=self.max_age_days)
+
+    def get(self, symbol: str) -> Optional[List[Dict]]:
+        """Cached holder records for symbol (all quarters), or None if missing/stale"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at FROM symbol_fetches WHERE symbol = ?", (symbol,)
+            ).fetchone()
+            if row is None or not self.is_fresh(datetime.fromisoformat(row[0])):
+                return None
+            snapshots = self._conn.execute(
+                "SELECT holders FROM holder_snapshots WHERE symbol = ? ORDER BY date_reported DESC",
+                (symbol,)
+            ).fetchall()
+
+        holders = []
+        for (payload,) in snapshots:
+            holders.extend(json.loads(payload))
+        return holders
+
+    def put(self, symbol: str, holders: List[Dict]):
+        """
+        Store holder records split into one snapshot per dateReported
+
+        Records without a dateReported go into an UNDATED snapshot that each
+        fetch replaces (there is no quarter to keep them apart by).
+        """
+        by_quarter = defaultdict(list)
+        for holder in holders:
+            by_quarter[holder.get('dateReported') or UNDATED].append(holder)
+
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM holder_snapshots WHERE symbol = ? AND date_reported = ?", (symbol, UNDATED)
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO holder_snapshots (symbol, date_reported, holders) VALUES (?, ?, ?)",
+                [(symbol, q, json.dumps(rows)) for q, rows in by_quarter.items()]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO symbol_fetches (symbol, fetched_at) VALUES (?, ?)",
+                (symbol, datetime.now().isoformat())
+            )
+            self._conn.commit()
+
+    def quarters(self, symbol: str) -> List[str]:
+        """dateReported values cached for symbol, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date_reported FROM holder_snapshots WHERE symbol = ? AND date_reported != ? "
+                "ORDER BY date_reported DESC",
+                (symbol, UNDATED)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
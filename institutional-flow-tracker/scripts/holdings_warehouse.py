@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Institutional Flow Tracker - Local 13F Holdings Warehouse
+
+FMP serves 13F holder records per stock. This module ingests those per-symbol
+lists across a universe into a columnar store (one set of NumPy columns per
+dateReported) and keeps two indexes over every quarter:
+
+    symbol -> holders     rows sorted by (symbol_id, holder_id), located with
+                          a binary search on the symbol column
+    holder -> positions   a stable argsort of the holder column, so each
+                          holder's positions come out ordered by symbol_id
+
+Because both index lookups return sorted, unique id arrays, quarter-over-quarter
+diffs are plain set operations (setdiff1d / intersect1d) over two snapshots.
+
+Coverage caveat: a holder's "portfolio" only contains the symbols that were
+ingested. Diffs are restricted to symbols present in both quarters so that a
+symbol missing from one snapshot is not reported as a new or closed position.
+
+Usage:
+    from holdings_warehouse import HoldingsWarehouse
+
+    warehouse = HoldingsWarehouse()
+    warehouse.ingest(tracker.fetch_all_holders(['AAPL', 'KO', 'BAC']))
+    warehouse.save()
+
+    warehouse.positions_of('BERKSHIRE HATHAWAY INC')
+    warehouse.diff_positions('BERKSHIRE HATHAWAY INC')   # new/closed/increased/decreased
+"""
+
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    print("Error: 'numpy' library not installed. Install with: pip install numpy")
+    sys.exit(1)
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fmp_client import CACHE_DIR
+
+DEFAULT_WAREHOUSE_PATH = CACHE_DIR / "warehouse"
+
+COLUMNS = ('symbol_id', 'holder_id', 'shares', 'value', 'change')
+
+
+# ============================================================================
+# Quarter Snapshot (columnar + indexes)
+# ============================================================================
+
+class QuarterSnapshot:
+    """Columnar 13F positions for one dateReported with symbol and holder indexes"""
+
+    def __init__(
+        self,
+        symbol_id: np.ndarray,
+        holder_id: np.ndarray,
+        shares: np.ndarray,
+        value: np.ndarray,
+        change: np.ndarray
+    ):
+        symbol_id = np.asarray(symbol_id, dtype=np.int64)
+        holder_id = np.asarray(holder_id, dtype=np.int64)
+
+        # Collapse duplicate (symbol, holder) rows; np.unique also leaves the
+        # keys sorted by symbol then holder, which is the primary row order
+        keys = (symbol_id << 32) | holder_id
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        n = len(unique_keys)
+
+        self.symbol_id = unique_keys >> 32
+        self.holder_id = unique_keys & 0xFFFFFFFF
+        self.shares = np.bincount(inverse, weights=shares, minlength=n).astype(np.int64)
+        self.value = np.bincount(inverse, weights=value, minlength=n)
+        self.change = np.bincount(inverse, weights=change, minlength=n).astype(np.int64)
+
+        # Secondary index: holder -> row numbers (stable, so symbol order is kept)
+        self.holder_order = np.argsort(self.holder_id, kind='stable')
+        self._holder_sorted = self.holder_id[self.holder_order]
+
+        # Symbols this snapshot has data for (used to bound diffs)
+        self.covered_symbols = np.unique(self.symbol_id)
+
+    def __len__(self) -> int:
+        return len(self.symbol_id)
+
+    def symbol_rows(self, symbol_id: int) -> np.ndarray:
+        """Row numbers for one symbol, ordered by holder_id"""
+        lo, hi = np.searchsorted(self.symbol_id, [symbol_id, symbol_id + 1])
+        return np.arange(lo, hi)
+
+    def holder_rows(self, holder_id: int) -> np.ndarray:
+        """Row numbers for one holder, ordered by symbol_id"""
+        lo, hi = np.searchsorted(self._holder_sorted, [holder_id, holder_id + 1])
+        return self.holder_order[lo:hi]
+
+    def without_symbols(self, symbol_ids: np.ndarray) -> Dict[str, np.ndarray]:
+        """Columns with every row for the given symbols removed"""
+        keep = ~np.isin(self.symbol_id, symbol_ids)
+        return {col: getattr(self, col)[keep] for col in COLUMNS}
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {col: getattr(self, col) for col in COLUMNS}
+
+
+def diff_sets(
+    current_ids: np.ndarray,
+    current_shares: np.ndarray,
+    previous_ids: np.ndarray,
+    previous_shares: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Quarter-over-quarter diff of two sorted, unique id arrays
+
+    Returns ids for new/closed positions and ids with share deltas for the
+    positions held in both quarters.
+    """
+    new = np.setdiff1d(current_ids, previous_ids, assume_unique=True)
+    closed = np.setdiff1d(previous_ids, current_ids, assume_unique=True)
+    common, ci, pi = np.intersect1d(current_ids, previous_ids, assume_unique=True, return_indices=True)
+    delta = current_shares[ci] - previous_shares[pi]
+
+    return {
+        'new': new,
+        'closed': closed,
+        'common': common,
+        'current_shares': current_shares[ci],
+        'previous_shares': previous_shares[pi],
+        'delta': delta
+    }
+
+
+# ============================================================================
+# Warehouse
+# ============================================================================
+
+class HoldingsWarehouse:
+    """Columnar store of 13F holder records across a universe of symbols"""
+
+    def __init__(self, path: Path = DEFAULT_WAREHOUSE_PATH):
+        self.path = Path(path)
+        self.symbols: List[str] = []
+        self.holders: List[str] = []
+        self._symbol_ids: Dict[str, int] = {}
+        self._holder_ids: Dict[str, int] = {}
+        self.snapshots: Dict[str, QuarterSnapshot] = {}
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        dictionary_path = self.path / "dictionary.json"
+        if not dictionary_path.exists():
+            return
+
+        with open(dictionary_path) as f:
+            dictionary = json.load(f)
+        self.symbols = dictionary['symbols']
+        self.holders = dictionary['holders']
+        self._symbol_ids = {s: i for i, s in enumerate(self.symbols)}
+        self._holder_ids = {h: i for i, h in enumerate(self.holders)}
+
+        for quarter in dictionary['quarters']:
+            with np.load(self.path / f"{quarter}.npz") as data:
+                self.snapshots[quarter] = QuarterSnapshot(**{col: data[col] for col in COLUMNS})
+
+    def save(self):
+        """Write one compressed .npz per quarter plus the id dictionaries"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        for quarter, snapshot in self.snapshots.items():
+            np.savez_compressed(self.path / f"{quarter}.npz", **snapshot.columns())
+
+        with open(self.path / "dictionary.json", 'w') as f:
+            json.dump({
+                'symbols': self.symbols,
+                'holders': self.holders,
+                'quarters': sorted(self.snapshots)
+            }, f)
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _intern(value: str, table: List[str], ids: Dict[str, int]) -> int:
+        if value not in ids:
+            ids[value] = len(table)
+            table.append(value)
+        return ids[value]
+
+    def ingest(self, holders_by_symbol: Dict[str, List[Dict]]) -> int:
+        """
+        Load per-symbol holder records (as returned by get_institutional_holders)
+
+        Re-ingesting a symbol replaces all of its rows in every quarter it
+        reports, so refreshed data never double counts. Returns rows ingested.
+        """
+        columns = defaultdict(lambda: {col: [] for col in COLUMNS})
+        ingested_ids = []
+
+        for symbol, holders in holders_by_symbol.items():
+            if not holders:
+                continue
+            sid = self._intern(symbol, self.symbols, self._symbol_ids)
+            ingested_ids.append(sid)
+
+            for holder in holders:
+                quarter = holder.get('dateReported', '')
+                if not quarter:
+                    continue
+                cols = columns[quarter]
+                cols['symbol_id'].append(sid)
+                cols['holder_id'].append(
+                    self._intern(holder.get('holder', 'Unknown'), self.holders, self._holder_ids)
+                )
+                cols['shares'].append(holder.get('totalShares', 0) or 0)
+                cols['value'].append(holder.get('totalInvested', 0) or 0)
+                cols['change'].append(holder.get('change', 0) or 0)
+
+        ingested_ids = np.array(ingested_ids, dtype=np.int64)
+        rows = 0
+
+        for quarter in set(columns) | set(self.snapshots):
+            if quarter in self.snapshots:
+                merged = self.snapshots[quarter].without_symbols(ingested_ids)
+            else:
+                merged = {col: np.empty(0) for col in COLUMNS}
+
+            new = columns.get(quarter)
+            if new:
+                rows += len(new['symbol_id'])
+                merged = {col: np.concatenate([merged[col], np.asarray(new[col], dtype=float)])
+                          for col in COLUMNS}
+
+            if len(merged['symbol_id']):
+                self.snapshots[quarter] = QuarterSnapshot(**merged)
+            else:
+                self.snapshots.pop(quarter, None)
+
+        return rows
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def quarters(self) -> List[str]:
+        """Stored dateReported values, newest first"""
+        return sorted(self.snapshots, reverse=True)
+
+    def _resolve_quarters(self, quarter: Optional[str], previous: Optional[str]):
+        quarters = self.quarters()
+        if not quarters:
+            return None, None
+        quarter = quarter or quarters[0]
+        if previous is None:
+            older = [q for q in quarters if q < quarter]
+            previous = older[0] if older else None
+        return quarter, previous
+
+    def find_holders(self, query: str) -> List[str]:
+        """Holder names containing query (case-insensitive), exact match first"""
+        needle = query.lower()
+        matches = [h for h in self.holders if needle in h.lower()]
+        matches.sort(key=lambda h: (h.lower() != needle, len(h)))
+        return matches
+
+    def holders_of(self, symbol: str, quarter: Optional[str] = None) -> List[Dict]:
+        """Holders of one symbol in a quarter (symbol index), largest first"""
+        quarter, _ = self._resolve_quarters(quarter, None)
+        sid = self._symbol_ids.get(symbol)
+        if quarter is None or sid is None:
+            return []
+
+        snapshot = self.snapshots[quarter]
+        rows = snapshot.symbol_rows(sid)
+        rows = rows[np.argsort(-snapshot.shares[rows], kind='stable')]
+        return [
+            {
+                'holder': self.holders[snapshot.holder_id[r]],
+                'shares': int(snapshot.shares[r]),
+                'value': float(snapshot.value[r]),
+                'change': int(snapshot.change[r])
+            }
+            for r in rows
+        ]
+
+    def positions_of(self, holder: str, quarter: Optional[str] = None) -> List[Dict]:
+        """One holder's positions in a quarter (holder index), largest value first"""
+        quarter, _ = self._resolve_quarters(quarter, None)
+        hid = self._holder_ids.get(holder)
+        if quarter is None or hid is None:
+            return []
+
+        snapshot = self.snapshots[quarter]
+        rows = snapshot.holder_rows(hid)
+        rows = rows[np.lexsort((-snapshot.shares[rows], -snapshot.value[rows]))]
+        return [
+            {
+                'symbol': self.symbols[snapshot.symbol_id[r]],
+                'shares': int(snapshot.shares[r]),
+                'value': float(snapshot.value[r]),
+                'change': int(snapshot.change[r])
+            }
+            for r in rows
+        ]
+
+    def diff_positions(
+        self,
+        holder: str,
+        quarter: Optional[str] = None,
+        previous: Optional[str] = None
+    ) -> Dict:
+        """What a holder opened, closed, added to and trimmed between two quarters"""
+        quarter, previous = self._resolve_quarters(quarter, previous)
+        hid = self._holder_ids.get(holder)
+        if quarter is None or previous is None or hid is None:
+            return {}
+
+        cur, prev = self.snapshots[quarter], self.snapshots[previous]
+        covered = np.intersect1d(cur.covered_symbols, prev.covered_symbols, assume_unique=True)
+
+        def holdings(snapshot):
+            rows = snapshot.holder_rows(hid)
+            rows = rows[np.isin(snapshot.symbol_id[rows], covered)]
+            return snapshot.symbol_id[rows], snapshot.shares[rows], snapshot.value[rows]
+
+        cur_ids, cur_shares, cur_value = holdings(cur)
+        prev_ids, prev_shares, prev_value = holdings(prev)
+        diff = diff_sets(cur_ids, cur_shares, prev_ids, prev_shares)
+
+        return self._format_diff(
+            diff, self.symbols, 'symbol', quarter, previous,
+            cur_ids, cur_shares, cur_value, prev_ids, prev_shares
+        )
+
+    def diff_holders(
+        self,
+        symbol: str,
+        quarter: Optional[str] = None,
+        previous: Optional[str] = None
+    ) -> Dict:
+        """Which institutions entered, exited, added to and trimmed a symbol"""
+        quarter, previous = self._resolve_quarters(quarter, previous)
+        sid = self._symbol_ids.get(symbol)
+        if quarter is None or previous is None or sid is None:
+            return {}
+
+        cur, prev = self.snapshots[quarter], self.snapshots[previous]
+        cur_rows, prev_rows = cur.symbol_rows(sid), prev.symbol_rows(sid)
+        if not len(cur_rows) or not len(prev_rows):
+            return {}
+
+        cur_ids, prev_ids = cur.holder_id[cur_rows], prev.holder_id[prev_rows]
+        diff = diff_sets(cur_ids, cur.shares[cur_rows], prev_ids, prev.shares[prev_rows])
+
+        return self._format_diff(
+            diff, self.holders, 'holder', quarter, previous,
+            cur_ids, cur.shares[cur_rows], cur.value[cur_rows], prev_ids, prev.shares[prev_rows]
+        )
+
+    @staticmethod
+    def _format_diff(diff, names, key, quarter, previous,
+                     cur_ids, cur_shares, cur_value, prev_ids, prev_shares) -> Dict:
+        # Both id arrays are sorted, so positions come straight from searchsorted
+        new_idx = cur_ids.searchsorted(diff['new'])
+        closed_idx = prev_ids.searchsorted(diff['closed'])
+
+        changed = []
+        for i, current, before, delta in zip(
+            diff['common'], diff['current_shares'], diff['previous_shares'], diff['delta']
+        ):
+            if delta == 0:
+                continue
+            changed.append({
+                key: names[i],
+                'current_shares': int(current),
+                'previous_shares': int(before),
+                'change': int(delta),
+                'pct_change': float(delta / before * 100) if before > 0 else 0.0
+            })
+
+        increased = sorted((c for c in changed if c['change'] > 0), key=lambda c: -c['change'])
+        decreased = sorted((c for c in changed if c['change'] < 0), key=lambda c: c['change'])
+
+        return {
+            'quarter': quarter,
+            'previous_quarter': previous,
+            'new': sorted(
+                ({key: names[i], 'shares': int(cur_shares[j]), 'value': float(cur_value[j])}
+                 for i, j in zip(diff['new'], new_idx)),
+                key=lambda p: -p['shares']
+            ),
+            'closed': sorted(
+                ({key: names[i], 'previous_shares': int(prev_shares[j])}
+                 for i, j in zip(diff['closed'], closed_idx)),
+                key=lambda p: -p['previous_shares']
+            ),
+            'increased': increased,
+            'decreased': decreased
+        }
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Institutional Flow Tracker - Vectorized Ownership Analytics
+
+Quarterly aggregation and quarter-over-quarter position diffing over a single
+DataFrame of 13F holder records for any number of symbols. The screener and
+the single-stock deep dive both build on these helpers, so a whole universe
+is aggregated with one groupby and classified with one merge instead of
+per-symbol dict loops.
+
+Frame columns:
+    symbol, holder, quarter (dateReported), shares (totalShares),
+    value (totalInvested), change, q_rank (0 = most recent quarter per symbol)
+
+Usage:
+    from ownership_analytics import holders_frame, ownership_metrics, position_changes
+
+    df = holders_frame(tracker.fetch_all_holders(symbols))
+    metrics = ownership_metrics(df)          # one row per symbol
+    changes = position_changes(df)           # one row per (symbol, holder)
+"""
+
+import sys
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    print("Error: 'pandas' library not installed. Install with: pip install pandas numpy")
+    sys.exit(1)
+
+FRAME_COLUMNS = ['symbol', 'holder', 'quarter', 'shares', 'value', 'change']
+
+# FMP field -> frame column
+SOURCE_FIELDS = {
+    'holder': 'holder',
+    'dateReported': 'quarter',
+    'totalShares': 'shares',
+    'totalInvested': 'value',
+    'change': 'change'
+}
+
+
+def holders_frame(holders_by_symbol: Dict[str, List[Dict]]) -> pd.DataFrame:
+    """Flatten per-symbol holder records into one frame with per-symbol quarter ranks"""
+    records = [h for holders in holders_by_symbol.values() for h in holders]
+    df = pd.DataFrame.from_records(records, columns=list(SOURCE_FIELDS)).rename(columns=SOURCE_FIELDS)
+    df.insert(0, 'symbol', np.repeat(list(holders_by_symbol), [len(h) for h in holders_by_symbol.values()]))
+
+    df['holder'] = df['holder'].fillna('Unknown')
+    df[['shares', 'value', 'change']] = df[['shares', 'value', 'change']].fillna(0)
+    df = df[df['quarter'].fillna('') != ''].reset_index(drop=True)
+
+    # Dense rank of dateReported within each symbol, newest = 0. Ranking the
+    # categorical codes (ISO dates sort lexically) avoids a string groupby-rank
+    quarter_codes = pd.Series(pd.Categorical(df['quarter']).codes, index=df.index)
+    df['q_rank'] = (
+        quarter_codes.groupby(df['symbol']).rank(method='dense', ascending=False).astype(int) - 1
+    )
+    return df
+
+
+def quarterly_summary(df: pd.DataFrame, max_quarters: Optional[int] = None) -> pd.DataFrame:
+    """Total shares, value and holder count per (symbol, quarter), newest first"""
+    if max_quarters is not None:
+        df = df[df['q_rank'] < max_quarters]
+
+    return (
+        df.groupby(['symbol', 'quarter', 'q_rank'], sort=False)
+        .agg(total_shares=('shares', 'sum'), total_value=('value', 'sum'), num_holders=('holder', 'size'))
+        .reset_index()
+        .sort_values(['symbol', 'q_rank'])
+        .reset_index(drop=True)
+    )
+
+
+def ownership_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Current vs previous quarter aggregates for every symbol with two quarters
+
+    Indexed by symbol; mirrors the keys of calculate_ownership_metrics.
+    """
+    summary = quarterly_summary(df, max_quarters=2)
+    current = summary[summary['q_rank'] == 0].set_index('symbol')
+    previous = summary[summary['q_rank'] == 1].set_index('symbol')
+
+    m = current.join(previous, how='inner', lsuffix='_current', rsuffix='_previous')
+    metrics = pd.DataFrame({
+        'current_quarter': m['quarter_current'],
+        'previous_quarter': m['quarter_previous'],
+        'current_total_shares': m['total_shares_current'],
+        'previous_total_shares': m['total_shares_previous'],
+        'shares_change': m['total_shares_current'] - m['total_shares_previous'],
+        'current_institution_count': m['num_holders_current'],
+        'previous_institution_count': m['num_holders_previous'],
+        'institution_count_change': m['num_holders_current'] - m['num_holders_previous'],
+        'current_value': m['total_value_current'],
+        'previous_value': m['total_value_previous'],
+        'value_change': m['total_value_current'] - m['total_value_previous'],
+    })
+
+    prev_shares = metrics['previous_total_shares']
+    metrics['percent_change'] = np.where(
+        prev_shares > 0, metrics['shares_change'] / prev_shares.where(prev_shares > 0, 1) * 100, 0.0
+    ).round(2)
+    return metrics
+
+
+def top_holders(df: pd.DataFrame, n: int = 10, q_rank: int = 0) -> pd.DataFrame:
+    """Largest n holders per symbol in the given quarter rank"""
+    quarter = df[df['q_rank'] == q_rank]
+    return (
+        quarter.sort_values(['symbol', 'shares'], ascending=[True, False], kind='stable')
+        .groupby('symbol', sort=False)
+        .head(n)
+    )
+
+
+def position_changes(df: pd.DataFrame, current_rank: int = 0, previous_rank: int = 1) -> pd.DataFrame:
+    """
+    Classify every (symbol, holder) between two quarter ranks with one outer merge
+
+    status is one of new / closed / increased / decreased / unchanged. Only
+    symbols that report both quarters are included.
+    """
+    positions = (
+        df[df['q_rank'].isin([current_rank, previous_rank])]
+        .groupby(['symbol', 'q_rank', 'holder'], as_index=False)['shares'].sum()
+    )
+    current = positions[positions['q_rank'] == current_rank].drop(columns='q_rank')
+    previous = positions[positions['q_rank'] == previous_rank].drop(columns='q_rank')
+
+    both = np.intersect1d(current['symbol'].unique(), previous['symbol'].unique())
+    merged = current.merge(
+        previous, on=['symbol', 'holder'], how='outer',
+        suffixes=('_current', '_previous'), indicator=True
+    )
+    merged = merged[merged['symbol'].isin(both)]
+
+    current_shares = merged['shares_current'].fillna(0)
+    previous_shares = merged['shares_previous'].fillna(0)
+    change = current_shares - previous_shares
+
+    status = np.select(
+        [merged['_merge'] == 'left_only', merged['_merge'] == 'right_only', change > 0, change < 0],
+        ['new', 'closed', 'increased', 'decreased'],
+        default='unchanged'
+    )
+
+    return pd.DataFrame({
+        'symbol': merged['symbol'],
+        'holder': merged['holder'],
+        'current_shares': current_shares.astype('int64'),
+        'previous_shares': previous_shares.astype('int64'),
+        'change': change.astype('int64'),
+        'pct_change': np.where(
+            previous_shares > 0, change / previous_shares.where(previous_shares > 0, 1) * 100, 0.0
+        ),
+        'status': status
+    }).reset_index(drop=True)
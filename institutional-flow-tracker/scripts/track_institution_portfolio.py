@@ -5,101 +5,313 @@ Institutional Flow Tracker - Portfolio Tracking
 Track portfolio changes of specific institutional investors (hedge funds, mutual funds)
 by analyzing their 13F filings over time. Follow superinvestors like Warren Buffett.
 
+FMP organizes 13F holder data by stock, so the portfolio is rebuilt from a local
+holdings warehouse (see holdings_warehouse.py): holder lists for a universe of
+stocks are ingested once per quarter, after which "what did Berkshire add this
+quarter" is an indexed lookup plus a set difference against the prior quarter.
+
 Usage:
     python3 track_institution_portfolio.py --cik 0001067983 --name "Berkshire Hathaway"
-    python3 track_institution_portfolio.py --cik 0001579982 --name "ARK Investment"
+    python3 track_institution_portfolio.py --name "ARK Investment" --symbols TSLA,COIN,ROKU,SQ
+    python3 track_institution_portfolio.py --name "Berkshire" --ingest --min-market-cap 10000000000
+
+Requirements:
+    - FMP API key (set FMP_API_KEY environment variable or pass --api-key)
+    - numpy
 
-Note: This is a simplified version. For full portfolio tracking, use WhaleWisdom or
-      SEC EDGAR directly, as FMP API has limited institution-specific endpoints.
+Note: Positions are limited to the ingested universe. For a complete filing,
+      use SEC EDGAR or WhaleWisdom directly.
 """
 
 import argparse
 import os
 import sys
 from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from holdings_warehouse import HoldingsWarehouse
+from track_institutional_flow import InstitutionalFlowTracker
+
+
+def ingest_universe(
+    warehouse: HoldingsWarehouse,
+    api_key: str,
+    symbols: Optional[List[str]] = None,
+    min_market_cap: int = 1000000000,
+    universe_size: int = 200,
+    max_workers: int = 8,
+    requests_per_second: float = 5.0
+):
+    """Fetch holder lists for the universe and load them into the warehouse"""
+    tracker = InstitutionalFlowTracker(
+        api_key, max_workers=max_workers, requests_per_second=requests_per_second
+    )
+
+    if not symbols:
+        print(f"Fetching universe: up to {universe_size} stocks with market cap >= ${min_market_cap:,}...")
+        stocks = tracker.get_stock_screener(market_cap_min=min_market_cap, limit=universe_size)
+        symbols = [s.get('symbol', '') for s in stocks if s.get('symbol')]
+
+    if not symbols:
+        print("No symbols to ingest")
+        return
+
+    print(f"Ingesting institutional holders for {len(symbols)} stocks...")
+    rows = warehouse.ingest(tracker.fetch_all_holders(symbols))
+    warehouse.save()
+    print(f"Ingested {rows:,} holder records ({tracker.api_calls} API calls); "
+          f"warehouse now covers {len(warehouse.symbols)} stocks, "
+          f"{len(warehouse.holders):,} institutions, {len(warehouse.snapshots)} quarters\n")
+
+
+def build_portfolio_summary(
+    warehouse: HoldingsWarehouse,
+    holder: str,
+    quarter: Optional[str] = None,
+    top: int = 50,
+    min_position_value: float = 0
+) -> Dict:
+    """Current positions and quarter-over-quarter changes for one holder"""
+    positions = warehouse.positions_of(holder, quarter)
+    total_value = sum(p['value'] for p in positions)
+    for p in positions:
+        p['weight'] = (p['value'] / total_value * 100) if total_value > 0 else 0
+
+    diff = warehouse.diff_positions(holder, quarter)
+
+    return {
+        'holder': holder,
+        'quarter': diff.get('quarter') or quarter or warehouse.quarters()[0],
+        'previous_quarter': diff.get('previous_quarter'),
+        'num_positions': len(positions),
+        'total_value': total_value,
+        'positions': [p for p in positions if p['value'] >= min_position_value][:top],
+        'new_positions': diff.get('new', []),
+        'increased_positions': diff.get('increased', []),
+        'decreased_positions': diff.get('decreased', []),
+        'closed_positions': diff.get('closed', [])
+    }
+
+
+def generate_report(summary: Dict, cik: Optional[str] = None, output_file: Optional[str] = None) -> str:
+    """Generate markdown portfolio report"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-print("""
-================================================================================
-TRACK INSTITUTION PORTFOLIO - SIMPLIFIED VERSION
-================================================================================
-
-This is a placeholder script. For comprehensive institution portfolio tracking:
-
-1. Use WhaleWisdom (free tier available): https://whalewisdom.com
-2. Use SEC EDGAR directly: https://www.sec.gov/cgi-bin/browse-edgar
-3. Use DataRoma for superinvestors: https://www.dataroma.com
-
-FMP API has limited institution-specific portfolio endpoints. The institutional
-holder data is organized by stock (not by institution), making it difficult to
-efficiently reconstruct an institution's full portfolio.
-
-Recommended Workflow:
---------------------
-1. Visit WhaleWisdom or DataRoma
-2. Search for your target institution by name or CIK
-3. View their current portfolio and quarterly changes
-4. Use this skill's other scripts to analyze specific stocks they hold
-
-Notable Institutions to Track:
------------------------------
-- Berkshire Hathaway (CIK: 0001067983) - Warren Buffett
-- Baupost Group (CIK: 0001061768) - Seth Klarman
-- Pershing Square (CIK: 0001336528) - Bill Ackman
-- Appaloosa Management (CIK: 0001079114) - David Tepper
-- Third Point (CIK: 0001040273) - Dan Loeb
-- ARK Investment (CIK: 0001579982) - Cathie Wood
-- Fidelity Management (CIK: 0000315066)
-- T. Rowe Price (CIK: 0001113169)
-- Dodge & Cox (CIK: 0000922614)
-
-Alternative Approach:
--------------------
-If you know the top holdings of an institution, you can use the
-analyze_single_stock.py script to see if they've changed their positions:
-
-Example for Berkshire's top holdings:
-    python3 analyze_single_stock.py AAPL  # Check if Berkshire changed position
-    python3 analyze_single_stock.py KO    # Coca-Cola
-    python3 analyze_single_stock.py BAC   # Bank of America
-
-================================================================================
-""")
+    report = f"""# Institutional Portfolio: {summary['holder']}
+
+**Quarter:** {summary['quarter']} (vs {summary['previous_quarter'] or 'N/A'})
+**Positions in Universe:** {summary['num_positions']}
+**Reported Value in Universe:** ${summary['total_value']:,.0f}
+**Analysis Date:** {timestamp}
+
+## Top Holdings
+
+"""
+    if summary['positions']:
+        report += "| Rank | Symbol | Shares | Value | % of Universe Value | Latest Change |\n"
+        report += "|------|--------|--------|-------|--------------------|---------------|\n"
+        for i, p in enumerate(summary['positions'], 1):
+            report += f"| {i} | {p['symbol']} | {p['shares']:,} | ${p['value']:,.0f} | {p['weight']:.2f}% | {p['change']:+,} |\n"
+    else:
+        report += "No positions above the minimum position value.\n"
+
+    report += "\n## New Positions\n\n"
+    if summary['new_positions']:
+        report += "| Symbol | Shares | Value |\n"
+        report += "|--------|--------|-------|\n"
+        for p in summary['new_positions']:
+            report += f"| {p['symbol']} | {p['shares']:,} | ${p['value']:,.0f} |\n"
+    else:
+        report += "No new positions detected.\n"
+
+    for title, key in (("Increased Positions", 'increased_positions'),
+                       ("Decreased Positions", 'decreased_positions')):
+        report += f"\n## {title}\n\n"
+        if summary[key]:
+            report += "| Symbol | Current Shares | Change | % Change |\n"
+            report += "|--------|----------------|--------|----------|\n"
+            for p in summary[key]:
+                report += f"| {p['symbol']} | {p['current_shares']:,} | {p['change']:+,} | {p['pct_change']:+.2f}% |\n"
+        else:
+            report += f"No {title.lower()} detected.\n"
+
+    report += "\n## Closed Positions\n\n"
+    if summary['closed_positions']:
+        report += "| Symbol | Previous Shares |\n"
+        report += "|--------|-----------------|\n"
+        for p in summary['closed_positions']:
+            report += f"| {p['symbol']} | {p['previous_shares']:,} |\n"
+    else:
+        report += "No closed positions detected.\n"
+
+    report += """
+---
+
+**Data Source:** FMP API (13F SEC Filings) via local holdings warehouse
+**Coverage:** Only stocks ingested into the warehouse are included; changes are
+computed over stocks present in both quarters.
+"""
+    if cik:
+        report += f"**Full Filing:** https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK={cik}&type=13F\n"
+
+    output_path = output_file if output_file else \
+        f"institution_portfolio_{summary['holder'][:30].replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.md"
+    if not output_path.endswith('.md'):
+        output_path = f"{output_path}.md"
+
+    with open(output_path, 'w') as f:
+        f.write(report)
+
+    print(f"\n✅ Report saved to: {output_path}")
+    return report
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description='Track institutional investor portfolio changes (simplified)'
+        description='Track institutional investor portfolio changes',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Track Berkshire Hathaway (builds the warehouse on first run)
+  python3 track_institution_portfolio.py --cik 0001067983 --name "Berkshire Hathaway"
+
+  # Restrict the universe to known holdings
+  python3 track_institution_portfolio.py --name "ARK Investment" --symbols TSLA,COIN,ROKU,SQ
+
+  # Refresh the warehouse with a larger universe
+  python3 track_institution_portfolio.py --name "Berkshire" --ingest --universe-size 500
+        """
     )
 
     parser.add_argument(
         '--cik',
         type=str,
-        required=True,
-        help='Central Index Key of the institution'
+        help='Central Index Key of the institution (used for the SEC EDGAR link)'
     )
     parser.add_argument(
         '--name',
         type=str,
         required=True,
-        help='Institution name'
+        help='Institution name (case-insensitive substring match)'
     )
     parser.add_argument(
         '--api-key',
         type=str,
         default=os.getenv('FMP_API_KEY'),
-        help='FMP API key (currently not used in simplified version)'
+        help='FMP API key (or set FMP_API_KEY environment variable)'
+    )
+    parser.add_argument(
+        '--symbols',
+        type=str,
+        help='Comma-separated symbols to ingest instead of the screener universe'
+    )
+    parser.add_argument(
+        '--ingest',
+        action='store_true',
+        help='(Re-)ingest the universe before querying (automatic when the warehouse is empty)'
+    )
+    parser.add_argument(
+        '--min-market-cap',
+        type=int,
+        default=1000000000,
+        help='Minimum market cap for the screener universe (default: 1B)'
+    )
+    parser.add_argument(
+        '--universe-size',
+        type=int,
+        default=200,
+        help='Number of screener stocks to ingest (default: 200)'
+    )
+    parser.add_argument(
+        '--quarter',
+        type=str,
+        help='dateReported to report on, e.g. 2024-09-30 (default: latest)'
+    )
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=50,
+        help='Number of top holdings to show (default: 50)'
+    )
+    parser.add_argument(
+        '--min-position-value',
+        type=float,
+        default=10000000,
+        help='Minimum position value to include in holdings (default: 10M)'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        help='Output file path for markdown report'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=8,
+        help='Concurrent holder requests during ingestion (default: 8)'
+    )
+    parser.add_argument(
+        '--rate-limit',
+        type=float,
+        default=5.0,
+        help='Maximum API requests per second during ingestion (default: 5)'
     )
 
     args = parser.parse_args()
 
-    print(f"Institution: {args.name}")
-    print(f"CIK: {args.cik}")
-    print()
-    print("For detailed portfolio tracking, please use:")
-    print(f"1. WhaleWisdom: https://whalewisdom.com/filer/{args.name.lower().replace(' ', '-')}")
-    print(f"2. SEC EDGAR: https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK={args.cik}&type=13F")
-    print(f"3. DataRoma: https://www.dataroma.com (if superinvestor)")
-    print()
+    warehouse = HoldingsWarehouse()
+    symbols = [s.strip().upper() for s in args.symbols.split(',')] if args.symbols else None
+
+    if args.ingest or symbols or not warehouse.snapshots:
+        if not args.api_key:
+            print("Error: FMP API key required")
+            print("Set FMP_API_KEY environment variable or pass --api-key argument")
+            print("Get free API key at: https://financialmodelingprep.com/developer/docs")
+            sys.exit(1)
+        ingest_universe(
+            warehouse, args.api_key,
+            symbols=symbols,
+            min_market_cap=args.min_market_cap,
+            universe_size=args.universe_size,
+            max_workers=args.workers,
+            requests_per_second=args.rate_limit
+        )
+
+    if args.quarter and args.quarter not in warehouse.snapshots:
+        print(f"Error: quarter {args.quarter} not in warehouse "
+              f"(available: {', '.join(warehouse.quarters()) or 'none'})")
+        sys.exit(1)
+
+    matches = warehouse.find_holders(args.name)
+    if not matches:
+        print(f"No institution matching '{args.name}' holds any stock in the warehouse universe")
+        print("Try --symbols with known holdings or a larger --universe-size")
+        sys.exit(1)
+
+    holder = matches[0]
+    if len(matches) > 1:
+        print(f"Matched '{holder}' ({len(matches) - 1} other matches: {', '.join(matches[1:6])})")
+
+    summary = build_portfolio_summary(
+        warehouse, holder,
+        quarter=args.quarter,
+        top=args.top,
+        min_position_value=args.min_position_value
+    )
+
+    generate_report(summary, cik=args.cik, output_file=args.output)
+
+    print("\n" + "="*80)
+    print(f"PORTFOLIO SUMMARY: {holder} ({summary['quarter']} vs {summary['previous_quarter'] or 'N/A'})")
+    print("="*80)
+    print(f"Positions in universe: {summary['num_positions']} (${summary['total_value']:,.0f})")
+    print(f"  - New: {', '.join(p['symbol'] for p in summary['new_positions'][:10]) or 'none'}")
+    print(f"  - Increased: {', '.join(p['symbol'] for p in summary['increased_positions'][:10]) or 'none'}")
+    print(f"  - Decreased: {', '.join(p['symbol'] for p in summary['decreased_positions'][:10]) or 'none'}")
+    print(f"  - Closed: {', '.join(p['symbol'] for p in summary['closed_positions'][:10]) or 'none'}")
 
     return 0
 
@@ -10,18 +10,27 @@ Usage:
     python3 track_institutional_flow.py --sector Technology --min-institutions 20
     python3 track_institutional_flow.py --api-key YOUR_KEY --output results.json
 
+    python3 track_institutional_flow.py --workers 8 --rate-limit 5 --refresh-cache
+
 Requirements:
     - FMP API key (set FMP_API_KEY environment variable or pass --api-key)
     - Free tier: 250 requests/day (sufficient for ~40-50 stocks)
+    - pandas, numpy
+
+Holder data is fetched concurrently through a shared rate limiter and cached
+per (symbol, dateReported) in institutional-flow-tracker/cache/, so repeat
+screens within the same 13F quarter make almost no API calls.
 """
 
 import argparse
 import json
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from pathlib import Path
 from typing import List, Dict, Optional
-import time
 
 try:
     import requests
@@ -29,14 +38,33 @@ except ImportError:
     print("Error: 'requests' library not installed. Install with: pip install requests")
     sys.exit(1)
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fmp_client import RateLimiter, HolderSnapshotCache, build_session
+from ownership_analytics import holders_frame, ownership_metrics, top_holders
+
 
 class InstitutionalFlowTracker:
     """Track institutional ownership changes across stocks"""
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        max_workers: int = 8,
+        requests_per_second: float = 5.0,
+        use_cache: bool = True,
+        refresh_cache: bool = False
+    ):
         self.api_key = api_key
         self.base_url = "https://financialmodelingprep.com/api/v3"
         self.base_url_v4 = "https://financialmodelingprep.com/api/v4"
+        self.max_workers = max_workers
+        self.session = build_session(pool_size=max_workers)
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.cache = HolderSnapshotCache() if use_cache else None
+        self.refresh_cache = refresh_cache
+        self.api_calls = 0
+        self._calls_lock = threading.Lock()
 
     def get_stock_screener(
         self,
@@ -52,117 +80,126 @@ class InstitutionalFlowTracker:
         }
 
         try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
+            response = self._get(url, params)
             return response.json()
         except requests.exceptions.RequestException as e:
             print(f"Error fetching stock screener: {e}")
             return []
 
+    def _get(self, url: str, params: Dict) -> requests.Response:
+        """Rate-limited GET over the pooled session (retries handled by the adapter)"""
+        self.rate_limiter.wait()
+        with self._calls_lock:
+            self.api_calls += 1
+        response = self.session.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        return response
+
     def get_institutional_holders(self, symbol: str) -> List[Dict]:
-        """Get institutional holders for a specific stock"""
+        """Get institutional holders for a specific stock (cache first)"""
+        if self.cache and not self.refresh_cache:
+            cached = self.cache.get(symbol)
+            if cached is not None:
+                return cached
+
         url = f"{self.base_url}/institutional-holder/{symbol}"
         params = {"apikey": self.api_key}
 
         try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            return data if isinstance(data, list) else []
+            data = self._get(url, params).json()
+            holders = data if isinstance(data, list) else []
         except requests.exceptions.RequestException as e:
             print(f"Error fetching institutional holders for {symbol}: {e}")
             return []
 
+        if self.cache and holders:
+            self.cache.put(symbol, holders)
+        return holders
+
+    def fetch_all_holders(self, symbols: List[str]) -> Dict[str, List[Dict]]:
+        """
+        Fetch holders for many symbols concurrently
+
+        Workers share one rate limiter and connection pool; cached symbols
+        return immediately without touching the network.
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.get_institutional_holders, s): s for s in symbols}
+            for i, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                if i % 25 == 0 or i == len(futures):
+                    print(f"Progress: {i}/{len(futures)} holder lists fetched...")
+        return results
+
     def calculate_ownership_metrics(
         self,
         symbol: str,
         company_name: str,
-        market_cap: float
+        market_cap: float,
+        holders: Optional[List[Dict]] = None
     ) -> Optional[Dict]:
         """Calculate institutional ownership metrics for a stock"""
-        holders = self.get_institutional_holders(symbol)
+        if holders is None:
+            holders = self.get_institutional_holders(symbol)
 
-        if not holders or len(holders) < 2:
-            return None
+        stock = {'symbol': symbol, 'companyName': company_name, 'marketCap': market_cap}
+        results = self.calculate_universe_metrics([stock], {symbol: holders or []})
+        return results[0] if results else None
 
-        # Group by date to get quarterly snapshots
-        quarters = {}
-        for holder in holders:
-            date = holder.get('dateReported', '')
-            if not date:
-                continue
-            if date not in quarters:
-                quarters[date] = []
-            quarters[date].append(holder)
-
-        # Need at least 2 quarters for comparison
-        if len(quarters) < 2:
-            return None
-
-        # Get most recent 2 quarters
-        sorted_quarters = sorted(quarters.keys(), reverse=True)
-        current_q = sorted_quarters[0]
-        previous_q = sorted_quarters[1]
-
-        current_holders = quarters[current_q]
-        previous_holders = quarters[previous_q]
-
-        # Calculate aggregate metrics
-        current_total_shares = sum(h.get('totalShares', 0) for h in current_holders)
-        previous_total_shares = sum(h.get('totalShares', 0) for h in previous_holders)
-
-        # Calculate changes
-        shares_change = current_total_shares - previous_total_shares
-        if previous_total_shares > 0:
-            percent_change = (shares_change / previous_total_shares) * 100
-        else:
-            percent_change = 0
-
-        # Count institutions
-        current_count = len(current_holders)
-        previous_count = len(previous_holders)
-        institution_change = current_count - previous_count
-
-        # Calculate dollar value (approximate)
-        # Note: This is approximate as we don't have exact prices
-        current_value = sum(h.get('totalInvested', 0) for h in current_holders)
-        previous_value = sum(h.get('totalInvested', 0) for h in previous_holders)
-        value_change = current_value - previous_value
-
-        # Get top holders
-        top_holders = sorted(
-            current_holders,
-            key=lambda x: x.get('totalShares', 0),
-            reverse=True
-        )[:10]
-
-        top_holder_names = [
-            {
-                'name': h.get('holder', 'Unknown'),
-                'shares': h.get('totalShares', 0),
-                'change': h.get('change', 0)
-            }
-            for h in top_holders
-        ]
+    def calculate_universe_metrics(
+        self,
+        stocks: List[Dict],
+        holders_by_symbol: Dict[str, List[Dict]]
+    ) -> List[Dict]:
+        """
+        Ownership metrics for every stock in one pass
+
+        All holder records go into one DataFrame; quarterly totals come from a
+        single groupby and the top holders from one sort, instead of grouping
+        and summing per symbol. Stocks with fewer than two quarters are skipped.
+        """
+        df = holders_frame(holders_by_symbol)
+        if df.empty:
+            return []
 
-        return {
-            'symbol': symbol,
-            'company_name': company_name,
-            'market_cap': market_cap,
-            'current_quarter': current_q,
-            'previous_quarter': previous_q,
-            'current_total_shares': current_total_shares,
-            'previous_total_shares': previous_total_shares,
-            'shares_change': shares_change,
-            'percent_change': round(percent_change, 2),
-            'current_institution_count': current_count,
-            'previous_institution_count': previous_count,
-            'institution_count_change': institution_change,
-            'current_value': current_value,
-            'previous_value': previous_value,
-            'value_change': value_change,
-            'top_holders': top_holder_names
+        metrics = ownership_metrics(df)
+        top = top_holders(df[df['symbol'].isin(metrics.index)], n=10)
+        top_by_symbol = {
+            symbol: [
+                {'name': h['holder'], 'shares': h['shares'], 'change': h['change']}
+                for h in group[['holder', 'shares', 'change']].to_dict('records')
+            ]
+            for symbol, group in top.groupby('symbol', sort=False)
         }
+        metrics_by_symbol = metrics.to_dict('index')
+
+        results = []
+        for stock in stocks:
+            symbol = stock.get('symbol', '')
+            m = metrics_by_symbol.get(symbol)
+            if m is None:
+                continue
+            results.append({
+                'symbol': symbol,
+                'company_name': stock.get('companyName', ''),
+                'market_cap': stock.get('marketCap', 0),
+                'current_quarter': m['current_quarter'],
+                'previous_quarter': m['previous_quarter'],
+                'current_total_shares': m['current_total_shares'],
+                'previous_total_shares': m['previous_total_shares'],
+                'shares_change': m['shares_change'],
+                'percent_change': m['percent_change'],
+                'current_institution_count': m['current_institution_count'],
+                'previous_institution_count': m['previous_institution_count'],
+                'institution_count_change': m['institution_count_change'],
+                'current_value': m['current_value'],
+                'previous_value': m['previous_value'],
+                'value_change': m['value_change'],
+                'top_holders': top_by_symbol.get(symbol, [])
+            })
+
+        return results
 
     def screen_stocks(
         self,
@@ -187,28 +224,19 @@ class InstitutionalFlowTracker:
             stocks = [s for s in stocks if s.get('sector', '').lower() == sector.lower()]
             print(f"Filtered to {len(stocks)} stocks in {sector} sector")
 
-        print(f"Analyzing institutional ownership for {len(stocks)} stocks...")
-        print("This may take a few minutes. Please wait...\n")
+        print(f"Analyzing institutional ownership for {len(stocks)} stocks "
+              f"({self.max_workers} workers)...\n")
 
-        results = []
-        for i, stock in enumerate(stocks, 1):
-            symbol = stock.get('symbol', '')
-            company_name = stock.get('companyName', '')
-            market_cap = stock.get('marketCap', 0)
+        calls_before = self.api_calls
+        holders_by_symbol = self.fetch_all_holders([s.get('symbol', '') for s in stocks])
+        print(f"Holder fetch used {self.api_calls - calls_before} API calls "
+              f"({len(stocks) - (self.api_calls - calls_before)} served from cache)")
 
-            if i % 10 == 0:
-                print(f"Progress: {i}/{len(stocks)} stocks analyzed...")
-
-            # Rate limiting: max 5 requests per second
-            time.sleep(0.2)
-
-            metrics = self.calculate_ownership_metrics(symbol, company_name, market_cap)
-
-            if metrics:
-                # Apply filters
-                if abs(metrics['percent_change']) >= min_change_percent:
-                    if metrics['current_institution_count'] >= min_institutions:
-                        results.append(metrics)
+        results = [
+            metrics for metrics in self.calculate_universe_metrics(stocks, holders_by_symbol)
+            if abs(metrics['percent_change']) >= min_change_percent
+            and metrics['current_institution_count'] >= min_institutions
+        ]
 
         print(f"\nFound {len(results)} stocks meeting criteria")
 
@@ -402,6 +430,28 @@ Examples:
         type=str,
         help='Output file path for JSON results'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=8,
+        help='Concurrent holder requests (default: 8)'
+    )
+    parser.add_argument(
+        '--rate-limit',
+        type=float,
+        default=5.0,
+        help='Maximum API requests per second across all workers (default: 5)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the local 13F holder snapshot cache'
+    )
+    parser.add_argument(
+        '--refresh-cache',
+        action='store_true',
+        help='Re-fetch all holders and overwrite cached snapshots'
+    )
 
     args = parser.parse_args()
 
@@ -413,7 +463,13 @@ Examples:
         sys.exit(1)
 
     # Initialize tracker
-    tracker = InstitutionalFlowTracker(args.api_key)
+    tracker = InstitutionalFlowTracker(
+        args.api_key,
+        max_workers=args.workers,
+        requests_per_second=args.rate_limit,
+        use_cache=not args.no_cache,
+        refresh_cache=args.refresh_cache
+    )
 
     # Run screening
     results = tracker.screen_stocks(
@@ -3,16 +3,23 @@
 Market Analysis Utility Functions for Environment Report
 
 This script provides common functions for market analysis report creation.
+Trading-day arithmetic and market status come from the shared exchange
+session calendar in trading_calendar.py (holidays and early closes included).
 """
 
-from datetime import datetime, timedelta
-import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from trading_calendar import get_calendar
 
 
 def get_market_session_times():
     """Returns major market trading hours"""
     return {
-        "Tokyo": {"open": "09:00 JST", "close": "15:00 JST", "lunch": "11:30-12:30"},
+        "Tokyo": {"open": "09:00 JST", "close": "15:30 JST", "lunch": "11:30-12:30"},
         "Shanghai": {"open": "09:30 CST", "close": "15:00 CST", "lunch": "11:30-13:00"},
         "Hong Kong": {"open": "09:30 HKT", "close": "16:00 HKT", "lunch": "12:00-13:00"},
         "Singapore": {"open": "09:00 SGT", "close": "17:00 SGT", "lunch": "12:00-13:00"},
@@ -34,21 +41,9 @@ Created: {now.strftime('%Y-%m-%d')} ({weekdays[now.weekday()]}) {now.strftime('%
 """
 
 
-def calculate_trading_days_to_event(event_date_str):
-    """Calculate trading days to event"""
-    # Simple version: excludes weekends (doesn't consider holidays)
-    event_date = datetime.strptime(event_date_str, "%Y-%m-%d")
-    today = datetime.now().date()
-    
-    trading_days = 0
-    current = today
-    
-    while current < event_date.date():
-        if current.weekday() < 5:  # Monday to Friday
-            trading_days += 1
-        current += timedelta(days=1)
-    
-    return trading_days
+def calculate_trading_days_to_event(event_date_str, market="NYSE", today=None):
+    """Calculate trading days to event (sessions from today up to, not including, the event date)"""
+    return get_calendar(market).trading_days_between(today or datetime.now().date(), event_date_str)
 
 
 def format_percentage_change(value):
@@ -73,26 +68,32 @@ def categorize_volatility(vix_value):
         return "Extreme Volatility 🚨"
 
 
-def get_market_status():
-    """Determine current market status"""
-    now = datetime.now()
-    hour = now.hour
-    
+def get_market_status(now=None):
+    """Determine current market status from the exchange session calendars"""
+    now = now or datetime.now(timezone.utc)
+    labels = {
+        "open": "🟢 {name} Market: Trading",
+        "lunch": "🍱 {name} Market: Lunch break",
+        "pre-open": "⏰ {name} Market: Pre-market (opens {next_open})",
+        "closed": "🔴 {name} Market: Closed (next open {next_open})",
+        "holiday": "🔴 {name} Market: Holiday - {holiday} (next open {next_open})",
+        "weekend": "🔴 {name} Market: Weekend (next open {next_open})"
+    }
+
     status = []
-    
-    # Simple market open determination (timezone not considered)
-    if 9 <= hour < 15:
-        status.append("🟢 Tokyo Market: Trading")
-    elif 15 <= hour < 18:
-        status.append("🔴 Tokyo Market: Closed")
-    else:
-        status.append("⏰ Tokyo Market: After hours")
-    
-    if 21 <= hour or hour < 4:
-        status.append("🟢 US Market: Trading (previous day)")
-    else:
-        status.append("🔴 US Market: Closed")
-    
+    for market, name in (("TSE", "Tokyo"), ("LSE", "London"), ("NYSE", "US")):
+        calendar = get_calendar(market)
+        local_day = now.astimezone(calendar.tz).date()
+        state = calendar.status(now)
+        line = labels[state].format(
+            name=name,
+            holiday=calendar.holiday_name(local_day) if state == "holiday" else "",
+            next_open=calendar.next_open(now).strftime("%a %H:%M %Z")
+        )
+        if state == "open" and calendar.is_early_close(local_day):
+            line += f" (early close {calendar.next_close(now).strftime('%H:%M %Z')})"
+        status.append(line)
+
     return "\n".join(status)
 
 
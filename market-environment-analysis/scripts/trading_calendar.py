@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Exchange Trading Calendar
+
+Precomputed session calendars for NYSE, LSE and TSE covering 1990-2050:
+weekends, exchange holidays (rule-based, including observed/substitute days
+and one-off closures) and early closes.
+
+Each calendar stores its trading sessions as a sorted list of date ordinals,
+so every query is a binary search:
+
+    trading_days_between(start, end)   sessions in [start, end)
+    next_session / previous_session    nearest session on either side
+    add_sessions(day, n)               n-th session after day
+    is_open(moment) / next_open(...)   intraday status in exchange local time
+
+Shared by market-environment-analysis, earnings-calendar,
+economic-calendar-fetcher and stock-analysis.
+
+Usage:
+    from trading_calendar import get_calendar
+
+    nyse = get_calendar("NYSE")
+    nyse.trading_days_between("2025-12-22", "2026-01-05")    # 8
+    nyse.next_open()                                          # tz-aware datetime
+    nyse.trading_days_until(["2025-11-03", "2025-11-28"], today="2025-10-31")
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+
+FIRST_YEAR = 1990
+LAST_YEAR = 2050
+
+DateLike = Union[date, datetime, str]
+
+MON, TUE, WED, THU, FRI, SAT, SUN = range(7)
+
+
+# ==========================================
+# Date helpers
+# ==========================================
+
+def _to_date(value: DateLike) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value[:10], "%Y-%m-%d").date()
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th weekday of the month (n = -1 for the last one)"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = (date(year, month + 1, 1) if month < 12 else date(year + 1, 1, 1)) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    """Western Easter Sunday (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _us_observed(day: date) -> date:
+    """Saturday holidays move to Friday, Sunday holidays to Monday"""
+    if day.weekday() == SAT:
+        return day - timedelta(days=1)
+    if day.weekday() == SUN:
+        return day + timedelta(days=1)
+    return day
+
+
+# ==========================================
+# Holiday rules (year -> {date: name})
+# ==========================================
+
+NYSE_SPECIAL_CLOSURES = {
+    date(1994, 4, 27): "National Day of Mourning (Nixon)",
+    date(2001, 9, 11): "September 11",
+    date(2001, 9, 12): "September 11",
+    date(2001, 9, 13): "September 11",
+    date(2001, 9, 14): "September 11",
+    date(2004, 6, 11): "National Day of Mourning (Reagan)",
+    date(2007, 1, 2): "National Day of Mourning (Ford)",
+    date(2012, 10, 29): "Hurricane Sandy",
+    date(2012, 10, 30): "Hurricane Sandy",
+    date(2018, 12, 5): "National Day of Mourning (G.H.W. Bush)",
+    date(2025, 1, 9): "National Day of Mourning (Carter)",
+}
+
+LSE_SPECIAL_CLOSURES = {
+    date(1999, 12, 31): "Millennium",
+    date(2002, 6, 3): "Golden Jubilee",
+    date(2011, 4, 29): "Royal Wedding",
+    date(2012, 6, 5): "Diamond Jubilee",
+    date(2022, 6, 3): "Platinum Jubilee",
+    date(2022, 9, 19): "State Funeral of Queen Elizabeth II",
+    date(2023, 5, 8): "Coronation of King Charles III",
+}
+
+TSE_SPECIAL_CLOSURES = {
+    date(1990, 11, 12): "Enthronement Ceremony",
+    date(1993, 6, 9): "Crown Prince Wedding",
+    date(2019, 5, 1): "Enthronement Day",
+    date(2019, 10, 22): "Enthronement Ceremony",
+}
+
+
+def nyse_holidays(year: int) -> Dict[date, str]:
+    holidays = {}
+    new_year = date(year, 1, 1)
+    # NYSE does not observe New Year's Day on the preceding Friday
+    if new_year.weekday() != SAT:
+        holidays[_us_observed(new_year)] = "New Year's Day"
+    if year >= 1998:
+        holidays[_nth_weekday(year, 1, MON, 3)] = "Martin Luther King Jr. Day"
+    holidays[_nth_weekday(year, 2, MON, 3)] = "Washington's Birthday"
+    holidays[_easter(year) - timedelta(days=2)] = "Good Friday"
+    holidays[_nth_weekday(year, 5, MON, -1)] = "Memorial Day"
+    if year >= 2022:
+        holidays[_us_observed(date(year, 6, 19))] = "Juneteenth"
+    holidays[_us_observed(date(year, 7, 4))] = "Independence Day"
+    holidays[_nth_weekday(year, 9, MON, 1)] = "Labor Day"
+    holidays[_nth_weekday(year, 11, THU, 4)] = "Thanksgiving Day"
+    holidays[_us_observed(date(year, 12, 25))] = "Christmas Day"
+    return holidays
+
+
+def nyse_early_closes(year: int) -> List[date]:
+    return [
+        date(year, 7, 3),
+        _nth_weekday(year, 11, THU, 4) + timedelta(days=1),
+        date(year, 12, 24),
+    ]
+
+
+def lse_holidays(year: int) -> Dict[date, str]:
+    holidays = {}
+    new_year = date(year, 1, 1)
+    holidays[new_year + timedelta(days={SAT: 2, SUN: 1}.get(new_year.weekday(), 0))] = "New Year's Day"
+
+    easter = _easter(year)
+    holidays[easter - timedelta(days=2)] = "Good Friday"
+    holidays[easter + timedelta(days=1)] = "Easter Monday"
+
+    early_may = {1995: date(1995, 5, 8), 2020: date(2020, 5, 8)}
+    holidays[early_may.get(year, _nth_weekday(year, 5, MON, 1))] = "Early May Bank Holiday"
+    spring = {2002: date(2002, 6, 4), 2012: date(2012, 6, 4), 2022: date(2022, 6, 2)}
+    holidays[spring.get(year, _nth_weekday(year, 5, MON, -1))] = "Spring Bank Holiday"
+    holidays[_nth_weekday(year, 8, MON, -1)] = "Summer Bank Holiday"
+
+    # Christmas and Boxing Day roll forward past the weekend and each other
+    day = date(year, 12, 25)
+    for name in ("Christmas Day", "Boxing Day"):
+        while day.weekday() >= SAT or day in holidays:
+            day += timedelta(days=1)
+        holidays[day] = name
+        day += timedelta(days=1)
+    return holidays
+
+
+def lse_early_closes(year: int) -> List[date]:
+    return [date(year, 12, 24), date(year, 12, 31)]
+
+
+def _jp_equinoxes(year: int) -> Tuple[date, date]:
+    """Vernal and autumnal equinox days (approximation valid 1980-2099)"""
+    drift = 0.242194 * (year - 1980) - (year - 1980) // 4
+    return date(year, 3, int(20.8431 + drift)), date(year, 9, int(23.2488 + drift))
+
+
+def tse_holidays(year: int) -> Dict[date, str]:
+    vernal, autumnal = _jp_equinoxes(year)
+    national = {
+        date(year, 1, 1): "New Year's Day",
+        (date(year, 1, 15) if year < 2000 else _nth_weekday(year, 1, MON, 2)): "Coming of Age Day",
+        date(year, 2, 11): "National Foundation Day",
+        vernal: "Vernal Equinox Day",
+        date(year, 4, 29): "Showa Day" if year >= 2007 else "Greenery Day",
+        date(year, 5, 3): "Constitution Memorial Day",
+        date(year, 5, 5): "Children's Day",
+        autumnal: "Autumnal Equinox Day",
+        date(year, 11, 3): "Culture Day",
+        date(year, 11, 23): "Labor Thanksgiving Day",
+    }
+    if year >= 2007:
+        national[date(year, 5, 4)] = "Greenery Day"
+    if 1989 <= year <= 2018:
+        national[date(year, 12, 23)] = "Emperor's Birthday"
+    elif year >= 2020:
+        national[date(year, 2, 23)] = "Emperor's Birthday"
+
+    # Olympic year moves in 2020/2021
+    marine = {2020: date(2020, 7, 23), 2021: date(2021, 7, 22)}
+    sports = {2020: date(2020, 7, 24), 2021: date(2021, 7, 23)}
+    mountain = {2020: date(2020, 8, 10), 2021: date(2021, 8, 8)}
+    if year >= 1996:
+        national[marine.get(year, date(year, 7, 20) if year < 2003 else _nth_weekday(year, 7, MON, 3))] = "Marine Day"
+    if year >= 2016:
+        national[mountain.get(year, date(year, 8, 11))] = "Mountain Day"
+    national[date(year, 9, 15) if year < 2003 else _nth_weekday(year, 9, MON, 3)] = "Respect for the Aged Day"
+    national[sports.get(year, date(year, 10, 10) if year < 2000 else _nth_weekday(year, 10, MON, 2))] = "Sports Day"
+
+    national.update({d: name for d, name in TSE_SPECIAL_CLOSURES.items() if d.year == year})
+
+    holidays = dict(national)
+    # Substitute holiday: a Sunday holiday moves to the next non-holiday day
+    for day in sorted(national):
+        if day.weekday() == SUN:
+            substitute = day + timedelta(days=1)
+            while substitute in holidays:
+                substitute += timedelta(days=1)
+            holidays[substitute] = "Substitute Holiday"
+    # Citizens' holiday: a weekday sandwiched between two holidays
+    for day in sorted(holidays):
+        between = day + timedelta(days=1)
+        if between not in holidays and between + timedelta(days=1) in holidays and between.weekday() != SUN:
+            holidays[between] = "Citizens' Holiday"
+
+    # Exchange year-end/new-year closure
+    for day, name in ((date(year, 1, 2), "Market Holiday"), (date(year, 1, 3), "Market Holiday"),
+                      (date(year, 12, 31), "Market Holiday")):
+        holidays.setdefault(day, name)
+    return holidays
+
+
+# ==========================================
+# Market definitions
+# ==========================================
+
+@dataclass(frozen=True)
+class MarketSpec:
+    code: str
+    name: str
+    timezone: str
+    open: time
+    close: time
+    early_close: Optional[time] = None
+    lunch: Optional[Tuple[time, time]] = None
+
+
+MARKETS = {
+    "NYSE": (MarketSpec("NYSE", "New York", "America/New_York", time(9, 30), time(16, 0), time(13, 0)),
+             nyse_holidays, nyse_early_closes, NYSE_SPECIAL_CLOSURES),
+    "LSE": (MarketSpec("LSE", "London", "Europe/London", time(8, 0), time(16, 30), time(12, 30)),
+            lse_holidays, lse_early_closes, LSE_SPECIAL_CLOSURES),
+    "TSE": (MarketSpec("TSE", "Tokyo", "Asia/Tokyo", time(9, 0), time(15, 30), None, (time(11, 30), time(12, 30))),
+            tse_holidays, None, {}),
+}
+
+ALIASES = {
+    "US": "NYSE", "NASDAQ": "NYSE", "NEW YORK": "NYSE", "XNYS": "NYSE",
+    "UK": "LSE", "GB": "LSE", "LONDON": "LSE", "XLON": "LSE",
+    "JP": "TSE", "JPX": "TSE", "TOKYO": "TSE", "XTKS": "TSE",
+}
+
+
+class TradingCalendar:
+    """Sorted session/holiday arrays for one exchange with binary-search queries"""
+
+    def __init__(self, market: str, first_year: int = FIRST_YEAR, last_year: int = LAST_YEAR):
+        spec, holiday_rule, early_close_rule, special_closures = MARKETS[market]
+        self.spec = spec
+        self.tz = ZoneInfo(spec.timezone)
+        self.first_day = date(first_year, 1, 1)
+        self.last_day = date(last_year, 12, 31)
+
+        holidays: Dict[date, str] = {}
+        for year in range(first_year, last_year + 1):
+            holidays.update(holiday_rule(year))
+        holidays.update(special_closures)
+        self.holidays = {d.toordinal(): name for d, name in holidays.items()
+                         if d.weekday() < SAT and self.first_day <= d <= self.last_day}
+
+        first, last = self.first_day.toordinal(), self.last_day.toordinal()
+        # date.toordinal() % 7: 0 = Sunday, 6 = Saturday
+        self.sessions = [o for o in range(first, last + 1) if o % 7 not in (0, 6) and o not in self.holidays]
+        self.holiday_days = sorted(self.holidays)
+
+        self.early_closes = set()
+        if early_close_rule and spec.early_close:
+            for year in range(first_year, last_year + 1):
+                self.early_closes.update(
+                    d.toordinal() for d in early_close_rule(year) if d.weekday() < SAT
+                )
+            self.early_closes -= set(self.holidays)
+
+    # ------------------------------------------------------------------
+    # Day-level queries
+    # ------------------------------------------------------------------
+
+    def _ordinal(self, value: DateLike) -> int:
+        day = _to_date(value)
+        if not self.first_day <= day <= self.last_day:
+            raise ValueError(f"{day} is outside the {self.spec.code} calendar range "
+                             f"({self.first_day} to {self.last_day})")
+        return day.toordinal()
+
+    def is_session(self, day: DateLike) -> bool:
+        """Whether the exchange trades on this day"""
+        ordinal = self._ordinal(day)
+        i = bisect_left(self.sessions, ordinal)
+        return i < len(self.sessions) and self.sessions[i] == ordinal
+
+    def holiday_name(self, day: DateLike) -> Optional[str]:
+        """Holiday name if the exchange is closed for a holiday on this weekday"""
+        return self.holidays.get(self._ordinal(day))
+
+    def is_early_close(self, day: DateLike) -> bool:
+        return self._ordinal(day) in self.early_closes
+
+    def trading_days_between(self, start: DateLike, end: DateLike) -> int:
+        """Sessions in [start, end); negative when end is before start"""
+        return bisect_left(self.sessions, self._ordinal(end)) - bisect_left(self.sessions, self._ordinal(start))
+
+    def trading_days_until(self, days: Iterable[DateLike], today: Optional[DateLike] = None) -> List[int]:
+        """trading_days_between(today, day) for many days, one bisect each"""
+        start = bisect_left(self.sessions, self._ordinal(today or date.today()))
+        return [bisect_left(self.sessions, self._ordinal(day)) - start for day in days]
+
+    def next_session(self, day: DateLike, inclusive: bool = True) -> date:
+        """First session on or after day (strictly after when inclusive=False)"""
+        ordinal = self._ordinal(day)
+        i = bisect_left(self.sessions, ordinal) if inclusive else bisect_right(self.sessions, ordinal)
+        if i >= len(self.sessions):
+            raise ValueError(f"No {self.spec.code} session after {_to_date(day)} in calendar range")
+        return date.fromordinal(self.sessions[i])
+
+    def previous_session(self, day: DateLike, inclusive: bool = True) -> date:
+        """Last session on or before day (strictly before when inclusive=False)"""
+        ordinal = self._ordinal(day)
+        i = (bisect_right(self.sessions, ordinal) if inclusive else bisect_left(self.sessions, ordinal)) - 1
+        if i < 0:
+            raise ValueError(f"No {self.spec.code} session before {_to_date(day)} in calendar range")
+        return date.fromordinal(self.sessions[i])
+
+    def add_sessions(self, day: DateLike, n: int) -> date:
+        """The n-th session after day (n < 0: before day; n = 0: next session on or after)"""
+        ordinal = self._ordinal(day)
+        if n > 0:
+            i = bisect_right(self.sessions, ordinal) + n - 1
+        elif n < 0:
+            i = bisect_left(self.sessions, ordinal) + n
+        else:
+            i = bisect_left(self.sessions, ordinal)
+        if not 0 <= i < len(self.sessions):
+            raise ValueError(f"Session offset {n} from {_to_date(day)} is outside the calendar range")
+        return date.fromordinal(self.sessions[i])
+
+    def sessions_in_range(self, start: DateLike, end: DateLike) -> List[date]:
+        """All sessions with start <= day <= end"""
+        lo = bisect_left(self.sessions, self._ordinal(start))
+        hi = bisect_right(self.sessions, self._ordinal(end))
+        return [date.fromordinal(o) for o in self.sessions[lo:hi]]
+
+    def holidays_in_range(self, start: DateLike, end: DateLike) -> List[Tuple[date, str]]:
+        """Weekday holidays with start <= day <= end"""
+        lo = bisect_left(self.holiday_days, self._ordinal(start))
+        hi = bisect_right(self.holiday_days, self._ordinal(end))
+        return [(date.fromordinal(o), self.holidays[o]) for o in self.holiday_days[lo:hi]]
+
+    # ------------------------------------------------------------------
+    # Intraday queries
+    # ------------------------------------------------------------------
+
+    def _local(self, moment: Optional[datetime]) -> datetime:
+        if moment is None:
+            return datetime.now(self.tz)
+        if moment.tzinfo is None:
+            moment = moment.astimezone()  # naive datetimes are system local time
+        return moment.astimezone(self.tz)
+
+    def session_times(self, day: DateLike) -> Tuple[datetime, datetime]:
+        """Open and close of a session as tz-aware exchange-local datetimes"""
+        day = _to_date(day)
+        if not self.is_session(day):
+            raise ValueError(f"{day} is not a {self.spec.code} session")
+        close = self.spec.early_close if day.toordinal() in self.early_closes else self.spec.close
+        return (datetime.combine(day, self.spec.open, self.tz),
+                datetime.combine(day, close, self.tz))
+
+    def status(self, moment: Optional[datetime] = None) -> str:
+        """One of 'open', 'lunch', 'pre-open', 'closed', 'holiday', 'weekend'"""
+        local = self._local(moment)
+        day = local.date()
+        if day.weekday() >= SAT:
+            return "weekend"
+        if not self.is_session(day):
+            return "holiday"
+        open_at, close_at = self.session_times(day)
+        if local < open_at:
+            return "pre-open"
+        if local >= close_at:
+            return "closed"
+        if self.spec.lunch and self.spec.lunch[0] <= local.time() < self.spec.lunch[1]:
+            return "lunch"
+        return "open"
+
+    def is_open(self, moment: Optional[datetime] = None) -> bool:
+        """Whether the exchange is in continuous trading at moment (default: now)"""
+        return self.status(moment) == "open"
+
+    def next_open(self, moment: Optional[datetime] = None) -> datetime:
+        """Next session open strictly after moment, in exchange local time"""
+        local = self._local(moment)
+        day = local.date()
+        if self.is_session(day):
+            open_at, _ = self.session_times(day)
+            if local < open_at:
+                return open_at
+        return self.session_times(self.next_session(day, inclusive=False))[0]
+
+    def next_close(self, moment: Optional[datetime] = None) -> datetime:
+        """Close of the current session, or of the next one when closed"""
+        local = self._local(moment)
+        day = local.date()
+        if self.is_session(day):
+            _, close_at = self.session_times(day)
+            if local < close_at:
+                return close_at
+        return self.session_times(self.next_session(day, inclusive=False))[1]
+
+
+@lru_cache(maxsize=None)
+def _build(market: str) -> TradingCalendar:
+    return TradingCalendar(market)
+
+
+def resolve_market(market: str) -> str:
+    """Canonical market code for an exchange code, alias or country code"""
+    code = market.strip().upper()
+    code = ALIASES.get(code, code)
+    if code not in MARKETS:
+        raise ValueError(f"Unknown market: {market} (supported: {', '.join(MARKETS)})")
+    return code
+
+
+def get_calendar(market: str = "NYSE") -> TradingCalendar:
+    """Shared, lazily built calendar for a market (NYSE, LSE, TSE or an alias)"""
+    return _build(resolve_market(market))
+
+
+if __name__ == "__main__":
+    now = datetime.now(timezone.utc)
+    for code in MARKETS:
+        cal = get_calendar(code)
+        upcoming = cal.holidays_in_range(now.date(), now.date() + timedelta(days=90))
+        print(f"{cal.spec.name} ({code}): {cal.status(now)}, next open {cal.next_open(now):%Y-%m-%d %H:%M %Z}")
+        for day, name in upcoming:
+            print(f"  {day}  {name}")
@@ -7,6 +7,16 @@ import time
 import re
 import concurrent.futures
 from datetime import datetime
+from pathlib import Path
+
+# Shared RSS/Atom poller (technews skill): conditional GETs, new-item tracking
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "technews" / "scripts"))
+try:
+    from feed_poller import FeedPoller
+except ImportError:
+    FeedPoller = None
+
+FEEDS_FILE = Path(__file__).parent.parent / "cache" / "feeds.db"
 
 # Headers for scraping to avoid basic bot detection
 HEADERS = {
@@ -258,8 +268,29 @@ def fetch_wallstreetcn(limit=5, keyword=None):
         return filter_items(items, keyword)[:limit]
     except: return []
 
+def fetch_feed_items(url, source, heat):
+    """RSS/Atom items via the feed poller; "new" marks items not seen in earlier runs."""
+    poller = FeedPoller(FEEDS_FILE)
+    try:
+        result = poller.poll(url)
+    finally:
+        poller.close()
+    new_ids = {item['id'] for item in result['new']}
+    return [{
+        "source": source,
+        "title": item['title'],
+        "url": item['link'],
+        "time": item['published'],
+        "heat": heat,
+        "new": item['id'] in new_ids
+    } for item in result['items']]
+
 def fetch_producthunt(limit=5, keyword=None):
     try:
+        if FeedPoller:
+            items = fetch_feed_items("https://www.producthunt.com/feed", "Product Hunt", "Top Product")
+            return filter_items(items, keyword)[:limit]
+
         # Using RSS for speed and reliability without API key
         response = requests.get("https://www.producthunt.com/feed", headers=HEADERS, timeout=10)
         soup = BeautifulSoup(response.text, 'xml')
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+American Options Pricing Engine
+
+Prices American calls and puts with early exercise and discrete cash
+dividends on a Cox-Ross-Rubinstein binomial tree.
+
+Features:
+- Vectorized CRR backward induction (all nodes of a step in one operation)
+- Many strikes priced in a single pass over one cached lattice
+- Discrete dividends via the escrowed-dividend model, plus continuous yield q
+- Same Greeks interface as OptionPricer: delta/gamma/theta read off the tree,
+  vega/rho by central finite differences
+- Configurable tree depth and a convergence benchmark (error vs steps and time)
+
+Usage:
+    from american_pricer import AmericanPricer
+
+    pricer = AmericanPricer(
+        S=180, K=185, T=60/365, r=0.053, sigma=0.25,
+        dividends=[(20/365, 0.24)],   # (time in years, cash amount)
+        steps=500
+    )
+
+    put_price = pricer.put_price()
+    greeks = pricer.get_all_greeks('put')
+
+    # Whole strip of strikes on one lattice
+    AmericanPricer(S=180, K=np.arange(150, 215, 5.0), T=60/365, r=0.053, sigma=0.25).put_price()
+
+Author: Claude Trading Skills
+Version: 1.0
+"""
+
+import argparse
+import time
+from functools import lru_cache
+
+import numpy as np
+import requests
+
+from black_scholes import ChainPricer
+
+
+# =============================================================================
+# Lattice
+# =============================================================================
+
+class _Lattice:
+    """
+    Strike-independent CRR tree parameters
+
+    Node (i, j) holds S* · u^(2j - i) + PV(dividends remaining after step i),
+    where S* is spot less the PV of all dividends before expiry. Storing u^k
+    for k = -N..N lets every layer be sliced out without materializing the
+    full N² tree.
+    """
+
+    def __init__(self, S, T, r, sigma, q, dividends, steps):
+        self.steps = steps
+        self.dt = T / steps
+        self.u = np.exp(sigma * np.sqrt(self.dt))
+        self.disc = np.exp(-r * self.dt)
+        self.p_up = (np.exp((r - q) * self.dt) - 1 / self.u) / (self.u - 1 / self.u)
+
+        if not 0 < self.p_up < 1:
+            raise ValueError("Too few steps for these inputs (risk-neutral probability outside 0-1)")
+
+        step_times = np.arange(steps + 1) * self.dt
+        self.pv_dividends = np.zeros(steps + 1)
+        for pay_time, amount in dividends:
+            if 0 < pay_time <= T:
+                upcoming = step_times < pay_time
+                self.pv_dividends[upcoming] += amount * np.exp(-r * (pay_time - step_times[upcoming]))
+
+        self.escrowed_spot = S - self.pv_dividends[0]
+        if self.escrowed_spot <= 0:
+            raise ValueError("Dividends exceed stock price")
+
+        self.powers = self.u ** np.arange(-steps, steps + 1)
+
+    def spots(self, i):
+        """Stock prices at every node of step i (lowest first)"""
+        n = self.steps
+        return self.escrowed_spot * self.powers[n - i:n + i + 1:2] + self.pv_dividends[i]
+
+
+@lru_cache(maxsize=64)
+def _get_lattice(S, T, r, sigma, q, dividends, steps):
+    """Build or reuse a lattice; dividends must be a tuple of (time, amount) tuples"""
+    return _Lattice(S, T, r, sigma, q, dividends, steps)
+
+
+def _backward_induction(lattice, K, is_call):
+    """
+    Roll option values back through the tree for a vector of strikes
+
+    Returns: (root values, step-1 values, step-2 values), each (n_strikes, nodes)
+    """
+    sign = 1.0 if is_call else -1.0
+    K = K[:, None]
+    n = lattice.steps
+    cont_up = lattice.disc * lattice.p_up
+    cont_down = lattice.disc * (1 - lattice.p_up)
+
+    values = np.maximum(sign * (lattice.spots(n) - K), 0.0)
+    layers = {}
+
+    for i in range(n - 1, -1, -1):
+        continuation = cont_up * values[:, 1:] + cont_down * values[:, :-1]
+        exercise = np.maximum(sign * (lattice.spots(i) - K), 0.0)
+        values = np.maximum(continuation, exercise)
+        if i <= 2:
+            layers[i] = values
+
+    return layers[0], layers.get(1), layers.get(2)
+
+
+# =============================================================================
+# American Option Pricer
+# =============================================================================
+
+class AmericanPricer:
+    """Binomial-tree pricer for American options with discrete dividends"""
+
+    VOL_BUMP = 0.01
+    RATE_BUMP = 0.0001
+
+    def __init__(self, S, K, T, r, sigma, q=0, dividends=None, steps=500):
+        """
+        Initialize pricer with option parameters
+
+        Parameters:
+        -----------
+        S : float
+            Current stock price
+        K : float or array-like
+            Strike price(s); an array prices every strike on one lattice
+        T : float
+            Time to expiration in years
+        r : float
+            Risk-free interest rate (annual)
+        sigma : float
+            Volatility (annual)
+        q : float, optional
+            Continuous dividend yield (annual, default 0)
+        dividends : list of (float, float), optional
+            Discrete cash dividends as (time in years, amount per share)
+        steps : int
+            Tree depth (accuracy vs speed; see benchmark_convergence)
+        """
+        self.S = S
+        self.K = K
+        self.T = T
+        self.r = r
+        self.sigma = sigma
+        self.q = q
+        self.dividends = tuple((float(t), float(d)) for t, d in (dividends or []))
+        self.steps = steps
+
+        # Validate inputs
+        if S <= 0:
+            raise ValueError("Stock price must be positive")
+        if np.any(np.asarray(K) <= 0):
+            raise ValueError("Strike price must be positive")
+        if T <= 0:
+            raise ValueError("Time to expiration must be positive")
+        if sigma <= 0:
+            raise ValueError("Volatility must be positive")
+        if steps < 3:
+            raise ValueError("Need at least 3 tree steps")
+
+        self._strikes = np.atleast_1d(np.asarray(K, dtype=float))
+        self._scalar = np.ndim(K) == 0
+        self._results = {}
+
+    def _solve(self, option_type, sigma=None, r=None):
+        """Backward induction on a cached lattice, memoized per (type, sigma, r)"""
+        sigma = self.sigma if sigma is None else sigma
+        r = self.r if r is None else r
+        key = (option_type, sigma, r)
+        if key not in self._results:
+            lattice = _get_lattice(self.S, self.T, r, sigma, self.q, self.dividends, self.steps)
+            self._results[key] = (lattice, _backward_induction(
+                lattice, self._strikes, option_type == 'call'
+            ))
+        return self._results[key]
+
+    def _out(self, values):
+        """Return a float for scalar K, an array otherwise"""
+        return float(values[0]) if self._scalar else values
+
+    def _price(self, option_type, **bump):
+        _, (root, _, _) = self._solve(option_type, **bump)
+        return root[:, 0]
+
+    def _delta(self, option_type):
+        lattice, (_, step1, _) = self._solve(option_type)
+        s = lattice.spots(1)
+        return (step1[:, 1] - step1[:, 0]) / (s[1] - s[0])
+
+    # =========================================================================
+    # Option Pricing
+    # =========================================================================
+
+    def call_price(self):
+        """Calculate American call option price"""
+        return self._out(self._price('call'))
+
+    def put_price(self):
+        """Calculate American put option price"""
+        return self._out(self._price('put'))
+
+    # =========================================================================
+    # Greeks (finite differences)
+    # =========================================================================
+
+    def call_delta(self):
+        """Call delta from the step-1 nodes"""
+        return self._out(self._delta('call'))
+
+    def put_delta(self):
+        """Put delta from the step-1 nodes"""
+        return self._out(self._delta('put'))
+
+    def gamma(self, option_type='call'):
+        """Gamma from the step-2 nodes (differs for calls and puts under early exercise)"""
+        lattice, (_, _, step2) = self._solve(option_type.lower())
+        s = lattice.spots(2)
+        delta_up = (step2[:, 2] - step2[:, 1]) / (s[2] - s[1])
+        delta_down = (step2[:, 1] - step2[:, 0]) / (s[1] - s[0])
+        return self._out((delta_up - delta_down) / ((s[2] - s[0]) / 2))
+
+    def _theta(self, option_type):
+        lattice, (root, _, step2) = self._solve(option_type)
+        theta_annual = (step2[:, 1] - root[:, 0]) / (2 * lattice.dt)
+        return self._out(theta_annual / 365)  # Convert to per-day
+
+    def call_theta(self):
+        """Call theta per day, from the middle step-2 node"""
+        return self._theta('call')
+
+    def put_theta(self):
+        """Put theta per day, from the middle step-2 node"""
+        return self._theta('put')
+
+    def vega(self, option_type='call'):
+        """Vega per 1% change in volatility (central difference)"""
+        option_type = option_type.lower()
+        h = self.VOL_BUMP
+        up = self._price(option_type, sigma=self.sigma + h)
+        down = self._price(option_type, sigma=max(self.sigma - h, 1e-4))
+        return self._out((up - down) / (self.sigma + h - max(self.sigma - h, 1e-4)) / 100)
+
+    def _rho(self, option_type):
+        h = self.RATE_BUMP
+        up = self._price(option_type, r=self.r + h)
+        down = self._price(option_type, r=self.r - h)
+        return self._out((up - down) / (2 * h) / 100)  # Per 1% change
+
+    def call_rho(self):
+        """Call rho per 1% change in interest rate (central difference)"""
+        return self._rho('call')
+
+    def put_rho(self):
+        """Put rho per 1% change in interest rate (central difference)"""
+        return self._rho('put')
+
+    # =========================================================================
+    # Utility Methods
+    # =========================================================================
+
+    def intrinsic_value(self, option_type='call'):
+        """Calculate intrinsic value"""
+        if option_type.lower() == 'call':
+            return self._out(np.maximum(self.S - self._strikes, 0))
+        return self._out(np.maximum(self._strikes - self.S, 0))
+
+    def early_exercise_premium(self, option_type='call'):
+        """
+        American minus European value
+
+        The European reference uses the escrowed spot so that discrete
+        dividends are treated consistently in both prices.
+        """
+        option_type = option_type.lower()
+        lattice, _ = self._solve(option_type)
+        european = ChainPricer(lattice.escrowed_spot, self._strikes, self.T, self.r,
+                               self.sigma, self.q).price(option_type)
+        return self._out(self._price(option_type) - european)
+
+    def get_all_greeks(self, option_type='call'):
+        """
+        Get all Greeks for an option
+
+        Returns: dict with all Greeks
+        """
+        option_type = option_type.lower()
+        price = self.call_price() if option_type == 'call' else self.put_price()
+        intrinsic = self.intrinsic_value(option_type)
+
+        return {
+            'price': price,
+            'delta': self.call_delta() if option_type == 'call' else self.put_delta(),
+            'gamma': self.gamma(option_type),
+            'theta': self.call_theta() if option_type == 'call' else self.put_theta(),
+            'vega': self.vega(option_type),
+            'rho': self.call_rho() if option_type == 'call' else self.put_rho(),
+            'intrinsic_value': intrinsic,
+            'time_value': price - intrinsic,
+            'early_exercise_premium': self.early_exercise_premium(option_type)
+        }
+
+
+# =============================================================================
+# FMP API Integration
+# =============================================================================
+
+def project_discrete_dividends(symbol, api_key, days_to_expiration):
+    """
+    Project upcoming cash dividends from FMP dividend history
+
+    Assumes the most recent dividend repeats at its historical spacing.
+
+    Returns:
+    --------
+    list
+        (time in years, amount) tuples for ex-dates before expiration
+    """
+    url = f"https://financialmodelingprep.com/api/v3/historical-price-full/stock_dividend/{symbol}"
+    params = {'apikey': api_key}
+
+    try:
+        response = requests.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        history = response.json().get('historical', [])
+    except Exception as e:
+        print(f"Error fetching dividends for {symbol}: {e}")
+        return []
+
+    if len(history) < 2:
+        return []
+
+    dates = [np.datetime64(item['date']) for item in history[:2]]
+    spacing = int((dates[0] - dates[1]) / np.timedelta64(1, 'D'))
+    if spacing <= 0:
+        return []
+
+    amount = history[0].get('adjDividend', history[0].get('dividend', 0))
+    days_since = int((np.datetime64('today') - dates[0]) / np.timedelta64(1, 'D'))
+
+    projected = []
+    next_day = spacing - days_since
+    while next_day <= days_to_expiration:
+        if next_day > 0:
+            projected.append((next_day / 365, amount))
+        next_day += spacing
+    return projected
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def benchmark_convergence(steps_list=(25, 50, 100, 200, 400, 800, 1600),
+                          reference_steps=10000, n_strikes=21):
+    """
+    Price error and time vs tree depth
+
+    Put error is measured against a deep reference tree; call error (no
+    dividends) against the closed-form Black-Scholes price, since an American
+    call without dividends is never exercised early.
+    """
+    S, K, T, r, sigma = 100.0, 100.0, 1.0, 0.05, 0.25
+    strikes = np.linspace(80, 120, n_strikes)
+
+    reference_put = AmericanPricer(S, K, T, r, sigma, steps=reference_steps).put_price()
+    exact_call = float(ChainPricer(S, K, T, r, sigma).price('call'))
+
+    rows = []
+    for steps in steps_list:
+        start = time.perf_counter()
+        put = AmericanPricer(S, K, T, r, sigma, steps=steps).put_price()
+        single_seconds = time.perf_counter() - start
+
+        call = AmericanPricer(S, K, T, r, sigma, steps=steps).call_price()
+
+        start = time.perf_counter()
+        AmericanPricer(S, strikes, T, r, sigma, steps=steps).put_price()
+        strip_seconds = time.perf_counter() - start
+
+        rows.append({
+            'steps': steps,
+            'put_price': put,
+            'put_error': put - reference_put,
+            'call_error': call - exact_call,
+            'single_ms': single_seconds * 1000,
+            'strip_ms': strip_seconds * 1000,
+        })
+
+    return {'reference_put': reference_put, 'exact_call': exact_call,
+            'n_strikes': n_strikes, 'rows': rows}
+
+
+# =============================================================================
+# Example Usage
+# =============================================================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='American option pricer example and benchmark')
+    parser.add_argument('--steps', type=int, default=500, help='Tree depth (default: 500)')
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("AMERICAN OPTIONS PRICER - EXAMPLE")
+    print("="*70)
+
+    dividends = [(20/365, 0.24)]
+    pricer = AmericanPricer(S=180, K=185, T=60/365, r=0.053, sigma=0.25,
+                            dividends=dividends, steps=args.steps)
+
+    print(f"\nInput: S=$180, K=$185, 60 days, IV 25%, r 5.3%, $0.24 dividend in 20 days, "
+          f"{args.steps} steps")
+
+    for option_type in ('call', 'put'):
+        greeks = pricer.get_all_greeks(option_type)
+        print(f"\n{option_type.upper()}")
+        print(f"  Price: ${greeks['price']:.4f} "
+              f"(early exercise premium ${greeks['early_exercise_premium']:.4f})")
+        print(f"  Delta: {greeks['delta']:.4f}  Gamma: {greeks['gamma']:.4f}  "
+              f"Theta: ${greeks['theta']:.4f}/day")
+        print(f"  Vega: ${greeks['vega']:.4f} per 1%  Rho: ${greeks['rho']:.4f} per 1%")
+
+    print(f"\n{'='*70}")
+    print("CONVERGENCE BENCHMARK (S=K=100, T=1y, r=5%, IV=25%)")
+    print("="*70)
+
+    bench = benchmark_convergence()
+    print(f"Reference put (10,000 steps): {bench['reference_put']:.6f}   "
+          f"Black-Scholes call: {bench['exact_call']:.6f}")
+    print(f"\n{'Steps':>7}{'Put':>12}{'Put Err':>12}{'Call Err':>12}{'1 strike':>12}"
+          f"{bench['n_strikes']:>4} strikes")
+    for row in bench['rows']:
+        print(f"{row['steps']:>7}{row['put_price']:>12.6f}{row['put_error']:>12.2e}"
+              f"{row['call_error']:>12.2e}{row['single_ms']:>10.2f}ms{row['strip_ms']:>10.2f}ms")
+    print("\n" + "="*70 + "\n")
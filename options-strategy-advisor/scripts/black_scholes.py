@@ -7,6 +7,7 @@ Calculates theoretical option prices and Greeks using Black-Scholes model.
 Features:
 - European call and put pricing
 - All Greeks (Delta, Gamma, Theta, Vega, Rho)
+- Array-native chain pricing (ChainPricer) for whole chains and surfaces
 - Historical volatility calculation from price data
 - Dividend adjustment support
 
@@ -25,11 +26,18 @@ Usage:
     call_price = pricer.call_price()
     delta = pricer.call_delta()
 
+    # Whole chain at once (arrays broadcast against each other)
+    from black_scholes import ChainPricer
+
+    chain = ChainPricer(S=180, K=strikes, T=expiries, r=0.053, sigma=ivs, q=0.01)
+    greeks = chain.greeks(option_types)   # dict of arrays: price, delta, ...
+
 Author: Claude Trading Skills
 Version: 1.0
 """
 
 import numpy as np
+from scipy.special import ndtr
 from scipy.stats import norm
 import requests
 import os
@@ -251,30 +259,186 @@ class OptionPricer:
         """
         Get all Greeks for an option
 
+        d1/d2 and the normal CDF/PDF are evaluated once and shared by every
+        Greek (see ChainPricer). Any option_type other than 'call' is priced
+        as a put.
+
         Returns: dict with all Greeks
         """
-        if option_type.lower() == 'call':
-            return {
-                'price': self.call_price(),
-                'delta': self.call_delta(),
-                'gamma': self.gamma(),
-                'theta': self.call_theta(),
-                'vega': self.vega(),
-                'rho': self.call_rho(),
-                'intrinsic_value': self.intrinsic_value('call'),
-                'time_value': self.time_value('call')
-            }
-        else:
-            return {
-                'price': self.put_price(),
-                'delta': self.put_delta(),
-                'gamma': self.gamma(),
-                'theta': self.put_theta(),
-                'vega': self.vega(),
-                'rho': self.put_rho(),
-                'intrinsic_value': self.intrinsic_value('put'),
-                'time_value': self.time_value('put')
-            }
+        kind = 'call' if option_type.lower() == 'call' else 'put'
+        greeks = ChainPricer(self.S, self.K, self.T, self.r, self.sigma, self.q).greeks(kind)
+        return {name: float(value) for name, value in greeks.items()}
+
+
+# =============================================================================
+# Vectorized Chain Pricer
+# =============================================================================
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+class ChainPricer:
+    """
+    Array-native Black-Scholes pricer for whole option chains
+
+    Accepts scalars or NumPy arrays for every input; they are broadcast
+    against each other, so a chain (one spot, many strikes/expiries/vols) or a
+    full surface can be priced in one call. d1, d2 and the normal CDF/PDF are
+    computed once and shared by the price and every Greek.
+
+    Greeks use the same units as OptionPricer: vega and rho per 1% change,
+    theta per calendar day.
+    """
+
+    def __init__(self, S, K, T, r, sigma, q=0):
+        """
+        Initialize pricer with option parameters
+
+        Parameters:
+        -----------
+        S, K, T, r, sigma, q : float or array-like
+            Same meaning as OptionPricer; arrays must be broadcast-compatible
+        """
+        S, K, T, r, sigma, q = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (S, K, T, r, sigma, q))
+        )
+        self.S, self.K, self.T, self.r, self.sigma, self.q = S, K, T, r, sigma, q
+
+        # Validate inputs
+        if np.any(S <= 0):
+            raise ValueError("Stock price must be positive")
+        if np.any(K <= 0):
+            raise ValueError("Strike price must be positive")
+        if np.any(T <= 0):
+            raise ValueError("Time to expiration must be positive")
+        if np.any(sigma <= 0):
+            raise ValueError("Volatility must be positive")
+
+        sqrt_t = np.sqrt(T)
+        sigma_sqrt_t = sigma * sqrt_t
+
+        self.d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / sigma_sqrt_t
+        self.d2 = self.d1 - sigma_sqrt_t
+
+        # One pass through the normal CDF for N(d1), N(d2), N(-d1), N(-d2)
+        self._cdf = ndtr(np.stack([self.d1, self.d2, -self.d1, -self.d2]))
+        self._pdf_d1 = _INV_SQRT_2PI * np.exp(-0.5 * self.d1 ** 2)
+
+        self._sqrt_t = sqrt_t
+        self._disc_q = np.exp(-q * T)
+        self._disc_r = np.exp(-r * T)
+
+    @staticmethod
+    def _is_call(option_type, shape):
+        """Boolean call mask from 'call'/'put' (scalar or array)"""
+        kinds = np.char.lower(np.asarray(option_type, dtype=str))
+        if not np.all((kinds == 'call') | (kinds == 'put')):
+            raise ValueError("option_type must be 'call' or 'put'")
+        return np.broadcast_to(kinds == 'call', shape)
+
+    def price(self, option_type='call'):
+        """Option prices as an array"""
+        return self.greeks(option_type)['price']
+
+    def greeks(self, option_type='call'):
+        """
+        Prices and all Greeks as columnar arrays
+
+        Parameters:
+        -----------
+        option_type : str or array-like of str
+            'call' or 'put', per contract or for the whole chain
+
+        Returns: dict of arrays (price, delta, gamma, theta, vega, rho,
+        intrinsic_value, time_value)
+        """
+        is_call = self._is_call(option_type, self.d1.shape)
+        cdf_d1, cdf_d2, cdf_neg_d1, cdf_neg_d2 = self._cdf
+
+        S, K, T, r, q = self.S, self.K, self.T, self.r, self.q
+        s_disc = S * self._disc_q
+        k_disc = K * self._disc_r
+
+        call_price = s_disc * cdf_d1 - k_disc * cdf_d2
+        put_price = k_disc * cdf_neg_d2 - s_disc * cdf_neg_d1
+        price = np.maximum(np.where(is_call, call_price, put_price), 0)
+
+        delta = np.where(is_call, self._disc_q * cdf_d1, self._disc_q * (cdf_d1 - 1))
+        gamma = self._disc_q * self._pdf_d1 / (S * self.sigma * self._sqrt_t)
+        vega = s_disc * self._pdf_d1 * self._sqrt_t / 100
+
+        decay = -s_disc * self._pdf_d1 * self.sigma / (2 * self._sqrt_t)
+        call_theta = decay - r * k_disc * cdf_d2 + q * s_disc * cdf_d1
+        put_theta = decay + r * k_disc * cdf_neg_d2 - q * s_disc * cdf_neg_d1
+        theta = np.where(is_call, call_theta, put_theta) / 365
+
+        rho = np.where(is_call, k_disc * T * cdf_d2, -k_disc * T * cdf_neg_d2) / 100
+
+        intrinsic = np.where(is_call, np.maximum(S - K, 0), np.maximum(K - S, 0))
+
+        return {
+            'price': price,
+            'delta': delta,
+            'gamma': gamma,
+            'theta': theta,
+            'vega': vega,
+            'rho': rho,
+            'intrinsic_value': intrinsic,
+            'time_value': price - intrinsic
+        }
+
+
+def _scalar_greeks(pricer, option_type):
+    """Per-Greek scalar path (each method recomputes d1/d2), kept as the benchmark baseline"""
+    if option_type == 'call':
+        price, delta, theta, rho = pricer.call_price(), pricer.call_delta(), pricer.call_theta(), pricer.call_rho()
+    else:
+        price, delta, theta, rho = pricer.put_price(), pricer.put_delta(), pricer.put_theta(), pricer.put_rho()
+    return {
+        'price': price,
+        'delta': delta,
+        'gamma': pricer.gamma(),
+        'theta': theta,
+        'vega': pricer.vega(),
+        'rho': rho,
+        'intrinsic_value': pricer.intrinsic_value(option_type),
+        'time_value': pricer.time_value(option_type)
+    }
+
+
+def benchmark_chain_pricing(n_contracts=2000, repeats=20):
+    """
+    Time ChainPricer against a per-contract loop over the scalar OptionPricer
+    methods (one call per Greek)
+
+    Returns: dict with seconds per chain and microseconds per contract
+    """
+    import time
+
+    rng = np.random.default_rng(0)
+    strikes = rng.uniform(100, 260, n_contracts)
+    expiries = rng.uniform(7, 720, n_contracts) / 365
+    vols = rng.uniform(0.15, 0.60, n_contracts)
+    types = np.where(rng.random(n_contracts) < 0.5, 'call', 'put')
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        ChainPricer(180, strikes, expiries, 0.053, vols, 0.01).greeks(types)
+    vector_seconds = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for K, T, sigma, kind in zip(strikes, expiries, vols, types):
+        _scalar_greeks(OptionPricer(180, K, T, 0.053, sigma, 0.01), kind)
+    loop_seconds = time.perf_counter() - start
+
+    return {
+        'contracts': n_contracts,
+        'vector_seconds': vector_seconds,
+        'vector_us_per_contract': vector_seconds / n_contracts * 1e6,
+        'loop_seconds': loop_seconds,
+        'loop_us_per_contract': loop_seconds / n_contracts * 1e6,
+        'speedup': loop_seconds / vector_seconds
+    }
 
 
 # =============================================================================
@@ -473,6 +637,17 @@ if __name__ == '__main__':
     print(f"Moneyness: {pricer.moneyness()}")
     print("="*70 + "\n")
 
+    # Chain Pricing Example
+    print("\nChain Pricing Benchmark (2,000 contracts):")
+    print("-" * 70)
+
+    bench = benchmark_chain_pricing(2000)
+    print(f"ChainPricer:        {bench['vector_seconds']*1000:.2f} ms per chain "
+          f"({bench['vector_us_per_contract']:.2f} µs/contract)")
+    print(f"OptionPricer loop:  {bench['loop_seconds']*1000:.2f} ms per chain "
+          f"({bench['loop_us_per_contract']:.2f} µs/contract)")
+    print(f"Speedup: {bench['speedup']:.0f}x")
+
     # Historical Volatility Example
     print("\nHistorical Volatility Example:")
     print("-" * 70)
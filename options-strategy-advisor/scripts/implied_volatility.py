@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Implied Volatility Solver and Volatility Surface
+
+Inverts Black-Scholes prices back to volatility for whole option chains and
+fits an interpolated IV surface over strike and expiry.
+
+Features:
+- Vectorized IV solver: safeguarded Newton iterations using vega, falling back
+  to bisection inside a per-contract bracket when a Newton step leaves it
+- Corrado-Miller initial guesses (most contracts converge in under 5 passes)
+- Arbitrage-bound checks (prices outside [intrinsic, upper bound] return NaN)
+- VolSurface: total-variance grid over log-moneyness × expiry with cheap
+  vectorized bilinear queries, usable directly as a ChainPricer source
+- Convergence and throughput benchmarks on synthetic chains
+
+Usage:
+    from implied_volatility import implied_volatility, VolSurface
+
+    ivs = implied_volatility(market_prices, S=180, K=strikes, T=expiries,
+                             r=0.053, q=0.01, option_type=types)
+
+    surface = VolSurface(S=180, strikes=strikes, expiries=expiries, ivs=ivs)
+    sigma = surface.implied_vol(K=187.5, T=45/365)
+    pricer = surface.pricer(K=new_strikes, T=new_expiries, r=0.053, q=0.01)
+
+    # Benchmarks
+    python implied_volatility.py --contracts 10000
+
+Author: Claude Trading Skills
+Version: 1.0
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from black_scholes import ChainPricer
+
+
+# =============================================================================
+# Implied Volatility Solver
+# =============================================================================
+
+def _initial_guess(price, s_disc, k_disc, T, is_call):
+    """
+    Corrado-Miller approximation, applied to the call price via put-call parity
+
+    Falls back to Brenner-Subrahmanyam where the discriminant goes negative.
+    """
+    call_price = np.where(is_call, price, price + s_disc - k_disc)
+    half_gap = (s_disc - k_disc) / 2
+    adjusted = call_price - half_gap
+    discriminant = np.maximum(adjusted ** 2 - (s_disc - k_disc) ** 2 / np.pi, 0.0)
+
+    guess = np.sqrt(2 * np.pi / T) / (s_disc + k_disc) * (adjusted + np.sqrt(discriminant))
+    brenner = np.sqrt(2 * np.pi / T) * call_price / s_disc
+    guess = np.where(guess > 0, guess, brenner)
+
+    return np.clip(np.nan_to_num(guess, nan=0.3), 0.01, 3.0)
+
+
+def implied_volatility(price, S, K, T, r, q=0, option_type='call', tol=1e-8,
+                       max_iter=50, sigma_bounds=(1e-4, 5.0), return_info=False):
+    """
+    Solve for implied volatility across a whole chain at once
+
+    Each contract keeps a [low, high] volatility bracket that tightens after
+    every pricing pass. Newton steps (price error / vega) are taken when they
+    land inside the bracket; otherwise the contract bisects, so deep ITM/OTM
+    contracts with vanishing vega still converge.
+
+    Parameters:
+    -----------
+    price : float or array-like
+        Observed option prices
+    S, K, T, r, q : float or array-like
+        Same meaning as OptionPricer; broadcast against price
+    option_type : str or array-like of str
+        'call' or 'put'
+    tol : float
+        Absolute price tolerance for convergence
+    max_iter : int
+        Maximum pricing passes
+    sigma_bounds : tuple
+        Initial (low, high) volatility bracket
+    return_info : bool
+        Also return a dict with per-contract iterations and converged flags
+
+    Returns:
+    --------
+    array
+        Implied volatilities (NaN where price violates arbitrage bounds)
+    """
+    *inputs, kinds = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (price, S, K, T, r, q)),
+        np.asarray(option_type, dtype=str)
+    )
+    shape = kinds.shape
+    price, S, K, T, r, q = (a.ravel().copy() for a in inputs)
+    is_call = ChainPricer._is_call(kinds, shape).ravel()
+    types = np.where(is_call, 'call', 'put')
+    n = price.size
+
+    s_disc = S * np.exp(-q * T)
+    k_disc = K * np.exp(-r * T)
+
+    # No-arbitrage bounds: time value must be positive and below the max payoff
+    lower = np.where(is_call, np.maximum(s_disc - k_disc, 0), np.maximum(k_disc - s_disc, 0))
+    upper = np.where(is_call, s_disc, k_disc)
+    valid = (T > 0) & (S > 0) & (K > 0) & (price > lower) & (price < upper)
+
+    sigma = np.full(n, np.nan)
+    sigma[valid] = _initial_guess(price[valid], s_disc[valid], k_disc[valid],
+                                  T[valid], is_call[valid])
+    low = np.full(n, sigma_bounds[0])
+    high = np.full(n, sigma_bounds[1])
+    iterations = np.zeros(n, dtype=np.int64)
+    converged = np.zeros(n, dtype=bool)
+    active = valid.copy()
+
+    for _ in range(max_iter):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+
+        greeks = ChainPricer(S[idx], K[idx], T[idx], r[idx], sigma[idx], q[idx]).greeks(types[idx])
+        error = greeks['price'] - price[idx]
+        vega = greeks['vega'] * 100  # Back to per-unit volatility
+        iterations[idx] += 1
+
+        done = np.abs(error) < tol
+        converged[idx[done]] = True
+
+        # Tighten the bracket: overpriced means sigma is too high
+        too_high = error > 0
+        high[idx] = np.where(too_high, sigma[idx], high[idx])
+        low[idx] = np.where(too_high, low[idx], sigma[idx])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = sigma[idx] - error / vega
+        inside = (newton > low[idx]) & (newton < high[idx])
+        step = np.where(inside, newton, 0.5 * (low[idx] + high[idx]))
+
+        sigma[idx] = np.where(done, sigma[idx], step)
+        collapsed = (high[idx] - low[idx]) < 1e-12
+        converged[idx[collapsed]] = True
+        active[idx] = ~(done | collapsed)
+
+    sigma = sigma.reshape(shape)
+    if return_info:
+        return sigma, {
+            'iterations': iterations.reshape(shape),
+            'converged': converged.reshape(shape),
+            'valid': valid.reshape(shape)
+        }
+    return sigma
+
+
+# =============================================================================
+# Volatility Surface
+# =============================================================================
+
+class VolSurface:
+    """
+    Interpolated implied volatility surface over strike and expiry
+
+    Total variance (sigma^2 * T) is gridded over log-moneyness ln(K/S) for each
+    listed expiry, then queried with bilinear interpolation: linear in
+    moneyness within a slice and linear in total variance across expiries.
+    Outside the fitted range the surface extrapolates flat in volatility.
+    """
+
+    def __init__(self, S, strikes, expiries, ivs, n_moneyness=41):
+        """
+        Fit the surface from solved implied volatilities
+
+        Parameters:
+        -----------
+        S : float
+            Spot price the IVs were solved against
+        strikes, expiries, ivs : array-like
+            One entry per contract; NaN IVs are ignored
+        n_moneyness : int
+            Grid points along log-moneyness
+        """
+        strikes, expiries, ivs = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float).ravel() for x in (strikes, expiries, ivs))
+        )
+        keep = np.isfinite(ivs) & (ivs > 0) & (expiries > 0)
+        if not keep.any():
+            raise ValueError("No valid implied volatilities to fit")
+
+        self.S = float(S)
+        moneyness = np.log(strikes[keep] / self.S)
+        expiries, ivs = expiries[keep], ivs[keep]
+        total_variance = ivs ** 2 * expiries
+
+        self.expiry_grid = np.unique(expiries)
+        self.moneyness_grid = np.linspace(moneyness.min(), moneyness.max(), n_moneyness)
+
+        grid = np.empty((self.expiry_grid.size, n_moneyness))
+        for j, expiry in enumerate(self.expiry_grid):
+            in_slice = expiries == expiry
+            order = np.argsort(moneyness[in_slice])
+            grid[j] = np.interp(self.moneyness_grid,
+                                moneyness[in_slice][order],
+                                total_variance[in_slice][order])
+
+        # Total variance must not fall with expiry (calendar arbitrage)
+        self.total_variance = np.maximum.accumulate(grid, axis=0)
+
+    @classmethod
+    def from_prices(cls, price, S, K, T, r, q=0, option_type='call', **kwargs):
+        """Solve IVs for a chain of market prices and fit the surface"""
+        ivs = implied_volatility(price, S, K, T, r, q, option_type)
+        return cls(S, K, T, ivs, **kwargs)
+
+    def implied_vol(self, K, T, S=None):
+        """
+        Query implied volatility at arbitrary strikes/expiries
+
+        Parameters:
+        -----------
+        K, T : float or array-like
+            Strikes and expiries (years), broadcast against each other
+        S : float, optional
+            Spot for moneyness (defaults to the fitting spot, i.e. sticky-moneyness
+            when a new spot is passed)
+
+        Returns:
+        --------
+        array
+            Implied volatilities
+        """
+        K, T = np.broadcast_arrays(np.asarray(K, dtype=float), np.asarray(T, dtype=float))
+        spot = self.S if S is None else S
+        k_grid, t_grid, w = self.moneyness_grid, self.expiry_grid, self.total_variance
+
+        # Moneyness axis: fractional index on the uniform grid
+        k = np.clip(np.log(K / spot), k_grid[0], k_grid[-1])
+        if k_grid.size > 1:
+            pos = (k - k_grid[0]) / (k_grid[1] - k_grid[0])
+            i0 = np.clip(np.floor(pos).astype(int), 0, k_grid.size - 2)
+            fk = pos - i0
+        else:
+            i0 = np.zeros(k.shape, dtype=int)
+            fk = np.zeros(k.shape)
+        i1 = np.minimum(i0 + 1, k_grid.size - 1)
+
+        # Expiry axis: bracketing listed expiries
+        t = np.clip(T, t_grid[0], t_grid[-1])
+        if t_grid.size > 1:
+            j1 = np.clip(np.searchsorted(t_grid, t), 1, t_grid.size - 1)
+            j0 = j1 - 1
+            ft = (t - t_grid[j0]) / (t_grid[j1] - t_grid[j0])
+        else:
+            j0 = j1 = np.zeros(t.shape, dtype=int)
+            ft = np.zeros(t.shape)
+
+        w0 = w[j0, i0] * (1 - fk) + w[j0, i1] * fk
+        w1 = w[j1, i0] * (1 - fk) + w[j1, i1] * fk
+        variance = w0 * (1 - ft) + w1 * ft
+
+        return np.sqrt(variance / t)
+
+    def pricer(self, K, T, r, q=0, S=None):
+        """ChainPricer with volatilities read off the surface"""
+        spot = self.S if S is None else S
+        return ChainPricer(spot, K, T, r, self.implied_vol(K, T, spot), q)
+
+
+# =============================================================================
+# Benchmarks
+# =============================================================================
+
+def generate_synthetic_chain(n_contracts=10000, S=180.0, r=0.053, q=0.01, seed=0):
+    """
+    Synthetic chain priced with ChainPricer under a smile/term-structure
+
+    Returns: dict of arrays (K, T, sigma, option_type, price)
+    """
+    rng = np.random.default_rng(seed)
+    expiry_days = np.array([7, 14, 30, 60, 90, 180, 365, 730])
+    T = rng.choice(expiry_days, n_contracts) / 365
+    K = S * np.exp(rng.uniform(-0.5, 0.5, n_contracts) * np.sqrt(np.maximum(T, 0.1)))
+    moneyness = np.log(K / S)
+    sigma = 0.22 - 0.10 * moneyness + 0.35 * moneyness ** 2 + 0.03 * np.sqrt(T)
+    option_type = np.where(moneyness >= 0, 'call', 'put')
+
+    price = ChainPricer(S, K, T, r, sigma, q).price(option_type)
+
+    return {'S': S, 'r': r, 'q': q, 'K': K, 'T': T, 'sigma': sigma,
+            'option_type': option_type, 'price': price}
+
+
+def benchmark_iv_solver(n_contracts=10000, tol=1e-8, repeats=5):
+    """Convergence and throughput of the IV solver on a synthetic chain"""
+    chain = generate_synthetic_chain(n_contracts)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        ivs, info = implied_volatility(
+            chain['price'], chain['S'], chain['K'], chain['T'], chain['r'],
+            chain['q'], chain['option_type'], tol=tol, return_info=True
+        )
+    seconds = (time.perf_counter() - start) / repeats
+
+    solvable = info['valid']
+    error = np.abs(ivs - chain['sigma'])[solvable]
+    iterations = info['iterations'][solvable]
+
+    return {
+        'contracts': n_contracts,
+        'solvable': int(solvable.sum()),
+        'converged_pct': float(info['converged'][solvable].mean() * 100),
+        'mean_iterations': float(iterations.mean()),
+        'max_iterations': int(iterations.max()),
+        'max_abs_vol_error': float(np.nanmax(error)),
+        'median_abs_vol_error': float(np.nanmedian(error)),
+        'seconds': seconds,
+        'contracts_per_second': n_contracts / seconds
+    }
+
+
+def benchmark_surface(n_contracts=10000, n_queries=100000):
+    """Fit time, query throughput and in-sample error of VolSurface"""
+    chain = generate_synthetic_chain(n_contracts)
+
+    start = time.perf_counter()
+    surface = VolSurface(chain['S'], chain['K'], chain['T'], chain['sigma'], n_moneyness=81)
+    fit_seconds = time.perf_counter() - start
+
+    rng = np.random.default_rng(1)
+    query_K = rng.uniform(chain['K'].min(), chain['K'].max(), n_queries)
+    query_T = rng.uniform(7, 730, n_queries) / 365
+
+    start = time.perf_counter()
+    surface.implied_vol(query_K, query_T)
+    query_seconds = time.perf_counter() - start
+
+    fitted = surface.implied_vol(chain['K'], chain['T'])
+
+    return {
+        'fit_seconds': fit_seconds,
+        'queries': n_queries,
+        'query_seconds': query_seconds,
+        'queries_per_second': n_queries / query_seconds,
+        'max_abs_fit_error': float(np.max(np.abs(fitted - chain['sigma']))),
+        'mean_abs_fit_error': float(np.mean(np.abs(fitted - chain['sigma'])))
+    }
+
+
+# =============================================================================
+# Example Usage
+# =============================================================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Implied volatility solver benchmarks')
+    parser.add_argument('--contracts', type=int, default=10000,
+                        help='Synthetic chain size (default: 10000)')
+    parser.add_argument('--tol', type=float, default=1e-8,
+                        help='Price tolerance for convergence (default: 1e-8)')
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("IMPLIED VOLATILITY SOLVER - EXAMPLE")
+    print("="*70)
+
+    # Round-trip a single contract through the pricer and back
+    market_price = ChainPricer(180, 185, 30/365, 0.053, 0.27, 0.01).price('call')
+    iv = implied_volatility(market_price, 180, 185, 30/365, 0.053, 0.01, 'call')
+    print(f"\nCall @ $185, 30 days, market price ${float(market_price):.4f}")
+    print(f"  Implied Volatility: {float(iv)*100:.4f}% (true 27.0000%)")
+
+    print(f"\n{'='*70}")
+    print(f"SOLVER BENCHMARK ({args.contracts:,} contracts)")
+    print("="*70)
+    solver = benchmark_iv_solver(args.contracts, args.tol)
+    print(f"  Solvable (within arbitrage bounds): {solver['solvable']:,}")
+    print(f"  Converged: {solver['converged_pct']:.2f}%")
+    print(f"  Iterations: mean {solver['mean_iterations']:.2f}, max {solver['max_iterations']}")
+    print(f"  Vol error: median {solver['median_abs_vol_error']:.2e}, max {solver['max_abs_vol_error']:.2e}")
+    print(f"  Time: {solver['seconds']*1000:.1f} ms ({solver['contracts_per_second']:,.0f} contracts/sec)")
+
+    print(f"\n{'='*70}")
+    print("SURFACE BENCHMARK")
+    print("="*70)
+    surf = benchmark_surface(args.contracts)
+    print(f"  Fit: {surf['fit_seconds']*1000:.1f} ms")
+    print(f"  Query: {surf['queries']:,} points in {surf['query_seconds']*1000:.1f} ms "
+          f"({surf['queries_per_second']:,.0f} queries/sec)")
+    print(f"  In-sample vol error: mean {surf['mean_abs_fit_error']:.2e}, max {surf['max_abs_fit_error']:.2e}")
+    print("\n" + "="*70 + "\n")
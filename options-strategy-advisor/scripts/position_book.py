@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Option Position Book - Greeks-Aware Risk Aggregation
+
+Loads a book of option and stock positions across many underlyings, reprices
+every leg with the vectorized ChainPricer, and aggregates net Greeks by
+underlying and in total, including beta-weighted delta in SPY shares.
+
+Legs are held as columnar arrays with an integer code per underlying, so
+aggregation is a set of np.bincount reductions. When quotes update, only the
+rows whose underlying moved are repriced.
+
+Positions file (CSV or JSON list with the same fields):
+    symbol,type,strike,expiration,quantity,iv
+    AAPL,call,185,2025-12-19,10,0.27
+    AAPL,put,170,2025-12-19,-5,0.30
+    MSFT,stock,,,200,
+
+    quantity: signed contracts for options (negative = short), shares for stock
+    iv: implied volatility as a decimal (default: --default-iv)
+
+Usage:
+    python position_book.py --positions positions.csv
+    python position_book.py --positions positions.csv --watch 5
+    python position_book.py --benchmark 5000
+
+Author: Claude Trading Skills
+Version: 1.0
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import date, datetime
+
+import numpy as np
+import requests
+
+from black_scholes import ChainPricer
+
+
+CONTRACT_MULTIPLIER = 100
+GREEKS = ('delta', 'gamma', 'theta', 'vega', 'rho')
+
+
+# =============================================================================
+# Position Book
+# =============================================================================
+
+class PositionBook:
+    """Columnar option book with incremental repricing and group-by risk"""
+
+    def __init__(self, positions, spots, betas=None, r=0.053, default_iv=0.30,
+                 benchmark_symbol='SPY', as_of=None):
+        """
+        Initialize book
+
+        Parameters:
+        -----------
+        positions : list of dict
+            Rows with symbol, type, strike, expiration, quantity, iv
+        spots : dict
+            Current price per symbol; must include benchmark_symbol for
+            beta-weighted delta
+        betas : dict, optional
+            Beta to the benchmark per symbol (default 1.0)
+        r : float
+            Risk-free rate
+        default_iv : float
+            IV for rows without one
+        benchmark_symbol : str
+            Symbol that beta-weighted delta is expressed in
+        as_of : date, optional
+            Valuation date (default: today)
+        """
+        if not positions:
+            raise ValueError("Position book is empty")
+
+        self.r = r
+        self.benchmark_symbol = benchmark_symbol
+        self.as_of = as_of or date.today()
+
+        self.symbols = sorted({p['symbol'].upper() for p in positions})
+        code_of = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        self.codes = np.array([code_of[p['symbol'].upper()] for p in positions])
+        self.is_stock = np.array([p['type'].lower() == 'stock' for p in positions])
+        self.types = np.array(['call' if s else p['type'].lower()
+                               for s, p in zip(self.is_stock, positions)])
+        self.strikes = np.array([float(p.get('strike') or 1.0) for p in positions])
+        self.expirations = [p.get('expiration') or None for p in positions]
+        self.ivs = np.array([float(p.get('iv') or default_iv) for p in positions])
+        quantity = np.array([float(p['quantity']) for p in positions])
+        self.units = np.where(self.is_stock, quantity, quantity * CONTRACT_MULTIPLIER)
+
+        self.spot_by_code = np.array([float(spots[s]) for s in self.symbols])
+        self.beta_by_code = np.array([float((betas or {}).get(s, 1.0)) for s in self.symbols])
+        self.benchmark_price = float(spots.get(benchmark_symbol, np.nan))
+
+        # Per-row unit Greeks (per share), filled by reprice()
+        self.row_greeks = {name: np.zeros(len(positions)) for name in ('price',) + GREEKS}
+        self._set_expiry_times()
+        self.reprice()
+
+    def _set_expiry_times(self):
+        """
+        Years to expiration per row; options past expiration are flagged and
+        valued at intrinsic, same-day expiries are priced with a half-day floor
+        """
+        days = np.array([
+            (datetime.strptime(e, '%Y-%m-%d').date() - self.as_of).days if e else 0
+            for e in self.expirations
+        ], dtype=float)
+        self.expired = ~self.is_stock & (days < 0)
+        self.T = np.maximum(days, 0.5) / 365
+
+    # =========================================================================
+    # Repricing
+    # =========================================================================
+
+    def reprice(self, rows=None):
+        """
+        Recompute per-share price and Greeks for the given rows (default: all)
+
+        Stock rows carry delta 1 and no other Greeks.
+        """
+        rows = np.arange(self.codes.size) if rows is None else rows
+        options = rows[~self.is_stock[rows]]
+        stocks = rows[self.is_stock[rows]]
+
+        if options.size:
+            spot = self.spot_by_code[self.codes[options]]
+            greeks = ChainPricer(spot, self.strikes[options], self.T[options],
+                                 self.r, self.ivs[options]).greeks(self.types[options])
+            expired = self.expired[options]
+            if expired.any():
+                intrinsic = greeks['intrinsic_value']
+                greeks['price'] = np.where(expired, intrinsic, greeks['price'])
+                for name in GREEKS:
+                    greeks[name] = np.where(expired, 0.0, greeks[name])
+            for name in self.row_greeks:
+                self.row_greeks[name][options] = greeks[name]
+
+        if stocks.size:
+            self.row_greeks['price'][stocks] = self.spot_by_code[self.codes[stocks]]
+            self.row_greeks['delta'][stocks] = 1.0
+            for name in GREEKS[1:]:
+                self.row_greeks[name][stocks] = 0.0
+
+    def set_as_of(self, as_of):
+        """
+        Move the valuation date and reprice every leg if it changed
+
+        Returns: True if the date changed
+        """
+        if as_of == self.as_of:
+            return False
+        self.as_of = as_of
+        self._set_expiry_times()
+        self.reprice()
+        return True
+
+    def update_spots(self, spots):
+        """
+        Apply new quotes and reprice only legs whose underlying moved
+
+        Returns: number of rows repriced
+        """
+        if self.benchmark_symbol in spots:
+            self.benchmark_price = float(spots[self.benchmark_symbol])
+
+        new_spots = self.spot_by_code.copy()
+        for i, symbol in enumerate(self.symbols):
+            if symbol in spots:
+                new_spots[i] = float(spots[symbol])
+
+        moved = new_spots != self.spot_by_code
+        if not moved.any():
+            return 0
+
+        self.spot_by_code = new_spots
+        rows = np.flatnonzero(moved[self.codes])
+        self.reprice(rows)
+        return rows.size
+
+    # =========================================================================
+    # Aggregation
+    # =========================================================================
+
+    def risk_by_underlying(self):
+        """
+        Net position Greeks per underlying via bincount reductions
+
+        Returns: dict of arrays aligned with self.symbols. Delta is in shares,
+        dollar_delta in $, gamma in shares per $1, theta in $/day, vega/rho in
+        $ per 1%, beta_delta in benchmark shares, market_value in $.
+        """
+        n = len(self.symbols)
+
+        def group_sum(values):
+            return np.bincount(self.codes, weights=values * self.units, minlength=n)
+
+        risk = {name: group_sum(self.row_greeks[name]) for name in GREEKS}
+        risk['market_value'] = group_sum(self.row_greeks['price'])
+        risk['dollar_delta'] = risk['delta'] * self.spot_by_code
+        risk['beta_delta'] = risk['dollar_delta'] * self.beta_by_code / self.benchmark_price
+        return risk
+
+    def total_risk(self, risk=None):
+        """Book-level totals of every aggregated measure"""
+        risk = risk or self.risk_by_underlying()
+        return {name: float(values.sum()) for name, values in risk.items()}
+
+
+# =============================================================================
+# Loading & FMP API
+# =============================================================================
+
+def load_positions(path):
+    """Load positions from CSV or JSON"""
+    with open(path, 'r') as f:
+        if path.lower().endswith('.json'):
+            return json.load(f)
+        return [row for row in csv.DictReader(f) if row.get('symbol')]
+
+
+def fetch_quotes(symbols, api_key, batch_size=200):
+    """Fetch latest prices for many symbols with batched FMP quote requests"""
+    quotes = {}
+    symbols = list(symbols)
+    for i in range(0, len(symbols), batch_size):
+        batch = ','.join(symbols[i:i + batch_size])
+        url = f"https://financialmodelingprep.com/api/v3/quote/{batch}"
+        try:
+            response = requests.get(url, params={'apikey': api_key}, timeout=30)
+            response.raise_for_status()
+            for item in response.json():
+                if item.get('price'):
+                    quotes[item['symbol']] = item['price']
+        except Exception as e:
+            print(f"Error fetching quotes: {e}")
+    return quotes
+
+
+def fetch_betas(symbols, api_key, batch_size=200):
+    """Fetch beta for many symbols from batched FMP profile requests"""
+    betas = {}
+    symbols = list(symbols)
+    for i in range(0, len(symbols), batch_size):
+        batch = ','.join(symbols[i:i + batch_size])
+        url = f"https://financialmodelingprep.com/api/v3/profile/{batch}"
+        try:
+            response = requests.get(url, params={'apikey': api_key}, timeout=30)
+            response.raise_for_status()
+            for item in response.json():
+                if item.get('beta') is not None:
+                    betas[item['symbol']] = item['beta']
+        except Exception as e:
+            print(f"Error fetching betas: {e}")
+    return betas
+
+
+# =============================================================================
+# Reporting
+# =============================================================================
+
+def print_risk_report(book):
+    """Print per-underlying and total Greeks"""
+    risk = book.risk_by_underlying()
+    total = book.total_risk(risk)
+
+    print("\n" + "=" * 104)
+    print(f"POSITION BOOK RISK  ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')}, "
+          f"{book.codes.size} legs, {len(book.symbols)} underlyings)")
+    print("=" * 104)
+    print(f"{'Symbol':<8}{'Spot':>10}{'Delta':>11}{'$Delta':>14}{'SPY Δ':>10}"
+          f"{'Gamma':>10}{'Theta/d':>11}{'Vega/1%':>11}{'Mkt Value':>16}")
+    print("-" * 104)
+
+    order = np.argsort(-np.abs(risk['dollar_delta']))
+    for i in order:
+        print(f"{book.symbols[i]:<8}{book.spot_by_code[i]:>10.2f}{risk['delta'][i]:>11.1f}"
+              f"{risk['dollar_delta'][i]:>14,.0f}{risk['beta_delta'][i]:>10.1f}"
+              f"{risk['gamma'][i]:>10.2f}{risk['theta'][i]:>11,.0f}{risk['vega'][i]:>11,.0f}"
+              f"{risk['market_value'][i]:>16,.0f}")
+
+    print("-" * 104)
+    print(f"{'TOTAL':<8}{'':>10}{'':>11}{total['dollar_delta']:>14,.0f}{total['beta_delta']:>10.1f}"
+          f"{total['gamma']:>10.2f}{total['theta']:>11,.0f}{total['vega']:>11,.0f}"
+          f"{total['market_value']:>16,.0f}")
+    print("=" * 104)
+    print(f"Beta-weighted delta is in {book.benchmark_symbol} shares "
+          f"(@ ${book.benchmark_price:.2f}).\n")
+
+
+def benchmark_book(n_legs=5000, n_underlyings=100, moved_fraction=0.1, seed=0):
+    """Time a full reprice vs an incremental update on a synthetic book"""
+    rng = np.random.default_rng(seed)
+    symbols = [f"SYM{i:03d}" for i in range(n_underlyings)]
+    spots = {s: float(rng.uniform(20, 500)) for s in symbols}
+    spots['SPY'] = 500.0
+
+    positions = []
+    for _ in range(n_legs):
+        symbol = symbols[rng.integers(n_underlyings)]
+        expiry = date.fromordinal(date.today().toordinal() + int(rng.integers(7, 365)))
+        positions.append({
+            'symbol': symbol,
+            'type': 'call' if rng.random() < 0.5 else 'put',
+            'strike': round(spots[symbol] * rng.uniform(0.8, 1.2), 1),
+            'expiration': expiry.isoformat(),
+            'quantity': int(rng.integers(-20, 21)) or 1,
+            'iv': float(rng.uniform(0.15, 0.8)),
+        })
+
+    book = PositionBook(positions, spots)
+
+    start = time.perf_counter()
+    book.reprice()
+    book.risk_by_underlying()
+    full_seconds = time.perf_counter() - start
+
+    moved = rng.choice(symbols, max(int(n_underlyings * moved_fraction), 1), replace=False)
+    start = time.perf_counter()
+    rows = book.update_spots({s: spots[s] * 1.01 for s in moved})
+    book.risk_by_underlying()
+    incremental_seconds = time.perf_counter() - start
+
+    return {'legs': n_legs, 'full_ms': full_seconds * 1000,
+            'incremental_rows': rows, 'incremental_ms': incremental_seconds * 1000}
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Aggregate Greeks across an option position book',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python position_book.py --positions positions.csv
+  python position_book.py --positions positions.csv --watch 5
+  python position_book.py --benchmark 5000
+        """
+    )
+    parser.add_argument('--positions', type=str, help='Positions CSV or JSON file')
+    parser.add_argument('--rate', type=float, default=5.3, help='Risk-free rate in percent (default: 5.3)')
+    parser.add_argument('--default-iv', type=float, default=30.0,
+                        help='IV in percent for rows without one (default: 30)')
+    parser.add_argument('--benchmark-symbol', type=str, default='SPY',
+                        help='Symbol for beta-weighted delta (default: SPY)')
+    parser.add_argument('--watch', type=float,
+                        help='Refresh quotes and re-risk every N seconds')
+    parser.add_argument('--benchmark', type=int, metavar='LEGS',
+                        help='Time full vs incremental repricing on a synthetic book')
+    parser.add_argument('--api-key', type=str, help='FMP API key (or set FMP_API_KEY env variable)')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        result = benchmark_book(args.benchmark)
+        print(f"\nSynthetic book: {result['legs']:,} legs")
+        print(f"  Full reprice + aggregation: {result['full_ms']:.2f} ms")
+        print(f"  Incremental ({result['incremental_rows']:,} rows moved): {result['incremental_ms']:.2f} ms\n")
+        return
+
+    if not args.positions:
+        parser.error("--positions is required (or use --benchmark)")
+
+    api_key = args.api_key or os.environ.get('FMP_API_KEY')
+    if not api_key:
+        print("ERROR: FMP_API_KEY not found. Set environment variable or use --api-key")
+        sys.exit(1)
+
+    positions = load_positions(args.positions)
+    symbols = sorted({p['symbol'].upper() for p in positions} | {args.benchmark_symbol})
+
+    spots = fetch_quotes(symbols, api_key)
+    missing = [s for s in symbols if s not in spots]
+    if missing:
+        print(f"ERROR: No quote for {', '.join(missing)}")
+        sys.exit(1)
+
+    book = PositionBook(positions, spots, betas=fetch_betas(symbols, api_key),
+                        r=args.rate / 100, default_iv=args.default_iv / 100,
+                        benchmark_symbol=args.benchmark_symbol)
+    print_risk_report(book)
+
+    while args.watch:
+        time.sleep(args.watch)
+        start = time.perf_counter()
+        if book.set_as_of(date.today()):
+            print(f"Valuation date rolled to {book.as_of}: all legs repriced")
+        rows = book.update_spots(fetch_quotes(symbols, api_key))
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Repriced {rows} of {book.codes.size} legs ({elapsed:.1f} ms incl. quotes)")
+        print_risk_report(book)
+
+
+if __name__ == '__main__':
+    main()
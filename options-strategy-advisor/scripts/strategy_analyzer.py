@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Options Strategy Analyzer
+
+Scenario and Monte Carlo engine for multi-leg option strategies, built on the
+Black-Scholes pricer.
+
+Features:
+- Multi-leg positions (calls, puts, stock; long/short; mixed expirations)
+- P/L grids over spot × days forward × IV shift in one broadcasted computation
+- Expiration P/L metrics: max profit/loss, breakevens, net debit/credit
+- Net position Greeks
+- GBM Monte Carlo with antithetic variates for probability of profit and
+  expected value, seeded and evaluated in fixed-size chunks so millions of
+  paths never sit in memory at once
+
+Usage:
+    from strategy_analyzer import OptionStrategy
+
+    strategy = OptionStrategy(
+        S=180, r=0.053, sigma=0.25, q=0.01,
+        legs=[
+            {'position': 'long', 'type': 'call', 'strike': 180, 'days': 30},
+            {'position': 'short', 'type': 'call', 'strike': 185, 'days': 30},
+        ],
+        contracts=10
+    )
+
+    grid = strategy.pnl_grid(spots, days_forward=[0, 10, 20], vol_shifts=[-0.05, 0, 0.05])
+    mc = strategy.monte_carlo(n_paths=2_000_000, seed=42)
+
+    # Command line
+    python strategy_analyzer.py --price 180 --iv 25 \\
+        --legs long:call:180:30,short:call:185:30 --contracts 10 --paths 1000000
+
+Author: Claude Trading Skills
+Version: 1.0
+"""
+
+import argparse
+
+import numpy as np
+
+from black_scholes import ChainPricer
+
+
+CONTRACT_MULTIPLIER = 100
+
+
+# =============================================================================
+# Strategy Definition
+# =============================================================================
+
+class OptionStrategy:
+    """Multi-leg option position with scenario and Monte Carlo analysis"""
+
+    def __init__(self, S, legs, r, sigma, q=0, contracts=1):
+        """
+        Initialize strategy
+
+        Parameters:
+        -----------
+        S : float
+            Current stock price
+        legs : list of dict
+            Each leg has:
+              'position': 'long' or 'short'
+              'type': 'call', 'put' or 'stock'
+              'strike': strike price (options only)
+              'days': calendar days to expiration (options only)
+              'quantity': contracts (options) or shares (stock) per unit, default 1 / 100
+              'premium': entry price per share (default: Black-Scholes price now)
+              'iv': leg volatility (default: strategy sigma)
+        r : float
+            Risk-free rate
+        sigma : float
+            Volatility used for legs without 'iv' and for Monte Carlo paths
+        q : float, optional
+            Continuous dividend yield
+        contracts : int
+            Number of strategy units (all leg quantities are multiplied by this)
+        """
+        if not legs:
+            raise ValueError("Strategy needs at least one leg")
+
+        self.S = S
+        self.r = r
+        self.sigma = sigma
+        self.q = q
+        self.contracts = contracts
+        self.legs = legs
+
+        is_stock = np.array([leg['type'].lower() == 'stock' for leg in legs])
+        sign = np.array([1.0 if leg['position'].lower() == 'long' else -1.0 for leg in legs])
+        quantity = np.array([
+            leg.get('quantity', CONTRACT_MULTIPLIER if leg['type'].lower() == 'stock' else 1)
+            for leg in legs
+        ], dtype=float)
+
+        # Per-leg arrays; stock legs get placeholder option fields that are masked out
+        self._is_stock = is_stock
+        self._types = np.array(['call' if s else leg['type'].lower() for s, leg in zip(is_stock, legs)])
+        self._strikes = np.array([leg.get('strike', S) for leg in legs], dtype=float)
+        self._days = np.array([leg.get('days', 0) for leg in legs], dtype=float)
+        self._ivs = np.array([leg.get('iv', sigma) for leg in legs], dtype=float)
+        self._units = sign * np.where(is_stock, quantity, quantity * CONTRACT_MULTIPLIER) * contracts
+
+        if np.any(~is_stock & (self._days <= 0)):
+            raise ValueError("Option legs need positive 'days' to expiration")
+
+        # Entry premiums: user-supplied fills or theoretical prices today
+        theoretical = self._leg_values(np.asarray(S, dtype=float), 0.0, 0.0)
+        self._premiums = np.array([
+            leg.get('premium', theoretical[i]) for i, leg in enumerate(legs)
+        ], dtype=float)
+
+        self.horizon_days = float(self._days[~is_stock].min()) if (~is_stock).any() else 0.0
+
+    def _leg_values(self, spot, days_forward, vol_shift):
+        """
+        Per-share value of every leg, broadcasting scenarios against legs
+
+        spot, days_forward and vol_shift must already be shaped so they
+        broadcast against a trailing legs axis. Expired options are valued at
+        intrinsic.
+        """
+        T = (self._days - days_forward) / 365
+        expired = T <= 0
+        sigma = np.maximum(self._ivs + vol_shift, 1e-4)
+
+        shape = np.broadcast_shapes(np.shape(spot), np.shape(T), np.shape(sigma))
+        intrinsic = np.where(self._types == 'call',
+                             np.maximum(spot - self._strikes, 0),
+                             np.maximum(self._strikes - spot, 0))
+
+        if np.all(expired):
+            value = np.broadcast_to(intrinsic, shape)
+        else:
+            value = ChainPricer(spot, self._strikes, np.where(expired, 1e-9, T),
+                                self.r, sigma, self.q).price(np.broadcast_to(self._types, shape))
+            value = np.where(expired, intrinsic, value)
+        return np.where(self._is_stock, np.broadcast_to(spot, shape), value)
+
+    # =========================================================================
+    # Scenario Analysis
+    # =========================================================================
+
+    def pnl_grid(self, spots, days_forward=(0,), vol_shifts=(0.0,)):
+        """
+        P/L over every (spot, days forward, IV shift) combination
+
+        Evaluated as one (spot × days × vol × legs) broadcast; no Python loop
+        over scenarios or legs.
+
+        Parameters:
+        -----------
+        spots : array-like
+            Stock prices to evaluate
+        days_forward : array-like
+            Calendar days from today
+        vol_shifts : array-like
+            Absolute IV shifts (e.g. -0.05 for IV down 5 points)
+
+        Returns:
+        --------
+        array
+            P/L in dollars with shape (len(spots), len(days_forward), len(vol_shifts))
+        """
+        spot = np.asarray(spots, dtype=float)[:, None, None, None]
+        days = np.asarray(days_forward, dtype=float)[None, :, None, None]
+        shift = np.asarray(vol_shifts, dtype=float)[None, None, :, None]
+
+        values = self._leg_values(spot, days, shift)
+        return ((values - self._premiums) * self._units).sum(axis=-1)
+
+    def expiration_pnl(self, spots):
+        """P/L at the nearest option expiration across a range of stock prices"""
+        return self.pnl_grid(spots, [self.horizon_days], [0.0])[:, 0, 0]
+
+    def summary(self, price_range=0.5, points=2001):
+        """
+        Expiration P/L metrics over S ± price_range
+
+        Returns: dict with net_premium (positive = debit), max_profit, max_loss,
+        breakevens and the evaluated price/P&L curve
+        """
+        spots = np.linspace(self.S * (1 - price_range), self.S * (1 + price_range), points)
+        pnl = self.expiration_pnl(spots)
+
+        crossings = np.flatnonzero(np.diff(np.sign(pnl)) != 0)
+        breakevens = [
+            float(spots[i] - pnl[i] * (spots[i + 1] - spots[i]) / (pnl[i + 1] - pnl[i]))
+            for i in crossings if pnl[i + 1] != pnl[i]
+        ]
+
+        return {
+            'net_premium': float((self._premiums * self._units).sum()),
+            'max_profit': float(pnl.max()),
+            'max_loss': float(pnl.min()),
+            'breakevens': breakevens,
+            'spots': spots,
+            'pnl': pnl
+        }
+
+    def position_greeks(self):
+        """Net position Greeks in dollar terms per unit move"""
+        options = ~self._is_stock
+        units = self._units[options]
+        greeks = ChainPricer(self.S, self._strikes[options], self._days[options] / 365,
+                             self.r, self._ivs[options], self.q).greeks(self._types[options])
+
+        net = {name: float((greeks[name] * units).sum())
+               for name in ('delta', 'gamma', 'theta', 'vega', 'rho')}
+        net['delta'] += float(self._units[self._is_stock].sum())
+        return net
+
+    # =========================================================================
+    # Monte Carlo
+    # =========================================================================
+
+    def monte_carlo(self, n_paths=1_000_000, days=None, seed=None, drift=None,
+                    chunk_size=250_000, antithetic=True):
+        """
+        Simulate GBM terminal prices and value the strategy at the horizon
+
+        Paths are generated and evaluated chunk by chunk, keeping only running
+        sums, so memory stays at O(chunk_size) regardless of n_paths. With the
+        same seed and chunk_size, results are bit-for-bit reproducible.
+
+        Parameters:
+        -----------
+        n_paths : int
+            Total simulated paths (rounded up to an even number with antithetics)
+        days : float, optional
+            Horizon in calendar days (default: nearest option expiration)
+        seed : int, optional
+            Random seed
+        drift : float, optional
+            Annual drift (default: risk-free rate, i.e. risk-neutral)
+        chunk_size : int
+            Paths evaluated per chunk
+        antithetic : bool
+            Pair every normal draw Z with -Z to reduce variance
+
+        Returns:
+        --------
+        dict
+            probability_of_profit, expected_value, standard_error, min/max P/L
+        """
+        days = self.horizon_days if days is None else days
+        mu = self.r if drift is None else drift
+        t = days / 365
+        drift_term = (mu - self.q - 0.5 * self.sigma ** 2) * t
+        diffusion = self.sigma * np.sqrt(t)
+
+        rng = np.random.default_rng(seed)
+        draws_per_chunk = max(chunk_size // 2 if antithetic else chunk_size, 1)
+        total_draws = -(-n_paths // 2) if antithetic else n_paths
+
+        count = 0
+        profitable = 0
+        pnl_sum = 0.0
+        sample_sum = 0.0
+        sample_sq_sum = 0.0
+        pnl_min, pnl_max = np.inf, -np.inf
+
+        remaining = total_draws
+        while remaining > 0:
+            n = min(draws_per_chunk, remaining)
+            remaining -= n
+            z = rng.standard_normal(n)
+
+            spot = self.S * np.exp(drift_term + diffusion * z)
+            pnl = self._terminal_pnl(spot, days)
+            if antithetic:
+                pnl_anti = self._terminal_pnl(self.S * np.exp(drift_term - diffusion * z), days)
+                # Each antithetic pair is one independent sample for the error estimate
+                samples = 0.5 * (pnl + pnl_anti)
+                pnl = np.concatenate([pnl, pnl_anti])
+            else:
+                samples = pnl
+
+            count += pnl.size
+            profitable += int((pnl > 0).sum())
+            pnl_sum += float(pnl.sum())
+            sample_sum += float(samples.sum())
+            sample_sq_sum += float((samples ** 2).sum())
+            pnl_min = min(pnl_min, float(pnl.min()))
+            pnl_max = max(pnl_max, float(pnl.max()))
+
+        n_samples = total_draws
+        sample_mean = sample_sum / n_samples
+        sample_var = max(sample_sq_sum / n_samples - sample_mean ** 2, 0.0)
+
+        return {
+            'paths': count,
+            'horizon_days': days,
+            'probability_of_profit': profitable / count,
+            'expected_value': pnl_sum / count,
+            'standard_error': float(np.sqrt(sample_var / n_samples)),
+            'min_pnl': pnl_min,
+            'max_pnl': pnl_max
+        }
+
+    def _terminal_pnl(self, spot, days):
+        """P/L for a 1-D array of terminal stock prices at `days` forward"""
+        values = self._leg_values(spot[:, None], days, 0.0)
+        return ((values - self._premiums) * self._units).sum(axis=-1)
+
+
+# =============================================================================
+# Command Line
+# =============================================================================
+
+def parse_legs(spec):
+    """
+    Parse legs like 'long:call:180:30,short:call:185:30[:premium]' or 'long:stock:100'
+
+    Stock legs take an optional share count instead of strike/days.
+    """
+    legs = []
+    for item in spec.split(','):
+        parts = item.strip().split(':')
+        position, kind = parts[0].lower(), parts[1].lower()
+        if kind == 'stock':
+            leg = {'position': position, 'type': 'stock'}
+            if len(parts) > 2:
+                leg['quantity'] = float(parts[2])
+        else:
+            leg = {'position': position, 'type': kind,
+                   'strike': float(parts[2]), 'days': float(parts[3])}
+            if len(parts) > 4:
+                leg['premium'] = float(parts[4])
+        legs.append(leg)
+    return legs
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Scenario and Monte Carlo analysis for multi-leg option strategies',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Bull call spread, 10 contracts
+  python strategy_analyzer.py --price 180 --iv 25 \\
+      --legs long:call:180:30,short:call:185:30 --contracts 10
+
+  # Iron condor with 2M Monte Carlo paths
+  python strategy_analyzer.py --price 180 --iv 25 --paths 2000000 --seed 7 \\
+      --legs long:put:165:45,short:put:170:45,short:call:190:45,long:call:195:45
+        """
+    )
+    parser.add_argument('--price', type=float, required=True, help='Current stock price')
+    parser.add_argument('--legs', type=str, required=True,
+                        help='Legs as position:type:strike:days[:premium], comma-separated')
+    parser.add_argument('--iv', type=float, required=True, help='Implied volatility in percent')
+    parser.add_argument('--rate', type=float, default=5.3, help='Risk-free rate in percent (default: 5.3)')
+    parser.add_argument('--div-yield', type=float, default=0.0, help='Dividend yield in percent (default: 0)')
+    parser.add_argument('--contracts', type=int, default=1, help='Number of strategy units (default: 1)')
+    parser.add_argument('--paths', type=int, default=1_000_000, help='Monte Carlo paths (default: 1,000,000)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    args = parser.parse_args()
+
+    strategy = OptionStrategy(
+        S=args.price, legs=parse_legs(args.legs), r=args.rate / 100,
+        sigma=args.iv / 100, q=args.div_yield / 100, contracts=args.contracts
+    )
+
+    summary = strategy.summary()
+    greeks = strategy.position_greeks()
+
+    print("\n" + "="*70)
+    print("OPTIONS STRATEGY ANALYSIS")
+    print("="*70)
+    print(f"\nStock Price: ${args.price:.2f}   IV: {args.iv:.1f}%   Contracts: {args.contracts}")
+    premium = summary['net_premium']
+    print(f"Net {'Debit' if premium >= 0 else 'Credit'}: ${abs(premium):,.2f}")
+    print(f"Max Profit (at expiration, ±50%): ${summary['max_profit']:,.2f}")
+    print(f"Max Loss (at expiration, ±50%): ${summary['max_loss']:,.2f}")
+    if summary['breakevens']:
+        print(f"Breakeven(s): {', '.join(f'${b:.2f}' for b in summary['breakevens'])}")
+
+    print(f"\nPosition Greeks:")
+    print(f"  Delta: {greeks['delta']:+.2f} shares")
+    print(f"  Gamma: {greeks['gamma']:+.4f}")
+    print(f"  Theta: ${greeks['theta']:+,.2f}/day")
+    print(f"  Vega: ${greeks['vega']:+,.2f} per 1% IV")
+
+    # Scenario grid: spot × days × IV shift
+    spots = args.price * np.array([0.9, 0.95, 1.0, 1.05, 1.1])
+    horizon = strategy.horizon_days
+    days = [0, round(horizon / 2), horizon]
+    shifts = [-0.05, 0.0, 0.05]
+    grid = strategy.pnl_grid(spots, days, shifts)
+
+    print(f"\n{'='*70}")
+    print("SCENARIO P/L (rows: stock price, columns: days forward / IV shift)")
+    print("="*70)
+    header = f"{'Price':>9} |" + "".join(f"{f'd{d:.0f} {s*100:+.0f}%':>11}" for d in days for s in shifts)
+    print(header)
+    for i, spot in enumerate(spots):
+        row = "".join(f"{grid[i, j, k]:>11,.0f}" for j in range(len(days)) for k in range(len(shifts)))
+        print(f"${spot:>8.2f} |{row}")
+
+    mc = strategy.monte_carlo(n_paths=args.paths, seed=args.seed)
+
+    print(f"\n{'='*70}")
+    print(f"MONTE CARLO ({mc['paths']:,} antithetic GBM paths, {mc['horizon_days']:.0f} days)")
+    print("="*70)
+    print(f"  Probability of Profit: {mc['probability_of_profit']*100:.1f}%")
+    print(f"  Expected Value: ${mc['expected_value']:,.2f} (± ${mc['standard_error']:,.2f} s.e.)")
+    print(f"  P/L Range: ${mc['min_pnl']:,.2f} to ${mc['max_pnl']:,.2f}")
+    print("\n" + "="*70 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Tests for the options position book
+
+Run with: python3 -m pytest scripts/test_position_book.py -v
+"""
+
+from datetime import date
+
+from position_book import PositionBook
+
+
+AS_OF = date(2026, 10, 19)
+
+
+def _book(expiration):
+    positions = [{'symbol': 'AAPL', 'type': 'call', 'strike': 180, 'expiration': expiration,
+                  'quantity': 1, 'iv': 0.30}]
+    return PositionBook(positions, {'AAPL': 180.0, 'SPY': 500.0}, as_of=AS_OF)
+
+
+class TestExpiry:
+    def test_zero_dte_atm_leg_keeps_its_greeks(self):
+        book = _book('2026-10-19')
+
+        assert not book.expired[0]
+        assert book.row_greeks['delta'][0] > 0
+        assert book.row_greeks['gamma'][0] > 0
+
+    def test_expired_leg_is_valued_at_intrinsic(self):
+        book = _book('2026-10-16')
+
+        assert book.expired[0]
+        assert book.row_greeks['price'][0] == 0
+        assert book.row_greeks['delta'][0] == 0
@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+Pair Trade Backtester
+
+Simulates z-score entry/exit/stop rules over historical spreads to measure
+whether the screener's signal thresholds actually make money.
+
+The backtest is vectorized across pairs and parameter combinations: every
+(pair, entry, exit, stop) combination is a column, and the position state
+machine steps through time once for all columns together. Hedge ratios are
+estimated walk-forward from a trailing window so no future prices leak into
+the spread, and each (hedge window, z-score window) grid cell runs in its own
+worker process.
+
+Usage:
+    # Backtest specific pairs with default thresholds (entry 2.0, exit 0.0, stop 3.0)
+    python backtest_pairs.py --pairs AAPL/MSFT,JPM/BAC
+
+    # Backtest the top pairs from a find_pairs.py run over a parameter grid
+    python backtest_pairs.py \\
+        --pairs-file pair_analysis.json \\
+        --top 20 \\
+        --entry-zscores 1.5,2.0,2.5 \\
+        --exit-zscores 0.0,0.5 \\
+        --stop-zscores 3.0,4.0 \\
+        --hedge-windows 120,250 \\
+        --zscore-windows 60,90 \\
+        --workers 4 \\
+        --output backtest_results.json
+
+Requirements:
+    pip install pandas numpy scipy statsmodels requests
+
+Author: Claude Trading Skills
+Version: 1.0
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from find_pairs import get_api_key, fetch_historical_prices
+
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+# =============================================================================
+# Data Loading
+# =============================================================================
+
+def parse_float_list(value):
+    """Parse a comma-separated list of floats"""
+    return [float(v) for v in value.split(',') if v.strip()]
+
+
+def parse_int_list(value):
+    """Parse a comma-separated list of integers"""
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def load_pairs(pairs_arg=None, pairs_file=None, top=None):
+    """Load (stock_a, stock_b) tuples from --pairs or a find_pairs.py output file"""
+    pairs = []
+
+    if pairs_arg:
+        for item in pairs_arg.split(','):
+            if '/' not in item:
+                print(f"ERROR: Invalid pair '{item}' (expected format AAPL/MSFT)")
+                sys.exit(1)
+            stock_a, stock_b = item.split('/', 1)
+            pairs.append((stock_a.strip().upper(), stock_b.strip().upper()))
+
+    if pairs_file:
+        with open(pairs_file, 'r') as f:
+            data = json.load(f)
+        records = data['pairs'] if isinstance(data, dict) else data
+        for record in records:
+            pairs.append((record['stock_a'], record['stock_b']))
+
+    # Preserve ranking order while dropping duplicates
+    pairs = list(dict.fromkeys(pairs))
+    if top:
+        pairs = pairs[:top]
+
+    return pairs
+
+
+def fetch_pair_prices(pairs, api_key, lookback_days=730):
+    """Fetch historical prices once per unique symbol across all pairs"""
+    symbols = sorted({symbol for pair in pairs for symbol in pair})
+    print(f"\n[1/4] Fetching {lookback_days} days of price data for {len(symbols)} symbols...")
+
+    price_data = {}
+    for i, symbol in enumerate(symbols, 1):
+        print(f"  [{i}/{len(symbols)}] Fetching {symbol}...", end='', flush=True)
+        prices = fetch_historical_prices(symbol, api_key, lookback_days)
+        if prices is not None and len(prices) >= 250:
+            price_data[symbol] = prices
+            print(f" ✓ ({len(prices)} days)")
+        else:
+            print(" ✗ (insufficient data)")
+        time.sleep(0.3)  # Rate limiting
+
+    return price_data
+
+
+def build_price_panel(pairs, price_data):
+    """
+    Align leg prices into two (dates x pairs) frames.
+
+    Returns frames for leg A and leg B whose columns are pair labels, so all
+    rolling statistics can be computed column-wise in one call.
+    """
+    valid_pairs = [(a, b) for a, b in pairs if a in price_data and b in price_data]
+    labels = [f"{a}/{b}" for a, b in valid_pairs]
+
+    prices = pd.DataFrame({symbol: series for symbol, series in price_data.items()})
+    prices = prices.sort_index().ffill()
+
+    leg_a = pd.DataFrame({label: prices[a] for label, (a, _) in zip(labels, valid_pairs)})
+    leg_b = pd.DataFrame({label: prices[b] for label, (_, b) in zip(labels, valid_pairs)})
+
+    return leg_a, leg_b
+
+
+# =============================================================================
+# Walk-Forward Spread Construction
+# =============================================================================
+
+def walk_forward_hedge_ratio(leg_a, leg_b, hedge_window=250, refit_days=21):
+    """
+    Estimate OLS hedge ratios from a trailing window, refit every refit_days.
+
+    The estimate used on day t only sees prices up to t-1, and is held constant
+    between refits, matching how a live desk would re-estimate the hedge.
+    """
+    cov_ab = leg_a.rolling(hedge_window).cov(leg_b)
+    var_b = leg_b.rolling(hedge_window).var()
+    beta = (cov_ab / var_b).shift(1)
+
+    refit_mask = np.arange(len(beta)) % refit_days == 0
+    beta = beta.where(pd.Series(refit_mask, index=beta.index), axis=0)
+    return beta.ffill()
+
+
+def calculate_walk_forward_zscore(leg_a, leg_b, beta, zscore_window=90):
+    """
+    Z-score of A - beta*B using rolling moments of each leg.
+
+    The spread's mean/var over the trailing zscore_window are built
+    algebraically from per-leg rolling moments with today's beta, which keeps
+    the z-score consistent with the current hedge ratio instead of mixing
+    spreads built from different betas inside one window.
+    """
+    roll_a = leg_a.rolling(zscore_window)
+    roll_b = leg_b.rolling(zscore_window)
+
+    mean_a, mean_b = roll_a.mean(), roll_b.mean()
+    var_a, var_b = roll_a.var(), roll_b.var()
+    cov_ab = roll_a.cov(leg_b)
+
+    spread = leg_a - beta * leg_b
+    spread_mean = mean_a - beta * mean_b
+    spread_var = var_a + beta ** 2 * var_b - 2 * beta * cov_ab
+    spread_std = np.sqrt(spread_var.where(spread_var > 0))
+
+    return (spread - spread_mean) / spread_std
+
+
+# =============================================================================
+# Vectorized Simulation
+# =============================================================================
+
+def simulate_positions(zscore, price_a, price_b, beta, entry, exit_, stop,
+                       max_holding_days=90, cost_bps=5.0):
+    """
+    Step the entry/exit/stop state machine through time for all columns at once.
+
+    All array arguments are (T x M); entry, exit_ and stop are length-M. The
+    hedge ratio and capital are locked at entry for the life of each trade.
+
+    Returns:
+        returns: (T x M) daily returns on committed capital
+        stats: dict of length-M arrays (trades, wins, holding_days, exposure_days)
+    """
+    n_days, n_cols = zscore.shape
+    cost = cost_bps / 10_000
+
+    position = np.zeros(n_cols)
+    trade_beta = np.zeros(n_cols)
+    capital = np.ones(n_cols)
+    held = np.zeros(n_cols)
+    trade_pnl = np.zeros(n_cols)
+
+    returns = np.zeros((n_days, n_cols))
+    trades = np.zeros(n_cols, dtype=np.int64)
+    wins = np.zeros(n_cols, dtype=np.int64)
+    holding_days = np.zeros(n_cols)
+    exposure_days = np.zeros(n_cols)
+
+    d_a = np.diff(price_a, axis=0, prepend=price_a[:1])
+    d_b = np.diff(price_b, axis=0, prepend=price_b[:1])
+
+    for t in range(n_days):
+        in_trade = position != 0
+
+        # Mark open positions to market with the beta locked at entry
+        day_ret = np.where(in_trade, position * (d_a[t] - trade_beta * d_b[t]) / capital, 0.0)
+        day_ret = np.nan_to_num(day_ret)
+        trade_pnl += day_ret
+        held += in_trade
+        exposure_days += in_trade
+
+        z = zscore[t]
+        valid = ~np.isnan(z)
+
+        # Exits: mean reversion through the exit band, stop loss, or time stop
+        reverted = ((position > 0) & (z >= -exit_)) | ((position < 0) & (z <= exit_))
+        stopped = ((position > 0) & (z <= -stop)) | ((position < 0) & (z >= stop))
+        timed_out = in_trade & (held >= max_holding_days)
+        closing = in_trade & ((valid & (reverted | stopped)) | timed_out)
+
+        day_ret -= closing * cost
+        trade_pnl -= closing * cost
+        trades += closing
+        wins += closing & (trade_pnl > 0)
+        holding_days += np.where(closing, held, 0.0)
+        position[closing] = 0.0
+        held[closing] = 0.0
+
+        # Entries: only flat columns that did not exit today, inside the stop band
+        flat = (position == 0) & ~closing & valid & (np.abs(z) < stop)
+        go_short = flat & (z > entry)
+        go_long = flat & (z < -entry)
+        opening = go_short | go_long
+
+        if opening.any():
+            position[go_short] = -1.0
+            position[go_long] = 1.0
+            trade_beta[opening] = beta[t, opening]
+            capital[opening] = price_a[t, opening] + np.abs(beta[t, opening]) * price_b[t, opening]
+            trade_pnl[opening] = -cost
+            day_ret -= opening * cost
+
+        returns[t] = day_ret
+
+    # Count positions still open at the end as trades marked at the last close
+    still_open = position != 0
+    trades += still_open
+    wins += still_open & (trade_pnl > 0)
+    holding_days += np.where(still_open, held, 0.0)
+
+    stats = {
+        'trades': trades,
+        'wins': wins,
+        'holding_days': holding_days,
+        'exposure_days': exposure_days,
+    }
+    return returns, stats
+
+
+def calculate_performance(returns, stats):
+    """Sharpe, drawdown, return and trade statistics for every column"""
+    n_days = returns.shape[0]
+
+    mean = returns.mean(axis=0)
+    std = returns.std(axis=0, ddof=1)
+    sharpe = np.divide(mean, std, out=np.zeros_like(mean), where=std > 0)
+    sharpe *= np.sqrt(TRADING_DAYS_PER_YEAR)
+
+    equity = 1.0 + np.cumsum(returns, axis=0)
+    max_drawdown = (np.maximum.accumulate(equity, axis=0) - equity).max(axis=0)
+
+    trades = stats['trades']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        win_rate = np.where(trades > 0, stats['wins'] / trades, np.nan)
+        avg_holding = np.where(trades > 0, stats['holding_days'] / trades, np.nan)
+
+    return {
+        'total_return': returns.sum(axis=0),
+        'annual_return': mean * TRADING_DAYS_PER_YEAR,
+        'sharpe': sharpe,
+        'max_drawdown': max_drawdown,
+        'trades': trades,
+        'win_rate': win_rate,
+        'avg_holding_days': avg_holding,
+        'exposure': stats['exposure_days'] / n_days,
+    }
+
+
+def run_grid_cell(leg_a, leg_b, hedge_window, zscore_window, thresholds,
+                  refit_days=21, max_holding_days=90, cost_bps=5.0):
+    """
+    Backtest every pair against every threshold combination for one
+    (hedge_window, zscore_window) cell. Runs inside a worker process.
+    """
+    beta = walk_forward_hedge_ratio(leg_a, leg_b, hedge_window, refit_days)
+    zscore = calculate_walk_forward_zscore(leg_a, leg_b, beta, zscore_window)
+
+    labels = list(leg_a.columns)
+    n_pairs, n_combos = len(labels), len(thresholds)
+
+    # Tile pairs across threshold combinations: column = combo * n_pairs + pair
+    def tile(frame):
+        return np.tile(frame.to_numpy(dtype=float), (1, n_combos))
+
+    entry, exit_, stop = (np.repeat(np.array(col, dtype=float), n_pairs)
+                          for col in zip(*thresholds))
+
+    returns, stats = simulate_positions(
+        tile(zscore), tile(leg_a), tile(leg_b), tile(beta),
+        entry, exit_, stop, max_holding_days, cost_bps
+    )
+    perf = calculate_performance(returns, stats)
+
+    results = []
+    for col in range(n_pairs * n_combos):
+        combo, pair_idx = divmod(col, n_pairs)
+        entry_z, exit_z, stop_z = thresholds[combo]
+        results.append({
+            'pair': labels[pair_idx],
+            'hedge_window': hedge_window,
+            'zscore_window': zscore_window,
+            'entry_zscore': entry_z,
+            'exit_zscore': exit_z,
+            'stop_zscore': stop_z,
+            **{key: _to_builtin(values[col]) for key, values in perf.items()},
+        })
+    return results
+
+
+def _to_builtin(value):
+    """Convert numpy scalars to JSON-friendly Python values"""
+    value = value.item() if hasattr(value, 'item') else value
+    if isinstance(value, float):
+        return None if np.isnan(value) else round(value, 4)
+    return value
+
+
+def run_grid_search(leg_a, leg_b, hedge_windows, zscore_windows, entry_zscores,
+                    exit_zscores, stop_zscores, refit_days=21, max_holding_days=90,
+                    cost_bps=5.0, workers=None):
+    """Fan (hedge_window, zscore_window) cells out across worker processes"""
+    thresholds = [
+        (entry, exit_, stop)
+        for entry, exit_, stop in product(entry_zscores, exit_zscores, stop_zscores)
+        if exit_ < entry < stop
+    ]
+    if not thresholds:
+        print("ERROR: No valid threshold combinations (need exit < entry < stop)")
+        sys.exit(1)
+
+    cells = list(product(hedge_windows, zscore_windows))
+    print(f"\n[2/4] Backtesting {leg_a.shape[1]} pairs × {len(thresholds)} threshold sets "
+          f"× {len(cells)} window sets ({leg_a.shape[1] * len(thresholds) * len(cells)} runs)...")
+
+    results = []
+    if workers == 1 or len(cells) == 1:
+        for hedge_window, zscore_window in cells:
+            results.extend(run_grid_cell(leg_a, leg_b, hedge_window, zscore_window, thresholds,
+                                         refit_days, max_holding_days, cost_bps))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(run_grid_cell, leg_a, leg_b, hedge_window, zscore_window,
+                            thresholds, refit_days, max_holding_days, cost_bps)
+            for hedge_window, zscore_window in cells
+        ]
+        for i, future in enumerate(futures, 1):
+            results.extend(future.result())
+            print(f"  [{i}/{len(cells)}] window sets complete", end='\r', flush=True)
+    print()
+
+    return results
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+def select_best_by_pair(results, min_trades=3):
+    """Pick the highest-Sharpe parameter set per pair with enough trades"""
+    best = {}
+    for row in results:
+        if row['trades'] < min_trades:
+            continue
+        current = best.get(row['pair'])
+        if current is None or row['sharpe'] > current['sharpe']:
+            best[row['pair']] = row
+    return sorted(best.values(), key=lambda r: -r['sharpe'])
+
+
+def save_results(results, best, config, output_file):
+    """Save full grid and per-pair best parameters to JSON"""
+    print(f"\n[3/4] Saving results to {output_file}...")
+
+    output_data = {
+        'metadata': {
+            'generated_at': datetime.now().isoformat(),
+            'total_runs': len(results),
+            'pairs_tested': len({r['pair'] for r in results}),
+            'config': config,
+        },
+        'best_by_pair': best,
+        'results': results,
+    }
+
+    with open(output_file, 'w') as f:
+        json.dump(output_data, f, indent=2)
+
+    print(f"  → Saved {len(results)} backtest runs to {output_file}")
+
+
+def print_summary(best):
+    """Print per-pair best parameter sets"""
+    print(f"\n[4/4] Summary")
+    print("\n" + "=" * 100)
+    print("PAIR TRADE BACKTEST - BEST PARAMETERS BY PAIR")
+    print("=" * 100)
+
+    if not best:
+        print("\nNo parameter set produced enough trades. Try lowering --min-trades or --entry-zscores.")
+        print("=" * 100 + "\n")
+        return
+
+    header = (f"{'Pair':<14}{'Entry':>7}{'Exit':>6}{'Stop':>6}{'Hedge':>7}{'Z-Win':>7}"
+              f"{'Sharpe':>8}{'Return':>9}{'MaxDD':>8}{'Trades':>8}{'Win%':>7}{'Hold':>7}")
+    print(header)
+    print("-" * 100)
+
+    for row in best:
+        win_rate = f"{row['win_rate'] * 100:.0f}%" if row['win_rate'] is not None else "N/A"
+        holding = f"{row['avg_holding_days']:.0f}d" if row['avg_holding_days'] is not None else "N/A"
+        print(f"{row['pair']:<14}{row['entry_zscore']:>7.1f}{row['exit_zscore']:>6.1f}"
+              f"{row['stop_zscore']:>6.1f}{row['hedge_window']:>7}{row['zscore_window']:>7}"
+              f"{row['sharpe']:>8.2f}{row['total_return'] * 100:>8.1f}%"
+              f"{row['max_drawdown'] * 100:>7.1f}%{row['trades']:>8}{win_rate:>7}{holding:>7}")
+
+    print("=" * 100)
+    print("Returns are on capital committed per trade (|A| + |beta|·B), net of costs.")
+    print("Best-of-grid Sharpe is in-sample; confirm on a held-out period before trading.\n")
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Backtest z-score entry/exit/stop rules for stock pairs',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Default thresholds for two pairs
+  python backtest_pairs.py --pairs AAPL/MSFT,JPM/BAC
+
+  # Grid search over the top 10 screener pairs
+  python backtest_pairs.py --pairs-file pair_analysis.json --top 10 \\
+      --entry-zscores 1.5,2.0,2.5 --exit-zscores 0.0,0.5 --stop-zscores 3.0,4.0
+        """
+    )
+
+    parser.add_argument('--pairs', type=str,
+                        help='Comma-separated pairs, e.g. AAPL/MSFT,JPM/BAC')
+    parser.add_argument('--pairs-file', type=str,
+                        help='find_pairs.py output JSON to backtest')
+    parser.add_argument('--top', type=int,
+                        help='Only backtest the first N pairs (default: all)')
+    parser.add_argument('--lookback-days', type=int, default=730,
+                        help='Historical data lookback period in days (default: 730)')
+    parser.add_argument('--entry-zscores', type=parse_float_list, default=[2.0],
+                        help='Entry thresholds to test (default: 2.0)')
+    parser.add_argument('--exit-zscores', type=parse_float_list, default=[0.0],
+                        help='Exit thresholds to test (default: 0.0)')
+    parser.add_argument('--stop-zscores', type=parse_float_list, default=[3.0],
+                        help='Stop-loss thresholds to test (default: 3.0)')
+    parser.add_argument('--hedge-windows', type=parse_int_list, default=[250],
+                        help='Trailing windows for hedge ratio estimation (default: 250)')
+    parser.add_argument('--zscore-windows', type=parse_int_list, default=[90],
+                        help='Rolling windows for z-score calculation (default: 90)')
+    parser.add_argument('--refit-days', type=int, default=21,
+                        help='Re-estimate hedge ratio every N days (default: 21)')
+    parser.add_argument('--max-holding-days', type=int, default=90,
+                        help='Time stop for open trades (default: 90)')
+    parser.add_argument('--cost-bps', type=float, default=5.0,
+                        help='Transaction cost per entry/exit in basis points (default: 5)')
+    parser.add_argument('--min-trades', type=int, default=3,
+                        help='Minimum trades for a parameter set to be ranked (default: 3)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Worker processes for grid search (default: all cores)')
+    parser.add_argument('--output', type=str, default='backtest_results.json',
+                        help='Output JSON file (default: backtest_results.json)')
+    parser.add_argument('--api-key', type=str,
+                        help='FMP API key (or set FMP_API_KEY env variable)')
+
+    args = parser.parse_args()
+
+    if not args.pairs and not args.pairs_file:
+        parser.error("Either --pairs or --pairs-file must be provided")
+
+    pairs = load_pairs(args.pairs, args.pairs_file, args.top)
+    if not pairs:
+        print("ERROR: No pairs to backtest")
+        sys.exit(1)
+
+    api_key = get_api_key(args.api_key)
+
+    print("\n" + "=" * 70)
+    print("PAIR TRADE BACKTESTER")
+    print("=" * 70)
+    print(f"Configuration:")
+    print(f"  Pairs: {len(pairs)}")
+    print(f"  Lookback Days: {args.lookback_days}")
+    print(f"  Entry/Exit/Stop: {args.entry_zscores} / {args.exit_zscores} / {args.stop_zscores}")
+    print(f"  Hedge Windows: {args.hedge_windows} (refit every {args.refit_days} days)")
+    print(f"  Z-Score Windows: {args.zscore_windows}")
+
+    price_data = fetch_pair_prices(pairs, api_key, args.lookback_days)
+    leg_a, leg_b = build_price_panel(pairs, price_data)
+
+    if leg_a.shape[1] == 0:
+        print("\nERROR: No pairs with valid price data for both legs")
+        sys.exit(1)
+
+    longest_window = max(args.hedge_windows) + max(args.zscore_windows)
+    if len(leg_a) <= longest_window:
+        print(f"\nWARNING: {len(leg_a)} days of data leaves little room after "
+              f"{longest_window} warm-up days; consider increasing --lookback-days")
+
+    results = run_grid_search(
+        leg_a, leg_b,
+        args.hedge_windows, args.zscore_windows,
+        args.entry_zscores, args.exit_zscores, args.stop_zscores,
+        args.refit_days, args.max_holding_days, args.cost_bps, args.workers
+    )
+
+    best = select_best_by_pair(results, args.min_trades)
+
+    config = {
+        'lookback_days': args.lookback_days,
+        'refit_days': args.refit_days,
+        'max_holding_days': args.max_holding_days,
+        'cost_bps': args.cost_bps,
+        'min_trades': args.min_trades,
+    }
+    save_results(results, best, config, args.output)
+    print_summary(best)
+
+
+if __name__ == '__main__':
+    main()
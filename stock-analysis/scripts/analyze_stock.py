@@ -23,11 +23,20 @@ import sys
 import time
 from dataclasses import dataclass, asdict
 from datetime import datetime
+from pathlib import Path
 from typing import Literal
 
 import pandas as pd
 import yfinance as yf
 
+# Shared exchange session calendar (market-environment-analysis skill)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "market-environment-analysis" / "scripts"))
+try:
+    from trading_calendar import get_calendar
+except ImportError:
+    # Standalone install: earnings timing falls back to calendar days
+    get_calendar = None
+
 
 # Top 20 supported cryptocurrencies
 SUPPORTED_CRYPTOS = {
@@ -168,6 +177,8 @@ class EarningsTiming:
     price_change_5d: float | None
     confidence_adjustment: float
     caveats: list[str]
+    trading_days_until_earnings: int | None = None
+    trading_days_since_earnings: int | None = None
 
 
 @dataclass
@@ -1101,15 +1112,13 @@ def analyze_sector_performance(data: StockData, verbose: bool = False) -> Sector
         return None
 
 
-def analyze_earnings_timing(data: StockData) -> EarningsTiming | None:
+def analyze_earnings_timing(data: StockData, now: datetime | None = None) -> EarningsTiming | None:
     """Check earnings timing and flag pre/post-earnings periods."""
     try:
-        from datetime import datetime, timedelta
-
         if data.earnings_history is None or data.earnings_history.empty:
             return None
 
-        current_date = datetime.now()
+        current_date = now or datetime.now()
         earnings_dates = data.earnings_history.sort_index(ascending=False)
 
         # Find next and last earnings dates
@@ -1135,6 +1144,19 @@ def analyze_earnings_timing(data: StockData) -> EarningsTiming | None:
         if last_earnings_date:
             days_since_earnings = (current_date - last_earnings_date).days
 
+        # NYSE sessions (holiday-aware), to line up with the daily price bars
+        trading_days_until = None
+        trading_days_since = None
+        if get_calendar is not None:
+            try:
+                nyse = get_calendar("NYSE")
+                if next_earnings_date:
+                    trading_days_until = nyse.trading_days_between(current_date, next_earnings_date)
+                if last_earnings_date:
+                    trading_days_since = nyse.trading_days_between(last_earnings_date, current_date)
+            except ValueError:
+                trading_days_until = trading_days_since = None
+
         # Determine timing flag
         timing_flag = "safe"
         confidence_adjustment = 0.0
@@ -1144,11 +1166,13 @@ def analyze_earnings_timing(data: StockData) -> EarningsTiming | None:
         if days_until_earnings is not None and days_until_earnings <= 14:
             timing_flag = "pre_earnings"
             confidence_adjustment = -0.3
-            caveats.append(f"Earnings in {days_until_earnings} days - high volatility expected")
+            sessions = f" ({trading_days_until} trading days)" if trading_days_until is not None else ""
+            caveats.append(f"Earnings in {days_until_earnings} days{sessions} - high volatility expected")
 
-        # Post-earnings check (< 5 days)
+        # Post-earnings check (within the 5-bar price window)
         price_change_5d = None
-        if days_since_earnings is not None and days_since_earnings <= 5:
+        recent = trading_days_since if trading_days_since is not None else days_since_earnings
+        if recent is not None and recent <= 5:
             # Calculate 5-day price change
             if data.price_history is not None and len(data.price_history) >= 5:
                 price_5d_ago = data.price_history["Close"].iloc[-5]
@@ -1169,6 +1193,8 @@ def analyze_earnings_timing(data: StockData) -> EarningsTiming | None:
             price_change_5d=price_change_5d,
             confidence_adjustment=confidence_adjustment,
             caveats=caveats,
+            trading_days_until_earnings=trading_days_until,
+            trading_days_since_earnings=trading_days_since,
         )
 
     except Exception:
@@ -2025,6 +2051,8 @@ def synthesize_signal(
         components_dict["earnings_timing"] = {
             "days_until_earnings": earnings_timing.days_until_earnings,
             "days_since_earnings": earnings_timing.days_since_earnings,
+            "trading_days_until_earnings": earnings_timing.trading_days_until_earnings,
+            "trading_days_since_earnings": earnings_timing.trading_days_since_earnings,
             "timing_flag": earnings_timing.timing_flag,
             "price_change_5d": earnings_timing.price_change_5d,
             "confidence_adjustment": earnings_timing.confidence_adjustment,
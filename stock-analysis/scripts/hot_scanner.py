@@ -12,6 +12,7 @@ import gzip
 import io
 import subprocess
 import os
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 import re
@@ -33,6 +34,14 @@ if ENV_FILE.exists():
 CACHE_DIR = Path(__file__).parent.parent / "cache"
 CACHE_DIR.mkdir(exist_ok=True)
 
+# Shared RSS/Atom poller (technews skill): conditional GETs, new-item tracking
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "technews" / "scripts"))
+try:
+    from feed_poller import FeedPoller
+except ImportError:
+    # Standalone install: feeds are downloaded and parsed in full every scan
+    FeedPoller = None
+
 # SSL context
 SSL_CONTEXT = ssl.create_default_context()
 
@@ -48,6 +57,7 @@ class HotScanner:
             "social": []
         }
         self.mentions = defaultdict(lambda: {"count": 0, "sources": [], "sentiment_hints": []})
+        self.feeds = FeedPoller(CACHE_DIR / "feeds.db") if FeedPoller else None
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
@@ -69,6 +79,22 @@ class HotScanner:
         """Fetch and parse JSON."""
         return json.loads(self._fetch(url, timeout))
     
+    def _feed_items(self, url, limit):
+        """First `limit` items of an RSS feed as {"title", "new"}."""
+        if self.feeds:
+            result = self.feeds.poll(url, max_items=limit)
+            if result["status"] == "error" and not result["items"]:
+                raise RuntimeError(result["error"])
+            new_ids = {item["id"] for item in result["new"]}
+            return [{"title": item["title"], "new": item["id"] in new_ids} for item in result["items"]]
+        
+        root = ET.fromstring(self._fetch(url))
+        items = []
+        for item in root.findall(".//item")[:limit]:
+            title_elem = item.find("title")
+            items.append({"title": title_elem.text if title_elem is not None else "", "new": None})
+        return items
+    
     def scan_all(self):
         """Run all scans in parallel."""
         print("🔍 Scanning for hot trends...\n")
@@ -171,19 +197,17 @@ class HotScanner:
         try:
             # Business news topic
             url = "https://news.google.com/rss/topics/CAAqJggKIiBDQkFTRWdvSUwyMHZNRGx6TVdZU0FtVnVHZ0pWVXlnQVAB?hl=en-US&gl=US&ceid=US:en"
-            text = self._fetch(url)
-            root = ET.fromstring(text)
-            items = root.findall(".//item")
+            items = self._feed_items(url, 15)
             
-            for item in items[:15]:
-                title_elem = item.find("title")
-                title = title_elem.text if title_elem is not None else ""
+            for item in items:
+                title = item["title"]
                 tickers = self._extract_tickers(title)
                 
                 news_entry = {
                     "title": title,
                     "tickers_mentioned": tickers,
-                    "source": "google_news_finance"
+                    "source": "google_news_finance",
+                    "new": item["new"]
                 }
                 self.results["news"].append(news_entry)
                 
@@ -201,9 +225,7 @@ class HotScanner:
         print("  📰 Google News Crypto...")
         try:
             url = "https://news.google.com/rss/search?q=bitcoin+OR+ethereum+OR+crypto+crash+OR+crypto+pump&hl=en-US&gl=US&ceid=US:en"
-            text = self._fetch(url)
-            root = ET.fromstring(text)
-            items = root.findall(".//item")
+            items = self._feed_items(url, 12)
             
             crypto_keywords = {
                 "bitcoin": "BTC", "btc": "BTC", "ethereum": "ETH", "eth": "ETH",
@@ -211,9 +233,8 @@ class HotScanner:
                 "cardano": "ADA", "polkadot": "DOT", "avalanche": "AVAX",
             }
             
-            for item in items[:12]:
-                title_elem = item.find("title")
-                title = title_elem.text if title_elem is not None else ""
+            for item in items:
+                title = item["title"]
                 tickers = self._extract_tickers(title)
                 
                 for word, ticker in crypto_keywords.items():
@@ -225,7 +246,8 @@ class HotScanner:
                     news_entry = {
                         "title": title,
                         "tickers_mentioned": tickers,
-                        "source": "google_news_crypto"
+                        "source": "google_news_crypto",
+                        "new": item["new"]
                     }
                     self.results["news"].append(news_entry)
                     
@@ -503,7 +525,8 @@ class HotScanner:
             if news.get("tickers_mentioned"):
                 summary["breaking_news"].append({
                     "title": news["title"],
-                    "tickers": news["tickers_mentioned"]
+                    "tickers": news["tickers_mentioned"],
+                    "new": news.get("new")
                 })
         
         return summary
@@ -573,7 +596,8 @@ def main():
     for news in summary["breaking_news"][:5]:
         tickers = ", ".join(news["tickers"][:3])
         title = news["title"][:55] + "..." if len(news["title"]) > 55 else news["title"]
-        print(f"  [{tickers}] {title}")
+        new = "🆕 " if news.get("new") else ""
+        print(f"  {new}[{tickers}] {title}")
     
     print(f"\n💾 Saved: {output_file}\n")
 
@@ -25,6 +25,7 @@ from analyze_stock import (
     calculate_rsi,
     fetch_stock_data,
     analyze_earnings_surprise,
+    analyze_earnings_timing,
     analyze_fundamentals,
     analyze_momentum,
     synthesize_signal,
@@ -129,6 +130,30 @@ class TestEarningsSurprise:
         assert "Missed" in result.explanation
 
 
+class TestEarningsTiming:
+    """Test earnings timing with the NYSE session calendar."""
+    
+    def test_trading_days_skip_holidays(self):
+        """Thanksgiving and weekends are not counted as trading days."""
+        mock_earnings = pd.DataFrame({
+            "Reported EPS": [None, 1.10],
+            "EPS Estimate": [1.00, 1.00],
+        }, index=[pd.Timestamp("2025-12-02"), pd.Timestamp("2025-10-30")])
+        
+        mock_data = Mock(spec=StockData)
+        mock_data.earnings_history = mock_earnings
+        mock_data.price_history = None
+        
+        result = analyze_earnings_timing(mock_data, now=datetime(2025, 11, 26, 12, 0))
+        
+        assert result is not None
+        assert result.days_until_earnings == 5
+        # Nov 26, 28 (early close), Dec 1
+        assert result.trading_days_until_earnings == 3
+        assert result.trading_days_since_earnings == 19
+        assert result.timing_flag == "pre_earnings"
+
+
 class TestFundamentals:
     """Test fundamentals analysis."""
     
@@ -1,15 +1,35 @@
 #!/usr/bin/env python3
 """
 Article Fetcher - Fetches and extracts content from article URLs
+
+Articles are fetched concurrently over one pooled httpx.AsyncClient, with a
+global limit and a per-host limit so a batch of stories from the same site
+doesn't hammer it. Bodies are streamed and cut off at MAX_BYTES.
+
+Pages are parsed with lxml and the main content is picked readability-style:
+boilerplate is dropped, paragraphs score their parent and grandparent
+containers, scores are scaled down by link density and the best container
+(plus related siblings) becomes the article text.
+
+Extracted articles are cached per URL with the response's ETag and
+Last-Modified; the next fetch is a conditional GET and a 304 reuses the
+cached article without downloading or parsing it again.
 """
 
+import asyncio
+import hashlib
 import json
+import os
 import random
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from pathlib import Path
 from typing import List, Dict, Optional
-import requests
-from bs4 import BeautifulSoup
+from urllib.parse import urlparse
+
+import httpx
+import lxml.html
+from lxml import etree
 
 # Common user agents to rotate
 USER_AGENTS = [
@@ -19,23 +39,34 @@ USER_AGENTS = [
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
 ]
 
+CACHE_DIR = Path.home() / ".cache/technews/articles"
+CACHE_MAX_AGE = 7 * 86400          # drop cached articles not fetched for a week
+MAX_BYTES = 2 * 1024 * 1024        # article text is near the top; stop reading after 2 MB
+MAX_WORKERS = 10
+PER_HOST = 2
+
+# Elements that never hold article text
+BOILERPLATE_TAGS = ("script", "style", "noscript", "nav", "header", "footer", "aside",
+                    "form", "iframe", "svg", "button", "select", "template")
+UNLIKELY_RE = re.compile(
+    r"comment|sidebar|share|social|related|promo|newsletter|subscribe|cookie|banner|"
+    r"footer|masthead|menu|nav|popup|modal|advert|sponsor|breadcrumb|widget|pagination",
+    re.I
+)
+LIKELY_RE = re.compile(r"article|body|content|entry|main|post|story|text|prose", re.I)
+TEXT_TAGS = ("p", "h1", "h2", "h3", "li", "pre", "blockquote")
+BLOCK_TAGS = {"p", "div", "ul", "ol", "table", "pre", "blockquote", "section", "article",
+              "h1", "h2", "h3", "h4", "h5", "h6", "figure"}
+CLEAN_DOC = etree.XPath("//*[@class or @id]")
+
 
 def get_random_ua() -> str:
     """Get a random user agent for requests."""
     return random.choice(USER_AGENTS)
 
 
-def fetch_article(url: str, timeout: int = 15) -> Dict:
-    """Fetch article content from URL."""
-    headers = {
-        "User-Agent": get_random_ua(),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate",
-        "Connection": "keep-alive",
-    }
-    
-    result = {
+def _empty_result(url: str) -> Dict:
+    return {
         "url": url,
         "success": False,
         "title": "",
@@ -43,76 +74,315 @@ def fetch_article(url: str, timeout: int = 15) -> Dict:
         "word_count": 0,
         "error": None
     }
-    
+
+
+def _text(elem) -> str:
+    return " ".join(elem.text_content().split())
+
+
+def _class_weight(elem) -> int:
+    names = f"{elem.get('class', '')} {elem.get('id', '')}"
+    weight = 0
+    if LIKELY_RE.search(names):
+        weight += 25
+    if UNLIKELY_RE.search(names):
+        weight -= 25
+    return weight
+
+
+def _link_density(elem, text_length: int) -> float:
+    if not text_length:
+        return 1.0
+    link_length = sum(len(_text(a)) for a in elem.iter("a"))
+    return min(link_length / text_length, 1.0)
+
+
+def _drop_boilerplate(doc):
+    etree.strip_elements(doc, *BOILERPLATE_TAGS, etree.Comment, with_tail=False)
+    for elem in CLEAN_DOC(doc):
+        if elem.tag in ("html", "body", "article", "main") or elem.getparent() is None:
+            continue
+        names = f"{elem.get('class', '')} {elem.get('id', '')}"
+        if UNLIKELY_RE.search(names) and not LIKELY_RE.search(names):
+            elem.drop_tree()
+    # Text-only divs are paragraphs in disguise
+    for div in doc.iter("div"):
+        if not any(child.tag in BLOCK_TAGS for child in div):
+            div.tag = "p"
+
+
+def _best_candidates(doc) -> List:
+    """Main-content container (plus related siblings) by paragraph scoring."""
+    scores = {}
+    for p in doc.iter("p", "pre", "td"):
+        text = _text(p)
+        if len(text) < 25 or _link_density(p, len(text)) > 0.5:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        parent = p.getparent()
+        for elem, share in ((parent, 1.0), (parent.getparent() if parent is not None else None, 0.5)):
+            if elem is None or not isinstance(elem.tag, str):
+                continue
+            if elem not in scores:
+                scores[elem] = _class_weight(elem) + (5 if elem.tag in ("div", "article", "section") else 0)
+            scores[elem] += score * share
+
+    if not scores:
+        return []
+    for elem in scores:
+        scores[elem] *= 1 - _link_density(elem, len(_text(elem)))
+    top = max(scores, key=scores.get)
+
+    parent = top.getparent()
+    if parent is None:
+        return [top]
+    threshold = max(10, scores[top] * 0.2)
+    selected = []
+    for sibling in parent:
+        if sibling is top or scores.get(sibling, 0) >= threshold:
+            selected.append(sibling)
+        elif sibling.tag == "p":
+            text = _text(sibling)
+            if len(text) > 80 and _link_density(sibling, len(text)) < 0.25:
+                selected.append(sibling)
+    return selected
+
+
+def _title(doc) -> str:
+    og = doc.xpath("//meta[@property='og:title']/@content")
+    if og and og[0].strip():
+        return og[0].strip()
+    title = doc.find(".//title")
+    if title is not None:
+        return _text(title)
+    h1 = doc.find(".//h1")
+    return _text(h1) if h1 is not None else ""
+
+
+def extract_article(html, url: str = "") -> Dict:
+    """
+    Extract title and main text from an HTML page (str or bytes).
+
+    Returns the same shape as fetch_article: success is False when no
+    article text was found.
+    """
+    result = _empty_result(url)
+    if isinstance(html, str) and html.lstrip().startswith("<?xml"):
+        html = html.encode("utf-8")  # lxml rejects str with an encoding declaration
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # Extract title
-        title_elem = soup.select_one("title")
-        result["title"] = title_elem.get_text(strip=True) if title_elem else ""
-        
-        # Try to find main content - common selectors
-        content_selectors = [
-            "article",
-            "[role=main]",
-            "main",
-            "div.post-content",
-            "div.article-content",
-            "div.entry-content",
-            "div.content",
-            "div.story-body",
-        ]
-        
-        content = None
-        for selector in content_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                content = elem
-                break
-        
-        if not content:
-            # Fallback: find largest text block
-            paragraphs = soup.select("p")
-            if paragraphs:
-                content = paragraphs[0].parent
-        
-        if content:
-            # Extract text from paragraphs
-            text_parts = []
-            for p in content.find_all(["p", "h1", "h2", "h3", "li"]):
-                text = p.get_text(strip=True)
-                if len(text) > 20:  # Filter out nav elements
-                    text_parts.append(text)
-            
-            result["content"] = " ".join(text_parts)
-            result["word_count"] = len(result["content"].split())
-            result["success"] = True
-            
-    except requests.exceptions.Timeout:
-        result["error"] = "timeout"
-    except requests.exceptions.RequestException as e:
-        result["error"] = str(e)
-    except Exception as e:
-        result["error"] = f"parse_error: {str(e)}"
-    
+        doc = lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError) as e:
+        result["error"] = f"parse_error: {e}"
+        return result
+
+    result["title"] = _title(doc)
+    _drop_boilerplate(doc)
+    containers = _best_candidates(doc)
+    if not containers:
+        body = doc.find("body")
+        containers = [body if body is not None else doc]
+
+    text_parts = []
+    for container in containers:
+        for elem in container.iter(*TEXT_TAGS):
+            # Only the innermost text elements, so <li><p>..</p></li> counts once
+            if next(elem.iterdescendants(*TEXT_TAGS), None) is not None:
+                continue
+            text = _text(elem)
+            if len(text) > 20:  # Filter out nav elements
+                text_parts.append(text)
+
+    result["content"] = " ".join(text_parts)
+    result["word_count"] = len(result["content"].split())
+    result["success"] = bool(text_parts)
+    if not text_parts:
+        result["error"] = "no_content"
     return result
 
 
-def fetch_multiple(urls: List[str], max_workers: int = 5) -> List[Dict]:
-    """Fetch multiple articles in parallel."""
-    results = []
-    
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(fetch_article, url): url for url in urls}
-        
-        for future in as_completed(futures):
-            result = future.result()
-            results.append(result)
-    
-    return results
+class ArticleCache:
+    """Extracted articles keyed by URL, with the ETag/Last-Modified they were fetched with."""
+
+    def __init__(self, directory: Path = CACHE_DIR):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+    def get(self, url: str) -> Optional[Dict]:
+        try:
+            with open(self._path(url)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], article: Dict):
+        path = self._path(url)
+        tmp_file = path.with_suffix(".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump({"url": url, "etag": etag, "last_modified": last_modified,
+                       "fetched_at": time.time(), "article": article}, f)
+        os.replace(tmp_file, path)
+
+    def touch(self, url: str):
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def prune(self, max_age: float = CACHE_MAX_AGE) -> int:
+        """Remove entries not used for max_age seconds; returns how many."""
+        cutoff = time.time() - max_age
+        removed = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+class ArticleFetcher:
+    """
+    Async article fetcher: one pooled client, global and per-host concurrency
+    limits, streamed bodies capped at max_bytes, conditional GETs from the cache.
+
+    async with ArticleFetcher() as fetcher:
+        articles = await fetcher.fetch_all(urls)
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS, per_host: int = PER_HOST,
+                 max_bytes: int = MAX_BYTES, timeout: float = 15,
+                 cache: Optional[ArticleCache] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.cache = cache
+        self.transport = transport
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            headers={
+                "User-Agent": get_random_ua(),
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.9",
+            },
+            timeout=self.timeout,
+            follow_redirects=True,
+            transport=self.transport,
+            limits=httpx.Limits(max_connections=self.max_workers,
+                                max_keepalive_connections=self.max_workers),
+        )
+        self.workers = asyncio.Semaphore(self.max_workers)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.aclose()
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return self._host_limits[host]
+
+    async def _download(self, url: str, headers: Dict):
+        """(response, body, truncated); body is None for 304."""
+        async with self.client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 304:
+                return response, None, False
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "")
+            if content_type and "html" not in content_type and "xml" not in content_type:
+                raise ValueError(f"unsupported content type: {content_type.split(';')[0]}")
+            chunks, size, truncated = [], 0, False
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= self.max_bytes:
+                    truncated = True
+                    break
+            return response, b"".join(chunks)[:self.max_bytes], truncated
+
+    async def fetch(self, url: str) -> Dict:
+        """Fetch and extract one article (never raises; errors go in result["error"])."""
+        cached = self.cache.get(url) if self.cache else None
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        result = _empty_result(url)
+        try:
+            # Wait for the host first so queued requests to a busy host don't
+            # hold global slots that other hosts could use
+            async with self._host_limit(url), self.workers:
+                response, body, truncated = await self._download(url, headers)
+        except httpx.TimeoutException:
+            result["error"] = "timeout"
+            return result
+        except httpx.HTTPError as e:
+            result["error"] = str(e)
+            return result
+        except ValueError as e:
+            result["error"] = str(e)
+            return result
+
+        if body is None and cached:
+            self.cache.touch(url)
+            return dict(cached["article"], cached=True)
+
+        html = body
+        if response.charset_encoding:
+            html = body.decode(response.charset_encoding, errors="replace")
+        try:
+            result = await asyncio.to_thread(extract_article, html, url)
+        except Exception as e:
+            result["error"] = f"parse_error: {str(e)}"
+            return result
+        if truncated:
+            result["truncated"] = True
+
+        if result["success"] and self.cache:
+            validators = (response.headers.get("etag"), response.headers.get("last-modified"))
+            if any(validators):
+                self.cache.put(url, *validators, result)
+        return result
+
+    async def fetch_all(self, urls: List[str]) -> List[Dict]:
+        """Fetch all URLs concurrently; results are in the order of urls."""
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
+
+
+async def fetch_multiple_async(urls: List[str], max_workers: int = MAX_WORKERS,
+                               per_host: int = PER_HOST, use_cache: bool = True) -> List[Dict]:
+    """Fetch multiple articles concurrently (results in input order)."""
+    cache = None
+    if use_cache:
+        cache = ArticleCache()
+        cache.prune()
+    async with ArticleFetcher(max_workers, per_host, cache=cache) as fetcher:
+        return await fetcher.fetch_all(urls)
+
+
+def fetch_article(url: str, timeout: int = 15) -> Dict:
+    """Fetch article content from URL."""
+    async def run():
+        async with ArticleFetcher(1, 1, timeout=timeout, cache=ArticleCache()) as fetcher:
+            return await fetcher.fetch(url)
+    return asyncio.run(run())
+
+
+def fetch_multiple(urls: List[str], max_workers: int = MAX_WORKERS) -> List[Dict]:
+    """Fetch multiple articles in parallel (results in input order)."""
+    return asyncio.run(fetch_multiple_async(urls, max_workers))
 
 
 def summarize_content(content: str, max_words: int = 100) -> str:
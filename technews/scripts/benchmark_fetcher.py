@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Article pipeline benchmark on the saved HTML fixtures (technews/fixtures/).
+
+Extraction: pages/second and MB/second for the lxml extractor next to a
+reference implementation of the previous BeautifulSoup(html.parser)
+selector-based extraction (skipped when beautifulsoup4 isn't installed),
+with the word count each one extracts per fixture.
+
+Fetching: ArticleFetcher against an in-process transport that serves the
+fixtures from several hosts with simulated latency and ETags. Reports
+articles/second cold and revalidated (304s from the cache), and the highest
+per-host concurrency seen.
+
+Usage:
+    python3 scripts/benchmark_fetcher.py
+    python3 scripts/benchmark_fetcher.py --iterations 200 --urls 300 --hosts 6 --latency 0.05
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from article_fetcher import ArticleCache, ArticleFetcher, extract_article
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+
+def reference_extract(html: str) -> Dict:
+    """Previous implementation: html.parser soup, first matching content selector."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    title_elem = soup.select_one("title")
+    title = title_elem.get_text(strip=True) if title_elem else ""
+
+    content = None
+    for selector in ["article", "[role=main]", "main", "div.post-content", "div.article-content",
+                     "div.entry-content", "div.content", "div.story-body"]:
+        content = soup.select_one(selector)
+        if content:
+            break
+    if not content:
+        paragraphs = soup.select("p")
+        if paragraphs:
+            content = paragraphs[0].parent
+
+    text = ""
+    if content:
+        parts = [p.get_text(strip=True) for p in content.find_all(["p", "h1", "h2", "h3", "li"])]
+        text = " ".join(t for t in parts if len(t) > 20)
+    return {"title": title, "content": text, "word_count": len(text.split())}
+
+
+def load_fixtures() -> Dict[str, bytes]:
+    fixtures = {path.name: path.read_bytes() for path in sorted(FIXTURES_DIR.glob("*.html"))}
+    if not fixtures:
+        print(f"No fixtures in {FIXTURES_DIR}")
+        sys.exit(1)
+    return fixtures
+
+
+def bench_extract(fixtures: Dict[str, bytes], iterations: int):
+    total_bytes = sum(len(body) for body in fixtures.values()) * iterations
+    pages = len(fixtures) * iterations
+
+    print(f"Extraction: {len(fixtures)} fixtures x {iterations} iterations "
+          f"({total_bytes / 1e6:.1f} MB)")
+    try:
+        import bs4  # noqa: F401
+        has_reference = True
+    except ImportError:
+        has_reference = False
+        print("  (beautifulsoup4 not installed: reference skipped)")
+
+    runs = [("lxml readability", lambda body: extract_article(body))]
+    if has_reference:
+        runs.append(("bs4 html.parser", lambda body: reference_extract(body.decode("utf-8", "replace"))))
+
+    for name, extract in runs:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for body in fixtures.values():
+                extract(body)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<18} {pages / elapsed:8.0f} pages/s  {total_bytes / elapsed / 1e6:6.1f} MB/s")
+
+    print("\n  Words extracted per fixture:")
+    for name, body in fixtures.items():
+        line = f"    {name:<22} lxml {extract_article(body)['word_count']:5d}"
+        if has_reference:
+            line += f"   bs4 {reference_extract(body.decode('utf-8', 'replace'))['word_count']:5d}"
+        print(line)
+
+
+def make_transport(fixtures: Dict[str, bytes], latency: float, stats: Dict):
+    bodies = list(fixtures.values())
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        stats["active"][host] = stats["active"].get(host, 0) + 1
+        stats["max_per_host"] = max(stats["max_per_host"], stats["active"][host])
+        try:
+            await asyncio.sleep(latency)
+            index = int(request.url.path.rsplit("/", 1)[-1]) % len(bodies)
+            etag = f'"{index}"'
+            if request.headers.get("if-none-match") == etag:
+                stats["not_modified"] += 1
+                return httpx.Response(304, headers={"ETag": etag})
+            return httpx.Response(200, content=bodies[index],
+                                  headers={"Content-Type": "text/html; charset=utf-8", "ETag": etag})
+        finally:
+            stats["active"][host] -= 1
+
+    return httpx.MockTransport(handler)
+
+
+async def bench_fetch(fixtures: Dict[str, bytes], urls: List[str], latency: float,
+                      max_workers: int, per_host: int):
+    stats = {"active": {}, "max_per_host": 0, "not_modified": 0}
+    transport = make_transport(fixtures, latency, stats)
+    hosts = len({httpx.URL(url).host for url in urls})
+
+    print(f"\nFetching: {len(urls)} URLs on {hosts} hosts, {latency * 1000:.0f} ms latency, "
+          f"{max_workers} workers, {per_host} per host")
+    print(f"  (serial fetching would take at least {len(urls) * latency:.1f}s)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ArticleCache(Path(tmp))
+        for label in ("cold", "revalidated"):
+            async with ArticleFetcher(max_workers, per_host, cache=cache, transport=transport) as fetcher:
+                start = time.perf_counter()
+                results = await fetcher.fetch_all(urls)
+                elapsed = time.perf_counter() - start
+            ok = sum(1 for r in results if r["success"])
+            cached = sum(1 for r in results if r.get("cached"))
+            print(f"  {label:<12} {len(urls) / elapsed:8.1f} articles/s  {elapsed:6.2f}s  "
+                  f"{ok} extracted, {cached} from cache")
+
+    print(f"  Max concurrent requests per host: {stats['max_per_host']} (limit {per_host})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark article fetching and extraction")
+    parser.add_argument("--iterations", type=int, default=100, help="Extraction passes over the fixtures")
+    parser.add_argument("--urls", type=int, default=200, help="URLs to fetch")
+    parser.add_argument("--hosts", type=int, default=8, help="Distinct hosts")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated response latency (s)")
+    parser.add_argument("--workers", type=int, default=10, help="Global concurrency")
+    parser.add_argument("--per-host", type=int, default=2, help="Per-host concurrency")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures()
+    bench_extract(fixtures, args.iterations)
+
+    urls = [f"https://news{i % args.hosts}.example.com/articles/{i}" for i in range(args.urls)]
+    asyncio.run(bench_fetch(fixtures, urls, args.latency, args.workers, args.per_host))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Feed Poller - Incremental RSS/Atom polling with conditional GET
+
+Each feed's ETag and Last-Modified are stored, so a repeat poll is a
+conditional GET and an unchanged feed costs a 304 with no body. Bodies are
+parsed incrementally as they download (XMLPullParser) and reading stops once
+max_items entries have been parsed. Every item is remembered per feed, so a
+poll reports the feed's current items and which of them are new since the
+last poll.
+
+Feeds are polled concurrently. Each feed has its own adaptive interval: it
+halves when a poll finds new items and grows by half when the feed is
+unchanged (doubles on errors), within [min_interval, max_interval]. A feed
+polled again before its interval is up is not fetched; the last items are
+returned with status "skipped".
+
+Standard library only, so other skills can import it:
+
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent / "technews" / "scripts"))
+    from feed_poller import FeedPoller
+
+    poller = FeedPoller(Path("cache/feeds.db"))
+    results = poller.poll_many([url1, url2], max_items=20)
+    for item in results[url1]["new"]:
+        print(item["title"], item["link"])
+
+Result per feed: {"url", "status": ok|not_modified|skipped|error, "items",
+"new", "error", "next_poll"}; items are {"id", "title", "link", "summary",
+"published"}, in feed order.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from html import unescape
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_STATE_FILE = Path.home() / ".cache/technews/feeds.db"
+USER_AGENT = "Mozilla/5.0 (compatible; TechNewsBot/1.0)"
+CHUNK_SIZE = 64 * 1024
+SEEN_MAX_AGE = 30 * 86400  # forget items not in a feed for 30 days
+
+ITEM_TAGS = {"item", "entry"}
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _clean(text: Optional[str]) -> str:
+    if not text:
+        return ""
+    return " ".join(unescape(re.sub(r"<[^>]+>", " ", text)).split())
+
+
+def _item_from_element(elem) -> Dict:
+    fields = {}
+    link = ""
+    for child in elem:
+        name = _local(child.tag)
+        if name == "link":
+            # Atom: <link rel="alternate" href=".."/>, RSS: <link>..</link>
+            if child.get("href") and child.get("rel", "alternate") == "alternate":
+                link = link or child.get("href")
+            elif child.text and child.text.strip():
+                link = link or child.text.strip()
+        elif name not in fields:
+            fields[name] = child.text or ""
+
+    title = _clean(fields.get("title"))
+    summary = fields.get("description") or fields.get("summary") or fields.get("content") or ""
+    published = fields.get("pubDate") or fields.get("published") or fields.get("updated") or fields.get("date") or ""
+    item_id = (fields.get("guid") or fields.get("id") or link or title).strip()
+    return {
+        "id": item_id,
+        "title": title,
+        "link": link,
+        "summary": _clean(summary),
+        "published": published.strip(),
+    }
+
+
+class FeedParser:
+    """Incremental RSS/Atom parser: feed() bytes as they arrive, collect items."""
+
+    def __init__(self, max_items: Optional[int] = None):
+        self.max_items = max_items
+        self.items: List[Dict] = []
+        self._parser = ET.XMLPullParser(events=("end",))
+
+    @property
+    def done(self) -> bool:
+        return self.max_items is not None and len(self.items) >= self.max_items
+
+    def feed(self, data: bytes):
+        self._parser.feed(data)
+        self._collect()
+
+    def close(self):
+        self._parser.close()
+        self._collect()
+
+    def _collect(self):
+        for _, elem in self._parser.read_events():
+            if self.done:
+                return
+            if _local(elem.tag) in ITEM_TAGS:
+                self.items.append(_item_from_element(elem))
+                elem.clear()
+
+
+def parse_feed(data: bytes, max_items: Optional[int] = None) -> List[Dict]:
+    """Parse a whole RSS/Atom document (items parsed before a syntax error are kept)."""
+    parser = FeedParser(max_items)
+    try:
+        for start in range(0, len(data), CHUNK_SIZE):
+            parser.feed(data[start:start + CHUNK_SIZE])
+            if parser.done:
+                break
+        if not parser.done:
+            parser.close()
+    except ET.ParseError:
+        if not parser.items:
+            raise
+    return parser.items
+
+
+def fetch_feed(url: str, etag: Optional[str] = None, last_modified: Optional[str] = None,
+               max_items: Optional[int] = None, timeout: float = 15) -> Dict:
+    """
+    Conditional GET of a feed, parsed while it streams in.
+
+    Returns {"status": "ok"|"not_modified", "items", "etag", "last_modified"};
+    raises urllib.error.URLError / ET.ParseError / OSError on failure.
+    """
+    headers = {
+        "User-Agent": USER_AGENT,
+        "Accept": "application/rss+xml, application/atom+xml, application/xml, text/xml, */*",
+        "Accept-Encoding": "gzip",
+    }
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return {"status": "not_modified", "items": [], "etag": etag, "last_modified": last_modified}
+        raise
+
+    with response:
+        decompress = None
+        if response.headers.get("Content-Encoding") == "gzip":
+            decompress = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        parser = FeedParser(max_items)
+        try:
+            while not parser.done:
+                chunk = response.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                parser.feed(decompress.decompress(chunk) if decompress else chunk)
+            if not parser.done:
+                parser.close()
+        except ET.ParseError:
+            if not parser.items:
+                raise
+        return {
+            "status": "ok",
+            "items": parser.items,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+
+def _retry_after(error: Exception) -> float:
+    if isinstance(error, urllib.error.HTTPError) and error.headers:
+        try:
+            return float(error.headers.get("Retry-After", 0))
+        except ValueError:
+            pass
+    return 0
+
+
+class FeedPoller:
+    """Per-feed conditional GET state, seen items and adaptive poll intervals (SQLite)."""
+
+    def __init__(self, path: Path = DEFAULT_STATE_FILE, min_interval: float = 300,
+                 max_interval: float = 7200, default_interval: float = 900, timeout: float = 15):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS feeds (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                interval REAL NOT NULL,
+                last_poll REAL,
+                next_poll REAL NOT NULL,
+                max_items INTEGER,
+                failures INTEGER NOT NULL DEFAULT 0,
+                snapshot TEXT NOT NULL DEFAULT '[]'
+            );
+            CREATE TABLE IF NOT EXISTS seen (
+                feed_url TEXT NOT NULL,
+                item_key TEXT NOT NULL,
+                last_seen REAL NOT NULL,
+                PRIMARY KEY (feed_url, item_key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_seen_last_seen ON seen (last_seen);
+        """)
+        self._conn.commit()
+
+    def _feed_state(self, url: str) -> Optional[Dict]:
+        row = self._conn.execute(
+            "SELECT etag, last_modified, interval, next_poll, max_items, failures, snapshot "
+            "FROM feeds WHERE url = ?", (url,)
+        ).fetchone()
+        if not row:
+            return None
+        etag, last_modified, interval, next_poll, max_items, failures, snapshot = row
+        return {"etag": etag, "last_modified": last_modified, "interval": interval,
+                "next_poll": next_poll, "max_items": max_items, "failures": failures,
+                "snapshot": json.loads(snapshot)}
+
+    @staticmethod
+    def _widens(state: Dict, max_items: Optional[int]) -> bool:
+        """True if max_items asks for more than the stored snapshot was capped at."""
+        cap = state["max_items"]
+        return cap is not None and (max_items is None or max_items > cap)
+
+    def _is_due(self, state: Optional[Dict], max_items: Optional[int], now: float) -> bool:
+        return state is None or now >= state["next_poll"] or self._widens(state, max_items)
+
+    def poll(self, url: str, max_items: Optional[int] = None, force: bool = False) -> Dict:
+        """Poll one feed (fetching only if due or forced); see module docstring for the result."""
+        now = time.time()
+        with self._lock:
+            state = self._feed_state(url)
+        result = {"url": url, "status": "skipped", "items": [], "new": [], "error": None}
+
+        if not force and not self._is_due(state, max_items, now):
+            result["items"] = state["snapshot"][:max_items]
+            result["next_poll"] = _iso(state["next_poll"])
+            return result
+
+        etag = state["etag"] if state else None
+        last_modified = state["last_modified"] if state else None
+        if state and self._widens(state, max_items):
+            # A 304 would not bring the items missing from the capped snapshot
+            etag = last_modified = None
+        interval = state["interval"] if state else self.default_interval
+        failures = state["failures"] if state else 0
+        snapshot = state["snapshot"] if state else []
+        cap = max_items
+
+        try:
+            fetched = fetch_feed(url, etag, last_modified, max_items, self.timeout)
+        except (urllib.error.URLError, ET.ParseError, OSError, ValueError) as e:
+            result.update(status="error", error=str(e), items=snapshot[:max_items])
+            failures += 1
+            interval = max(min(interval * 2, self.max_interval), _retry_after(e))
+            cap = state["max_items"] if state else max_items
+        else:
+            result["status"] = fetched["status"]
+            failures = 0
+            if fetched["status"] == "not_modified":
+                result["items"] = snapshot[:max_items]
+                interval = min(interval * 1.5, self.max_interval)
+                cap = state["max_items"] if state else max_items
+            else:
+                etag, last_modified = fetched["etag"], fetched["last_modified"]
+                snapshot = fetched["items"]
+                result["items"] = snapshot
+                with self._lock:
+                    result["new"] = self._mark_seen(url, snapshot, now)
+                if state is None:
+                    pass  # first poll: every item is new, no signal yet
+                elif result["new"]:
+                    interval = max(interval * 0.5, self.min_interval)
+                else:
+                    interval = min(interval * 1.5, self.max_interval)
+
+        next_poll = now + interval
+        result["next_poll"] = _iso(next_poll)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO feeds (url, etag, last_modified, interval, last_poll, "
+                "next_poll, max_items, failures, snapshot) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, interval, now, next_poll, cap, failures, json.dumps(snapshot))
+            )
+            self._conn.commit()
+        return result
+
+    def _mark_seen(self, url: str, items: List[Dict], now: float) -> List[Dict]:
+        """Record items as seen; returns those not seen before."""
+        keys = [hashlib.sha1(item["id"].encode()).hexdigest() for item in items]
+        known = set()
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            known.update(row[0] for row in self._conn.execute(
+                f"SELECT item_key FROM seen WHERE feed_url = ? AND item_key IN ({','.join('?' * len(chunk))})",
+                (url, *chunk)
+            ))
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO seen (feed_url, item_key, last_seen) VALUES (?, ?, ?)",
+            [(url, key, now) for key in keys]
+        )
+        self._conn.execute("DELETE FROM seen WHERE last_seen < ?", (now - SEEN_MAX_AGE,))
+        new, emitted = [], set()
+        for key, item in zip(keys, items):
+            if key not in known and key not in emitted:
+                emitted.add(key)
+                new.append(item)
+        return new
+
+    def poll_many(self, urls: Iterable[str], max_items: Optional[int] = None,
+                  force: bool = False, max_workers: int = 8) -> Dict[str, Dict]:
+        """Poll feeds concurrently; results keyed by URL."""
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+            results = executor.map(lambda url: self.poll(url, max_items, force), urls)
+            return dict(zip(urls, results))
+
+    def status(self) -> List[Dict]:
+        """Per-feed polling state (for --status)."""
+        rows = self._conn.execute(
+            "SELECT url, interval, last_poll, next_poll, failures, etag IS NOT NULL OR last_modified IS NOT NULL "
+            "FROM feeds ORDER BY url"
+        ).fetchall()
+        return [
+            {"url": url, "interval_minutes": round(interval / 60, 1), "last_poll": _iso(last_poll),
+             "next_poll": _iso(next_poll), "failures": failures, "conditional": bool(conditional)}
+            for url, interval, last_poll, next_poll, failures, conditional in rows
+        ]
+
+    def close(self):
+        self._conn.close()
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="seconds")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Poll RSS/Atom feeds and print their new items",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 feed_poller.py https://www.techmeme.com/feed.xml
+  python3 feed_poller.py URL1 URL2 --new-only --max-items 20
+  python3 feed_poller.py URL --force          # ignore the poll interval
+  python3 feed_poller.py --status
+"""
+    )
+    parser.add_argument("urls", nargs="*", help="Feed URLs")
+    parser.add_argument("--state", type=Path, default=DEFAULT_STATE_FILE, help="State database")
+    parser.add_argument("--max-items", type=int, help="Stop parsing each feed after N items")
+    parser.add_argument("--force", action="store_true", help="Poll even if the feed is not due")
+    parser.add_argument("--new-only", action="store_true", help="Only print items not seen before")
+    parser.add_argument("--status", action="store_true", help="Show per-feed intervals and exit")
+    args = parser.parse_args()
+
+    poller = FeedPoller(args.state)
+    try:
+        if args.status:
+            print(json.dumps(poller.status(), indent=2))
+            return
+        if not args.urls:
+            parser.print_help()
+            sys.exit(1)
+        results = poller.poll_many(args.urls, args.max_items, args.force)
+        if args.new_only:
+            for result in results.values():
+                result.pop("items")
+        print(json.dumps(list(results.values()), indent=2, ensure_ascii=False))
+    finally:
+        poller.close()
+
+
+if __name__ == "__main__":
+    main()
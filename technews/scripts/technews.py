@@ -6,6 +6,7 @@ TechNews Orchestrator - Main entry point for the technews skill
 import json
 import sys
 from pathlib import Path
+from typing import Dict, List
 
 # Add scripts to path
 SCRIPT_DIR = Path(__file__).parent
@@ -13,7 +14,7 @@ SCRIPT_DIR = Path(__file__).parent
 # Import our modules
 sys.path.insert(0, str(SCRIPT_DIR))
 
-from techmeme_scraper import fetch_techmeme, load_cache, save_cache
+from techmeme_scraper import fetch_techmeme
 from article_fetcher import fetch_multiple, summarize_content
 from social_reactions import analyze_reactions
 
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Outbound alert queue for topic-monitor.
+
+send_alert no longer talks to Telegram/Discord/email inline: it appends the
+message to a persistent spool (.alert_spool.db) and returns. One worker
+thread per channel delivers from the spool in the background while topics
+are still being searched:
+
+- Batching: due messages for a channel are joined into one send up to the
+  channel's size limit (Discord 2000 chars, Telegram 4096, email 50 alerts).
+- Rate limits: at most rate_limit_per_minute sends per channel; Discord 429
+  responses pause the channel for Retry-After / retry_after, and an
+  exhausted X-RateLimit-Remaining bucket waits for X-RateLimit-Reset-After.
+- Retries: network errors and 5xx responses are retried with exponential
+  backoff and jitter, up to MAX_ATTEMPTS; other 4xx responses fail at once.
+
+Anything not delivered when the run ends stays in the spool and is picked up
+by the next run (or by `alert_queue.py --flush`).
+
+Usage:
+    python3 scripts/alert_queue.py --status
+    python3 scripts/alert_queue.py --flush
+"""
+
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import ALERT_SPOOL_FILE, get_channel_config
+
+# Per-channel batching and rate defaults (overridable in channels.<name>)
+CHANNEL_LIMITS = {
+    "discord": {"max_chars": 2000, "max_messages": 10, "rate_limit_per_minute": 30},
+    "telegram": {"max_chars": 4096, "max_messages": 10, "rate_limit_per_minute": 20},
+    "email": {"max_chars": 100000, "max_messages": 50, "rate_limit_per_minute": 10},
+}
+BATCH_SEPARATOR = "\n\n───\n\n"
+
+MAX_ATTEMPTS = 8
+BACKOFF_BASE_SECONDS = 2
+BACKOFF_MAX_SECONDS = 900
+CLAIM_TIMEOUT_SECONDS = 600  # 'sending' rows older than this were abandoned by a crashed run
+
+
+class Delivery:
+    """Outcome of one send: ok, or retry (optionally after N seconds), or permanent failure."""
+
+    def __init__(self, ok: bool, retry_after: Optional[float] = None, permanent: bool = False,
+                 error: str = "", pause: Optional[float] = None):
+        self.ok = ok
+        self.retry_after = retry_after
+        self.permanent = permanent
+        self.error = error
+        self.pause = pause  # rate-limit bucket exhausted: wait before the next send
+
+
+class Spool:
+    """SQLite spool of outbound alerts (one connection per thread)."""
+
+    def __init__(self, path: Path = ALERT_SPOOL_FILE):
+        self._conn = sqlite3.connect(str(path), timeout=30, isolation_level=None)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS alerts (
+                id INTEGER PRIMARY KEY,
+                channel TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                subject TEXT,
+                message TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                claimed_at REAL,
+                last_error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_alerts_due ON alerts (channel, status, next_attempt_at);
+        """)
+
+    def enqueue(self, channel: str, message: str, priority: str = "high", subject: str = "") -> int:
+        now = time.time()
+        cursor = self._conn.execute(
+            "INSERT INTO alerts (channel, priority, subject, message, created_at, next_attempt_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (channel, priority, subject, message, now, now)
+        )
+        return cursor.lastrowid
+
+    def claim(self, channel: str, max_chars: int, max_messages: int) -> List[Tuple[int, str, str, int]]:
+        """Mark a batch of due alerts as 'sending' and return (id, message, subject, attempts)."""
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "UPDATE alerts SET status = 'pending' WHERE channel = ? AND status = 'sending' AND claimed_at < ?",
+                (channel, now - CLAIM_TIMEOUT_SECONDS)
+            )
+            rows = self._conn.execute(
+                "SELECT id, message, subject, attempts FROM alerts "
+                "WHERE channel = ? AND status = 'pending' AND next_attempt_at <= ? "
+                "ORDER BY priority = 'high' DESC, id LIMIT ?",
+                (channel, now, max_messages)
+            ).fetchall()
+            batch, size = [], 0
+            for row in rows:
+                length = len(row[1]) + (len(BATCH_SEPARATOR) if batch else 0)
+                if batch and size + length > max_chars:
+                    break
+                batch.append(row)
+                size += length
+            self._conn.executemany(
+                "UPDATE alerts SET status = 'sending', claimed_at = ? WHERE id = ?",
+                [(now, row[0]) for row in batch]
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return batch
+
+    def mark_sent(self, ids: List[int]):
+        self._conn.executemany("UPDATE alerts SET status = 'sent', last_error = NULL WHERE id = ?", [(i,) for i in ids])
+
+    def mark_retry(self, batch: List[Tuple], delivery: Delivery):
+        now = time.time()
+        jitter = random.uniform(0.8, 1.2)  # one factor per batch so it is retried together
+        for alert_id, _, _, attempts in batch:
+            attempts += 1
+            if delivery.permanent or attempts >= MAX_ATTEMPTS:
+                status, next_at = "failed", now
+            else:
+                backoff = delivery.retry_after
+                if backoff is None:
+                    backoff = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS) * jitter
+                status, next_at = "pending", now + backoff
+            self._conn.execute(
+                "UPDATE alerts SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (status, attempts, next_at, delivery.error[:500], alert_id)
+            )
+
+    def next_attempt(self, channel: str) -> Optional[float]:
+        """Earliest next_attempt_at among the channel's pending alerts."""
+        return self._conn.execute(
+            "SELECT MIN(next_attempt_at) FROM alerts WHERE channel = ? AND status = 'pending'", (channel,)
+        ).fetchone()[0]
+
+    def status_counts(self) -> Dict[Tuple[str, str], int]:
+        return {
+            (channel, status): count for channel, status, count in self._conn.execute(
+                "SELECT channel, status, COUNT(*) FROM alerts GROUP BY channel, status"
+            )
+        }
+
+    def purge_sent(self, older_than_days: float = 7):
+        self._conn.execute(
+            "DELETE FROM alerts WHERE status = 'sent' AND created_at < ?",
+            (time.time() - older_than_days * 86400,)
+        )
+
+    def close(self):
+        self._conn.close()
+
+
+# ----------------------------------------------------------------------
+# Channel senders
+# ----------------------------------------------------------------------
+
+def send_discord(text: str, config: Dict) -> Delivery:
+    """POST one message to the Discord webhook and classify the response."""
+    import requests
+
+    webhook_url = config.get("webhook_url")
+    if not webhook_url:
+        return Delivery(False, permanent=True, error="Discord webhook not configured")
+
+    payload = {
+        "username": config.get("username", "Research Bot"),
+        "avatar_url": config.get("avatar_url"),
+        "content": text
+    }
+    try:
+        response = requests.post(webhook_url, json=payload, timeout=10)
+    except Exception as e:
+        return Delivery(False, error=str(e))
+
+    pause = None
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        pause = float(response.headers.get("X-RateLimit-Reset-After", 1))
+
+    if response.status_code in (200, 204):
+        return Delivery(True, pause=pause)
+    if response.status_code == 429:
+        retry_after = response.headers.get("Retry-After")
+        try:
+            retry_after = float(retry_after) if retry_after else float(response.json().get("retry_after", 1))
+        except (ValueError, AttributeError):
+            retry_after = 1.0
+        return Delivery(False, retry_after=retry_after, error="429 rate limited", pause=retry_after)
+    if response.status_code >= 500:
+        return Delivery(False, error=f"HTTP {response.status_code}")
+    return Delivery(False, permanent=True, error=f"HTTP {response.status_code}: {response.text[:200]}")
+
+
+def send_telegram(text: str, config: Dict) -> Delivery:
+    """Send via Telegram (requires OpenClaw message tool)."""
+    # In real environment, this would use OpenClaw's message tool
+    # For now, just log
+    print(f"📱 [TELEGRAM] {text[:100]}...")
+    return Delivery(True)
+
+
+def send_email(text: str, config: Dict, subject: str = "") -> Delivery:
+    """Send via email."""
+    print(f"📧 [EMAIL] {subject}")
+    return Delivery(True)
+
+
+def deliver(channel: str, texts: List[str], subjects: List[str], config: Dict) -> Delivery:
+    text = BATCH_SEPARATOR.join(texts)
+    if channel == "discord":
+        return send_discord(text, config)
+    if channel == "telegram":
+        return send_telegram(text, config)
+    if channel == "email":
+        subject = subjects[0] if len(subjects) == 1 else f"{len(subjects)} research alerts"
+        return send_email(text, config, subject)
+    return Delivery(False, permanent=True, error=f"Unknown channel: {channel}")
+
+
+# ----------------------------------------------------------------------
+# Workers
+# ----------------------------------------------------------------------
+
+class ChannelWorker(threading.Thread):
+    """Delivers one channel's spooled alerts: batch, rate-limit, retry."""
+
+    def __init__(self, channel: str, path: Path, verbose: bool = False):
+        super().__init__(name=f"alerts-{channel}", daemon=True)
+        self.channel = channel
+        self.path = path
+        self.verbose = verbose
+        self.config = get_channel_config(channel)
+        self.limits = {**CHANNEL_LIMITS.get(channel, CHANNEL_LIMITS["telegram"]),
+                       **{k: v for k, v in self.config.items() if k in CHANNEL_LIMITS["discord"]}}
+        self.min_interval = 60.0 / max(self.limits["rate_limit_per_minute"], 1)
+        self.wakeup = threading.Event()
+        self.draining = threading.Event()
+        self.deadline: Optional[float] = None
+        self.sent = 0
+        self.failed = 0
+        self._next_send = 0.0
+
+    def run(self):
+        spool = Spool(self.path)
+        try:
+            while True:
+                if self.deadline is not None and time.monotonic() >= self.deadline:
+                    break
+                wait = self._next_send - time.monotonic()
+                if wait > 0:
+                    self._sleep(wait)
+                    continue
+
+                batch = spool.claim(self.channel, self.limits["max_chars"], self.limits["max_messages"])
+                if not batch:
+                    if self.draining.is_set():
+                        # Wait for retries that come due before the deadline, else stop
+                        next_at = spool.next_attempt(self.channel)
+                        remaining = self.deadline - time.monotonic() if self.deadline else 0
+                        if next_at is None or next_at - time.time() >= remaining:
+                            break
+                        self._sleep(next_at - time.time())
+                        continue
+                    self.wakeup.wait(1.0)
+                    self.wakeup.clear()
+                    continue
+
+                texts = [row[1][:self.limits["max_chars"]] for row in batch]
+                delivery = deliver(self.channel, texts, [row[2] for row in batch], self.config)
+                self._next_send = time.monotonic() + max(self.min_interval, delivery.pause or 0)
+                if delivery.ok:
+                    spool.mark_sent([row[0] for row in batch])
+                    self.sent += len(batch)
+                    if self.verbose:
+                        print(f"✅ Sent {len(batch)} alert(s) to {self.channel}")
+                else:
+                    spool.mark_retry(batch, delivery)
+                    if delivery.permanent:
+                        self.failed += len(batch)
+                    print(f"❌ {self.channel} delivery failed ({delivery.error}); "
+                          f"{'dropped' if delivery.permanent else 'will retry'}", file=sys.stderr)
+        finally:
+            spool.close()
+
+    def _sleep(self, seconds: float):
+        if self.deadline is not None:
+            seconds = min(seconds, self.deadline - time.monotonic())
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class AlertDispatcher:
+    """Spool writer plus one background worker per channel."""
+
+    def __init__(self, channels: Optional[List[str]] = None, path: Path = ALERT_SPOOL_FILE, verbose: bool = False):
+        self.path = path
+        self.verbose = verbose
+        self.spool = Spool(path)
+        self.workers: Dict[str, ChannelWorker] = {}
+        for channel in channels or []:
+            self._worker(channel)
+
+    def _worker(self, channel: str) -> ChannelWorker:
+        worker = self.workers.get(channel)
+        if worker is None:
+            worker = self.workers[channel] = ChannelWorker(channel, self.path, self.verbose)
+            worker.start()
+        return worker
+
+    def enqueue(self, channel: str, message: str, priority: str = "high", subject: str = ""):
+        """Spool one alert and wake its channel worker (returns immediately)."""
+        self.spool.enqueue(channel, message, priority, subject)
+        self._worker(channel).wakeup.set()
+
+    def close(self, timeout: float = 30) -> Dict[str, int]:
+        """Deliver what is due within timeout; the rest stays spooled. Returns sent/failed/pending."""
+        deadline = time.monotonic() + timeout
+        for worker in self.workers.values():
+            worker.deadline = deadline
+            worker.draining.set()
+            worker.wakeup.set()
+        for worker in self.workers.values():
+            worker.join(max(deadline - time.monotonic(), 0) + 1)
+        stats = {
+            "sent": sum(w.sent for w in self.workers.values()),
+            "failed": sum(w.failed for w in self.workers.values()),
+            "pending": sum(count for (_, status), count in self.spool.status_counts().items()
+                           if status in ("pending", "sending")),
+        }
+        self.spool.purge_sent()
+        self.spool.close()
+        return stats
+
+
+def spooled_channels(path: Path = ALERT_SPOOL_FILE) -> List[str]:
+    """Channels with undelivered alerts (so a new run resumes them)."""
+    spool = Spool(path)
+    try:
+        return sorted({channel for (channel, status) in spool.status_counts() if status in ("pending", "sending")})
+    finally:
+        spool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Inspect or flush the outbound alert spool",
+        epilog="Examples:\n"
+               "  python3 scripts/alert_queue.py --status\n"
+               "  python3 scripts/alert_queue.py --flush --timeout 120",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--status", action="store_true", help="Show spooled alerts per channel and status")
+    parser.add_argument("--flush", action="store_true", help="Deliver pending alerts now")
+    parser.add_argument("--timeout", type=float, default=60, help="Flush time limit in seconds (default: 60)")
+    args = parser.parse_args()
+
+    if args.flush:
+        dispatcher = AlertDispatcher(spooled_channels(), verbose=True)
+        stats = dispatcher.close(timeout=args.timeout)
+        print(f"📬 Sent {stats['sent']}, failed {stats['failed']}, still pending {stats['pending']}")
+        return
+
+    spool = Spool()
+    counts = spool.status_counts()
+    spool.close()
+    if not counts:
+        print("📭 Alert spool is empty")
+        return
+    print(f"{'channel':12} {'status':10} {'count':>6}")
+    for (channel, status), count in sorted(counts.items()):
+        print(f"{channel:12} {status:10} {count:6d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Scoring throughput benchmark for ImportanceScorer.
+
+Scores synthetic search results against synthetic topics and reports
+results/second for the compiled matcher, next to a reference implementation
+of the previous per-keyword regex scoring. Every (priority, score, reason)
+from the compiled matcher is checked against the reference.
+
+Usage:
+    python3 scripts/benchmark_scorer.py
+    python3 scripts/benchmark_scorer.py --results 5000 --topics 40 --keywords 12
+"""
+
+import re
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from importance_scorer import ImportanceScorer, score_result
+
+VOCABULARY = (
+    "ai model release launch announce gpt llm open source patch update version critical "
+    "bug fix security vulnerability cve exploit paper arxiv benchmark training inference "
+    "gpu nvidia chip price surge plunge market stock crypto bitcoin ethereum regulation "
+    "startup funding acquisition api developer framework python rust kernel linux cloud "
+    "machine learning data privacy quantum robotics battery electric vehicle"
+).split()
+
+SOURCES = ["github.com", "arxiv.org", "techcrunch.com", "example.com", "medium.com",
+           "theverge.com", "reddit.com", "news.ycombinator.com", "blog.example.org"]
+
+CONDITIONS = ["keyword_exact_match", "model_release", "patch_release", "major_bug_fix",
+              "major_paper", "price_change_10pct"]
+
+
+class ReferenceScorer(ImportanceScorer):
+    """Previous implementation: one regex per keyword per result."""
+
+    def score(self, result: Dict) -> Tuple[str, float, str]:
+        content = f"{result.get('title', '')} {result.get('snippet', '')}".lower()
+        keyword_score, keyword_reason = self._reference_keywords(content)
+        condition_score, condition_reason = self._reference_conditions(content, result.get("title", ""))
+        freshness_score, freshness_reason = self._score_freshness(result.get("published_date", ""))
+        source_score, source_reason = self._score_source(result.get("url", ""))
+        return self._combine([
+            ("keyword_match", keyword_score, keyword_reason),
+            ("freshness", freshness_score, freshness_reason),
+            ("source_quality", source_score, source_reason),
+            ("alert_conditions", condition_score, condition_reason),
+        ])
+
+    def _combine(self, signals):
+        total_score = sum(s[1] for s in signals)
+        threshold = self.topic.get("importance_threshold", "medium")
+        high, medium = {"high": (0.8, 0.5), "medium": (0.6, 0.3)}.get(threshold, (0.4, 0.1))
+        priority = "high" if total_score >= high else "medium" if total_score >= medium else "low"
+        top_signals = sorted(signals, key=lambda x: x[1], reverse=True)[:2]
+        reason_parts = [s[2] for s in top_signals if s[2]]
+        return priority, total_score, " + ".join(reason_parts) if reason_parts else "low_relevance"
+
+    def _reference_keywords(self, content: str) -> Tuple[float, str]:
+        keywords = self.topic.get("keywords", [])
+        if not keywords:
+            return 0.0, ""
+        matches = exact_matches = 0
+        for keyword in keywords:
+            keyword_lower = keyword.lower()
+            if keyword.startswith("-"):
+                if keyword_lower[1:] in content:
+                    return 0.0, f"contains_excluded_{keyword_lower[1:]}"
+                continue
+            if re.search(r'\b' + re.escape(keyword_lower) + r'\b', content):
+                exact_matches += 1
+                matches += 1
+            elif keyword_lower in content:
+                matches += 1
+        if exact_matches >= 2:
+            return 0.3, f"exact_match_{exact_matches}_keywords"
+        elif exact_matches == 1:
+            return 0.2, "exact_match_1_keyword"
+        elif matches >= 2:
+            return 0.15, f"partial_match_{matches}_keywords"
+        elif matches == 1:
+            return 0.1, "partial_match_1_keyword"
+        return 0.0, "no_keyword_match"
+
+    def _reference_conditions(self, content: str, title: str) -> Tuple[float, str]:
+        for condition in self.topic.get("alert_on", []):
+            if condition == "price_change_10pct":
+                if self._detect_price_change(content, threshold=0.10):
+                    return 0.3, "price_change_>10%"
+            elif condition == "keyword_exact_match":
+                for kw in self.topic.get("keywords", []):
+                    if re.search(r'\b' + re.escape(kw.lower()) + r'\b', content):
+                        return 0.2, "exact_keyword_in_condition"
+            elif condition == "major_paper":
+                if "arxiv" in content or "paper" in title.lower():
+                    return 0.25, "academic_paper_detected"
+            elif condition == "model_release":
+                if re.search(r'(release|launch|announce).*\b(model|gpt|llm)\b', content, re.I):
+                    return 0.3, "model_release_detected"
+            elif condition == "patch_release":
+                if re.search(r'(patch|update|version|release).*\d+\.\d+', content, re.I):
+                    return 0.25, "patch_release_detected"
+            elif condition == "major_bug_fix":
+                if re.search(r'(fix|patch|solve).*(critical|major|bug)', content, re.I):
+                    return 0.2, "major_bug_fix_detected"
+        return 0.0, ""
+
+
+def make_topics(count: int, keywords_per_topic: int, rng: random.Random) -> List[Dict]:
+    topics = []
+    for i in range(count):
+        keywords = rng.sample(VOCABULARY, keywords_per_topic)
+        keywords[0] = f"{keywords[0]} {keywords[1]}"  # one phrase keyword
+        keywords.append(f"-{rng.choice(VOCABULARY)}spam")  # negative keyword
+        topics.append({
+            "id": f"topic-{i}",
+            "keywords": keywords,
+            "alert_on": rng.sample(CONDITIONS, 3),
+            "importance_threshold": rng.choice(["high", "medium", "low"]),
+            "boost_sources": [rng.choice(SOURCES)],
+        })
+    return topics
+
+
+def make_results(count: int, rng: random.Random) -> List[Dict]:
+    now = datetime.now()
+    results = []
+    for i in range(count):
+        words = rng.choices(VOCABULARY, k=rng.randint(25, 60))
+        if rng.random() < 0.2:
+            words.insert(rng.randrange(len(words)), f"{rng.randint(1, 40)}.{rng.randint(0, 9)}%")
+        title = " ".join(words[:10]).title()
+        results.append({
+            "title": title,
+            "snippet": " ".join(words[10:]),
+            "url": f"https://{rng.choice(SOURCES)}/post/{i}",
+            "published_date": (now - timedelta(hours=rng.randint(0, 120))).isoformat(),
+        })
+    return results
+
+
+def run(scorer_factory, topics: List[Dict], results: List[Dict]) -> Tuple[float, List]:
+    outputs = []
+    start = time.perf_counter()
+    for topic in topics:
+        scorer = scorer_factory(topic)
+        outputs.extend(scorer.score(result) for result in results)
+    return time.perf_counter() - start, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ImportanceScorer throughput")
+    parser.add_argument("--results", type=int, default=2000, help="Synthetic results per topic (default: 2000)")
+    parser.add_argument("--topics", type=int, default=30, help="Synthetic topics (default: 30)")
+    parser.add_argument("--keywords", type=int, default=10, help="Keywords per topic (default: 10)")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    topics = make_topics(args.topics, args.keywords, rng)
+    results = make_results(args.results, rng)
+    total = len(topics) * len(results)
+    settings = {}
+
+    print(f"Scoring {len(results):,} results x {len(topics)} topics = {total:,} scores")
+
+    ref_time, ref_out = run(lambda t: ReferenceScorer(t, settings), topics, results)
+    new_time, new_out = run(lambda t: ImportanceScorer(t, settings), topics, results)
+
+    # score_result builds a scorer per call; the matcher cache keeps that cheap
+    start = time.perf_counter()
+    for topic in topics:
+        for result in results[:200]:
+            score_result(result, topic, settings)
+    per_call_time = (time.perf_counter() - start) / (len(topics) * min(200, len(results)))
+
+    mismatches = sum(1 for a, b in zip(ref_out, new_out) if a[0] != b[0] or a[2] != b[2] or abs(a[1] - b[1]) > 1e-9)
+
+    print(f"  reference (regex per keyword): {ref_time:7.2f}s  {total / ref_time:10,.0f} results/s")
+    print(f"  compiled matcher:              {new_time:7.2f}s  {total / new_time:10,.0f} results/s")
+    print(f"  score_result() per call:       {per_call_time * 1e6:7.1f}us")
+    print(f"  speedup: {ref_time / new_time:.2f}x | mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,31 +4,67 @@ Configuration loader for proactive-research skill.
 """
 
 import json
+import os
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locking
+    fcntl = None
+
 SKILL_DIR = Path(__file__).parent.parent
 CONFIG_FILE = SKILL_DIR / "config.json"
 STATE_FILE = SKILL_DIR / ".research_state.json"
+STATE_LOCK_FILE = SKILL_DIR / ".research_state.lock"
 FINDINGS_DIR = SKILL_DIR / ".findings"
+FINDINGS_DB_FILE = FINDINGS_DIR / "findings.db"
+DEDUP_DB_FILE = SKILL_DIR / ".dedup.db"
+ALERT_SPOOL_FILE = SKILL_DIR / ".alert_spool.db"
+
+
+# config.json parsed once per process and reloaded when its mtime/size
+# changes: (stamp, config, topics by id)
+_config_cache = (None, None, {})
+
+
+def _file_stamp(path: Path):
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
 
 
 def load_config() -> Dict:
-    """Load configuration from config.json."""
-    if not CONFIG_FILE.exists():
+    """Load configuration from config.json (cached until the file changes)."""
+    global _config_cache
+    try:
+        stamp = _file_stamp(CONFIG_FILE)
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Config file not found: {CONFIG_FILE}\n"
             "Copy config.example.json to config.json and customize it."
         )
     
-    with open(CONFIG_FILE) as f:
-        return json.load(f)
+    if stamp != _config_cache[0]:
+        with open(CONFIG_FILE) as f:
+            config = json.load(f)
+        _config_cache = (stamp, config, _index_topics(config))
+    return _config_cache[1]
+
+
+def _index_topics(config: Dict) -> Dict[str, Dict]:
+    return {topic.get("id"): topic for topic in config.get("topics", [])}
 
 
 def save_config(config: Dict):
-    """Save configuration to config.json."""
-    with open(CONFIG_FILE, 'w') as f:
+    """Save configuration to config.json (atomic replace)."""
+    global _config_cache
+    tmp_file = CONFIG_FILE.with_suffix(".tmp")
+    with open(tmp_file, 'w') as f:
         json.dump(config, f, indent=2)
+    os.replace(tmp_file, CONFIG_FILE)
+    _config_cache = (_file_stamp(CONFIG_FILE), config, _index_topics(config))
 
 
 def load_state() -> Dict:
@@ -38,15 +74,67 @@ def load_state() -> Dict:
             return json.load(f)
     return {
         "topics": {},
-        "deduplication": {"url_hash_map": {}},
         "learning": {"interactions": []}
     }
 
 
 def save_state(state: Dict):
-    """Save state to .research_state.json."""
-    with open(STATE_FILE, 'w') as f:
+    """Save state to .research_state.json (atomic replace)."""
+    tmp_file = STATE_FILE.with_suffix(".tmp")
+    with open(tmp_file, 'w') as f:
         json.dump(state, f, indent=2)
+    os.replace(tmp_file, STATE_FILE)
+
+
+@contextmanager
+def state_lock():
+    """Exclusive lock around a read-modify-write of the state file."""
+    with open(STATE_LOCK_FILE, 'w') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def merge_state(changes: Dict) -> Dict:
+    """
+    Merge one monitoring run's changes into the state on disk.
+
+    The state file is re-read under an exclusive lock, so runs that overlap
+    (e.g. hourly and daily cron jobs) never drop each other's updates.
+    Counters in changes are increments, timestamps keep the newest value.
+
+    changes = {
+        "topics": {topic_id: {"last_check": iso, "last_results_count": n,
+                              "last_search_latency": secs,
+                              "alerts_added": n, "findings_added": n}}
+    }
+
+    Seen URLs live in the dedup store (.dedup.db); a legacy
+    "deduplication" map is dropped here once it has been imported. The file
+    is only rewritten when the merge changed something.
+    """
+    with state_lock():
+        state = load_state()
+        before = json.dumps(state, sort_keys=True)
+        topics = state.setdefault("topics", {})
+        for topic_id, update in changes.get("topics", {}).items():
+            topic_state = topics.setdefault(topic_id, {})
+            topic_state["alerts_today"] = topic_state.get("alerts_today", 0) + update.get("alerts_added", 0)
+            topic_state["findings_count"] = topic_state.get("findings_count", 0) + update.get("findings_added", 0)
+            if update.get("last_check") and update["last_check"] >= topic_state.get("last_check", ""):
+                for key in ("last_check", "last_results_count", "last_search_latency"):
+                    if key in update:
+                        topic_state[key] = update[key]
+
+        state.pop("deduplication", None)
+
+        if json.dumps(state, sort_keys=True) != before:
+            save_state(state)
+    return state
 
 
 def get_topics() -> List[Dict]:
@@ -57,11 +145,8 @@ def get_topics() -> List[Dict]:
 
 def get_topic(topic_id: str) -> Optional[Dict]:
     """Get a specific topic by ID."""
-    topics = get_topics()
-    for topic in topics:
-        if topic.get("id") == topic_id:
-            return topic
-    return None
+    load_config()
+    return _config_cache[2].get(topic_id)
 
 
 def get_settings() -> Dict:
@@ -82,34 +167,24 @@ def ensure_findings_dir():
     FINDINGS_DIR.mkdir(exist_ok=True)
 
 
-def get_findings_file(topic_id: str, date_str: str) -> Path:
-    """Get path to findings file for topic and date."""
-    ensure_findings_dir()
-    return FINDINGS_DIR / f"{date_str}_{topic_id}.json"
+_findings_store = None
+
+
+def get_findings_store():
+    """Findings log for this process (opened on first use)."""
+    global _findings_store
+    if _findings_store is None:
+        from findings_store import FindingsStore
+        _findings_store = FindingsStore()
+    return _findings_store
 
 
 def save_finding(topic_id: str, date_str: str, finding: Dict):
-    """Save a finding to the findings directory."""
-    findings_file = get_findings_file(topic_id, date_str)
-    
-    # Load existing findings
-    findings = []
-    if findings_file.exists():
-        with open(findings_file) as f:
-            findings = json.load(f)
-    
-    # Append new finding
-    findings.append(finding)
-    
-    # Save
-    with open(findings_file, 'w') as f:
-        json.dump(findings, f, indent=2)
+    """Append a finding to the findings log."""
+    finding.setdefault("timestamp", f"{date_str}T{datetime.now().strftime('%H:%M:%S')}")
+    get_findings_store().append(topic_id, finding)
 
 
 def load_findings(topic_id: str, date_str: str) -> List[Dict]:
     """Load findings for a topic and date."""
-    findings_file = get_findings_file(topic_id, date_str)
-    if findings_file.exists():
-        with open(findings_file) as f:
-            return json.load(f)
-    return []
+    return get_findings_store().range(f"{date_str}T00:00:00", f"{date_str}T23:59:59.999999", topic_id)
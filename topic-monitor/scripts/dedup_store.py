@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Bounded URL deduplication store for topic-monitor.
+
+Seen URLs live in a small SQLite database (.dedup.db) instead of the
+url_hash_map inside .research_state.json. Rows are keyed by the hash of the
+canonical URL and indexed on last_seen, so entries older than
+deduplication_window_hours are evicted with one indexed DELETE and lookups
+for a whole batch of results are a single query.
+
+URLs are canonicalized before hashing so trivially different links to the
+same page collapse: tracking parameters (utm_*, fbclid, gclid, ...), AMP
+variants and AMP cache wrappers, mobile hosts (m., mobile., amp.), "www.",
+default ports, fragments, trailing slashes and query parameter order.
+
+Usage:
+    from dedup_store import DedupStore, canonicalize_url
+
+    store = DedupStore(window_hours=72)
+    seen = store.seen_many(urls)            # set of URLs already seen
+    store.mark_many(new_urls, topic_id="ai-models")
+"""
+
+import hashlib
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import DEDUP_DB_FILE
+
+# Only parameters that never select content: click IDs and mail/ad campaign tags
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gclsrc", "msclkid", "yclid", "twclid", "igshid",
+    "mc_cid", "mc_eid", "_hsenc", "_hsmi", "mkt_tok",
+    "guccounter", "guce_referrer", "guce_referrer_sig",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "hsa_", "oly_", "vero_")
+
+MOBILE_HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+# Google AMP viewer and AMP cache wrappers around the publisher URL
+AMP_WRAPPER_RE = re.compile(
+    r"^https?://(?:www\.)?google\.[a-z.]+/amp/(?:s/)?(?P<google>.+)$"
+    r"|^https?://[^/]+\.cdn\.ampproject\.org/[a-z]/(?P<secure>s/)?(?P<cache>.+)$",
+    re.I
+)
+# /article/amp, /article/amp/, /article.amp, /article.amp.html (not a bare /amp)
+AMP_PATH_RE = re.compile(r"(?<=[^/])/amp/?$|(?<=[^/])\.amp(?=(?:\.html?)?$)", re.I)
+
+
+def canonicalize_url(url: str) -> str:
+    """Canonical form of a URL for duplicate detection (not for fetching)."""
+    url = url.strip()
+    wrapped = AMP_WRAPPER_RE.match(url)
+    if wrapped:
+        inner = wrapped.group("google") or wrapped.group("cache")
+        url = inner if "://" in inner else f"https://{inner}"
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower() or "https"
+    if scheme == "http":
+        scheme = "https"
+
+    host = (parts.hostname or "").lower().rstrip(".")
+    for prefix in MOBILE_HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = AMP_PATH_RE.sub("", parts.path) or "/"
+    path = re.sub(r"/{2,}", "/", path)
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def url_key(url: str) -> str:
+    """Dedup key: hash of the canonical URL."""
+    return hashlib.md5(canonicalize_url(url).encode()).hexdigest()
+
+
+class DedupStore:
+    """SQLite set of recently seen URLs with time-window eviction."""
+
+    def __init__(self, path: Path = DEDUP_DB_FILE, window_hours: float = 72):
+        self.path = Path(path)
+        self.window = window_hours * 3600
+        self._session: Set[str] = set()
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS seen (
+                url_key TEXT PRIMARY KEY,
+                url TEXT,
+                topic_id TEXT,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_seen_last_seen ON seen (last_seen);
+        """)
+        self.evict()
+        self._has_legacy = self._legacy_rows_present()
+
+    def _legacy_rows_present(self) -> bool:
+        return self._conn.execute("SELECT 1 FROM seen WHERE url IS NULL LIMIT 1").fetchone() is not None
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Delete entries last seen before the window; returns rows removed."""
+        cutoff = (now or time.time()) - self.window
+        cursor = self._conn.execute("DELETE FROM seen WHERE last_seen < ?", (cutoff,))
+        self._conn.commit()
+        return cursor.rowcount
+
+    def seen_many(self, urls: Iterable[str], now: Optional[float] = None) -> Set[str]:
+        """The subset of urls seen within the window (one query per 500 URLs)."""
+        cutoff = (now or time.time()) - self.window
+        keys: Dict[str, List[str]] = {}
+        for url in urls:
+            if url:
+                keys.setdefault(url_key(url), []).append(url)
+                if self._has_legacy:
+                    keys.setdefault(hashlib.md5(url.encode()).hexdigest(), []).append(url)
+
+        found = {key for key in keys if key in self._session}
+        lookup = [key for key in keys if key not in found]
+        for i in range(0, len(lookup), 500):
+            chunk = lookup[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(row[0] for row in self._conn.execute(
+                f"SELECT url_key FROM seen WHERE url_key IN ({placeholders}) AND last_seen >= ?",
+                (*chunk, cutoff)
+            ))
+        return {url for key in found for url in keys[key]}
+
+    def is_seen(self, url: str) -> bool:
+        return bool(self.seen_many([url]))
+
+    def mark_many(self, urls: Iterable[str], topic_id: Optional[str] = None,
+                  persist: bool = True, now: Optional[float] = None):
+        """
+        Record urls as seen now.
+
+        persist=False only remembers them for this process (dry runs), so
+        later topics in the same run still skip them.
+        """
+        rows = {url_key(url): url for url in urls if url}
+        if not persist:
+            self._session.update(rows)
+            return
+        seen_at = now or time.time()
+        self._conn.executemany(
+            "INSERT INTO seen (url_key, url, topic_id, first_seen, last_seen) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(url_key) DO UPDATE SET last_seen = excluded.last_seen",
+            [(key, url, topic_id, seen_at, seen_at) for key, url in rows.items()]
+        )
+        self._conn.commit()
+
+    def import_legacy(self, url_hash_map: Dict[str, str]) -> int:
+        """
+        Import the url_hash_map from an old .research_state.json.
+
+        Legacy keys are hashes of raw URLs (no canonical form available), so
+        they are also looked up by raw-URL hash until they age out.
+        """
+        rows = []
+        for url_hash, seen_at in url_hash_map.items():
+            try:
+                timestamp = time.mktime(time.strptime(seen_at[:19], "%Y-%m-%dT%H:%M:%S"))
+            except (TypeError, ValueError):
+                continue
+            rows.append((url_hash, None, None, timestamp, timestamp))
+        self._conn.executemany("INSERT OR IGNORE INTO seen VALUES (?, ?, ?, ?, ?)", rows)
+        self._conn.commit()
+        self.evict()
+        self._has_legacy = self._legacy_rows_present()
+        return len(rows)
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -6,15 +6,14 @@ Compiles medium-priority findings from the week into a readable report.
 """
 
 import sys
-import json
 import argparse
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import load_config, get_topic, FINDINGS_DIR
+from config import load_config, get_topic, get_findings_store
+from findings_store import FindingsStore
 
 
 def get_week_range(offset_weeks: int = 0) -> tuple[datetime, datetime]:
@@ -22,7 +21,7 @@ def get_week_range(offset_weeks: int = 0) -> tuple[datetime, datetime]:
     today = datetime.now()
     # Find most recent Sunday
     days_since_sunday = (today.weekday() + 1) % 7
-    sunday = today - timedelta(days=days_since_sunday)
+    sunday = (today - timedelta(days=days_since_sunday)).replace(hour=0, minute=0, second=0, microsecond=0)
     
     # Apply offset
     start = sunday - timedelta(weeks=offset_weeks)
@@ -31,51 +30,16 @@ def get_week_range(offset_weeks: int = 0) -> tuple[datetime, datetime]:
     return start, end
 
 
-def load_week_findings(start: datetime, end: datetime) -> dict:
-    """Load all findings from the week."""
-    if not FINDINGS_DIR.exists():
-        return {}
-    
-    findings_by_topic = defaultdict(list)
-    
-    # Scan findings directory
-    for findings_file in FINDINGS_DIR.glob("*.json"):
-        # Parse filename: YYYY-MM-DD_topic-id.json
-        parts = findings_file.stem.split("_", 1)
-        if len(parts) != 2:
-            continue
-        
-        date_str, topic_id = parts
-        
-        try:
-            file_date = datetime.strptime(date_str, "%Y-%m-%d")
-        except ValueError:
-            continue
-        
-        # Check if in week range
-        if not (start <= file_date <= end):
-            continue
-        
-        # Load findings
-        with open(findings_file) as f:
-            findings = json.load(f)
-            findings_by_topic[topic_id].extend(findings)
-    
-    return dict(findings_by_topic)
-
-
-def generate_digest(findings_by_topic: dict, start: datetime, end: datetime) -> str:
-    """Generate digest markdown."""
-    config = load_config()
-    
+def generate_digest(store: FindingsStore, counts: dict, start: datetime, end: datetime) -> str:
+    """Generate digest markdown (top-K selection is done by the findings store)."""
     # Header
     digest = f"# 📊 Weekly Research Digest\n\n"
     digest += f"**{start.strftime('%B %d')} - {end.strftime('%B %d, %Y')}**\n\n"
     digest += "---\n\n"
     
     # Summary stats
-    total_findings = sum(len(f) for f in findings_by_topic.values())
-    topic_count = len(findings_by_topic)
+    total_findings = sum(counts.values())
+    topic_count = len(counts)
     
     if total_findings == 0:
         digest += "No new findings this week.\n"
@@ -85,27 +49,14 @@ def generate_digest(findings_by_topic: dict, start: datetime, end: datetime) ->
     digest += "---\n\n"
     
     # Highlights (highest scored findings)
-    all_findings = []
-    for topic_id, findings in findings_by_topic.items():
-        topic = get_topic(topic_id)
-        if not topic:
-            continue
-        
-        for finding in findings:
-            all_findings.append({
-                "topic": topic,
-                "finding": finding
-            })
-    
-    # Sort by score
-    all_findings.sort(key=lambda x: x["finding"].get("score", 0), reverse=True)
+    known = {topic_id: get_topic(topic_id) for topic_id in counts}
+    known = {topic_id: topic for topic_id, topic in known.items() if topic}
     
-    if len(all_findings) >= 3:
+    if sum(counts[topic_id] for topic_id in known) >= 3:
         digest += "## 🔥 Top Highlights\n\n"
         
-        for item in all_findings[:3]:
-            topic = item["topic"]
-            finding = item["finding"]
+        for finding in store.top(start, end, k=3, topics=known):
+            topic = known[finding["topic_id"]]
             result = finding.get("result", {})
             score = finding.get("score", 0)
             
@@ -119,21 +70,17 @@ def generate_digest(findings_by_topic: dict, start: datetime, end: datetime) ->
     # Findings by topic
     digest += "## 📚 Findings by Topic\n\n"
     
-    for topic_id, findings in sorted(findings_by_topic.items()):
-        topic = get_topic(topic_id)
-        if not topic:
-            continue
+    for topic_id in sorted(known):
+        topic = known[topic_id]
+        count = counts[topic_id]
         
         topic_name = topic.get("name", topic_id)
         topic_emoji = topic.get("emoji", "📌")
         
         digest += f"### {topic_emoji} {topic_name}\n\n"
-        digest += f"**{len(findings)} finding(s) this week**\n\n"
-        
-        # Sort findings by score
-        sorted_findings = sorted(findings, key=lambda x: x.get("score", 0), reverse=True)
+        digest += f"**{count} finding(s) this week**\n\n"
         
-        for finding in sorted_findings[:5]:  # Top 5 per topic
+        for finding in store.top(start, end, k=5, topics=topic_id):  # Top 5 per topic
             result = finding.get("result", {})
             score = finding.get("score", 0)
             reason = finding.get("reason", "")
@@ -145,8 +92,8 @@ def generate_digest(findings_by_topic: dict, start: datetime, end: datetime) ->
                 digest += f"  _Reason: {reason}_\n"
             digest += "\n"
         
-        if len(sorted_findings) > 5:
-            digest += f"_...and {len(sorted_findings) - 5} more_\n\n"
+        if count > 5:
+            digest += f"_...and {count - 5} more_\n\n"
         
         digest += "\n"
     
@@ -192,14 +139,15 @@ def main():
     print(f"📊 Generating digest for {start.strftime('%Y-%m-%d')} to {end.strftime('%Y-%m-%d')}")
     
     # Load findings
-    findings_by_topic = load_week_findings(start, end)
+    store = get_findings_store()
+    counts = store.count_by_topic(start, end)
     
-    if not findings_by_topic:
+    if not counts:
         print("⚠️ No findings for this period")
         return
     
     # Generate digest
-    digest = generate_digest(findings_by_topic, start, end)
+    digest = generate_digest(store, counts, start, end)
     
     # Send or preview
     if args.send:
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Append-only findings log for topic-monitor.
+
+Medium-priority findings used to be kept as one JSON array per topic and day
+(.findings/YYYY-MM-DD_topic.json), rewritten in full for every new finding
+and globbed and parsed in full for every digest. They now go to a SQLite log
+(.findings/findings.db): saving a finding is a single INSERT, and the digest
+asks for a time range with counts and top-K computed by SQLite over the
+(timestamp, score) and (topic, timestamp) indexes.
+
+Findings that belong to the same story cluster (see story_clusters.py) count
+once in range queries: the best-scored finding of each cluster is kept.
+
+The same database keeps one row per topic check (results, new results,
+findings, alerts) as history for the adaptive scheduler.
+
+Old per-day JSON files are imported the first time the log is opened and
+left in place.
+
+Usage:
+    from findings_store import FindingsStore
+
+    store = FindingsStore()
+    store.append("ai-models", {"result": {...}, "score": 0.4, "timestamp": "..."})
+    top = store.top(start, end, k=3)
+    per_topic = store.count_by_topic(start, end)
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from config import FINDINGS_DIR, FINDINGS_DB_FILE
+
+# Best finding per story cluster within [start, end] across all topics
+# (findings without a cluster are their own cluster)
+_RANGE_SQL = """
+    SELECT id, topic_id, ts, score, payload FROM (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY COALESCE(cluster_id, 'id:' || id) ORDER BY score DESC, id
+        ) AS cluster_rank
+        FROM findings
+        WHERE ts BETWEEN ? AND ?
+    )
+    WHERE cluster_rank = 1 {topic_filter}
+"""
+
+
+def _iso(value) -> str:
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+class FindingsStore:
+    """SQLite log of findings indexed by topic, timestamp and score."""
+
+    def __init__(self, path: Path = FINDINGS_DB_FILE, legacy_dir: Optional[Path] = FINDINGS_DIR):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS findings (
+                id INTEGER PRIMARY KEY,
+                topic_id TEXT NOT NULL,
+                ts TEXT NOT NULL,
+                score REAL NOT NULL,
+                cluster_id TEXT,
+                payload TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_findings_topic_ts ON findings (topic_id, ts);
+            CREATE INDEX IF NOT EXISTS idx_findings_ts_score ON findings (ts, score);
+
+            -- One row per topic check, for the adaptive scheduler
+            CREATE TABLE IF NOT EXISTS checks (
+                topic_id TEXT NOT NULL,
+                ts TEXT NOT NULL,
+                results INTEGER NOT NULL,
+                new_results INTEGER NOT NULL,
+                findings INTEGER NOT NULL,
+                alerts INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_checks_ts ON checks (ts);
+
+            CREATE TABLE IF NOT EXISTS imported_files (
+                name TEXT PRIMARY KEY
+            );
+        """)
+        self._conn.commit()
+        if legacy_dir is not None:
+            self.import_legacy(Path(legacy_dir))
+
+    def import_legacy(self, directory: Path) -> int:
+        """Import YYYY-MM-DD_topic-id.json files not imported yet; returns findings added."""
+        if not directory.exists():
+            return 0
+        done = {row[0] for row in self._conn.execute("SELECT name FROM imported_files")}
+        added = 0
+        for findings_file in sorted(directory.glob("*.json")):
+            if findings_file.name in done:
+                continue
+            parts = findings_file.stem.split("_", 1)
+            if len(parts) != 2:
+                continue
+            date_str, topic_id = parts
+            try:
+                datetime.strptime(date_str, "%Y-%m-%d")
+                with open(findings_file) as f:
+                    findings = json.load(f)
+            except (ValueError, OSError):
+                continue
+            for finding in findings:
+                finding.setdefault("timestamp", f"{date_str}T00:00:00")
+                self._insert(topic_id, finding)
+            self._conn.execute("INSERT INTO imported_files (name) VALUES (?)", (findings_file.name,))
+            self._conn.commit()
+            added += len(findings)
+        return added
+
+    def _insert(self, topic_id: str, finding: Dict):
+        self._conn.execute(
+            "INSERT INTO findings (topic_id, ts, score, cluster_id, payload) VALUES (?, ?, ?, ?, ?)",
+            (topic_id, finding.get("timestamp") or datetime.now().isoformat(),
+             finding.get("score", 0), finding.get("cluster_id"), json.dumps(finding))
+        )
+
+    def append(self, topic_id: str, finding: Dict):
+        """Append one finding (a single INSERT)."""
+        self._insert(topic_id, finding)
+        self._conn.commit()
+
+    def _query(self, start, end, topics: Optional[Iterable[str]], tail: str = "", args: tuple = ()) -> List:
+        topics = [topics] if isinstance(topics, str) else list(topics or [])
+        topic_filter = f"AND topic_id IN ({','.join('?' * len(topics))})" if topics else ""
+        params = (_iso(start), _iso(end), *topics, *args)
+        return self._conn.execute(_RANGE_SQL.format(topic_filter=topic_filter) + tail, params).fetchall()
+
+    def range(self, start, end, topics: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Findings with start <= timestamp <= end, oldest first (topics: id or ids)."""
+        return [json.loads(row[4]) for row in self._query(start, end, topics, " ORDER BY ts, id")]
+
+    def top(self, start, end, k: int, topics: Optional[Iterable[str]] = None) -> List[Dict]:
+        """The k best-scored findings in the range (topics: id or ids)."""
+        rows = self._query(start, end, topics, " ORDER BY score DESC, id LIMIT ?", (k,))
+        return [dict(json.loads(row[4]), topic_id=row[1]) for row in rows]
+
+    def count_by_topic(self, start, end) -> Dict[str, int]:
+        """Number of findings per topic in the range."""
+        sql = f"SELECT topic_id, COUNT(*) FROM ({_RANGE_SQL.format(topic_filter='')}) GROUP BY topic_id"
+        return dict(self._conn.execute(sql, (_iso(start), _iso(end))).fetchall())
+
+    def record_check(self, topic_id: str, ts, results: int, new_results: int, findings: int, alerts: int):
+        """Record the outcome of one topic check."""
+        self._conn.execute(
+            "INSERT INTO checks (topic_id, ts, results, new_results, findings, alerts) VALUES (?, ?, ?, ?, ?, ?)",
+            (topic_id, _iso(ts), results, new_results, findings, alerts)
+        )
+        self._conn.commit()
+
+    def checks(self, start, end=None) -> List[Dict]:
+        """Recorded checks with start <= ts (<= end), oldest first."""
+        rows = self._conn.execute(
+            "SELECT topic_id, ts, results, new_results, findings, alerts FROM checks "
+            "WHERE ts >= ? AND ts <= ? ORDER BY ts",
+            (_iso(start), _iso(end) if end else "9999")
+        ).fetchall()
+        return [
+            {"topic_id": topic_id, "ts": datetime.fromisoformat(ts), "results": results,
+             "new_results": new_results, "findings": findings, "alerts": alerts}
+            for topic_id, ts, results, new_results, findings, alerts in rows
+        ]
+
+    def count_checks(self, start) -> int:
+        """Number of checks since start (for the hourly search budget)."""
+        return self._conn.execute("SELECT COUNT(*) FROM checks WHERE ts >= ?", (_iso(start),)).fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -6,12 +6,112 @@ Scores findings as:
 - HIGH: Immediate alert
 - MEDIUM: Include in digest
 - LOW: Ignore
+
+Each topic's keywords and alert conditions are compiled once into a
+KeywordMatcher (cached per topic definition), so scoring a result is a single
+word scan plus precompiled pattern checks instead of building a regex per
+keyword per result.
 """
 
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+WORD_RE = re.compile(r'\w+')
+PCT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*%')
+PRICE_CHANGE_WORDS = ("surge", "plunge", "jump", "drop", "spike", "crash")
+
+# Alert condition -> (pattern, score, reason)
+CONDITION_PATTERNS = {
+    "model_release": (re.compile(r'(release|launch|announce).*\b(model|gpt|llm)\b', re.I),
+                      0.3, "model_release_detected"),
+    "patch_release": (re.compile(r'(patch|update|version|release).*\d+\.\d+', re.I),
+                      0.25, "patch_release_detected"),
+    "major_bug_fix": (re.compile(r'(fix|patch|solve).*(critical|major|bug)', re.I),
+                      0.2, "major_bug_fix_detected"),
+}
+
+
+class KeywordMatcher:
+    """
+    Precompiled keyword and condition matcher for one topic.
+
+    Positive keywords made only of word characters are matched as whole
+    words by set lookup against the words of the content (equivalent to
+    \\bkeyword\\b); other keywords (phrases, symbols) get one precompiled
+    whole-word pattern each. Keywords that do not match as whole words fall
+    back to substring checks. Negative keywords ("-foo") are substring checks.
+    """
+
+    def __init__(self, keywords: List[str], alert_on: List[str]):
+        self.positive: List[str] = []
+        self.negative: List[str] = []
+        self.word_keywords = set()
+        self.pattern_keywords: List[Tuple[str, re.Pattern]] = []
+
+        for keyword in keywords:
+            keyword_lower = keyword.lower()
+            if keyword.startswith("-"):
+                self.negative.append(keyword_lower[1:])
+                continue
+            self.positive.append(keyword_lower)
+            if keyword_lower and WORD_RE.fullmatch(keyword_lower):
+                self.word_keywords.add(keyword_lower)
+            else:
+                self.pattern_keywords.append(
+                    (keyword_lower, re.compile(r'\b' + re.escape(keyword_lower) + r'\b'))
+                )
+
+        # keyword_exact_match condition checks every keyword, negatives included
+        self.condition_patterns = [
+            re.compile(r'\b' + re.escape(kw.lower()) + r'\b') for kw in keywords if kw.startswith("-")
+        ]
+        self.alert_on = list(alert_on)
+
+    def match_keywords(self, content: str) -> Tuple[int, int, Optional[str]]:
+        """(exact_matches, total_matches, excluded_keyword) for lowercased content."""
+        for negative in self.negative:
+            if negative in content:
+                return 0, 0, negative
+
+        words = set(WORD_RE.findall(content)) if self.word_keywords else ()
+        exact = 0
+        matches = 0
+        for keyword in self.positive:
+            if keyword in self.word_keywords:
+                if keyword in words:
+                    exact += 1
+                    matches += 1
+                elif keyword in content:
+                    matches += 1
+        for keyword, pattern in self.pattern_keywords:
+            if pattern.search(content):
+                exact += 1
+                matches += 1
+            elif keyword in content:
+                matches += 1
+        return exact, matches, None
+
+    def has_exact_keyword(self, content: str, exact_matches: Optional[int] = None) -> bool:
+        """Whether any keyword appears as a whole word (keyword_exact_match)."""
+        if exact_matches is None:
+            words = set(WORD_RE.findall(content))
+            exact_matches = sum(1 for kw in self.word_keywords if kw in words) + \
+                sum(1 for _, pattern in self.pattern_keywords if pattern.search(content))
+        return exact_matches > 0 or any(p.search(content) for p in self.condition_patterns)
+
+
+_MATCHER_CACHE: Dict[Tuple, KeywordMatcher] = {}
+
+
+def get_matcher(topic: Dict) -> KeywordMatcher:
+    """Compiled matcher for a topic, built once per distinct keyword/condition set."""
+    key = (tuple(topic.get("keywords", [])), tuple(topic.get("alert_on", [])))
+    matcher = _MATCHER_CACHE.get(key)
+    if matcher is None:
+        matcher = _MATCHER_CACHE[key] = KeywordMatcher(*key)
+    return matcher
+
 
 class ImportanceScorer:
     """Score research findings for importance."""
@@ -20,6 +120,7 @@ class ImportanceScorer:
         self.topic = topic
         self.settings = settings
         self.learning_enabled = settings.get("learning_enabled", False)
+        self.matcher = get_matcher(topic)
     
     def score(self, result: Dict) -> Tuple[str, float, str]:
         """
@@ -41,8 +142,9 @@ class ImportanceScorer:
         published = result.get("published_date", "")
         content = f"{title} {snippet}".lower()
         
-        # Signal 1: Keyword matching (0.0 - 0.3)
-        keyword_score, keyword_reason = self._score_keywords(content)
+        # Signal 1: Keyword matching (0.0 - 0.3), one scan shared with the conditions
+        keyword_match = self.matcher.match_keywords(content)
+        keyword_score, keyword_reason = self._score_keywords(content, keyword_match)
         signals.append(("keyword_match", keyword_score, keyword_reason))
         total_score += keyword_score
         
@@ -57,7 +159,8 @@ class ImportanceScorer:
         total_score += source_score
         
         # Signal 4: Alert conditions (0.0 - 0.3)
-        condition_score, condition_reason = self._score_conditions(content, title)
+        exact_matches = keyword_match[0] if keyword_match[2] is None else None
+        condition_score, condition_reason = self._score_conditions(content, title, exact_matches)
         signals.append(("alert_conditions", condition_score, condition_reason))
         total_score += condition_score
         
@@ -96,32 +199,18 @@ class ImportanceScorer:
         
         return priority, total_score, reason
     
-    def _score_keywords(self, content: str) -> Tuple[float, str]:
+    def _score_keywords(
+        self,
+        content: str,
+        keyword_match: Optional[Tuple[int, int, Optional[str]]] = None
+    ) -> Tuple[float, str]:
         """Score based on keyword matching."""
-        keywords = self.topic.get("keywords", [])
-        if not keywords:
+        if not self.topic.get("keywords", []):
             return 0.0, ""
         
-        matches = 0
-        exact_matches = 0
-        
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            
-            # Check for negation (keywords starting with -)
-            if keyword.startswith("-"):
-                negative_keyword = keyword_lower[1:]
-                if negative_keyword in content:
-                    return 0.0, f"contains_excluded_{negative_keyword}"
-                continue
-            
-            # Exact match (whole word)
-            if re.search(r'\b' + re.escape(keyword_lower) + r'\b', content):
-                exact_matches += 1
-                matches += 1
-            # Partial match
-            elif keyword_lower in content:
-                matches += 1
+        exact_matches, matches, excluded = keyword_match or self.matcher.match_keywords(content)
+        if excluded is not None:
+            return 0.0, f"contains_excluded_{excluded}"
         
         if exact_matches >= 2:
             return 0.3, f"exact_match_{exact_matches}_keywords"
@@ -182,37 +271,31 @@ class ImportanceScorer:
         
         return 0.05, "standard_source"
     
-    def _score_conditions(self, content: str, title: str) -> Tuple[float, str]:
+    def _score_conditions(
+        self,
+        content: str,
+        title: str,
+        exact_matches: Optional[int] = None
+    ) -> Tuple[float, str]:
         """Score based on alert conditions."""
-        alert_on = self.topic.get("alert_on", [])
-        
-        for condition in alert_on:
+        for condition in self.matcher.alert_on:
             if condition == "price_change_10pct":
                 if self._detect_price_change(content, threshold=0.10):
                     return 0.3, "price_change_>10%"
             
             elif condition == "keyword_exact_match":
                 # Already handled in keyword scoring, but boost it
-                keywords = self.topic.get("keywords", [])
-                for kw in keywords:
-                    if re.search(r'\b' + re.escape(kw.lower()) + r'\b', content):
-                        return 0.2, "exact_keyword_in_condition"
+                if self.matcher.has_exact_keyword(content, exact_matches):
+                    return 0.2, "exact_keyword_in_condition"
             
             elif condition == "major_paper":
                 if "arxiv" in content or "paper" in title.lower():
                     return 0.25, "academic_paper_detected"
             
-            elif condition == "model_release":
-                if re.search(r'(release|launch|announce).*\b(model|gpt|llm)\b', content, re.I):
-                    return 0.3, "model_release_detected"
-            
-            elif condition == "patch_release":
-                if re.search(r'(patch|update|version|release).*\d+\.\d+', content, re.I):
-                    return 0.25, "patch_release_detected"
-            
-            elif condition == "major_bug_fix":
-                if re.search(r'(fix|patch|solve).*(critical|major|bug)', content, re.I):
-                    return 0.2, "major_bug_fix_detected"
+            elif condition in CONDITION_PATTERNS:
+                pattern, score, reason = CONDITION_PATTERNS[condition]
+                if pattern.search(content):
+                    return score, reason
             
             elif condition == "high_engagement":
                 # Would need engagement data from API
@@ -227,21 +310,13 @@ class ImportanceScorer:
     def _detect_price_change(self, content: str, threshold: float = 0.10) -> bool:
         """Detect significant price changes."""
         # Look for percentage patterns
-        pct_pattern = r'(\d+(?:\.\d+)?)\s*%'
-        matches = re.findall(pct_pattern, content)
-        
-        for match in matches:
-            pct = float(match)
-            if pct >= threshold * 100:  # Convert to percentage
+        for match in PCT_RE.findall(content):
+            if float(match) >= threshold * 100:  # Convert to percentage
                 return True
         
         # Look for price change keywords
-        change_keywords = ["surge", "plunge", "jump", "drop", "spike", "crash"]
-        for keyword in change_keywords:
-            if keyword in content.lower():
-                return True
-        
-        return False
+        content_lower = content.lower()
+        return any(keyword in content_lower for keyword in PRICE_CHANGE_WORDS)
 
 
 def score_result(result: Dict, topic: Dict, settings: Dict) -> Tuple[str, float, str]:
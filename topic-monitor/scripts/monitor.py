@@ -4,62 +4,62 @@ Proactive Research Monitor
 
 Checks topics due for monitoring, scores findings, and sends alerts.
 Run via cron for automated monitoring.
+
+Searches run concurrently on a bounded thread pool (each web-search-plus call
+is a subprocess with its own timeout); results are scored and alerted on the
+main thread as they arrive, and the run's state changes are merged into the
+state file under a lock at the end. Seen URLs are kept in the dedup store
+(.dedup.db), looked up once per topic for the whole batch of results.
 """
 
 import sys
 import json
+import time
 import hashlib
 import argparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 # Add parent dir to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import (
-    load_config, load_state, save_state, get_settings,
-    get_channel_config, save_finding
+    load_config, load_state, merge_state, get_settings,
+    save_finding, get_findings_store
 )
 from importance_scorer import score_result
+from dedup_store import DedupStore, url_key
+from story_clusters import StoryIndex
+from scheduler import schedule_settings, select_adaptive
+from alert_queue import AlertDispatcher, spooled_channels
 
 
-def hash_url(url: str) -> str:
-    """Create hash of URL for deduplication."""
-    return hashlib.md5(url.encode()).hexdigest()
-
-
-def is_duplicate(url: str, state: Dict, dedup_hours: int = 72) -> bool:
-    """Check if URL was recently alerted."""
-    url_hash = hash_url(url)
-    dedup_map = state.get("deduplication", {}).get("url_hash_map", {})
-    
-    if url_hash not in dedup_map:
-        return False
-    
-    # Check if within deduplication window
-    last_seen_str = dedup_map[url_hash]
-    last_seen = datetime.fromisoformat(last_seen_str)
-    age = datetime.now() - last_seen
-    
-    return age < timedelta(hours=dedup_hours)
+def open_dedup_store(state: Dict, settings: Dict) -> DedupStore:
+    """Open the dedup store, importing a legacy url_hash_map from state once."""
+    store = DedupStore(window_hours=settings.get("deduplication_window_hours", 72))
+    legacy = state.get("deduplication", {}).get("url_hash_map")
+    if legacy:
+        store.import_legacy(legacy)
+    return store
 
 
-def mark_as_seen(url: str, state: Dict):
-    """Mark URL as seen in deduplication map."""
-    url_hash = hash_url(url)
-    if "deduplication" not in state:
-        state["deduplication"] = {"url_hash_map": {}}
-    
-    state["deduplication"]["url_hash_map"][url_hash] = datetime.now().isoformat()
+def open_story_index(settings: Dict) -> Optional[StoryIndex]:
+    """Story cluster index, or None when story_similarity_threshold is 0/false."""
+    threshold = settings.get("story_similarity_threshold", 0.5)
+    if not threshold:
+        return None
+    return StoryIndex(window_hours=settings.get("deduplication_window_hours", 72), threshold=threshold)
 
 
-def search_topic(topic: Dict, dry_run: bool = False) -> List[Dict]:
+def search_topic(topic: Dict, dry_run: bool = False, timeout: float = 30) -> List[Dict]:
     """
     Search for topic using available search tools.
     
     In real OpenClaw environment, this would use web_search tool.
     For standalone testing, returns mock results.
+    timeout bounds the web-search-plus subprocess (the per-topic deadline).
     """
     query = topic.get("query", "")
     
@@ -73,14 +73,14 @@ def search_topic(topic: Dict, dry_run: bool = False) -> List[Dict]:
                 ["python3", str(web_search_plus), "--query", query, "--max-results", "5"],
                 capture_output=True,
                 text=True,
-                timeout=30
+                timeout=timeout
             )
             
             if result.returncode == 0:
                 data = json.loads(result.stdout)
                 return data.get("results", [])
         except Exception as e:
-            print(f"⚠️ web-search-plus failed: {e}", file=sys.stderr)
+            print(f"⚠️ web-search-plus failed for {topic.get('id')}: {e}", file=sys.stderr)
     
     # Fallback: Return mock results for testing
     if dry_run:
@@ -96,8 +96,79 @@ def search_topic(topic: Dict, dry_run: bool = False) -> List[Dict]:
     return []
 
 
+def run_searches(
+    topics: List[Dict],
+    dry_run: bool = False,
+    max_workers: int = 8,
+    timeout: float = 30,
+    deadline: Optional[float] = None
+) -> Iterator[Tuple[Dict, Optional[List[Dict]], float, Optional[str]]]:
+    """
+    Search topics concurrently, yielding (topic, results, latency, error) as each finishes.
+    
+    At most max_workers searches run at once; each is bounded by timeout,
+    capped at what is left of the run deadline (seconds from start) so no
+    search outlives it. Searches not finished by the deadline are yielded
+    with results=None and error="deadline" so the topic stays due for the
+    next run.
+    """
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    
+    def timed_search(topic):
+        t0 = time.monotonic()
+        limit = timeout
+        if deadline is not None:
+            limit = min(timeout, deadline - (t0 - started))
+            if limit <= 0:
+                raise TimeoutError("deadline")
+        results = search_topic(topic, dry_run=dry_run, timeout=limit)
+        return results, time.monotonic() - t0
+    
+    futures = {executor.submit(timed_search, topic): topic for topic in topics}
+    pending = set(futures)
+    try:
+        while pending:
+            remaining = None if deadline is None else deadline - (time.monotonic() - started)
+            if remaining is not None and remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                topic = futures[future]
+                try:
+                    results, latency = future.result()
+                    yield topic, results, latency, None
+                except Exception as e:
+                    yield topic, None, time.monotonic() - started, str(e)
+        
+        for future in pending:
+            yield futures[future], None, time.monotonic() - started, "deadline"
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def format_latency_report(latencies: List[Tuple[str, float, int, Optional[str]]], wall_time: float) -> str:
+    """Per-topic search latency table, slowest first."""
+    if not latencies:
+        return ""
+    
+    ordered = sorted(latencies, key=lambda x: x[1], reverse=True)
+    times = sorted(l[1] for l in latencies)
+    median = times[len(times) // 2]
+    
+    lines = ["⏱️  Search latency per topic:"]
+    for topic_id, latency, count, error in ordered:
+        status = f"❌ {error}" if error else f"{count} results"
+        lines.append(f"   {topic_id:30} {latency:6.2f}s  {status}")
+    lines.append(
+        f"   median {median:.2f}s | max {times[-1]:.2f}s | "
+        f"sum {sum(times):.2f}s | wall {wall_time:.2f}s"
+    )
+    return "\n".join(lines)
+
+
 def should_check_topic(topic: Dict, state: Dict, force: bool = False) -> bool:
-    """Determine if topic should be checked now."""
+    """Determine if topic should be checked now (fixed frequency; see scheduler.py for adaptive)."""
     if force:
         return True
     
@@ -150,8 +221,21 @@ def check_rate_limits(topic: Dict, state: Dict, settings: Dict) -> bool:
     return True
 
 
-def send_alert(topic: Dict, result: Dict, priority: str, score: float, reason: str, dry_run: bool = False):
-    """Send alert via configured channels."""
+def send_alert(
+    topic: Dict,
+    result: Dict,
+    priority: str,
+    score: float,
+    reason: str,
+    dry_run: bool = False,
+    dispatcher: Optional[AlertDispatcher] = None
+):
+    """
+    Queue alert for the configured channels.
+    
+    With a dispatcher the alert is spooled and delivered in the background;
+    without one it is delivered before returning.
+    """
     channels = topic.get("channels", [])
     
     # Build message
@@ -181,77 +265,70 @@ def send_alert(topic: Dict, result: Dict, priority: str, score: float, reason: s
         print(f"{'='*60}\n")
         return
     
-    # Send to channels
+    # Spool for the channel workers
+    own_dispatcher = dispatcher is None
+    if own_dispatcher:
+        dispatcher = AlertDispatcher()
     for channel in channels:
-        if channel == "telegram":
-            send_telegram(message, priority)
-        elif channel == "discord":
-            send_discord(message, priority)
-        elif channel == "email":
-            send_email(message, priority, topic_name)
+        dispatcher.enqueue(channel, message, priority, subject=topic_name)
+    if own_dispatcher:
+        dispatcher.close()
 
 
-def send_telegram(message: str, priority: str):
-    """Send via Telegram (requires OpenClaw message tool)."""
-    # In real environment, this would use OpenClaw's message tool
-    # For now, just log
-    print(f"📱 [TELEGRAM] {priority.upper()}: {message[:100]}...")
-
-
-def send_discord(message: str, priority: str):
-    """Send via Discord webhook."""
-    import requests
-    from config import get_channel_config
-    
-    discord_config = get_channel_config("discord")
-    webhook_url = discord_config.get("webhook_url")
-    
-    if not webhook_url:
-        print("⚠️ Discord webhook not configured", file=sys.stderr)
-        return
-    
-    payload = {
-        "username": discord_config.get("username", "Research Bot"),
-        "avatar_url": discord_config.get("avatar_url"),
-        "content": message
-    }
+def monitor_topic(
+    topic: Dict,
+    state: Dict,
+    settings: Dict,
+    dry_run: bool = False,
+    verbose: bool = False,
+    results: Optional[List[Dict]] = None,
+    changes: Optional[Dict] = None,
+    latency: Optional[float] = None,
+    dedup: Optional[DedupStore] = None,
+    stories: Optional[StoryIndex] = None,
+    dispatcher: Optional[AlertDispatcher] = None
+):
+    """
+    Monitor a single topic.
     
-    try:
-        requests.post(webhook_url, json=payload, timeout=10)
-        print(f"✅ Sent to Discord")
-    except Exception as e:
-        print(f"❌ Discord send failed: {e}", file=sys.stderr)
-
-
-def send_email(message: str, priority: str, subject: str):
-    """Send via email."""
-    print(f"📧 [EMAIL] {priority.upper()}: {subject}")
-
-
-def monitor_topic(topic: Dict, state: Dict, settings: Dict, dry_run: bool = False, verbose: bool = False):
-    """Monitor a single topic."""
+    results are searched here unless already fetched by run_searches. State
+    is updated in memory (for rate limits) and recorded in changes for
+    merge_state. Seen URLs go to the dedup store and alerted/saved stories to
+    the story index (only for this process on dry runs); both are opened here
+    if not passed in.
+    """
     topic_id = topic.get("id")
     topic_name = topic.get("name")
+    changes = changes if changes is not None else {}
+    topic_changes = changes.setdefault("topics", {}).setdefault(topic_id, {})
     
     if verbose:
         print(f"\n🔍 Checking topic: {topic_name} ({topic_id})")
     
     # Search
-    results = search_topic(topic, dry_run=dry_run)
+    if results is None:
+        results = search_topic(topic, dry_run=dry_run)
     
     if verbose:
-        print(f"   Found {len(results)} results")
+        took = f" in {latency:.2f}s" if latency is not None else ""
+        print(f"   Found {len(results)} results{took}")
     
     # Score and filter
-    dedup_hours = settings.get("deduplication_window_hours", 72)
+    own_store = dedup is None
+    if own_store:
+        dedup = open_dedup_store(state, settings)
+    already_seen = dedup.seen_many(result.get("url", "") for result in results)
+    batch_keys = set()
+    new_urls = []
     high_priority = []
     medium_priority = []
     
     for result in results:
         url = result.get("url", "")
         
-        # Check deduplication
-        if is_duplicate(url, state, dedup_hours):
+        # Check deduplication (against the store and earlier results in this batch)
+        key = url_key(url) if url else None
+        if url in already_seen or (key and key in batch_keys):
             if verbose:
                 print(f"   ⏭️  Skipping duplicate: {url}")
             continue
@@ -269,26 +346,59 @@ def monitor_topic(topic: Dict, state: Dict, settings: Dict, dry_run: bool = Fals
             medium_priority.append((result, score, reason))
         
         # Mark as seen
-        mark_as_seen(url, state)
+        if key:
+            batch_keys.add(key)
+            new_urls.append(url)
+    
+    dedup.mark_many(new_urls, topic_id=topic_id, persist=not dry_run)
+    if own_store:
+        dedup.close()
+    
+    # One alert/finding per story cluster: best-scored copy first, later copies
+    # (other sources, other topics, earlier runs in the window) are dropped.
+    # High-priority stories only claim their cluster once the alert is queued,
+    # so a copy skipped by the rate limit doesn't suppress later ones.
+    cluster_ids = {}
+    own_index = stories is None
+    if own_index:
+        stories = open_story_index(settings)
+    per_topic = settings.get("story_clusters_per_topic", False)
+    
+    def new_story(result: Dict) -> bool:
+        if stories is None:
+            return True
+        cluster_id, is_new = stories.assign(result, topic_id, per_topic=per_topic, persist=not dry_run)
+        if not is_new:
+            if verbose:
+                print(f"   ⏭️  Same story as cluster {cluster_id}: {result.get('title', '')[:50]}...")
+            return False
+        cluster_ids[id(result)] = cluster_id
+        return True
+    
+    topic_state = state.setdefault("topics", {}).setdefault(topic_id, {})
     
     # Send high priority alerts
-    for result, score, reason in high_priority:
+    alerts_sent = 0
+    for result, score, reason in sorted(high_priority, key=lambda x: x[1], reverse=True):
         if check_rate_limits(topic, state, settings):
-            send_alert(topic, result, "high", score, reason, dry_run=dry_run)
+            if not new_story(result):
+                continue
+            send_alert(topic, result, "high", score, reason, dry_run=dry_run, dispatcher=dispatcher)
+            alerts_sent += 1
             
             # Increment alert counter
             if not dry_run:
-                if "topics" not in state:
-                    state["topics"] = {}
-                if topic_id not in state["topics"]:
-                    state["topics"][topic_id] = {}
-                
-                state["topics"][topic_id]["alerts_today"] = \
-                    state["topics"][topic_id].get("alerts_today", 0) + 1
+                topic_state["alerts_today"] = topic_state.get("alerts_today", 0) + 1
+                topic_changes["alerts_added"] = topic_changes.get("alerts_added", 0) + 1
         else:
             if verbose:
                 print(f"   ⚠️ Rate limit reached, skipping alert")
     
+    medium_priority = [item for item in sorted(medium_priority, key=lambda x: x[1], reverse=True)
+                       if new_story(item[0])]
+    if own_index and stories is not None:
+        stories.close()
+    
     # Save medium priority to findings
     date_str = datetime.now().strftime("%Y-%m-%d")
     for result, score, reason in medium_priority:
@@ -297,6 +407,7 @@ def monitor_topic(topic: Dict, state: Dict, settings: Dict, dry_run: bool = Fals
                 "result": result,
                 "score": score,
                 "reason": reason,
+                "cluster_id": cluster_ids.get(id(result)),
                 "timestamp": datetime.now().isoformat()
             })
         
@@ -305,15 +416,29 @@ def monitor_topic(topic: Dict, state: Dict, settings: Dict, dry_run: bool = Fals
     
     # Update topic state
     if not dry_run:
-        if "topics" not in state:
-            state["topics"] = {}
-        if topic_id not in state["topics"]:
-            state["topics"][topic_id] = {}
+        now = datetime.now().isoformat()
+        topic_state["last_check"] = now
+        topic_state["last_results_count"] = len(results)
+        topic_state["findings_count"] = topic_state.get("findings_count", 0) + len(medium_priority)
+        
+        topic_changes["last_check"] = now
+        topic_changes["last_results_count"] = len(results)
+        topic_changes["findings_added"] = topic_changes.get("findings_added", 0) + len(medium_priority)
+        if latency is not None:
+            topic_state["last_search_latency"] = round(latency, 3)
+            topic_changes["last_search_latency"] = round(latency, 3)
         
-        state["topics"][topic_id]["last_check"] = datetime.now().isoformat()
-        state["topics"][topic_id]["last_results_count"] = len(results)
-        state["topics"][topic_id]["findings_count"] = \
-            state["topics"][topic_id].get("findings_count", 0) + len(medium_priority)
+        # Check history for the adaptive scheduler
+        get_findings_store().record_check(
+            topic_id, now, len(results), len(new_urls), len(medium_priority), alerts_sent
+        )
+
+
+def drain_alerts(dispatcher: AlertDispatcher, settings: Dict):
+    """Deliver queued alerts within alert_drain_seconds; the rest stays spooled."""
+    delivery = dispatcher.close(timeout=settings.get("alert_drain_seconds", 30))
+    if delivery["sent"] or delivery["pending"] or delivery["failed"]:
+        print(f"📬 Alerts: {delivery['sent']} sent, {delivery['pending']} queued, {delivery['failed']} failed")
 
 
 def main():
@@ -324,6 +449,14 @@ def main():
     parser.add_argument("--force", action="store_true", help="Force check even if not due")
     parser.add_argument("--frequency", choices=["hourly", "daily", "weekly"], 
                        help="Only check topics with this frequency")
+    parser.add_argument("--workers", type=int,
+                       help="Concurrent searches (default: settings.max_parallel_searches or 8)")
+    parser.add_argument("--timeout", type=float,
+                       help="Per-topic search timeout in seconds (default: settings.search_timeout_seconds or 30)")
+    parser.add_argument("--deadline", type=float,
+                       help="End searches after this many seconds (caps each search's timeout); unfinished topics stay due")
+    parser.add_argument("--adaptive", action="store_true",
+                       help="Pick due topics with the adaptive scheduler (default when adaptive_schedule.enabled)")
     
     args = parser.parse_args()
     
@@ -344,8 +477,12 @@ def main():
     
     # Filter topics
     topics_to_check = []
+    adaptive = (args.adaptive or schedule_settings(settings)["enabled"]) and not (args.force or args.topic)
+    
+    if adaptive:
+        topics_to_check = select_adaptive(topics, state, settings)
     
-    for topic in topics:
+    for topic in ([] if adaptive else topics):
         # Filter by specific topic
         if args.topic and topic.get("id") != args.topic:
             continue
@@ -361,23 +498,57 @@ def main():
     if not topics_to_check:
         if args.verbose:
             print("✅ No topics due for checking")
+        # Still retry alerts earlier runs left in the spool
+        channels = [] if args.dry_run else spooled_channels()
+        if channels:
+            drain_alerts(AlertDispatcher(channels, verbose=args.verbose), settings)
         sys.exit(0)
     
-    print(f"🔍 Monitoring {len(topics_to_check)} topic(s)...")
-    
-    # Monitor each topic
-    for topic in topics_to_check:
+    workers = args.workers or settings.get("max_parallel_searches", 8)
+    timeout = args.timeout or settings.get("search_timeout_seconds", 30)
+    deadline = args.deadline or settings.get("run_deadline_seconds")
+    
+    print(f"🔍 Monitoring {len(topics_to_check)} topic(s) with {min(workers, len(topics_to_check))} parallel search(es)...")
+    
+    # Search concurrently; score, alert and record state on this thread as results arrive
+    changes = {"topics": {}}
+    dedup = open_dedup_store(state, settings)
+    stories = open_story_index(settings)
+    dispatcher = None if args.dry_run else AlertDispatcher(spooled_channels(), verbose=args.verbose)
+    latencies = []
+    started = time.monotonic()
+    
+    for topic, results, latency, error in run_searches(
+        topics_to_check, dry_run=args.dry_run, max_workers=workers, timeout=timeout, deadline=deadline
+    ):
+        latencies.append((topic.get("id"), latency, len(results or []), error))
+        if error:
+            print(f"❌ Search failed for {topic.get('name')}: {error}", file=sys.stderr)
+            continue
         try:
-            monitor_topic(topic, state, settings, dry_run=args.dry_run, verbose=args.verbose)
+            monitor_topic(
+                topic, state, settings, dry_run=args.dry_run, verbose=args.verbose,
+                results=results, changes=changes, latency=latency, dedup=dedup,
+                stories=stories, dispatcher=dispatcher
+            )
         except Exception as e:
             print(f"❌ Error monitoring {topic.get('name')}: {e}", file=sys.stderr)
             if args.verbose:
                 import traceback
                 traceback.print_exc()
     
-    # Save state
+    dedup.close()
+    if stories is not None:
+        stories.close()
+    print(format_latency_report(latencies, time.monotonic() - started))
+    
+    # Deliver what is still queued; anything left stays spooled for the next run
+    if dispatcher is not None:
+        drain_alerts(dispatcher, settings)
+    
+    # Merge this run's changes into the state file
     if not args.dry_run:
-        save_state(state)
+        merge_state(changes)
         print("✅ State saved")
     
     print("✅ Monitoring complete")
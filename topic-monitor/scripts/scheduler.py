@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Adaptive per-topic scheduling for topic-monitor.
+
+Instead of fixed hourly/daily/weekly checks, each topic's yield is learned
+from its recorded checks (alerts, findings and new results per hour of
+elapsed time, exponentially decayed so recent behaviour dominates). A topic
+is due once its expected yield since the last check reaches target_yield,
+i.e. every target_yield / rate hours, clamped to the configured bounds. Due
+topics are taken from a priority queue ordered by expected waiting yield
+until the global hourly search budget is used up.
+
+The topic's fixed frequency acts as the prior (one unit of yield per base
+interval), so new topics start on their fixed schedule and drift from there.
+
+Settings (config.json "settings"):
+    "adaptive_schedule": {
+        "enabled": true,
+        "min_interval_hours": 0.5,
+        "max_interval_hours": 168,
+        "hourly_search_budget": 20,
+        "target_yield": 1.0,
+        "half_life_days": 7,
+        "tick_minutes": 15
+    }
+Topics may override min_interval_hours / max_interval_hours.
+
+Usage:
+    python3 scripts/scheduler.py --plan
+    python3 scripts/scheduler.py --simulate --days 30
+"""
+
+import sys
+import heapq
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import load_config, load_state, get_settings, get_findings_store
+
+DEFAULTS = {
+    "enabled": False,
+    "min_interval_hours": 0.5,
+    "max_interval_hours": 168,
+    "hourly_search_budget": 20,
+    "target_yield": 1.0,
+    "half_life_days": 7,
+    "tick_minutes": 15,
+}
+
+BASE_INTERVAL_HOURS = {"hourly": 1, "daily": 24, "weekly": 168}
+
+# Yield of one check: alerts count most, new (non-duplicate) results a little
+ALERT_WEIGHT = 2.0
+NEW_RESULT_WEIGHT = 0.1
+
+HISTORY_DAYS = 60
+
+
+def schedule_settings(settings: Dict) -> Dict:
+    return {**DEFAULTS, **settings.get("adaptive_schedule", {})}
+
+
+def check_yield(check: Dict) -> float:
+    return (ALERT_WEIGHT * check.get("alerts", 0) + check.get("findings", 0)
+            + NEW_RESULT_WEIGHT * check.get("new_results", 0))
+
+
+class TopicRate:
+    """Exponentially decayed yield-per-hour estimate for one topic (O(1) updates)."""
+
+    def __init__(self, base_hours: float, half_life_hours: float):
+        self.base_hours = base_hours
+        self.half_life = half_life_hours
+        self.weighted_yield = 0.0
+        self.weighted_hours = 0.0
+        self.updated: Optional[datetime] = None
+        self.last_check: Optional[datetime] = None
+
+    def observe(self, ts: datetime, value: float):
+        """Add a check at ts that found value since the previous check."""
+        if self.updated is not None:
+            decay = 0.5 ** (max((ts - self.updated).total_seconds(), 0) / 3600 / self.half_life)
+            self.weighted_yield *= decay
+            self.weighted_hours *= decay
+        if self.last_check is not None:
+            self.weighted_yield += value
+            self.weighted_hours += max((ts - self.last_check).total_seconds() / 3600, 1 / 60)
+        self.updated = ts
+        self.last_check = ts
+
+    def rate(self) -> float:
+        """Yield per hour; the fixed frequency counts as one pseudo-check."""
+        return (self.weighted_yield + 1.0) / (self.weighted_hours + self.base_hours)
+
+
+class AdaptiveScheduler:
+    """Picks which topics to check now, within bounds and the hourly budget."""
+
+    def __init__(self, topics: List[Dict], settings: Dict):
+        self.options = schedule_settings(settings)
+        half_life = self.options["half_life_days"] * 24
+        self.topics = {topic.get("id"): topic for topic in topics}
+        self.rates = {
+            topic_id: TopicRate(BASE_INTERVAL_HOURS.get(topic.get("frequency", "daily"), 24), half_life)
+            for topic_id, topic in self.topics.items()
+        }
+
+    def observe(self, check: Dict):
+        rate = self.rates.get(check["topic_id"])
+        if rate is not None:
+            rate.observe(check["ts"], check_yield(check))
+
+    def interval_hours(self, topic_id: str) -> float:
+        topic = self.topics[topic_id]
+        low = topic.get("min_interval_hours", self.options["min_interval_hours"])
+        high = topic.get("max_interval_hours", self.options["max_interval_hours"])
+        return min(max(self.options["target_yield"] / self.rates[topic_id].rate(), low), high)
+
+    def plan(self, now: datetime, last_checks: Optional[Dict[str, datetime]] = None) -> List[Dict]:
+        """Every topic with its rate, interval, next check time and priority."""
+        rows = []
+        for topic_id in self.topics:
+            rate = self.rates[topic_id]
+            last = (last_checks or {}).get(topic_id) or rate.last_check
+            interval = self.interval_hours(topic_id)
+            if last is None:
+                next_check, priority = now, float("inf")
+            else:
+                elapsed = (now - last).total_seconds() / 3600
+                next_check = last + timedelta(hours=interval)
+                priority = rate.rate() * elapsed
+            rows.append({
+                "topic_id": topic_id, "rate": rate.rate(), "interval_hours": interval,
+                "last_check": last, "next_check": next_check, "priority": priority,
+            })
+        return rows
+
+    def select(
+        self,
+        now: datetime,
+        last_checks: Optional[Dict[str, datetime]] = None,
+        used_this_hour: int = 0
+    ) -> List[Dict]:
+        """Due topics, highest expected waiting yield first, up to the remaining budget."""
+        budget = max(self.options["hourly_search_budget"] - used_this_hour, 0)
+        queue = [(-row["priority"], row["topic_id"]) for row in self.plan(now, last_checks)
+                 if row["next_check"] <= now]
+        heapq.heapify(queue)
+        selected = []
+        while queue and len(selected) < budget:
+            _, topic_id = heapq.heappop(queue)
+            selected.append(self.topics[topic_id])
+        return selected
+
+
+def load_scheduler(topics: List[Dict], settings: Dict, now: Optional[datetime] = None) -> AdaptiveScheduler:
+    """Scheduler trained on the recorded checks of the last HISTORY_DAYS."""
+    now = now or datetime.now()
+    scheduler = AdaptiveScheduler(topics, settings)
+    for check in get_findings_store().checks(now - timedelta(days=HISTORY_DAYS)):
+        scheduler.observe(check)
+    return scheduler
+
+
+def last_checks_from_state(state: Dict) -> Dict[str, datetime]:
+    return {
+        topic_id: datetime.fromisoformat(topic_state["last_check"])
+        for topic_id, topic_state in state.get("topics", {}).items()
+        if topic_state.get("last_check")
+    }
+
+
+def select_adaptive(topics: List[Dict], state: Dict, settings: Dict, now: Optional[datetime] = None) -> List[Dict]:
+    """Topics the adaptive scheduler wants checked now (used by monitor.py)."""
+    now = now or datetime.now()
+    scheduler = load_scheduler(topics, settings, now)
+    used = get_findings_store().count_checks(now - timedelta(hours=1))
+    return scheduler.select(now, last_checks_from_state(state), used)
+
+
+# ----------------------------------------------------------------------
+# Simulation
+# ----------------------------------------------------------------------
+
+def fixed_check_times(frequency: str, start: datetime, end: datetime) -> List[datetime]:
+    """Check times of the fixed cron schedule (hourly :00, daily 9:00, weekly Sunday 9:00)."""
+    times = []
+    t = start.replace(minute=0, second=0, microsecond=0)
+    while t < end:
+        if t >= start and (
+            frequency == "hourly"
+            or (frequency == "daily" and t.hour == 9)
+            or (frequency == "weekly" and t.hour == 9 and t.weekday() == 6)
+        ):
+            times.append(t)
+        t += timedelta(hours=1)
+    return times
+
+
+def _floor_to_tick(ts: datetime, tick_minutes: int) -> datetime:
+    """Start of the scheduler tick (cron slot) a timestamp falls in."""
+    minutes = ts.hour * 60 + ts.minute
+    midnight = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight + timedelta(minutes=minutes - minutes % tick_minutes)
+
+
+def _catch(arrivals: List[Tuple[datetime, float]], checks: List[datetime]) -> Tuple[float, float, List[float]]:
+    """Yield caught by the check times, pending yield, and detection delays (hours)."""
+    caught, delays = 0.0, []
+    i = 0
+    for arrival, value in arrivals:
+        while i < len(checks) and checks[i] < arrival:
+            i += 1
+        if i == len(checks):
+            break
+        caught += value
+        delays.append((checks[i] - arrival).total_seconds() / 3600)
+    pending = sum(value for _, value in arrivals) - caught
+    return caught, pending, delays
+
+
+def simulate(topics: List[Dict], history: List[Dict], settings: Dict,
+             start: datetime, end: datetime) -> Dict[str, Dict]:
+    """
+    Replay recorded checks against the fixed and the adaptive schedule.
+
+    Each recorded check's yield is treated as arriving at the start of the
+    tick its check ran in (checks are recorded a little after their cron
+    slot, and a check catches what is there when it runs). Both policies see
+    the same arrivals; a policy catches an arrival at its first check at or
+    after that time. The adaptive policy learns only from what its own
+    simulated checks found.
+    """
+    options = schedule_settings(settings)
+    arrivals = {topic.get("id"): [] for topic in topics}
+    for check in history:
+        if check["topic_id"] in arrivals and start <= check["ts"] < end and check_yield(check) > 0:
+            arrival = _floor_to_tick(check["ts"], options["tick_minutes"])
+            arrivals[check["topic_id"]].append((arrival, check_yield(check)))
+
+    # Fixed schedule
+    fixed_times = {
+        topic.get("id"): fixed_check_times(topic.get("frequency", "daily"), start, end) for topic in topics
+    }
+
+    # Adaptive schedule, ticking like cron
+    scheduler = AdaptiveScheduler(topics, settings)
+    adaptive_times = {topic_id: [] for topic_id in arrivals}
+    recent: List[datetime] = []
+    cursor = {topic_id: 0 for topic_id in arrivals}
+    tick = timedelta(minutes=options["tick_minutes"])
+    now = start
+    while now < end:
+        recent = [t for t in recent if t > now - timedelta(hours=1)]
+        for topic in scheduler.select(now, used_this_hour=len(recent)):
+            topic_id = topic.get("id")
+            found = 0.0
+            topic_arrivals = arrivals[topic_id]
+            while cursor[topic_id] < len(topic_arrivals) and topic_arrivals[cursor[topic_id]][0] <= now:
+                found += topic_arrivals[cursor[topic_id]][1]
+                cursor[topic_id] += 1
+            scheduler.observe({"topic_id": topic_id, "ts": now, "findings": found})
+            adaptive_times[topic_id].append(now)
+            recent.append(now)
+        now += tick
+
+    report = {}
+    for policy, times in (("fixed", fixed_times), ("adaptive", adaptive_times)):
+        searches = caught = pending = 0.0
+        delays: List[float] = []
+        for topic_id, topic_arrivals in arrivals.items():
+            c, p, d = _catch(topic_arrivals, times[topic_id])
+            searches += len(times[topic_id])
+            caught += c
+            pending += p
+            delays.extend(d)
+        delays.sort()
+        report[policy] = {
+            "searches": int(searches),
+            "yield_caught": caught,
+            "yield_pending": pending,
+            "yield_per_search": caught / searches if searches else 0.0,
+            "mean_delay_hours": sum(delays) / len(delays) if delays else 0.0,
+            "p90_delay_hours": delays[int(len(delays) * 0.9)] if delays else 0.0,
+        }
+    return report
+
+
+def format_plan(rows: List[Dict], now: datetime) -> str:
+    lines = [f"{'topic':30} {'yield/h':>8} {'interval':>9} {'next check':>17}"]
+    for row in sorted(rows, key=lambda r: r["next_check"]):
+        due = "due now" if row["next_check"] <= now else row["next_check"].strftime("%Y-%m-%d %H:%M")
+        lines.append(f"{row['topic_id']:30} {row['rate']:8.3f} {row['interval_hours']:8.1f}h {due:>17}")
+    return "\n".join(lines)
+
+
+def format_simulation(report: Dict[str, Dict], days: int) -> str:
+    lines = [f"Replay of the last {days} day(s) of recorded checks", ""]
+    lines.append(f"{'':10} {'searches':>9} {'yield':>8} {'pending':>8} {'yield/search':>13} {'mean delay':>11} {'p90 delay':>10}")
+    for policy, r in report.items():
+        lines.append(
+            f"{policy:10} {r['searches']:9d} {r['yield_caught']:8.1f} {r['yield_pending']:8.1f} "
+            f"{r['yield_per_search']:13.3f} {r['mean_delay_hours']:10.1f}h {r['p90_delay_hours']:9.1f}h"
+        )
+    fixed, adaptive = report["fixed"]["searches"], report["adaptive"]["searches"]
+    if fixed:
+        lines.append("")
+        lines.append(f"Adaptive uses {adaptive / fixed:.0%} of the fixed schedule's searches")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Adaptive topic scheduling: plan and simulation",
+        epilog="Examples:\n"
+               "  python3 scripts/scheduler.py --plan\n"
+               "  python3 scripts/scheduler.py --simulate --days 30",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--plan", action="store_true", help="Show each topic's learned rate and next check")
+    parser.add_argument("--simulate", action="store_true",
+                       help="Replay recorded checks and compare quota usage with the fixed schedule")
+    parser.add_argument("--days", type=int, default=30, help="Days of history to replay (default: 30)")
+    args = parser.parse_args()
+
+    try:
+        topics = load_config().get("topics", [])
+    except FileNotFoundError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    settings = get_settings()
+    now = datetime.now()
+
+    if args.simulate:
+        start = now - timedelta(days=args.days)
+        history = get_findings_store().checks(start, now)
+        if not history:
+            print("⚠️ No recorded checks to replay yet (monitor.py records one per topic check)")
+            sys.exit(0)
+        print(format_simulation(simulate(topics, history, settings, start, now), args.days))
+    else:
+        scheduler = load_scheduler(topics, settings, now)
+        print(format_plan(scheduler.plan(now, last_checks_from_state(load_state())), now))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,10 @@ Creates cron entries for:
 - Hourly topic checks
 - Daily topic checks
 - Weekly digest
+
+With settings.adaptive_schedule.enabled, the fixed hourly/daily/weekly checks
+are replaced by one monitor.py --adaptive entry every tick_minutes; the
+scheduler decides which topics are due on each tick.
 """
 
 import sys
@@ -15,7 +19,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import load_config, get_settings
+from scheduler import schedule_settings
 
+CRON_MARKER = "# proactive-research"
 SKILL_DIR = Path(__file__).parent.parent
 MONITOR_SCRIPT = SKILL_DIR / "scripts" / "monitor.py"
 DIGEST_SCRIPT = SKILL_DIR / "scripts" / "digest.py"
@@ -50,6 +56,8 @@ def remove_old_entries(crontab: str) -> str:
     filtered = [
         line for line in lines
         if "proactive-research" not in line.lower()
+        and "proactive research" not in line.lower()
+        and str(MONITOR_SCRIPT) not in line and str(DIGEST_SCRIPT) not in line
     ]
     return "\n".join(filtered)
 
@@ -59,22 +67,30 @@ def generate_cron_entries(settings: dict) -> list[str]:
     entries = []
     
     # Header
-    entries.append("# Proactive Research - Auto-generated")
-    
-    # Hourly check (every hour)
-    entries.append(
-        f"0 * * * * cd {SKILL_DIR} && /usr/bin/python3 {MONITOR_SCRIPT} --frequency hourly"
-    )
-    
-    # Daily check (9 AM)
-    entries.append(
-        f"0 9 * * * cd {SKILL_DIR} && /usr/bin/python3 {MONITOR_SCRIPT} --frequency daily"
-    )
-    
-    # Weekly check (Sunday 9 AM)
-    entries.append(
-        f"0 9 * * 0 cd {SKILL_DIR} && /usr/bin/python3 {MONITOR_SCRIPT} --frequency weekly"
-    )
+    entries.append(f"{CRON_MARKER} - auto-generated")
+    
+    schedule = schedule_settings(settings)
+    if schedule["enabled"]:
+        # Adaptive: frequent ticks, the scheduler picks due topics within the budget
+        tick = max(1, min(int(schedule["tick_minutes"]), 59))
+        entries.append(
+            f"*/{tick} * * * * cd {SKILL_DIR} && /usr/bin/python3 {MONITOR_SCRIPT} --adaptive {CRON_MARKER}"
+        )
+    else:
+        # Hourly check (every hour)
+        entries.append(
+            f"0 * * * * cd {SKILL_DIR} && /usr/bin/python3 {MONITOR_SCRIPT} --frequency hourly {CRON_MARKER}"
+        )
+        
+        # Daily check (9 AM)
+        entries.append(
+            f"0 9 * * * cd {SKILL_DIR} && /usr/bin/python3 {MONITOR_SCRIPT} --frequency daily {CRON_MARKER}"
+        )
+        
+        # Weekly check (Sunday 9 AM)
+        entries.append(
+            f"0 9 * * 0 cd {SKILL_DIR} && /usr/bin/python3 {MONITOR_SCRIPT} --frequency weekly {CRON_MARKER}"
+        )
     
     # Weekly digest
     digest_day = settings.get("digest_day", "sunday")
@@ -91,7 +107,7 @@ def generate_cron_entries(settings: dict) -> list[str]:
     day_num = day_map.get(digest_day.lower(), "0")
     
     entries.append(
-        f"{minute} {hour} * * {day_num} cd {SKILL_DIR} && /usr/bin/python3 {DIGEST_SCRIPT} --send"
+        f"{minute} {hour} * * {day_num} cd {SKILL_DIR} && /usr/bin/python3 {DIGEST_SCRIPT} --send {CRON_MARKER}"
     )
     
     return entries
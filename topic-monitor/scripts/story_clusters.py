@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate story clustering for topic-monitor.
+
+The same story syndicated across many sites (or rewritten from one wire
+report) arrives under different URLs, so URL dedup lets every copy through.
+Each result's title + snippet is reduced to a MinHash signature over word
+shingles; an LSH band index finds earlier stories with a similar signature in
+a few dict lookups, and matches above the similarity threshold join that
+story's cluster. Alerts and digest findings are emitted once per cluster.
+
+Signatures of recent stories are stored next to the URL dedup table in
+.dedup.db and loaded into memory for the rolling window
+(deduplication_window_hours); older stories are evicted like seen URLs.
+
+Usage:
+    from story_clusters import StoryIndex
+
+    index = StoryIndex(window_hours=72, threshold=0.5)
+    cluster_id, is_new = index.assign(result, topic_id="ai-models")
+"""
+
+import hashlib
+import re
+import sqlite3
+import time
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import DEDUP_DB_FILE
+
+NUM_PERM = 64
+BANDS = 32
+ROWS = NUM_PERM // BANDS  # 32 bands x 2 rows: a Jaccard-0.5 pair shares a band >99.9% of the time
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+# Fixed permutations (a, b) so signatures stay comparable across runs
+_PERMUTATIONS = [
+    (int.from_bytes(hashlib.md5(f"a{i}".encode()).digest()[:8], "big") % (MERSENNE_PRIME - 1) + 1,
+     int.from_bytes(hashlib.md5(f"b{i}".encode()).digest()[:8], "big") % MERSENNE_PRIME)
+    for i in range(NUM_PERM)
+]
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+# "Story title - Site Name" / "Story title | Site Name"
+SOURCE_SUFFIX_RE = re.compile(r"\s+[-|–—]\s+[^-|–—]{2,40}$")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was were will with".split()
+)
+
+
+def shingles(text: str) -> Set[int]:
+    """32-bit hashes of the word bigrams of text (unigrams if too short)."""
+    tokens = [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+    if len(tokens) < 3:
+        grams = tokens
+    else:
+        grams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return {int.from_bytes(hashlib.md5(g.encode()).digest()[:4], "little") for g in grams}
+
+
+def story_text(result: Dict) -> str:
+    title = SOURCE_SUFFIX_RE.sub("", result.get("title", "") or "")
+    return f"{title} {result.get('snippet', '') or ''}"
+
+
+def minhash(hashes: Set[int]) -> Tuple[int, ...]:
+    """MinHash signature (NUM_PERM values) of a set of shingle hashes."""
+    if not hashes:
+        return ()
+    return tuple(
+        min((a * h + b) % MERSENNE_PRIME for h in hashes) & MAX_HASH
+        for a, b in _PERMUTATIONS
+    )
+
+
+def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    if not sig_a or not sig_b:
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def band_keys(signature: Tuple[int, ...]) -> List[Tuple[int, int]]:
+    return [(band, hash(signature[band * ROWS:(band + 1) * ROWS])) for band in range(BANDS)]
+
+
+class StoryIndex:
+    """Rolling window of story signatures with an in-memory LSH index."""
+
+    def __init__(self, path: Path = DEDUP_DB_FILE, window_hours: float = 72, threshold: float = 0.5):
+        self.window = window_hours * 3600
+        self.threshold = threshold
+        self._signatures: List[Tuple[int, ...]] = []
+        self._clusters: List[str] = []
+        self._topics: List[Optional[str]] = []
+        self._buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._pending: List[Tuple] = []
+
+        self._conn = sqlite3.connect(str(path), timeout=30)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS stories (
+                cluster_id TEXT NOT NULL,
+                topic_id TEXT,
+                url TEXT,
+                signature BLOB NOT NULL,
+                seen_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_stories_seen_at ON stories (seen_at);
+        """)
+        cutoff = time.time() - self.window
+        self._conn.execute("DELETE FROM stories WHERE seen_at < ?", (cutoff,))
+        self._conn.commit()
+        for cluster_id, topic_id, blob in self._conn.execute(
+            "SELECT cluster_id, topic_id, signature FROM stories ORDER BY seen_at"
+        ):
+            self._add(tuple(array("I", blob)), cluster_id, topic_id)
+
+    def _add(self, signature: Tuple[int, ...], cluster_id: str, topic_id: Optional[str]):
+        position = len(self._signatures)
+        self._signatures.append(signature)
+        self._clusters.append(cluster_id)
+        self._topics.append(topic_id)
+        for key in band_keys(signature):
+            self._buckets[key].append(position)
+
+    def match(self, signature: Tuple[int, ...], topic_id: Optional[str] = None) -> Optional[str]:
+        """Cluster of the most similar earlier story above the threshold, if any.
+
+        With topic_id, only stories recorded for that topic are considered.
+        """
+        if not signature:
+            return None
+        candidates = set()
+        for key in band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+
+        best, best_score = None, self.threshold
+        for position in candidates:
+            if topic_id is not None and self._topics[position] != topic_id:
+                continue
+            score = similarity(signature, self._signatures[position])
+            if score >= best_score:
+                best, best_score = self._clusters[position], score
+        return best
+
+    def assign(
+        self,
+        result: Dict,
+        topic_id: Optional[str] = None,
+        per_topic: bool = False,
+        persist: bool = True
+    ) -> Tuple[Optional[str], bool]:
+        """
+        Add a result to the index; returns (cluster_id, is_new_cluster).
+
+        Results without text get (None, True). per_topic keeps clusters apart
+        between topics. persist=False keeps the story in memory only (dry
+        runs); otherwise it is written by flush().
+        """
+        signature = minhash(shingles(story_text(result)))
+        if not signature:
+            return None, True
+
+        cluster_id = self.match(signature, topic_id if per_topic else None)
+        is_new = cluster_id is None
+        if is_new:
+            seed = result.get("url") or story_text(result)
+            cluster_id = hashlib.md5(f"{seed}:{time.time()}".encode()).hexdigest()[:12]
+
+        self._add(signature, cluster_id, topic_id)
+        if persist:
+            self._pending.append((
+                cluster_id, topic_id, result.get("url"),
+                array("I", signature).tobytes(), time.time()
+            ))
+        return cluster_id, is_new
+
+    def flush(self):
+        """Write stories assigned since the last flush."""
+        if self._pending:
+            self._conn.executemany(
+                "INSERT INTO stories (cluster_id, topic_id, url, signature, seen_at) VALUES (?, ?, ?, ?, ?)",
+                self._pending
+            )
+            self._conn.commit()
+            self._pending = []
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def close(self):
+        self.flush()
+        self._conn.close()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests for topic-monitor URL canonicalization
+
+Run with: python3 -m pytest scripts/test_dedup_store.py -v
+"""
+
+import pytest
+
+from dedup_store import canonicalize_url
+
+
+class TestCanonicalizeUrl:
+    @pytest.mark.parametrize("variant, canonical", [
+        ("https://example.com/story?utm_source=x&utm_medium=rss", "https://example.com/story"),
+        ("https://example.com/story?fbclid=abc&id=7", "https://example.com/story?id=7"),
+        ("http://www.example.com/story/#comments", "https://example.com/story"),
+        ("https://m.example.com/story?b=2&a=1", "https://example.com/story?a=1&b=2"),
+        ("https://example.com/news/story/amp", "https://example.com/news/story"),
+        ("https://example.com/news/story.amp.html", "https://example.com/news/story.html"),
+        ("https://www.google.com/amp/s/example.com/news/story/amp", "https://example.com/news/story"),
+    ])
+    def test_same_page_variants_collapse(self, variant, canonical):
+        assert canonicalize_url(variant) == canonical
+
+    @pytest.mark.parametrize("url", [
+        "https://github.com/x/y?ref=main",
+        "https://example.com/item?share=1",
+        "https://example.com/item?si=abc",
+        "https://example.com/item?spm=a1.b2",
+    ])
+    def test_content_selecting_params_are_kept(self, url):
+        assert canonicalize_url(url) != canonicalize_url(url.split("?")[0])
+
+    def test_bare_amp_path_is_not_the_site_root(self):
+        assert canonicalize_url("https://example.com/amp") == "https://example.com/amp"
+        assert canonicalize_url("https://example.com/amp/") == "https://example.com/amp"
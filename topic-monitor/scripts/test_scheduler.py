@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests for the topic-monitor adaptive scheduler simulation
+
+Run with: python3 -m pytest scripts/test_scheduler.py -v
+"""
+
+from datetime import datetime, timedelta
+
+from scheduler import fixed_check_times, simulate
+
+
+START = datetime(2026, 10, 1)
+END = START + timedelta(days=7)
+
+
+def _recorded_checks(topic_id, frequency, lag_seconds=7):
+    """History as monitor.py records it: one check per cron slot, a few seconds late."""
+    return [
+        {"topic_id": topic_id, "ts": slot + timedelta(seconds=lag_seconds), "alerts": 1, "findings": 0}
+        for slot in fixed_check_times(frequency, START, END)
+    ]
+
+
+class TestSimulate:
+    def test_fixed_schedule_catches_its_own_history_without_delay(self):
+        topics = [{"id": "ai", "frequency": "hourly"}, {"id": "rust", "frequency": "daily"}]
+        history = _recorded_checks("ai", "hourly") + _recorded_checks("rust", "daily")
+
+        report = simulate(topics, history, {}, START, END)
+
+        fixed = report["fixed"]
+        assert fixed["yield_pending"] == 0
+        assert fixed["yield_caught"] == 2.0 * len(history)  # one alert per check
+        assert fixed["mean_delay_hours"] == 0
+        assert fixed["p90_delay_hours"] == 0
+
+    def test_late_recorded_checks_count_in_their_own_tick(self):
+        topics = [{"id": "ai", "frequency": "hourly"}]
+        history = _recorded_checks("ai", "hourly", lag_seconds=14 * 60)
+
+        report = simulate(topics, history, {"adaptive_schedule": {"tick_minutes": 15}}, START, END)
+
+        assert report["fixed"]["mean_delay_hours"] == 0
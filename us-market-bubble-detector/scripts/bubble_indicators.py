@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Bubble-O-Meter 自動指標パイプライン
+
+BubbleScorer の8指標を、キャッシュ済みの月次市場データから機械的に算出する。
+各指標は全期間の月次スコア(0-2点)をベクトル演算で一括計算するため、
+最新月の評価も過去数十年のヒストリカル・リプレイも同じ計算結果から得られる。
+
+指標とデータの対応:
+    mass_penetration      Put/Callレシオ (月平均)      <0.70: 2点, <0.85: 1点
+    media_saturation      VIX + S&P500の12ヶ月高値からの乖離
+                          VIX<12かつ高値5%以内: 2点, VIX<15かつ高値10%以内: 1点
+    new_accounts          S&P500出来高 3ヶ月平均/24ヶ月平均 (新規参入の代理指標)
+                          1.5倍以上: 2点, 1.2倍以上: 1点
+    new_issuance          IPO件数 直近四半期/過去5年の四半期平均
+                          2倍超: 2点, 1.5倍超: 1点
+    leverage              証拠金残高 前年比
+                          +20%以上かつ過去最高: 2点, +10%以上: 1点
+    price_acceleration    S&P500 3ヶ月リターンの過去10年パーセンタイル
+                          95%以上: 2点, 85%以上: 1点
+    valuation_disconnect  Shiller CAPE                 30以上: 2点, 25以上: 1点
+    breadth_expansion     Russell 2000 vs S&P500 (低位株まで上昇しているか)
+                          RUTが高値5%以内かつ6ヶ月リターンがS&P500以上: 2点,
+                          RUTが高値10%以内かつS&P500が高値5%以内: 1点
+
+データソース:
+    spx, spx_volume, vix, rut   Yahoo Finance (yfinance) から自動取得、1日キャッシュ
+    put_call, ipo_count,
+    margin_debt, cape           ユーザー提供のCSV (date,value) をデータディレクトリに配置
+
+    CBOE (Put/Call), Renaissance Capital (IPO), FINRA (Margin Statistics),
+    multpl.com / Shiller (CAPE) から取得した値を置く。日次データは月次に集約される。
+    データが無い指標はスコアなし(NaN)となり、評価から除外される。
+
+使用方法:
+    from bubble_indicators import BubbleIndicatorPipeline
+
+    pipeline = BubbleIndicatorPipeline()
+    scores, missing = pipeline.current_scores()
+    history = pipeline.replay(start="1990-01")
+
+必要ライブラリ:
+    pandas, numpy (必須), yfinance (Yahoo系列の自動取得に使用、任意)
+"""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    print("エラー: pandas/numpy がインストールされていません: pip install pandas numpy")
+    sys.exit(1)
+
+try:
+    import yfinance as yf
+except ImportError:
+    yf = None
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bubble_scorer import BubbleScorer, PHASES
+
+DEFAULT_DATA_DIR = Path(__file__).parent.parent / "cache" / "market_data"
+DOWNLOAD_TTL = timedelta(days=1)
+
+# 系列名 -> (ティッカー, 列名, 月次集約方法)。ティッカーが None の系列はユーザー提供CSV
+SERIES_SOURCES = {
+    "spx": ("^GSPC", "Close", "last"),
+    "spx_volume": ("^GSPC", "Volume", "sum"),
+    "vix": ("^VIX", "Close", "last"),
+    "rut": ("^RUT", "Close", "last"),
+    "put_call": (None, None, "mean"),
+    "ipo_count": (None, None, "sum"),
+    "margin_debt": (None, None, "last"),
+    "cape": (None, None, "last"),
+}
+
+# 最新月の評価で許容するデータの遅れ (月数)。IPO・証拠金は1-2ヶ月遅れで公表される
+MAX_STALENESS_MONTHS = 3
+
+
+def _grade(high: pd.Series, mid: pd.Series, valid: pd.Series) -> pd.Series:
+    """2点条件・1点条件から月次スコアを作る (データ欠損月は NaN)"""
+    score = np.select([high.fillna(False), mid.fillna(False)], [2.0, 1.0], default=0.0)
+    return pd.Series(score, index=valid.index).where(valid)
+
+
+def _to_monthly(series: pd.Series, how: str) -> pd.Series:
+    """日次・月次混在の系列を月次 (PeriodIndex) に集約"""
+    series = series.dropna()
+    index = pd.DatetimeIndex(series.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    grouped = series.groupby(index.to_period("M"))
+    return getattr(grouped, how)().astype(float)
+
+
+class MarketDataCache:
+    """月次市場データのローカルキャッシュ (CSV、Yahoo系列はTTL付きで再取得)"""
+
+    def __init__(self, data_dir: Path = DEFAULT_DATA_DIR, ttl: timedelta = DOWNLOAD_TTL,
+                 refresh: bool = False):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.refresh = refresh
+        self._memo: Dict[str, Optional[pd.Series]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+        self._attempted = set()
+
+    def _lock(self, key: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _path(self, name: str) -> Path:
+        return self.data_dir / f"{name}.csv"
+
+    def _is_fresh(self, path: Path) -> bool:
+        if self.refresh or not path.exists():
+            return False
+        return datetime.now() - datetime.fromtimestamp(path.stat().st_mtime) < self.ttl
+
+    def _read_csv(self, path: Path) -> Optional[pd.Series]:
+        try:
+            frame = pd.read_csv(path, index_col=0, parse_dates=True)
+        except (OSError, ValueError) as e:
+            print(f"警告: {path.name} を読み込めません: {e}", file=sys.stderr)
+            return None
+        if frame.empty:
+            return None
+        return pd.to_numeric(frame.iloc[:, 0], errors="coerce")
+
+    def _download(self, ticker: str):
+        """ティッカーの月次履歴を取得し、その列を使う全系列のCSVを書き出す"""
+        with self._lock(ticker):
+            targets = [(name, column) for name, (t, column, _) in SERIES_SOURCES.items() if t == ticker]
+            if ticker in self._attempted or all(self._is_fresh(self._path(name)) for name, _ in targets):
+                return
+            self._attempted.add(ticker)
+            if yf is None:
+                print(f"警告: yfinance 未インストールのため {ticker} を取得できません "
+                      f"(pip install yfinance)", file=sys.stderr)
+                return
+            try:
+                history = yf.Ticker(ticker).history(period="max", interval="1mo", auto_adjust=False)
+            except Exception as e:
+                print(f"警告: {ticker} の取得に失敗しました: {e}", file=sys.stderr)
+                return
+            if history is None or history.empty:
+                return
+            for name, column in targets:
+                if column in history:
+                    series = history[column].rename("value").rename_axis("date")
+                    series.index = series.index.strftime("%Y-%m-%d")
+                    series.to_csv(self._path(name))
+
+    def load(self, name: str) -> Optional[pd.Series]:
+        """月次系列 (PeriodIndex) を返す。データが無ければ None"""
+        with self._lock(name):
+            if name not in self._memo:
+                ticker, _, how = SERIES_SOURCES[name]
+                path = self._path(name)
+                if ticker is not None and not self._is_fresh(path):
+                    # 取得に失敗しても古いCSVがあればそれを使う
+                    self._download(ticker)
+
+                series = self._read_csv(path) if path.exists() else None
+                monthly = _to_monthly(series, how) if series is not None else None
+                self._memo[name] = monthly if monthly is not None and not monthly.empty else None
+            return self._memo[name]
+
+
+class BubbleIndicatorPipeline:
+    """市場データから8指標の月次スコアを並列に算出するパイプライン"""
+
+    def __init__(self, cache: Optional[MarketDataCache] = None, max_workers: int = 4):
+        self.cache = cache or MarketDataCache()
+        self.max_workers = max_workers
+        self.indicators: Dict[str, Callable[[], Optional[pd.Series]]] = {
+            "mass_penetration": self._mass_penetration,
+            "media_saturation": self._media_saturation,
+            "new_accounts": self._new_accounts,
+            "new_issuance": self._new_issuance,
+            "leverage": self._leverage,
+            "price_acceleration": self._price_acceleration,
+            "valuation_disconnect": self._valuation_disconnect,
+            "breadth_expansion": self._breadth_expansion,
+        }
+
+    # ------------------------------------------------------------------
+    # 指標計算 (全期間の月次スコアを返す。必要データが無ければ None)
+    # ------------------------------------------------------------------
+
+    def _load(self, *names: str) -> Optional[pd.DataFrame]:
+        series = [self.cache.load(name) for name in names]
+        if any(s is None for s in series):
+            return None
+        return pd.concat(series, axis=1, keys=names, join="inner")
+
+    @staticmethod
+    def _distance_from_high(price: pd.Series, window: int = 12) -> pd.Series:
+        return 1 - price / price.rolling(window, min_periods=1).max()
+
+    def _mass_penetration(self) -> Optional[pd.Series]:
+        put_call = self.cache.load("put_call")
+        if put_call is None:
+            return None
+        return _grade(put_call < 0.70, put_call < 0.85, put_call.notna())
+
+    def _media_saturation(self) -> Optional[pd.Series]:
+        data = self._load("vix", "spx")
+        if data is None:
+            return None
+        from_high = self._distance_from_high(data["spx"])
+        return _grade(
+            (data["vix"] < 12) & (from_high <= 0.05),
+            (data["vix"] < 15) & (from_high <= 0.10),
+            data["vix"].notna()
+        )
+
+    def _new_accounts(self) -> Optional[pd.Series]:
+        volume = self.cache.load("spx_volume")
+        if volume is None:
+            return None
+        volume = volume.where(volume > 0)
+        ratio = volume.rolling(3).mean() / volume.rolling(24).mean()
+        return _grade(ratio >= 1.5, ratio >= 1.2, ratio.notna())
+
+    def _new_issuance(self) -> Optional[pd.Series]:
+        ipos = self.cache.load("ipo_count")
+        if ipos is None:
+            return None
+        quarterly = ipos.rolling(3).sum()
+        baseline = ipos.rolling(60, min_periods=36).mean() * 3
+        ratio = quarterly / baseline.where(baseline > 0)
+        return _grade(ratio > 2.0, ratio > 1.5, ratio.notna())
+
+    def _leverage(self) -> Optional[pd.Series]:
+        margin = self.cache.load("margin_debt")
+        if margin is None:
+            return None
+        yoy = margin.pct_change(12, fill_method=None)
+        at_high = margin >= margin.cummax()
+        return _grade((yoy >= 0.20) & at_high, yoy >= 0.10, yoy.notna())
+
+    def _price_acceleration(self) -> Optional[pd.Series]:
+        spx = self.cache.load("spx")
+        if spx is None:
+            return None
+        returns = spx.pct_change(3, fill_method=None)
+        # 過去10年 (120ヶ月) の分布における当月のパーセンタイル
+        rank = returns.rolling(120, min_periods=60).rank(pct=True)
+        return _grade(rank >= 0.95, rank >= 0.85, rank.notna())
+
+    def _valuation_disconnect(self) -> Optional[pd.Series]:
+        cape = self.cache.load("cape")
+        if cape is None:
+            return None
+        return _grade(cape >= 30, cape >= 25, cape.notna())
+
+    def _breadth_expansion(self) -> Optional[pd.Series]:
+        data = self._load("rut", "spx")
+        if data is None:
+            return None
+        rut_from_high = self._distance_from_high(data["rut"])
+        spx_from_high = self._distance_from_high(data["spx"])
+        relative = data["rut"].pct_change(6, fill_method=None) - data["spx"].pct_change(6, fill_method=None)
+        return _grade(
+            (rut_from_high <= 0.05) & (relative >= 0),
+            (rut_from_high <= 0.10) & (spx_from_high <= 0.05),
+            relative.notna()
+        )
+
+    # ------------------------------------------------------------------
+    # 実行
+    # ------------------------------------------------------------------
+
+    def compute_history(self) -> pd.DataFrame:
+        """全指標の月次スコア (行: 月, 列: 指標) を並列に計算"""
+        def run(key):
+            try:
+                return key, self.indicators[key]()
+            except Exception as e:
+                print(f"警告: {key} の計算に失敗しました: {e}", file=sys.stderr)
+                return key, None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = dict(executor.map(run, self.indicators))
+
+        columns = {key: series for key, series in results.items() if series is not None}
+        history = pd.concat(columns, axis=1) if columns else pd.DataFrame()
+        return history.reindex(columns=list(self.indicators)).sort_index()
+
+    def current_scores(
+        self,
+        history: Optional[pd.DataFrame] = None
+    ) -> Tuple[Dict[str, int], List[str]]:
+        """
+        最新月時点の各指標スコア
+
+        Returns:
+            (スコア辞書, データ不足で算出できなかった指標のリスト)
+            公表が遅れる系列は直近 MAX_STALENESS_MONTHS ヶ月以内の値を採用する。
+        """
+        history = self.compute_history() if history is None else history
+        scores, missing = {}, []
+        if history.dropna(how="all").empty:
+            return scores, list(self.indicators)
+
+        latest = history.dropna(how="all").index[-1]
+        for key in self.indicators:
+            column = history[key].dropna() if key in history else pd.Series(dtype=float)
+            if column.empty or (latest - column.index[-1]).n > MAX_STALENESS_MONTHS:
+                missing.append(key)
+            else:
+                scores[key] = int(column.iloc[-1])
+        return scores, missing
+
+    def replay(self, start: Optional[str] = None, history: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        全月のバブルスコアを一括計算 (ヒストリカル・リプレイ)
+
+        各月の指標スコア、算出できた指標数、合計スコアとフェーズを返す。
+        欠損指標は0点として合計する。
+        """
+        history = self.compute_history() if history is None else history
+        if start:
+            history = history[history.index >= pd.Period(start, freq="M")]
+        history = history.dropna(how="all")
+
+        replay = history.copy()
+        replay["available"] = history.notna().sum(axis=1)
+        replay["total_score"] = history.fillna(0).sum(axis=1).astype(int)
+
+        total = replay["total_score"].to_numpy()
+        conditions = [total <= limit for limit, *_ in PHASES[:-1]]
+        replay["phase"] = np.select(conditions, [p[1] for p in PHASES[:-1]], default=PHASES[-1][1])
+        replay["risk_level"] = np.select(conditions, [p[2] for p in PHASES[:-1]], default=PHASES[-1][2])
+        return replay
+
+
+def format_replay(replay: pd.DataFrame, scorer: Optional[BubbleScorer] = None) -> str:
+    """リプレイ結果の要約 (フェーズ別月数、スコア上位月、フェーズ転換)"""
+    scorer = scorer or BubbleScorer()
+    if replay.empty:
+        return "リプレイ可能なデータがありません"
+
+    max_score = len(scorer.indicators) * 2
+    output = f"""
+{'='*60}
+🔍 Bubble-O-Meter ヒストリカル・リプレイ
+{'='*60}
+
+期間: {replay.index[0]} 〜 {replay.index[-1]} ({len(replay)}ヶ月)
+
+【フェーズ別月数】
+"""
+    counts = replay["phase"].value_counts()
+    for _, phase, risk, _ in PHASES:
+        output += f"  {phase} (リスク: {risk}): {counts.get(phase, 0)}ヶ月\n"
+
+    output += "\n【スコア上位月】\n"
+    for period, row in replay.nlargest(10, "total_score").iterrows():
+        output += f"  {period}: {row['total_score']}/{max_score}点 {row['phase']} (指標{row['available']}/8)\n"
+
+    changed = replay["phase"].ne(replay["phase"].shift())
+    output += "\n【フェーズ転換 (直近20件)】\n"
+    for period, row in replay[changed].tail(20).iterrows():
+        output += f"  {period}: {row['phase']} ({row['total_score']}点)\n"
+
+    output += f"\n{'='*60}\n"
+    return output
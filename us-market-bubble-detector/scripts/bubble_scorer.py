@@ -9,14 +9,28 @@ Bubble-O-Meter: 米国株式市場のバブル度を多面的に評価するス
 - 13-16: 臨界域
 
 使用方法:
-    python bubble_scorer.py --ticker SPY --period 1y
+    python bubble_scorer.py --manual
+    python bubble_scorer.py --scores '{"mass_penetration":1,...}'
+    python bubble_scorer.py --auto
+    python bubble_scorer.py --replay 1990-01 --replay-csv replay.csv
+
+--auto / --replay は bubble_indicators.py の自動指標パイプラインを使用 (pandas が必要)
 """
 
 import argparse
 import json
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Tuple
 
+# バブル段階: (合計スコア上限, フェーズ, リスク, 推奨アクション)。最後の段階は上限なし
+PHASES = [
+    (4, "正常域", "低", "通常通りの投資戦略を継続"),
+    (8, "警戒域", "中", "部分利確の開始、新規ポジションのサイズ縮小"),
+    (12, "熱狂域", "高", "階段状利確の加速、ATRトレーリングストップ厳格化、総リスク予算30-50%削減"),
+    (None, "臨界域", "極めて高", "大幅な利確またはフルヘッジ、新規参入停止、反転確認後のショートポジション検討"),
+]
+
 
 class BubbleScorer:
     """バブルスコアリングシステム"""
@@ -79,22 +93,9 @@ class BubbleScorer:
         max_score = len(self.indicators) * 2
         
         # バブル段階の判定
-        if total_score <= 4:
-            phase = "正常域"
-            risk_level = "低"
-            action = "通常通りの投資戦略を継続"
-        elif total_score <= 8:
-            phase = "警戒域"
-            risk_level = "中"
-            action = "部分利確の開始、新規ポジションのサイズ縮小"
-        elif total_score <= 12:
-            phase = "熱狂域"
-            risk_level = "高"
-            action = "階段状利確の加速、ATRトレーリングストップ厳格化、総リスク予算30-50%削減"
-        else:
-            phase = "臨界域"
-            risk_level = "極めて高"
-            action = "大幅な利確またはフルヘッジ、新規参入停止、反転確認後のショートポジション検討"
+        _, phase, risk_level, action = next(
+            p for p in PHASES if p[0] is None or total_score <= p[0]
+        )
         
         # Minskyフェーズの推定
         minsky_phase = self._estimate_minsky_phase(scores, total_score)
@@ -268,6 +269,33 @@ def main():
         type=str,
         help="JSON形式のスコア文字列 (例: '{\"mass_penetration\":2,\"media_saturation\":1,...}')"
     )
+    parser.add_argument(
+        "--auto",
+        action="store_true",
+        help="市場データから全指標を自動算出 (--scores で個別指標を上書き可能)"
+    )
+    parser.add_argument(
+        "--replay",
+        nargs="?",
+        const="1990-01",
+        metavar="YYYY-MM",
+        help="指定月以降の全月をスコアリングするヒストリカル・リプレイ (デフォルト: 1990-01)"
+    )
+    parser.add_argument(
+        "--replay-csv",
+        type=str,
+        help="リプレイ結果の月次スコアを書き出すCSVパス"
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        help="市場データCSVのディレクトリ (デフォルト: cache/market_data)"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="キャッシュを無視してYahoo Financeの系列を再取得"
+    )
     parser.add_argument(
         "--output",
         choices=["text", "json"],
@@ -277,10 +305,47 @@ def main():
     
     args = parser.parse_args()
     scorer = BubbleScorer()
+    missing = []
+    
+    if args.auto or args.replay:
+        from bubble_indicators import BubbleIndicatorPipeline, MarketDataCache, format_replay
+        
+        cache_args = {"refresh": args.refresh}
+        if args.data_dir:
+            cache_args["data_dir"] = args.data_dir
+        pipeline = BubbleIndicatorPipeline(MarketDataCache(**cache_args))
+        history = pipeline.compute_history()
+    
+    if args.replay:
+        replay = pipeline.replay(start=args.replay, history=history)
+        if args.replay_csv:
+            replay.to_csv(args.replay_csv, index_label="month")
+            print(f"リプレイ結果を保存しました: {args.replay_csv}")
+        if args.output == "json":
+            records = replay.reset_index(names="month").astype({"month": str})
+            print(records.to_json(orient="records", force_ascii=False, indent=2))
+        else:
+            print(format_replay(replay, scorer))
+        return 0
     
     # スコアの取得
     if args.manual:
         scores = manual_assessment()
+    elif args.auto:
+        scores, missing = pipeline.current_scores(history)
+        if args.scores:
+            try:
+                overrides = json.loads(args.scores)
+            except json.JSONDecodeError:
+                print("エラー: 無効なJSON形式です")
+                return 1
+            scores.update(overrides)
+            missing = [key for key in missing if key not in overrides]
+        if missing:
+            print(f"警告: データ不足のため0点として扱う指標: {', '.join(missing)}")
+            print("      --data-dir にCSVを配置するか --scores で手動スコアを指定してください")
+            scores.update(dict.fromkeys(missing, 0))
+        scores = {key: scores[key] for key in scorer.indicators if key in scores}
     elif args.scores:
         try:
             scores = json.loads(args.scores)
@@ -288,13 +353,15 @@ def main():
             print("エラー: 無効なJSON形式です")
             return 1
     else:
-        print("エラー: --manual または --scores を指定してください")
+        print("エラー: --manual / --scores / --auto / --replay のいずれかを指定してください")
         print("\nガイドラインを表示:")
         print(scorer.get_scoring_guidelines())
         return 1
     
     # 評価の実行
     result = scorer.calculate_score(scores)
+    if missing:
+        result["missing_indicators"] = missing
     
     # 出力
     if args.output == "json":